@@ -0,0 +1,479 @@
+"""
+Prueba de carga: tormenta de préstamos de inicio de semestre.
+
+Simula estudiantes concurrentes contra una instancia en marcha (runserver,
+gunicorn o el despliegue de render.yaml) con asyncio y la biblioteca
+estándar, sin importar Django:
+1. login: cada estudiante pide su token a /api/token/ (todos a la vez con
+   --ramp-up 0)
+2. durante --duration segundos cada estudiante repite: buscar libros
+   disponibles en /api/books/ con filtros, pedir uno (o --parallel-checkouts a
+   la vez) en /api/loans/ y esperar un tiempo de reflexión
+3. los bibliotecarios devuelven cada préstamo --hold segundos después de
+   crearse (PATCH /api/loans/<id>/return/)
+
+Informe por operación: peticiones, rendimiento (req/s), latencias p50, p90,
+p99 y máxima, y respuestas por tipo (2xx, 4xx de negocio, 429/503 del control
+de carga, 5xx y errores de conexión o timeouts). Además detecta:
+- sobreventa: más préstamos activos de un libro que su stock inicial, o
+  stock final distinto de stock inicial - préstamos activos
+- límite por estudiante: más de --loan-limit préstamos activos a la vez, o
+  el mismo libro dos veces
+
+Un préstamo deja de contarse como activo al enviar su devolución, así que
+las violaciones detectadas no son falsos positivos por el orden de llegada
+de las respuestas. Con --parallel-checkouts mayor que 1 cada estudiante
+pide varios libros a la vez, como un doble clic.
+
+Preparar los datos (una vez; con --reset antes de repetir una prueba):
+    python manage.py seed_load_test --students 500 --librarians 2 --books 100 --stock 3 --reset
+
+Uso:
+    python benchmarks/checkout_storm.py --base-url http://127.0.0.1:8000 \\
+        --students 200 --duration 60 --hold 15
+
+Todas las peticiones salen de la misma IP, así que el login comparte la
+cubeta anon de THROTTLING: repartir los logins con --ramp-up o, en una
+instancia dedicada a la prueba, ampliar esa cubeta. No se falsea
+X-Forwarded-For: el servidor solo confía en los proxies de NUM_PROXIES.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import ssl
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urlsplit
+
+OPERATIONS = ('login', 'browse', 'checkout', 'return', 'verify')
+
+
+class HttpClient:
+    """Cliente HTTP/1.1 mínimo con keep-alive: una conexión por usuario virtual"""
+
+    def __init__(self, base_url: str, timeout: float, headers: Optional[Dict[str, str]] = None):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == 'https' else None
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip('/')
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Any = None, headers: Optional[Dict[str, str]] = None):
+        """(estado, JSON de la respuesta o None)"""
+        content = json.dumps(body).encode() if body is not None else b''
+        lines = [
+            f'{method} {self.prefix}{path} HTTP/1.1',
+            f'Host: {self.netloc}',
+            'Accept: application/json',
+            'Accept-Encoding: identity',
+            f'Content-Length: {len(content)}',
+        ]
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        lines.extend(f'{name}: {value}' for name, value in {**self.headers, **(headers or {})}.items())
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + content
+
+        for attempt in range(2):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+                )
+            try:
+                self.writer.write(payload)
+                await self.writer.drain()
+                status, response_headers, data = await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, EOFError):
+                await self.close()
+                # El servidor cerró la conexión keep-alive: se reintenta una vez en una nueva
+                # (los POST de préstamo llevan Idempotency-Key, así que repetirlos es seguro)
+                if reused and attempt == 0:
+                    continue
+                raise
+            except asyncio.TimeoutError:
+                await self.close()
+                raise
+            if response_headers.get('connection', '').lower() == 'close':
+                await self.close()
+            try:
+                return status, json.loads(data) if data else None
+            except ValueError:
+                return status, None
+
+    async def _read_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("conexión cerrada por el servidor")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or 100 <= status < 200:
+            return status, headers, b''
+        if 'content-length' in headers:
+            return status, headers, await self.reader.readexactly(int(headers['content-length']))
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return status, headers, b''.join(chunks)
+                chunks.append((await self.reader.readexactly(size + 2))[:-2])
+        headers['connection'] = 'close'
+        return status, headers, await self.reader.read()
+
+    async def close(self) -> None:
+        writer, self.reader, self.writer = self.writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    outcomes: Counter = field(default_factory=Counter)
+
+    def record(self, seconds: float, status: Optional[int]) -> None:
+        self.latencies.append(seconds)
+        if status is None:
+            self.outcomes['exc'] += 1
+        elif status in (429, 503):
+            self.outcomes['429/503'] += 1
+        else:
+            self.outcomes[f'{status // 100}xx'] += 1
+
+    def percentile(self, percent: float) -> float:
+        values = sorted(self.latencies)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, max(0, math.ceil(percent / 100 * len(values)) - 1))]
+
+
+class Recorder:
+    """Latencias y resultados por operación"""
+
+    def __init__(self):
+        self.operations: Dict[str, OperationStats] = defaultdict(OperationStats)
+        self.errors: Counter = Counter()
+
+    async def call(self, operation: str, client: HttpClient, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            status, data = await client.request(method, path, **kwargs)
+        except (OSError, EOFError, asyncio.TimeoutError, ValueError, IndexError) as e:
+            self.operations[operation].record(time.perf_counter() - started, None)
+            self.errors[f'{operation}: {type(e).__name__}'] += 1
+            return None, None
+        self.operations[operation].record(time.perf_counter() - started, status)
+        if status >= 500:
+            self.errors[f'{operation}: HTTP {status}'] += 1
+        return status, data
+
+
+class Ledger:
+    """Préstamos creados y devueltos durante la prueba, para detectar sobreventa y límites"""
+
+    def __init__(self, loan_limit: int):
+        self.loan_limit = loan_limit
+        self.initial_stock: Dict[int, int] = {}
+        self.held: Dict[int, Set[int]] = defaultdict(set)
+        self.by_student: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.loans: Dict[int, Tuple[str, int]] = {}
+        self.active: Counter = Counter()
+        self.uncertain_books: Set[int] = set()
+        self.peak_held: Counter = Counter()
+        self.violations: List[str] = []
+
+    def student_books(self, student: str) -> Set[int]:
+        return set(self.by_student[student].values())
+
+    def created(self, student: str, loan_id: int, book_id: int) -> None:
+        self.loans[loan_id] = (student, book_id)
+        self.active[book_id] += 1
+
+        held = self.held[book_id]
+        held.add(loan_id)
+        self.peak_held[book_id] = max(self.peak_held[book_id], len(held))
+        if len(held) > self.initial_stock.get(book_id, math.inf):
+            self.violations.append(
+                f"sobreventa: libro {book_id} con {len(held)} préstamos activos y stock inicial "
+                f"{self.initial_stock[book_id]}"
+            )
+
+        loans = self.by_student[student]
+        if book_id in loans.values():
+            self.violations.append(f"duplicado: {student} tiene dos veces el libro {book_id}")
+        loans[loan_id] = book_id
+        if len(loans) > self.loan_limit:
+            self.violations.append(f"límite: {student} tiene {len(loans)} préstamos activos")
+
+    def returning(self, loan_id: int) -> None:
+        student, book_id = self.loans[loan_id]
+        self.held[book_id].discard(loan_id)
+        self.by_student[student].pop(loan_id, None)
+
+    def returned(self, loan_id: int, status: Optional[int]) -> None:
+        _, book_id = self.loans[loan_id]
+        if status == 200:
+            self.active[book_id] -= 1
+        elif status is None or status >= 500:
+            # No se sabe si la devolución se aplicó
+            self.uncertain_books.add(book_id)
+
+
+@dataclass
+class Storm:
+    args: argparse.Namespace
+    recorder: Recorder
+    ledger: Ledger
+    returns: asyncio.Queue
+    deadline: float = 0.0
+    genres: List[str] = field(default_factory=list)
+
+    def client(self, token: Optional[str] = None) -> HttpClient:
+        headers = {}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        return HttpClient(self.args.base_url, self.args.timeout, headers)
+
+    async def login(self, client: HttpClient, username: str) -> Optional[str]:
+        status, data = await self.recorder.call(
+            'login', client, 'POST', '/api/token/',
+            body={'username': username, 'password': self.args.password}
+        )
+        if status == 200 and data:
+            client.headers['Authorization'] = f"Bearer {data['access']}"
+            return data['access']
+        return None
+
+    async def load_catalog(self, client: HttpClient) -> None:
+        """Stock inicial de los libros de carga, recorriendo el listado paginado"""
+        page = 1
+        while True:
+            status, data = await self.recorder.call('verify', client, 'GET', '/api/books/?' + urlencode({
+                'author_name': self.args.catalog_author, 'page': page, 'page_size': 500
+            }))
+            if status != 200:
+                raise SystemExit(f"No se pudo leer el catálogo de carga (HTTP {status})")
+            for book in data['results']:
+                self.ledger.initial_stock[book['id']] = book['stock']
+            self.genres = sorted({book['genre_name'] for book in data['results']} | set(self.genres))
+            if not data['has_next']:
+                return
+            page += 1
+
+    async def student(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(self.args.ramp_up * index / max(1, self.args.students))
+        username = f'{self.args.student_prefix}{index + 1:05d}'
+        client = self.client()
+        token = await self.login(client, username)
+        if token is None:
+            return
+        # Una conexión por petición simultánea (HTTP/1.1 no multiplexa)
+        clients = [client] + [self.client(token) for _ in range(self.args.parallel_checkouts - 1)]
+        pages = max(1, math.ceil(len(self.ledger.initial_stock) / self.args.page_size))
+
+        try:
+            while loop.time() < self.deadline:
+                params = {
+                    'author_name': self.args.catalog_author,
+                    'available': 'true',
+                    'page': random.randint(1, pages),
+                    'page_size': self.args.page_size,
+                }
+                if self.genres and random.random() < 0.5:
+                    params['genre_name'] = random.choice(self.genres)
+                status, data = await self.recorder.call('browse', client, 'GET', '/api/books/?' + urlencode(params))
+
+                if status == 200 and data and loop.time() < self.deadline:
+                    mine = self.ledger.student_books(username)
+                    candidates = [book for book in data['results'] if book['is_available'] and book['id'] not in mine]
+                    picks = random.sample(candidates, min(len(candidates), self.args.parallel_checkouts))
+                    await asyncio.gather(*(
+                        self.checkout(connection, username, book['id']) for connection, book in zip(clients, picks)
+                    ))
+                await asyncio.sleep(random.expovariate(1 / self.args.think_time) if self.args.think_time > 0 else 0)
+        finally:
+            for connection in clients:
+                await connection.close()
+
+    async def checkout(self, client: HttpClient, username: str, book_id: int) -> None:
+        status, data = await self.recorder.call(
+            'checkout', client, 'POST', '/api/loans/',
+            body={'book_id': book_id}, headers={'Idempotency-Key': str(uuid.uuid4())}
+        )
+        if status == 201 and data:
+            self.ledger.created(username, data['id'], book_id)
+            await self.returns.put((asyncio.get_running_loop().time() + self.args.hold, data['id']))
+
+    async def librarian(self, index: int) -> None:
+        loop = asyncio.get_running_loop()
+        client = self.client()
+        if await self.login(client, f'{self.args.librarian_prefix}{index + 1:05d}') is None:
+            return
+        try:
+            while loop.time() < self.deadline:
+                try:
+                    ready_at, loan_id = await asyncio.wait_for(self.returns.get(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue
+                if ready_at >= self.deadline:
+                    break
+                await asyncio.sleep(max(0.0, ready_at - loop.time()))
+                self.ledger.returning(loan_id)
+                status, _ = await self.recorder.call('return', client, 'PATCH', f'/api/loans/{loan_id}/return/')
+                self.ledger.returned(loan_id, status)
+        finally:
+            await client.close()
+
+    async def verify_stock(self, client: HttpClient) -> List[str]:
+        """Stock final de cada libro prestado frente a stock inicial - préstamos activos"""
+        mismatches = []
+        for book_id in sorted(self.ledger.peak_held):
+            if book_id in self.ledger.uncertain_books:
+                continue
+            status, data = await self.recorder.call('verify', client, 'GET', f'/api/books/{book_id}/')
+            if status != 200:
+                continue
+            expected = self.ledger.initial_stock[book_id] - self.ledger.active[book_id]
+            if data['stock'] != expected:
+                mismatches.append(
+                    f"stock: libro {book_id} termina con {data['stock']} y debería tener {expected} "
+                    f"({self.ledger.active[book_id]} préstamos activos)"
+                )
+        return mismatches
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    storm = Storm(args, Recorder(), Ledger(args.loan_limit), asyncio.Queue())
+    admin = storm.client()
+    if await storm.login(admin, f'{args.librarian_prefix}00001') is None:
+        raise SystemExit("No se pudo iniciar sesión como bibliotecario: ¿se ejecutó manage.py seed_load_test?")
+    await storm.load_catalog(admin)
+    if not storm.ledger.initial_stock:
+        raise SystemExit(f"No hay libros de '{args.catalog_author}': ejecutar manage.py seed_load_test")
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    storm.deadline = started + args.ramp_up + args.duration
+    await asyncio.gather(
+        *(storm.student(index) for index in range(args.students)),
+        *(storm.librarian(index) for index in range(args.librarians)),
+    )
+    elapsed = loop.time() - started
+
+    violations = storm.ledger.violations + await storm.verify_stock(admin)
+    await admin.close()
+    return {
+        'elapsed': elapsed,
+        'operations': storm.recorder.operations,
+        'errors': storm.recorder.errors,
+        'violations': violations,
+        'loans': len(storm.ledger.loans),
+        'active_after': sum(storm.ledger.active.values()),
+        'books': len(storm.ledger.initial_stock),
+    }
+
+
+def report(args: argparse.Namespace, result: Dict[str, Any]) -> Dict[str, Any]:
+    elapsed = result['elapsed']
+    print(
+        f"{args.students} estudiantes, {args.librarians} bibliotecarios, {result['books']} libros, "
+        f"{elapsed:.1f} s; préstamos creados: {result['loans']}, activos al terminar: {result['active_after']}\n"
+    )
+    columns = ('2xx', '4xx', '429/503', '5xx', 'exc')
+    print(
+        f"{'operación':<10} {'peticiones':>10} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'máx ms':>8} "
+        + ' '.join(f'{column:>8}' for column in columns)
+    )
+    summary = {}
+    for name in OPERATIONS:
+        stats = result['operations'].get(name)
+        if not stats or not stats.latencies:
+            continue
+        row = {
+            'requests': len(stats.latencies),
+            'rps': len(stats.latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': stats.percentile(50) * 1000,
+            'p90_ms': stats.percentile(90) * 1000,
+            'p99_ms': stats.percentile(99) * 1000,
+            'max_ms': max(stats.latencies) * 1000,
+            'outcomes': {column: stats.outcomes[column] for column in columns},
+            'error_rate': (stats.outcomes['5xx'] + stats.outcomes['exc']) / len(stats.latencies),
+        }
+        summary[name] = row
+        print(
+            f"{name:<10} {row['requests']:>10} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} "
+            f"{row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+            + ' '.join(f'{stats.outcomes[column]:>8}' for column in columns)
+        )
+
+    if result['errors']:
+        print("\nErrores:")
+        for error, count in result['errors'].most_common(10):
+            print(f"  {count:>6}  {error}")
+    print(f"\nViolaciones: {len(result['violations'])}")
+    for violation in result['violations'][:20]:
+        print(f"  {violation}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--students', type=int, default=100, help="Estudiantes concurrentes")
+    parser.add_argument('--librarians', type=int, default=2, help="Bibliotecarios que devuelven préstamos")
+    parser.add_argument('--duration', type=float, default=60, help="Segundos de carga tras el arranque gradual")
+    parser.add_argument('--ramp-up', type=float, default=0, help="Segundos para que entren todos los estudiantes")
+    parser.add_argument('--think-time', type=float, default=2, help="Media (exponencial) entre acciones, en segundos")
+    parser.add_argument('--hold', type=float, default=15, help="Segundos hasta devolver cada préstamo")
+    parser.add_argument('--parallel-checkouts', type=int, default=1, help="Préstamos pedidos a la vez por estudiante")
+    parser.add_argument('--loan-limit', type=int, default=3, help="Máximo de préstamos activos por estudiante")
+    parser.add_argument('--page-size', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--password', default='LoadTest!2024')
+    parser.add_argument('--student-prefix', default='loadstudent')
+    parser.add_argument('--librarian-prefix', default='loadlibrarian')
+    parser.add_argument('--catalog-author', default='Autor de Carga')
+    parser.add_argument('--json-output', help="Guardar también el resumen en este archivo JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    summary = report(args, result)
+    if args.json_output:
+        with open(args.json_output, 'w') as output:
+            json.dump({
+                'config': vars(args),
+                'elapsed': result['elapsed'],
+                'operations': summary,
+                'violations': result['violations'],
+            }, output, indent=2)
+    # Código de salida distinto de cero si hubo sobreventa o se saltó el límite (útil en CI)
+    sys.exit(1 if result['violations'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark de memoria al mapear listados de préstamos a entidades de dominio.
+
+Compara, por fila, los bytes y el número de asignaciones de:
+- legacy: entidades @dataclass con __dict__ y un User/Book nuevo por fila
+- per-row: entidades con slots, pero un User/Book nuevo por fila (LoanMapper.to_domain)
+- eager-events: identity-map, pero con una lista de eventos vacía en cada Loan/Book
+- identity-map: entidades con slots compartiendo User/Book por ID (LoanMapper.to_domain_list);
+  la lista de eventos solo se crea al registrar el primero
+
+No necesita base de datos: las filas se construyen como modelos Django sin guardar,
+igual que las devolvería select_related.
+
+Uso:
+    python benchmarks/entity_memory.py --rows 50000 --students 2000 --books 5000
+"""
+import argparse
+import dataclasses
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User as DjangoUser  # noqa: E402
+
+from libraryapp.domain.entities.book import Book  # noqa: E402
+from libraryapp.domain.entities.loan import Loan  # noqa: E402
+from libraryapp.domain.entities.user import User, UserRole  # noqa: E402
+from libraryapp.infrastructure.models.django_models import (  # noqa: E402
+    DjangoAuthor, DjangoBook, DjangoGenre, DjangoLoan
+)
+from libraryapp.infrastructure.repositories.mappers import LoanMapper  # noqa: E402
+
+
+def _unslotted(cls):
+    """Copia de la entidad como @dataclass con __dict__ y lista de eventos propia (representación anterior)"""
+    fields = [
+        (f.name, f.type, dataclasses.field(
+            default=dataclasses.MISSING if f.name == 'events' else f.default,
+            default_factory=list if f.name == 'events' else f.default_factory,
+            init=f.init, repr=f.repr, compare=f.compare
+        ))
+        for f in dataclasses.fields(cls)
+    ]
+    return dataclasses.make_dataclass(f'Legacy{cls.__name__}', fields)
+
+
+LegacyUser, LegacyBook, LegacyLoan = _unslotted(User), _unslotted(Book), _unslotted(Loan)
+
+
+def _copy(text: str) -> str:
+    """Cadena nueva con el mismo contenido, como la crea el driver en cada fila"""
+    return ''.join(list(text))
+
+
+def build_rows(rows: int, students: int, books: int):
+    """Filas DjangoLoan con student/book ya cargados (como select_related + prefetch)"""
+    now = datetime.now(timezone.utc)
+    users = []
+    for i in range(students):
+        user = DjangoUser(id=i + 1, username=f'student{i}', email=f'student{i}@university.com',
+                          first_name='Nombre', last_name='Apellido')
+        user._prefetched_objects_cache = {'groups': []}
+        users.append(user)
+
+    result = []
+    for i in range(rows):
+        book_id = i % books + 1
+        # select_related crea autor/género nuevos por fila, con sus propias cadenas
+        author = DjangoAuthor(id=book_id % 500 + 1, name=_copy(f'Autor {book_id % 500}'))
+        genre = DjangoGenre(id=book_id % 20 + 1, name=_copy(f'Género {book_id % 20}'))
+        book = DjangoBook(id=book_id, title=f'Libro {book_id}', author=author, genre=genre,
+                          published_year=1990 + book_id % 30, stock=book_id % 4)
+        borrowed_at = now - timedelta(days=i % 60)
+        result.append(DjangoLoan(
+            id=i + 1, student=users[i % students], book=book, borrowed_at=borrowed_at,
+            returned_at=None, due_at=borrowed_at + timedelta(days=14)
+        ))
+    return result
+
+
+def legacy_map(django_loans):
+    loans = []
+    for django_loan in django_loans:
+        django_user, django_book = django_loan.student, django_loan.book
+        role = UserRole.LIBRARIAN if any(
+            group.name == 'Librarians' for group in django_user.groups.all()
+        ) else UserRole.STUDENT
+        loans.append(LegacyLoan(
+            id=django_loan.id,
+            student=LegacyUser(
+                id=django_user.id, username=django_user.username, email=django_user.email,
+                first_name=django_user.first_name or None, last_name=django_user.last_name or None,
+                role=role
+            ),
+            book=LegacyBook(
+                id=django_book.id, title=django_book.title, author_name=django_book.author_name,
+                published_year=django_book.published_year, genre_name=django_book.genre_name,
+                stock=django_book.stock
+            ),
+            borrowed_at=django_loan.borrowed_at,
+            returned_at=django_loan.returned_at,
+            due_at=django_loan.due_at
+        ))
+    return loans
+
+
+def eager_events(django_loans):
+    """Identity-map con la lista de eventos creada al construir cada entidad"""
+    loans = LoanMapper.to_domain_list(django_loans)
+    seen_books = set()
+    for loan in loans:
+        loan.events = []
+        if id(loan.book) not in seen_books:
+            seen_books.add(id(loan.book))
+            loan.book.events = []
+    return loans
+
+
+def measure(label, mapper, django_loans):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = mapper(django_loans)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diff = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in diff)
+    count = sum(stat.count_diff for stat in diff)
+    rows = len(result)
+    print(f'{label:<14} {size / rows:>10.1f} {count / rows:>12.2f} {size / 2 ** 20:>10.2f}')
+    del result
+
+
+def instance_sizes():
+    user = User(id=1, username='student', email='s@u.com')
+    book = Book(id=1, title='Libro', author_name='Autor', published_year=2000, genre_name='Ensayo')
+    loan = Loan(id=1, student=user, book=book, borrowed_at=datetime.now(timezone.utc))
+    print('Tamaño por instancia (bytes, incluye __dict__ y la lista de eventos si existen):')
+    for entity, legacy in ((user, LegacyUser), (book, LegacyBook), (loan, LegacyLoan)):
+        kwargs = {f.name: getattr(entity, f.name) for f in dataclasses.fields(entity) if f.init}
+        old = legacy(**kwargs)
+        old_size = sys.getsizeof(old) + sys.getsizeof(old.__dict__)
+        size = sys.getsizeof(entity)
+        if hasattr(old, 'events'):
+            old_size += sys.getsizeof(old.events)
+            print(f'  {type(entity).__name__:<6} slots={size:>4}  eager={size + sys.getsizeof([]):>4}  dict={old_size:>4}')
+        else:
+            print(f'  {type(entity).__name__:<6} slots={size:>4}  dict={old_size:>4}')
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--books', type=int, default=5000)
+    args = parser.parse_args()
+
+    instance_sizes()
+    django_loans = build_rows(args.rows, args.students, args.books)
+    print(f'{args.rows} préstamos, {args.students} estudiantes, {args.books} libros')
+    print(f'{"modo":<14} {"bytes/fila":>10} {"asign./fila":>12} {"total MB":>10}')
+    measure('legacy', legacy_map, django_loans)
+    measure('per-row', lambda rows: [LoanMapper.to_domain(row) for row in rows], django_loans)
+    measure('eager-events', eager_events, django_loans)
+    measure('identity-map', LoanMapper.to_domain_list, django_loans)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark de bytes en la red y coste de CPU al codificar listados de la API.
+
+Serializa un listado de préstamos (como GET /api/loans/) y otro de libros
+(GET /api/books/) con los serializers reales y mide, para cada combinación de
+formato (JSON, MessagePack) y codificación (identidad, gzip, br, zstd):
+- bytes enviados y proporción respecto al JSON sin comprimir
+- milisegundos de CPU por respuesta (renderizado + compresión)
+
+Usa los mismos compresores y niveles que CompressionMiddleware
+(settings.RESPONSE_COMPRESSION). MessagePack, brotli y zstd solo aparecen si
+están instalados los paquetes msgpack, brotli y zstandard.
+
+No necesita base de datos.
+
+Uso:
+    python benchmarks/response_encoding.py --rows 5000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from libraryapp.domain.entities.book import Book  # noqa: E402
+from libraryapp.domain.entities.loan import Loan  # noqa: E402
+from libraryapp.domain.entities.user import User, UserRole  # noqa: E402
+from libraryapp.presentation.middleware.compression import (  # noqa: E402
+    DEFAULT_CONFIG, available_compressors
+)
+from libraryapp.presentation.renderers import msgpack_renderer  # noqa: E402
+from libraryapp.presentation.serializers.clean_serializers import (  # noqa: E402
+    BookSerializer, LoanSerializer
+)
+
+
+def build_books(count: int):
+    return [
+        Book(id=i + 1, title=f'Libro {i}', author_name=f'Autor {i % 500}',
+             published_year=1900 + i % 120, genre_name=f'Género {i % 20}', stock=i % 4)
+        for i in range(count)
+    ]
+
+
+def build_loans(count: int, students: int, books):
+    now = datetime.now(timezone.utc)
+    users = [
+        User(id=i + 1, username=f'student{i}', email=f'student{i}@university.com',
+             first_name='Nombre', last_name='Apellido', role=UserRole.STUDENT)
+        for i in range(students)
+    ]
+    loans = []
+    for i in range(count):
+        borrowed_at = now - timedelta(days=i % 60, seconds=i)
+        loans.append(Loan(
+            id=i + 1, student=users[i % students], book=books[i % len(books)],
+            borrowed_at=borrowed_at, returned_at=None, due_at=borrowed_at + timedelta(days=14)
+        ))
+    return loans
+
+
+def renderers():
+    result = [('json', JSONRenderer().render)]
+    if msgpack_renderer.msgpack is not None:
+        result.append(('msgpack', msgpack_renderer.MessagePackRenderer().render))
+    return result
+
+
+def encoders(config):
+    result = [('identity', None)]
+    compressors = available_compressors()
+    for encoding in ('gzip', 'br', 'zstd'):
+        if encoding in compressors:
+            result.append((encoding, compressors[encoding]))
+    return result
+
+
+def encode(data, render, compressor_class, config) -> bytes:
+    body = render(data)
+    if compressor_class is None:
+        return body
+    compressor = compressor_class(config)
+    return compressor.compress(body) + compressor.finish()
+
+
+def measure(label: str, data, config, repeat: int) -> None:
+    print(f'{label}')
+    print(f'  {"formato":<10} {"codificación":<12} {"bytes":>12} {"ratio":>7} {"CPU ms":>9}')
+    baseline = None
+    for render_name, render in renderers():
+        for encoding, compressor_class in encoders(config):
+            started = time.process_time()
+            for _ in range(repeat):
+                payload = encode(data, render, compressor_class, config)
+            cpu_ms = (time.process_time() - started) * 1000 / repeat
+            size = len(payload)
+            if baseline is None:
+                baseline = size
+            print(f'  {render_name:<10} {encoding:<12} {size:>12,} {size / baseline:>7.1%} {cpu_ms:>9.1f}')
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--books', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    config = {**DEFAULT_CONFIG, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+    print(f'Niveles: gzip={config["GZIP_LEVEL"]} br={config["BROTLI_QUALITY"]} zstd={config["ZSTD_LEVEL"]}')
+    print(f'Codificaciones disponibles: {", ".join(available_compressors())}\n')
+
+    books = build_books(args.books)
+    loans = build_loans(args.rows, args.students, books)
+    measure(f'GET /api/books/ ({len(books)} libros)', BookSerializer(books, many=True).data, config, args.repeat)
+    measure(f'GET /api/loans/ ({len(loans)} préstamos)', LoanSerializer(loans, many=True).data, config, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
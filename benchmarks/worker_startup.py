@@ -0,0 +1,86 @@
+"""
+Benchmark del arranque en frío de un worker de la API.
+
+Lanza varias veces un proceso nuevo que hace lo mismo que un worker antes de
+su primera petición (django.setup() y cargar la URLconf con todos los
+ViewSets) y mide, para cada variante:
+- milisegundos hasta tener la URLconf cargada
+- RSS máximo del proceso (MB)
+- módulos importados
+
+Variantes:
+- docs eager: importando drf_yasg.views/codecs/generators al arrancar, como
+  antes de cargar la documentación de forma perezosa
+- docs lazy: documentación habilitada, cargada en la primera petición a /swagger/
+- docs off: API_DOCS_ENABLED=false
+
+No necesita base de datos.
+
+Uso:
+    python benchmarks/worker_startup.py --runs 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORKER_CODE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+if {eager}:
+    import drf_yasg.views, drf_yasg.codecs, drf_yasg.generators
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    'ms': elapsed * 1000,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+}}))
+"""
+
+VARIANTS = [
+    ('docs eager', {'API_DOCS_ENABLED': 'true'}, True),
+    ('docs lazy', {'API_DOCS_ENABLED': 'true'}, False),
+    ('docs off', {'API_DOCS_ENABLED': 'false'}, False),
+]
+
+
+def run_worker(env_overrides, eager: bool):
+    env = {**os.environ, **env_overrides}
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), env.get('PYTHONPATH')]))
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER_CODE.format(eager=eager)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'variante':<12} {'ms (mediana)':>13} {'RSS MB':>8} {'módulos':>8}")
+    for name, env_overrides, eager in VARIANTS:
+        # Una ejecución previa para que la caché de bytecode y del sistema de archivos esté caliente
+        run_worker(env_overrides, eager)
+        results = [run_worker(env_overrides, eager) for _ in range(args.runs)]
+        print(
+            f"{name:<12} "
+            f"{statistics.median(r['ms'] for r in results):>13.1f} "
+            f"{statistics.median(r['rss_mb'] for r in results):>8.1f} "
+            f"{results[0]['modules']:>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -7,5 +7,7 @@ pip install -r requirements.txt
 # Set production settings
 export DJANGO_SETTINGS_MODULE=config.settings_production
 
+python manage.py generate_schema
 python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+python manage.py createcachetable
@@ -10,9 +10,13 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 from datetime import timedelta
 
+import dj_database_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,13 +52,22 @@ INSTALLED_APPS = [
     "libraryapp"
 ]
 
+# Swagger UI, ReDoc y /swagger.json. Con API_DOCS_ENABLED=false no se registran sus rutas
+# ni la app drf_yasg, y los workers no importan sus dependencias (jsonschema, validadores).
+API_DOCS_ENABLED = os.environ.get('API_DOCS_ENABLED', 'true').lower() == 'true'
+if not API_DOCS_ENABLED:
+    INSTALLED_APPS.remove("drf_yasg")
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
+    "libraryapp.presentation.middleware.admission.AdmissionControlMiddleware",
+    "libraryapp.presentation.middleware.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "libraryapp.presentation.middleware.replica_routing.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -93,6 +106,26 @@ DATABASES = {
     }
 }
 
+# Réplicas de lectura: DATABASE_REPLICA_URLS con URLs separadas por comas
+# (p. ej. postgres://...@replica-1/librarydb). Los listados, búsquedas, detalles y
+# exportaciones leen de ellas; las escrituras y las lecturas dentro de una
+# transacción van siempre a default. En pruebas, las réplicas apuntan a default.
+DATABASE_REPLICAS = {
+    f'replica_{index}': {**dj_database_url.parse(url.strip()), 'TEST': {'MIRROR': 'default'}}
+    for index, url in enumerate(
+        (url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()), start=1
+    )
+}
+DATABASES.update(DATABASE_REPLICAS)
+
+DATABASE_ROUTERS = ['libraryapp.infrastructure.database.replica_router.ReplicaRouter']
+
+# Tras escribir, las lecturas del usuario van al primario durante STICKY_SECONDS
+# (mayor que el retraso habitual de replicación)
+REPLICA_ROUTING = {
+    'STICKY_SECONDS': int(os.environ.get('REPLICA_STICKY_SECONDS', '10')),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -146,6 +179,65 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'libraryapp.presentation.throttling.throttles.UserRateThrottle',
+        'libraryapp.presentation.throttling.throttles.AnonRateThrottle',
+    ],
+    # Proxies de confianza delante de la app: la IP de los límites anónimos se toma
+    # de X-Forwarded-For contando desde la derecha. Con 0 se usa REMOTE_ADDR y una
+    # cabecera enviada por el cliente no permite cambiar de cubeta.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '0')),
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# MessagePack (Accept: application/msgpack) solo si el paquete opcional está instalado
+if importlib.util.find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'libraryapp.presentation.renderers.msgpack_renderer.MessagePackRenderer'
+    )
+
+# Cubetas de tokens (RATE de recarga, BURST de capacidad) compartidas entre workers
+# a través de la caché. Los ámbitos sin entrada en BUCKETS no se limitan.
+# - user / anon: límite general por usuario autenticado o por IP
+# - loan_create / search: por estudiante y por usuario en creación de préstamos y
+#   búsquedas de texto (title, author_name, genre_name y /api/books/suggest/)
+# - *_endpoint: una sola cubeta por endpoint entre todos los usuarios
+THROTTLING = {
+    'CACHE': 'ratelimit',
+    'BUCKETS': {
+        'user': {'RATE': '300/min', 'BURST': 100},
+        'anon': {'RATE': '30/min', 'BURST': 10},
+        'loan_create': {'RATE': '10/min', 'BURST': 5},
+        'loan_create_endpoint': {'RATE': '600/min', 'BURST': 100},
+        'search': {'RATE': '60/min', 'BURST': 20},
+        'search_endpoint': {'RATE': '1200/min', 'BURST': 200},
+    },
+}
+
+# Control de admisión: responder 503 con Retry-After en lugar de encolar.
+# MAX_CONCURRENT: peticiones de la API en curso entre todos los workers (0 = sin límite)
+# MAX_QUEUE_MS: descartar peticiones que esperaron más en el backlog (requiere que
+# el proxy envíe X-Request-Start; 0 = desactivado)
+ADMISSION_CONTROL = {
+    'CACHE': 'ratelimit',
+    'MAX_CONCURRENT': 0,
+    'MAX_QUEUE_MS': 0,
+    'LEASE_SECONDS': 30,
+    'RETRY_AFTER': 2,
+}
+
+# Compresión de respuestas de la API (gzip siempre; br y zstd si están instalados
+# los paquetes brotli y zstandard). Las respuestas menores de MIN_SIZE bytes no
+# compensan el coste de CPU.
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+    'ZSTD_LEVEL': 3,
 }
 
 # JWT settings
@@ -155,3 +247,95 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
 }
+
+# Implementación de los repositorios de dominio (libros, préstamos, usuarios, autores, géneros):
+# 'django' (ORM) o 'memory' (MemoryStore del proceso, ver config/settings_inmemory.py).
+# Con SEED_FROM_DATABASE el almacén en memoria se llena al arrancar con los datos de la base de datos.
+REPOSITORIES = {
+    'BACKEND': 'django',
+    'SEED_FROM_DATABASE': False,
+}
+
+# Caché (por proceso en desarrollo; compartida entre workers en producción)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Contadores de límites de peticiones y control de admisión: necesitan incr
+    # atómico y que no se purguen entradas vivas (ver throttles.py)
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ratelimit',
+        'OPTIONS': {'MAX_ENTRIES': 1_000_000},
+    },
+}
+
+# Facetas del catálogo (?facets=true en /api/books/)
+BOOK_FACETS = {
+    'CACHE_SECONDS': 300,
+    'MAX_VALUES': 50,
+}
+
+# Copia en memoria del catálogo para los endpoints de lectura de libros.
+# Se mantiene al día con los mensajes del broker de STOCK_EVENTS y se recarga
+# completa cada REFRESH_SECONDS como red de seguridad.
+CATALOG_SNAPSHOT = {
+    'ENABLED': False,
+    'REFRESH_SECONDS': 300,
+    # Altas/cambios de título aplicados en sitio antes de forzar una recarga
+    'MAX_APPENDED': 1000,
+}
+
+# Respuestas guardadas por Idempotency-Key (POST /api/loans/, POST /api/jobs/).
+# Las claves caducan a las TTL_HOURS; manage.py purge_idempotency_keys (tarea periódica)
+# las elimina. Una reserva sin respuesta tras LEASE_SECONDS se da por abandonada.
+IDEMPOTENCY = {
+    'TTL_HOURS': 24,
+    'LEASE_SECONDS': 60,
+}
+
+# Esquema OpenAPI: `manage.py generate_schema` lo escribe en FILE durante el build (collectstatic
+# lo publica en /static/openapi/swagger.json). Con PREBUILT se sirve ese archivo; si no, se
+# genera una vez por proceso en la primera petición.
+OPENAPI_SCHEMA = {
+    'FILE': BASE_DIR / 'libraryapp' / 'static' / 'openapi' / 'swagger.json',
+    'PREBUILT': False,
+    'MAX_AGE': 3600,
+}
+
+# Swagger UI y ReDoc cargan el esquema ya generado en lugar de pedir ?format=openapi
+SWAGGER_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+REDOC_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+
+# Préstamos: días hasta la fecha límite de devolución
+LOAN_PERIOD_DAYS = 14
+
+# Listados con ?page=: los totales de más de ESTIMATE_MIN_ROWS filas salen de las estadísticas
+# de PostgreSQL (reltuples sin filtros, EXPLAIN con filtros) salvo con ?exact=true
+PAGINATION = {
+    'ESTIMATE_MIN_ROWS': 100_000,
+}
+
+# manage.py archive_loans mueve al histórico los préstamos devueltos hace más de AFTER_DAYS
+LOAN_ARCHIVE = {
+    'AFTER_DAYS': 180,
+}
+
+# Archivos de los trabajos de exportación: en la base de datos, por bloques, porque el
+# worker (library-jobs) y la API (library-api) no comparten disco
+EXPORTS = {
+    'CHUNK_BYTES': 1024 * 1024,
+}
+
+# Notificaciones de stock en tiempo real (SSE en /api/books/stream/)
+# BACKEND: 'local' (un solo proceso) o 'postgres' (LISTEN/NOTIFY entre procesos)
+STOCK_EVENTS = {
+    'BACKEND': 'local',
+    'CHANNEL': 'book_stock',
+    'HEARTBEAT_SECONDS': 15,
+    'MAX_STREAM_SECONDS': 300,
+}
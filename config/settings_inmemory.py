@@ -0,0 +1,36 @@
+"""
+Perfil sin PostgreSQL para pruebas y benchmarks de rendimiento.
+
+Los repositorios de dominio (libros, préstamos, usuarios, autores y géneros)
+usan el MemoryStore del proceso. Lo que no tiene versión en memoria
+(usuarios y tokens de autenticación, outbox, trabajos, claves de
+idempotencia y estadísticas) queda en un archivo SQLite local; al arrancar,
+el almacén en memoria se llena con los datos de ese archivo (los usuarios y
+libros de demostración de las migraciones).
+
+    DJANGO_SETTINGS_MODULE=config.settings_inmemory python manage.py migrate
+    DJANGO_SETTINGS_MODULE=config.settings_inmemory python manage.py runserver
+
+Cada proceso tiene su propio almacén: usar un único worker (runserver o
+gunicorn con WEB_CONCURRENCY=1) y no ejecutar el worker de trabajos, que
+escribe en la base de datos.
+"""
+import os
+from .settings import *
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('INMEMORY_SQLITE_PATH', str(BASE_DIR / 'inmemory.sqlite3')),
+    }
+}
+DATABASE_REPLICAS = {}
+
+REPOSITORIES = {
+    'BACKEND': 'memory',
+    'SEED_FROM_DATABASE': True,
+}
+
+# El almacén en memoria ya sirve las lecturas del catálogo
+CATALOG_SNAPSHOT = {**CATALOG_SNAPSHOT, 'ENABLED': False}
+STOCK_EVENTS = {**STOCK_EVENTS, 'BACKEND': 'local'}
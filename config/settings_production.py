@@ -1,5 +1,6 @@
 import os
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from .settings import *
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -23,20 +24,79 @@ DATABASES = {
     )
 }
 
+# Réplicas de lectura (DATABASE_REPLICA_URLS), con las mismas conexiones persistentes
+DATABASE_REPLICAS = {
+    alias: {**config, 'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True}
+    for alias, config in DATABASE_REPLICAS.items()
+}
+DATABASES.update(DATABASE_REPLICAS)
+
+# Caché compartida por todos los workers (tabla creada con createcachetable en build.sh)
+CACHES = {
+    **CACHES,
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'library_cache',
+    },
+}
+
+# Límites y control de admisión compartidos entre workers en Redis (servicio
+# library-ratelimit de render.yaml). Con la caché local de cada proceso los límites
+# se multiplicarían por el número de workers, así que sin Redis no se arranca.
+if not os.environ.get('RATELIMIT_REDIS_URL'):
+    raise ImproperlyConfigured(
+        "RATELIMIT_REDIS_URL is required: rate limits and admission control need a shared Redis cache"
+    )
+CACHES['ratelimit'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': os.environ['RATELIMIT_REDIS_URL'],
+}
+
+# Render termina TLS en un proxy que añade su propia entrada a X-Forwarded-For
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '1')),
+}
+
+# Los workers WSGI publican y el servicio ASGI escucha: requiere backend entre procesos
+STOCK_EVENTS = {
+    **STOCK_EVENTS,
+    'BACKEND': os.environ.get('STOCK_EVENTS_BACKEND', 'postgres'),
+}
+
+# Copia del catálogo en memoria por worker (requiere el backend postgres de STOCK_EVENTS)
+CATALOG_SNAPSHOT = {
+    **CATALOG_SNAPSHOT,
+    'ENABLED': os.environ.get('CATALOG_SNAPSHOT_ENABLED', 'false').lower() == 'true',
+}
+
+# Plazas de la API en curso entre todos los workers y espera máxima en el backlog
+ADMISSION_CONTROL = {
+    **ADMISSION_CONTROL,
+    'MAX_CONCURRENT': int(os.environ.get('ADMISSION_MAX_CONCURRENT', '0')),
+    'MAX_QUEUE_MS': int(os.environ.get('ADMISSION_MAX_QUEUE_MS', '0')),
+}
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# build.sh genera el esquema OpenAPI antes de collectstatic
+OPENAPI_SCHEMA = {**OPENAPI_SCHEMA, 'PREBUILT': True}
+
 # Add WhiteNoise to middleware
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "libraryapp.presentation.middleware.admission.AdmissionControlMiddleware",
+    "libraryapp.presentation.middleware.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "libraryapp.presentation.middleware.replica_routing.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
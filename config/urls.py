@@ -1,25 +1,7 @@
-
-
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title="Library Management API",
-      default_version='v2.0',
-      description="Library Management API",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@library.local"),
-      license=openapi.License(name="BSD License"),
-   ),
-   public=True,
-   permission_classes=[permissions.AllowAny],
-
-)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -29,8 +11,14 @@ urlpatterns = [
 urlpatterns += [
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-
-    path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
+
+if settings.API_DOCS_ENABLED:
+    from libraryapp.presentation.views.schema import openapi_schema, redoc_ui, swagger_ui
+
+    # Esquema generado una vez (ver libraryapp/presentation/views/schema.py); las UI lo cargan de SPEC_URL
+    urlpatterns += [
+        path('swagger.json', openapi_schema, name='schema-json'),
+        path('swagger/', swagger_ui, name='schema-swagger-ui'),
+        path('redoc/', redoc_ui, name='schema-redoc'),
+    ]
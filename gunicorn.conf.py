@@ -0,0 +1,39 @@
+"""
+Configuración de gunicorn (se carga sola desde la raíz del proyecto).
+
+Con preload_app el proceso maestro importa Django, los ViewSets, casos de uso
+y serializers una sola vez antes de crear los workers: cada worker arranca al
+instante tras el fork y comparte esas páginas de memoria con el maestro
+(copy-on-write) en lugar de tener su propia copia. GUNICORN_PRELOAD=false
+vuelve a importar la aplicación en cada worker.
+
+Las conexiones a la base de datos no se pueden compartir entre procesos: el
+maestro cierra las que abrió al cargar la aplicación antes de crear los
+workers, y cada worker abre las suyas en su primera petición.
+"""
+import os
+
+# Los workers (WEB_CONCURRENCY) y el puerto (PORT) los toma gunicorn del entorno
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+def when_ready(server):
+    """En el maestro, con la aplicación ya importada y antes del primer fork"""
+    if not server.cfg.preload_app:
+        return
+    # La URLconf se carga en la primera petición: cargarla aquí importa las vistas
+    # y todo lo que dependen de ellas una sola vez para todos los workers
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    _close_connections()
+
+
+def post_fork(server, worker):
+    """En cada worker recién creado"""
+    _close_connections()
+
+
+def _close_connections():
+    from django.db import connections
+    for connection in connections.all(initialized_only=True):
+        connection.close()
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class Clock(ABC):
+    """Interface para obtener la hora actual (sustituible en pruebas)"""
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """Instante actual con zona horaria"""
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import List
+from ...domain.events.domain_events import DomainEvent
+
+
+class EventPublisher(ABC):
+    """Interface para publicar eventos de dominio"""
+
+    @abstractmethod
+    def publish(self, events: List[DomainEvent]) -> None:
+        """Registrar eventos dentro de la transacción en curso"""
+        pass
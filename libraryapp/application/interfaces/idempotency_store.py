@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyRecord:
+    """Petición registrada con una Idempotency-Key; status_code None = en curso"""
+    fingerprint: str
+    status_code: Optional[int] = None
+    body: Any = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class IdempotencyStore(ABC):
+    """Interface para guardar respuestas de peticiones repetibles por Idempotency-Key"""
+
+    @abstractmethod
+    def get(self, user_id: int, key: str) -> Optional[IdempotencyRecord]:
+        """Petición vigente registrada con esta clave, o None"""
+        pass
+
+    @abstractmethod
+    def claim(self, user_id: int, key: str, fingerprint: str) -> bool:
+        """
+        Reservar la clave antes de ejecutar; False si otra petición la tiene
+        reservada o completada. Una reserva abandonada (concesión vencida sin
+        respuesta) de la misma petición se puede volver a tomar.
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, user_id: int, key: str, status_code: int, body: Any) -> None:
+        """Guardar la respuesta para devolverla en los reintentos (en la transacción de la operación)"""
+        pass
+
+    @abstractmethod
+    def release(self, user_id: int, key: str) -> None:
+        """Liberar la clave sin respuesta (error del servidor): el reintento se ejecuta"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, older_than: datetime) -> int:
+        """Eliminar claves creadas antes de older_than; devuelve cuántas"""
+        pass
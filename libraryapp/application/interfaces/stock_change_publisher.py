@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from ...domain.entities.book import Book
+
+
+class StockChangePublisher(ABC):
+    """Interface para notificar cambios de stock a observadores externos"""
+
+    @abstractmethod
+    def publish(self, book: Book) -> None:
+        """Publicar el stock actual de un libro"""
+        pass
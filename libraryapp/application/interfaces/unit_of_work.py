@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import ContextManager
+
+
+class UnitOfWork(ABC):
+    """Interface para agrupar en una transacción las escrituras de varios repositorios"""
+
+    @abstractmethod
+    def atomic(self) -> ContextManager[None]:
+        """Contexto transaccional: se confirma al salir y se deshace si hay una excepción"""
+        pass
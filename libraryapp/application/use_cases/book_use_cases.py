@@ -1,7 +1,19 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from ...domain.entities.author import Author
 from ...domain.entities.book import Book
+from ...domain.entities.book_facets import BookFacets
+from ...domain.entities.page import Page
+from ...domain.events.domain_events import BookDeleted
+from ...domain.repositories.author_repository import AuthorRepository
 from ...domain.repositories.book_repository import BookRepository
-from ...shared.exceptions.business_exceptions import BookNotFoundException, ValidationException, BusinessRuleException
+from ...domain.repositories.loan_repository import LoanRepository
+from ..interfaces.clock import Clock
+from ..interfaces.stock_change_publisher import StockChangePublisher
+from ..interfaces.event_publisher import EventPublisher
+from ..interfaces.unit_of_work import UnitOfWork
+from ...shared.exceptions.business_exceptions import (
+    BookNotFoundException, ValidationException, BusinessRuleException, ConcurrencyException
+)
 
 
 class GetBookUseCase:
@@ -19,12 +31,71 @@ class ListBooksUseCase:
     def __init__(self, book_repository: BookRepository):
         self.book_repository = book_repository
     
-    def execute(self, filters: Optional[Dict[str, Any]] = None) -> List[Book]:
-        if filters:
-            return self.book_repository.find_with_filters(filters)
+    def execute(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Book]:
+        if filters or fields:
+            return self.book_repository.find_with_filters(filters or {}, fields)
         return self.book_repository.get_all()
 
 
+
+class ListBooksPageUseCase:
+    MAX_PAGE_SIZE = 500
+
+    def __init__(self, book_repository: BookRepository):
+        self.book_repository = book_repository
+    
+    def execute(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Book]:
+        if page < 1 or not 1 <= page_size <= self.MAX_PAGE_SIZE:
+            raise ValidationException(f"page must be positive and page_size between 1 and {self.MAX_PAGE_SIZE}")
+        return self.book_repository.find_page(
+            filters, offset=(page - 1) * page_size, limit=page_size, fields=fields,
+            with_total=with_total, exact_total=exact_total
+        )
+
+
+class GetBookFacetsUseCase:
+    def __init__(self, book_repository: BookRepository):
+        self.book_repository = book_repository
+    
+    def execute(self, filters: Optional[Dict[str, Any]] = None) -> BookFacets:
+        return self.book_repository.facet_counts(filters or {})
+
+
+class SuggestBooksUseCase:
+    MAX_LIMIT = 25
+    MAX_PREFIX_LENGTH = 100
+    
+    def __init__(self, book_repository: BookRepository, author_repository: AuthorRepository):
+        self.book_repository = book_repository
+        self.author_repository = author_repository
+    
+    def execute(self, prefix: str, limit: int = 10) -> Tuple[List[Book], List[Author]]:
+        prefix = (prefix or '').strip()
+        if not prefix:
+            raise ValidationException("Prefix is required")
+        if len(prefix) > self.MAX_PREFIX_LENGTH:
+            raise ValidationException(f"Prefix cannot exceed {self.MAX_PREFIX_LENGTH} characters")
+        if limit < 1 or limit > self.MAX_LIMIT:
+            raise ValidationException(f"Limit must be between 1 and {self.MAX_LIMIT}")
+        
+        return (
+            self.book_repository.suggest_titles(prefix, limit),
+            self.author_repository.suggest_names(prefix, limit)
+        )
+
+
 class CreateBookUseCase:
     
     def __init__(self, book_repository: BookRepository):
@@ -54,18 +125,10 @@ class CreateBookUseCase:
             raise ValidationException("Genre name too short")
             
         # Verificar si ya existe un libro con el mismo título y autor
-        try:
-            from ...infrastructure.models.django_models import DjangoBook
-            existing_book = DjangoBook.objects.filter(
-                title__iexact=title.strip(),
-                author_name__iexact=author_name.strip()
-            ).exists()
-            if existing_book:
-                raise ValidationException(
-                    f"Ya existe un libro titulado '{title}' del autor '{author_name}'"
-                )
-        except ImportError:
-            pass
+        if self.book_repository.exists_by_title_author(title.strip(), author_name.strip()):
+            raise ValidationException(
+                f"Ya existe un libro titulado '{title}' del autor '{author_name}'"
+            )
         
         book = Book(
             id=None,
@@ -82,8 +145,19 @@ class CreateBookUseCase:
 
 class UpdateBookUseCase:
     
-    def __init__(self, book_repository: BookRepository):
+    def __init__(
+        self,
+        book_repository: BookRepository,
+        unit_of_work: UnitOfWork,
+        clock: Clock,
+        stock_publisher: Optional[StockChangePublisher] = None,
+        event_publisher: Optional[EventPublisher] = None
+    ):
         self.book_repository = book_repository
+        self.unit_of_work = unit_of_work
+        self.clock = clock
+        self.stock_publisher = stock_publisher
+        self.event_publisher = event_publisher
     
     def execute(
         self, 
@@ -92,11 +166,18 @@ class UpdateBookUseCase:
         author_name: Optional[str] = None,
         genre_name: Optional[str] = None,
         published_year: Optional[int] = None,
-        stock: Optional[int] = None
+        stock: Optional[int] = None,
+        expected_version: Optional[int] = None
     ) -> Book:
         book = self.book_repository.get_by_id(book_id)
         if not book:
             raise BookNotFoundException(f"Book with ID {book_id} not found")
+        # expected_version viene de If-Match: la versión que el cliente editó
+        if expected_version is not None and book.version != expected_version:
+            raise ConcurrencyException(
+                f"Book with ID {book_id} is at version {book.version}, not {expected_version}"
+            )
+        previous_stock = book.stock
         if title is not None:
             if not title or len(title.strip()) < 2:
                 raise ValidationException("Title too short")
@@ -120,29 +201,103 @@ class UpdateBookUseCase:
         if stock is not None:
             if stock < 0:
                 raise ValidationException("Stock cannot be negative")
-            book.stock = stock
+            book.update_stock(stock, self.clock.now())
         
         book.validate()
-        return self.book_repository.save(book)
+        with self.unit_of_work.atomic():
+            book = self.book_repository.save(book)
+            if self.event_publisher:
+                self.event_publisher.publish(book.pull_events())
+        
+        if self.stock_publisher and book.stock != previous_stock:
+            self.stock_publisher.publish(book)
+        
+        return book
 
 
 class DeleteBookUseCase:
     
-    def __init__(self, book_repository: BookRepository):
+    def __init__(
+        self,
+        book_repository: BookRepository,
+        loan_repository: LoanRepository,
+        unit_of_work: UnitOfWork,
+        clock: Clock,
+        event_publisher: Optional[EventPublisher] = None
+    ):
         self.book_repository = book_repository
+        self.loan_repository = loan_repository
+        self.unit_of_work = unit_of_work
+        self.clock = clock
+        self.event_publisher = event_publisher
     
     def execute(self, book_id: int) -> bool:
         book = self.book_repository.get_by_id(book_id)
         if not book:
             raise BookNotFoundException(f"Book with ID {book_id} not found")
-        try:
-            from ...infrastructure.models.django_models import DjangoLoan
-            active_loans = DjangoLoan.objects.filter(book_id=book_id, returned_at__isnull=True).count()
-            if active_loans > 0:
-                raise BusinessRuleException(
-                    f"Cannot delete book '{book.title}' - has {active_loans} active loan(s)"
-                )
-        except ImportError:
-            pass
+        active_loans = self.loan_repository.count_active_for_book(book_id)
+        if active_loans > 0:
+            raise BusinessRuleException(
+                f"Cannot delete book '{book.title}' - has {active_loans} active loan(s)"
+            )
+        
+        with self.unit_of_work.atomic():
+            deleted = self.book_repository.delete(book_id)
+            if deleted and self.event_publisher:
+                self.event_publisher.publish([BookDeleted(book_id=book_id, occurred_at=self.clock.now())])
+        return deleted
+
+
+class ImportBooksUseCase:
+    """Importación masiva de libros (pensada para ejecutarse en el worker de trabajos)"""
+    
+    def __init__(self, book_repository: BookRepository, unit_of_work: UnitOfWork, batch_size: int = 500):
+        self.book_repository = book_repository
+        self.unit_of_work = unit_of_work
+        self.batch_size = batch_size
+    
+    def execute(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        created = 0
+        skipped = 0
+        errors = []
+        seen = set()
+        
+        for start in range(0, len(rows), self.batch_size):
+            batch = []
+            for index, row in enumerate(rows[start:start + self.batch_size], start=start + 1):
+                try:
+                    book = Book(
+                        id=None,
+                        title=str(row['title']).strip(),
+                        author_name=str(row['author_name']).strip(),
+                        genre_name=str(row['genre_name']).strip(),
+                        published_year=int(row['published_year']),
+                        stock=int(row.get('stock') or 0)
+                    )
+                    book.validate()
+                except (KeyError, TypeError, ValueError) as e:
+                    errors.append({'row': index, 'error': str(e)})
+                    continue
+                
+                key = (book.title.lower(), book.author_name.lower())
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+                batch.append(book)
+            
+            # Una consulta por lote para descartar libros ya existentes
+            existing = self.book_repository.find_existing_title_authors(
+                [(book.title, book.author_name) for book in batch]
+            )
+            new_books = [
+                book for book in batch
+                if (book.title.lower(), book.author_name.lower()) not in existing
+            ]
+            skipped += len(batch) - len(new_books)
+            
+            if new_books:
+                with self.unit_of_work.atomic():
+                    created += len(self.book_repository.save_all(new_books))
         
-        return self.book_repository.delete(book_id)
\ No newline at end of file
+        return {'created': created, 'skipped': skipped, 'errors': errors}
\ No newline at end of file
@@ -0,0 +1,61 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from ...domain.entities.job import Job
+from ...domain.repositories.job_repository import JobRepository
+from ...shared.exceptions.business_exceptions import JobNotFoundException, ValidationException
+
+
+class SubmitJobUseCase:
+    """Caso de uso: Encolar un trabajo pesado para el worker"""
+    
+    def __init__(self, job_repository: JobRepository, available_job_types: Iterable[str]):
+        self.job_repository = job_repository
+        self.available_job_types = set(available_job_types)
+    
+    def execute(
+        self,
+        job_type: str,
+        params: Optional[Dict[str, Any]] = None,
+        created_by_id: Optional[int] = None
+    ) -> Job:
+        if job_type not in self.available_job_types:
+            raise ValidationException(
+                f"Tipo de trabajo '{job_type}' no soportado. "
+                f"Opciones: {', '.join(sorted(self.available_job_types))}"
+            )
+        
+        job = Job(
+            id=None,
+            job_type=job_type,
+            params=params or {},
+            created_by_id=created_by_id
+        )
+        try:
+            job.validate()
+        except ValueError as e:
+            raise ValidationException(str(e))
+        
+        return self.job_repository.save(job)
+
+
+class GetJobUseCase:
+    """Caso de uso: Consultar el estado de un trabajo"""
+    
+    def __init__(self, job_repository: JobRepository):
+        self.job_repository = job_repository
+    
+    def execute(self, job_id: int) -> Job:
+        job = self.job_repository.get_by_id(job_id)
+        if not job:
+            raise JobNotFoundException(f"Trabajo con ID {job_id} no encontrado")
+        return job
+
+
+class ListJobsUseCase:
+    """Caso de uso: Listar trabajos recientes"""
+    
+    def __init__(self, job_repository: JobRepository):
+        self.job_repository = job_repository
+    
+    def execute(self, created_by_id: Optional[int] = None, limit: int = 50) -> List[Job]:
+        return self.job_repository.find_recent(created_by_id=created_by_id, limit=limit)
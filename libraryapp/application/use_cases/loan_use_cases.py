@@ -1,10 +1,15 @@
-from typing import List, Optional
-from datetime import datetime
-from django.utils import timezone
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 from ...domain.entities.loan import Loan
+from ...domain.entities.page import Page
+from ...domain.events.domain_events import LoanCreated, LoanOverdue
 from ...domain.repositories.loan_repository import LoanRepository
 from ...domain.repositories.book_repository import BookRepository
 from ...domain.repositories.user_repository import UserRepository
+from ..interfaces.stock_change_publisher import StockChangePublisher
+from ..interfaces.clock import Clock
+from ..interfaces.event_publisher import EventPublisher
+from ..interfaces.unit_of_work import UnitOfWork
 from ...shared.exceptions.business_exceptions import (
     LoanNotFoundException, 
     BookNotFoundException, 
@@ -21,27 +26,88 @@ class GetLoanUseCase:
         self.loan_repository = loan_repository
     
     def execute(self, loan_id: int) -> Loan:
-        loan = self.loan_repository.get_by_id(loan_id)
+        # Los préstamos archivados siguen siendo consultables por su ID
+        loan = self.loan_repository.get_by_id(loan_id) or self.loan_repository.get_archived_by_id(loan_id)
         if not loan:
             raise LoanNotFoundException(f"Préstamo con ID {loan_id} no encontrado")
         return loan
 
 
+class ListLoanHistoryUseCase:
+    """Caso de uso: Listar el histórico de préstamos archivados por páginas"""
+    
+    MAX_LIMIT = 100
+    
+    def __init__(self, loan_repository: LoanRepository):
+        self.loan_repository = loan_repository
+    
+    def execute(
+        self,
+        user_id: int,
+        is_librarian: bool = False,
+        student_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        if limit < 1 or limit > self.MAX_LIMIT:
+            raise ValidationException(f"limit debe estar entre 1 y {self.MAX_LIMIT}")
+        # Los estudiantes solo ven su propio histórico
+        if not is_librarian:
+            student_id = user_id
+        return self.loan_repository.find_archived(student_id=student_id, before=before, limit=limit)
+
+
 class ListLoansUseCase:
     """Caso de uso: Listar préstamos (filtrados por usuario si es estudiante)"""
     
     def __init__(self, loan_repository: LoanRepository):
         self.loan_repository = loan_repository
     
-    def execute(self, user_id: Optional[int] = None, is_librarian: bool = False) -> List[Loan]:
+    def execute(
+        self,
+        user_id: Optional[int] = None,
+        is_librarian: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> List[Loan]:
         if is_librarian:
-            return self.loan_repository.get_all()
+            return self.loan_repository.get_all(fields)
         elif user_id:
-            return self.loan_repository.find_by_student_id(user_id)
+            return self.loan_repository.find_by_student_id(user_id, fields)
         else:
             return []
 
 
+
+class ListLoansPageUseCase:
+    """Caso de uso: Listar préstamos por páginas (solo los propios si es estudiante)"""
+    
+    MAX_PAGE_SIZE = 500
+    
+    def __init__(self, loan_repository: LoanRepository):
+        self.loan_repository = loan_repository
+    
+    def execute(
+        self,
+        user_id: int,
+        is_librarian: bool = False,
+        page: int = 1,
+        page_size: int = 50,
+        fields: Optional[List[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Loan]:
+        if page < 1 or not 1 <= page_size <= self.MAX_PAGE_SIZE:
+            raise ValidationException(f"La página debe ser positiva y su tamaño entre 1 y {self.MAX_PAGE_SIZE}")
+        return self.loan_repository.find_page(
+            student_id=None if is_librarian else user_id,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            fields=fields,
+            with_total=with_total,
+            exact_total=exact_total
+        )
+
+
 class CreateLoanUseCase:
     """Caso de uso: Crear nuevo préstamo"""
     
@@ -49,11 +115,21 @@ class CreateLoanUseCase:
         self,
         loan_repository: LoanRepository,
         book_repository: BookRepository,
-        user_repository: UserRepository
+        user_repository: UserRepository,
+        unit_of_work: UnitOfWork,
+        clock: Clock,
+        stock_publisher: Optional[StockChangePublisher] = None,
+        event_publisher: Optional[EventPublisher] = None,
+        loan_period: timedelta = timedelta(days=14)
     ):
         self.loan_repository = loan_repository
         self.book_repository = book_repository
         self.user_repository = user_repository
+        self.unit_of_work = unit_of_work
+        self.clock = clock
+        self.stock_publisher = stock_publisher
+        self.event_publisher = event_publisher
+        self.loan_period = loan_period
     
     def execute(self, student_id: int, book_id: int) -> Loan:
         # Validar que existan estudiante y libro
@@ -72,50 +148,63 @@ class CreateLoanUseCase:
         if not book.is_available():
             raise BusinessRuleException(f"El libro '{book.title}' no tiene stock disponible")
             
-        # Validación adicional: verificar si el estudiante ya tiene este libro prestado
-        try:
-            from ...infrastructure.models.django_models import DjangoLoan
-            existing_loan = DjangoLoan.objects.filter(
-                student_id=student_id, 
-                book_id=book_id, 
-                returned_at__isnull=True
-            ).exists()
-            if existing_loan:
-                raise BusinessRuleException(
-                    f"El estudiante '{student.username}' ya tiene el libro '{book.title}' en préstamo"
-                )
-                
-            # Validar límite de préstamos por estudiante (máximo 3 libros activos)
-            active_loans_count = DjangoLoan.objects.filter(
-                student_id=student_id, 
-                returned_at__isnull=True
-            ).count()
-            if active_loans_count >= 3:
-                raise BusinessRuleException(
-                    f"El estudiante '{student.username}' ya tiene el máximo de 3 libros en préstamo"
-                )
-        except ImportError:
-            # Si no se puede importar el modelo, continuar sin validación adicional
-            pass
-        
-        # Crear entidad préstamo
+        # Crear entidad préstamo con su fecha límite de devolución
+        borrowed_at = self.clock.now()
         loan = Loan(
             id=None,
             student=student,
             book=book,
-            borrowed_at=timezone.now(),
-            returned_at=None
+            borrowed_at=borrowed_at,
+            returned_at=None,
+            due_at=borrowed_at + self.loan_period
         )
         
         # Validar reglas de negocio
         loan.validate()
         
-        # Disminuir stock del libro
-        book.decrease_stock()
-        self.book_repository.save(book)
+        with self.unit_of_work.atomic():
+            # Bloquear al estudiante antes de contar: sin esto, dos préstamos
+            # simultáneos leen el mismo recuento y superan juntos el máximo de 3.
+            # La restricción única solo impide repetir el mismo libro
+            self.loan_repository.lock_student(student_id)
+            
+            # Validación adicional: el estudiante no puede tener este libro prestado
+            # ni superar el máximo de 3 libros activos (una sola consulta)
+            active_loans_count, has_book = self.loan_repository.active_summary_for_student(
+                student_id, book_id
+            )
+            if has_book:
+                raise BusinessRuleException(
+                    f"El estudiante '{student.username}' ya tiene el libro '{book.title}' en préstamo"
+                )
+            if active_loans_count >= 3:
+                raise BusinessRuleException(
+                    f"El estudiante '{student.username}' ya tiene el máximo de 3 libros en préstamo"
+                )
+            
+            # Restar una unidad con UPDATE ... WHERE stock > 0 en lugar de guardar
+            # el libro leído: los préstamos simultáneos solo fallan sin stock
+            stock = self.book_repository.adjust_stock(book.id, -1)
+            if stock is None:
+                raise BusinessRuleException(f"El libro '{book.title}' no tiene stock disponible")
+            book.stock_adjusted(stock, borrowed_at)
+            
+            # Guardar préstamo
+            loan = self.loan_repository.save(loan)
+            
+            # Registrar eventos en el outbox dentro de la misma transacción
+            if self.event_publisher:
+                self.event_publisher.publish(book.pull_events() + [
+                    LoanCreated(
+                        loan_id=loan.id, student_id=student.id, book_id=book.id, occurred_at=borrowed_at
+                    )
+                ])
+        
+        # Notificar el nuevo stock a los observadores
+        if self.stock_publisher:
+            self.stock_publisher.publish(book)
         
-        # Guardar préstamo
-        return self.loan_repository.save(loan)
+        return loan
 
 
 class ReturnLoanUseCase:
@@ -124,10 +213,18 @@ class ReturnLoanUseCase:
     def __init__(
         self,
         loan_repository: LoanRepository,
-        book_repository: BookRepository
+        book_repository: BookRepository,
+        unit_of_work: UnitOfWork,
+        clock: Clock,
+        stock_publisher: Optional[StockChangePublisher] = None,
+        event_publisher: Optional[EventPublisher] = None
     ):
         self.loan_repository = loan_repository
         self.book_repository = book_repository
+        self.unit_of_work = unit_of_work
+        self.clock = clock
+        self.stock_publisher = stock_publisher
+        self.event_publisher = event_publisher
     
     def execute(self, loan_id: int) -> Loan:
         # Obtener préstamo
@@ -139,12 +236,124 @@ class ReturnLoanUseCase:
             raise BusinessRuleException("Este préstamo ya ha sido devuelto")
         
         # Devolver libro (regla de negocio en la entidad)
-        return_date = timezone.now()
+        return_date = self.clock.now()
         loan.return_book(return_date)
         
-        # Guardar cambios en libro y préstamo
-        self.book_repository.save(loan.book)
-        return self.loan_repository.save(loan)
+        with self.unit_of_work.atomic():
+            # Cerrar el préstamo solo si sigue activo y reponer una unidad con
+            # UPDATE ... SET stock = stock + 1, sin conflicto de versión del libro
+            if not self.loan_repository.mark_returned(loan):
+                raise BusinessRuleException("Este préstamo ya ha sido devuelto")
+            stock = self.book_repository.adjust_stock(loan.book.id, 1)
+            if stock is None:
+                raise BookNotFoundException(f"Libro con ID {loan.book.id} no encontrado")
+            loan.book.stock_adjusted(stock, return_date)
+            
+            if self.event_publisher:
+                self.event_publisher.publish(loan.pull_events() + loan.book.pull_events())
+        
+        # Notificar el nuevo stock a los observadores
+        if self.stock_publisher:
+            self.stock_publisher.publish(loan.book)
+        
+        return loan
+
+
+class ListOverdueLoansUseCase:
+    """Caso de uso: Listar préstamos vencidos por páginas (cursor sobre due_at, id)"""
+    
+    MAX_LIMIT = 500
+    
+    def __init__(self, loan_repository: LoanRepository, clock: Clock):
+        self.loan_repository = loan_repository
+        self.clock = clock
+    
+    def execute(
+        self,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> Tuple[List[Loan], int]:
+        if limit < 1 or limit > self.MAX_LIMIT:
+            raise ValidationException(f"limit debe estar entre 1 y {self.MAX_LIMIT}")
+        
+        now = self.clock.now()
+        loans = self.loan_repository.find_overdue(now, after=after, limit=limit)
+        return loans, self.loan_repository.count_overdue(now)
+
+
+class ProcessOverdueLoansUseCase:
+    """Caso de uso: Procesar préstamos vencidos en lotes de coste acotado"""
+    
+    def __init__(
+        self,
+        loan_repository: LoanRepository,
+        unit_of_work: UnitOfWork,
+        clock: Clock,
+        event_publisher: Optional[EventPublisher] = None
+    ):
+        self.loan_repository = loan_repository
+        self.unit_of_work = unit_of_work
+        self.clock = clock
+        self.event_publisher = event_publisher
+    
+    def execute(self, chunk_size: int = 500, max_chunks: Optional[int] = None) -> int:
+        now = self.clock.now()
+        processed = 0
+        chunks = 0
+        
+        while max_chunks is None or chunks < max_chunks:
+            with self.unit_of_work.atomic():
+                loans = self.loan_repository.find_overdue_unprocessed(now, limit=chunk_size)
+                if not loans:
+                    break
+                
+                if self.event_publisher:
+                    self.event_publisher.publish([
+                        LoanOverdue(
+                            loan_id=loan.id,
+                            student_id=loan.student.id,
+                            book_id=loan.book.id,
+                            days_overdue=(now - loan.due_at).days,
+                            occurred_at=now
+                        )
+                        for loan in loans
+                    ])
+                self.loan_repository.mark_overdue_processed([loan.id for loan in loans], now)
+            
+            processed += len(loans)
+            chunks += 1
+            if len(loans) < chunk_size:
+                break
+        
+        return processed
+
+
+class ArchiveLoansUseCase:
+    """Caso de uso: Mover al histórico los préstamos devueltos hace más de `older_than`"""
+    
+    def __init__(self, loan_repository: LoanRepository, clock: Clock):
+        self.loan_repository = loan_repository
+        self.clock = clock
+    
+    def execute(
+        self,
+        older_than: timedelta,
+        chunk_size: int = 1000,
+        max_chunks: Optional[int] = None
+    ) -> int:
+        cutoff = self.clock.now() - older_than
+        archived = 0
+        chunks = 0
+        
+        # Lotes cortos: cada transacción bloquea pocas filas de la tabla activa
+        while max_chunks is None or chunks < max_chunks:
+            moved = self.loan_repository.archive_returned_before(cutoff, limit=chunk_size)
+            archived += moved
+            chunks += 1
+            if moved < chunk_size:
+                break
+        
+        return archived
 
 
 class DeleteLoanUseCase:
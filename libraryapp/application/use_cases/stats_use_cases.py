@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from ...domain.entities.circulation_stats import BookCirculation, GenreCirculation, MonthlyCirculation
+from ...domain.repositories.circulation_stats_repository import CirculationStatsRepository
+from ...shared.exceptions.business_exceptions import ValidationException
+
+DEFAULT_RANGE_DAYS = 365
+
+
+def _resolve_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS)
+    if start > end:
+        raise ValidationException("La fecha inicial no puede ser posterior a la final")
+    return start, end
+
+
+class GetBookCirculationUseCase:
+    """Caso de uso: Libros más prestados desde los rollups"""
+    
+    def __init__(self, stats_repository: CirculationStatsRepository):
+        self.stats_repository = stats_repository
+    
+    def execute(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        limit: int = 20
+    ) -> List[BookCirculation]:
+        if limit < 1:
+            raise ValidationException("El límite debe ser positivo")
+        start, end = _resolve_range(start, end)
+        return self.stats_repository.by_book(start, end, limit=limit)
+
+
+class GetGenreCirculationUseCase:
+    """Caso de uso: Circulación por género desde los rollups"""
+    
+    def __init__(self, stats_repository: CirculationStatsRepository):
+        self.stats_repository = stats_repository
+    
+    def execute(self, start: Optional[date] = None, end: Optional[date] = None) -> List[GenreCirculation]:
+        start, end = _resolve_range(start, end)
+        return self.stats_repository.by_genre(start, end)
+
+
+class GetMonthlyCirculationUseCase:
+    """Caso de uso: Circulación mensual desde los rollups"""
+    
+    def __init__(self, stats_repository: CirculationStatsRepository):
+        self.stats_repository = stats_repository
+    
+    def execute(self, start: Optional[date] = None, end: Optional[date] = None) -> List[MonthlyCirculation]:
+        start, end = _resolve_range(start, end)
+        return self.stats_repository.by_month(start, end)
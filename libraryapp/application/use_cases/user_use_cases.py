@@ -2,10 +2,12 @@
 from typing import List, Optional
 from datetime import datetime
 
+from ...domain.entities.page import Page
 from ...domain.entities.user import User, UserRole
+from ...domain.repositories.loan_repository import LoanRepository
 from ...domain.repositories.user_repository import UserRepository
 from ...shared.exceptions.business_exceptions import (
-    NotFoundException, ValidationException, BusinessRuleException
+    NotFoundException, ValidationException, BusinessRuleException, ConcurrencyException
 )
 
 
@@ -28,10 +30,38 @@ class ListUsersUseCase:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
     
-    def execute(self, role: Optional[UserRole] = None) -> List[User]:
+    def execute(
+        self,
+        role: Optional[UserRole] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[User]:
         if role:
-            return self.user_repository.find_by_role(role)
-        return self.user_repository.get_all()
+            return self.user_repository.find_by_role(role, fields)
+        return self.user_repository.get_all(fields)
+
+
+
+class ListUsersPageUseCase:
+    MAX_PAGE_SIZE = 500
+
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+    
+    def execute(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        role: Optional[UserRole] = None,
+        fields: Optional[List[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[User]:
+        if page < 1 or not 1 <= page_size <= self.MAX_PAGE_SIZE:
+            raise ValidationException(f"page must be positive and page_size between 1 and {self.MAX_PAGE_SIZE}")
+        return self.user_repository.find_page(
+            role, offset=(page - 1) * page_size, limit=page_size, fields=fields,
+            with_total=with_total, exact_total=exact_total
+        )
 
 
 class CreateUserUseCase:
@@ -61,12 +91,8 @@ class CreateUserUseCase:
         if existing_user:
             raise ValidationException(f"Username '{username}' already exists")
             
-        try:
-            from django.contrib.auth.models import User as DjangoUser
-            if DjangoUser.objects.filter(email=email).exists():
-                raise ValidationException(f"Email '{email}' already exists")
-        except ImportError:
-            pass
+        if self.user_repository.exists_by_email(email):
+            raise ValidationException(f"Email '{email}' already exists")
         
         user = User(
             id=None,
@@ -94,13 +120,20 @@ class UpdateUserUseCase:
         email: Optional[str] = None,
         first_name: Optional[str] = None,
         last_name: Optional[str] = None,
-        role: Optional[UserRole] = None
+        role: Optional[UserRole] = None,
+        expected_version: Optional[int] = None
     ) -> User:
         # Obtener usuario existente
         user = self.user_repository.get_by_id(user_id)
         if not user:
             raise UserNotFoundException(f"Usuario con ID {user_id} no encontrado")
         
+        # expected_version viene de If-Match: la versión que el cliente editó
+        if expected_version is not None and user.version != expected_version:
+            raise ConcurrencyException(
+                f"El usuario con ID {user_id} está en la versión {user.version}, no en la {expected_version}"
+            )
+        
         # Validar que el nuevo username no exista (si se está cambiando)
         if username and username != user.username:
             existing_user = self.user_repository.get_by_username(username)
@@ -129,8 +162,9 @@ class UpdateUserUseCase:
 class DeleteUserUseCase:
     """Caso de uso: Eliminar usuario"""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, loan_repository: LoanRepository):
         self.user_repository = user_repository
+        self.loan_repository = loan_repository
     
     def execute(self, user_id: int) -> bool:
         user = self.user_repository.get_by_id(user_id)
@@ -138,26 +172,17 @@ class DeleteUserUseCase:
             raise UserNotFoundException(f"Usuario con ID {user_id} no encontrado")
         
         # Validación de negocio: verificar si el usuario tiene préstamos activos
-        try:
-            from django.contrib.auth.models import User as DjangoUser
-            from ...infrastructure.models.django_models import DjangoLoan
+        active_loans = self.loan_repository.count_active_for_student(user_id)
+        if active_loans > 0:
+            raise BusinessRuleException(
+                f"No se puede eliminar el usuario '{user.username}' porque tiene {active_loans} préstamo(s) activo(s)"
+            )
             
-            active_loans = DjangoLoan.objects.filter(student_id=user_id, returned_at__isnull=True).count()
-            if active_loans > 0:
-                raise BusinessRuleException(
-                    f"No se puede eliminar el usuario '{user.username}' porque tiene {active_loans} préstamo(s) activo(s)"
-                )
-                
-            # Verificar si es el último bibliotecario
-            if user.is_librarian():
-                total_librarians = DjangoUser.objects.filter(groups__name='Librarians').count()
-                if total_librarians <= 1:
-                    raise BusinessRuleException(
-                        "No se puede eliminar el último bibliotecario del sistema"
-                    )
-        except ImportError:
-            # Si no se puede importar el modelo, continuar sin validación adicional
-            pass
+        # Verificar si es el último bibliotecario
+        if user.is_librarian() and self.user_repository.count_by_role(UserRole.LIBRARIAN) <= 1:
+            raise BusinessRuleException(
+                "No se puede eliminar el último bibliotecario del sistema"
+            )
         
         return self.user_repository.delete(user_id)
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LibraryappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "libraryapp"
+
+    def ready(self):
+        # Registrar los manejadores de eventos de dominio en el bus
+        from .infrastructure.events import handlers  # noqa: F401
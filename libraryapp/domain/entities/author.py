@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Author:
     """Entidad de dominio para Autor"""
     id: Optional[int]
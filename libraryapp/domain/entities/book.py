@@ -1,8 +1,10 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from ..events.domain_events import DomainEvent, BookStockChanged
 
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     id: Optional[int]
     title: str
@@ -10,6 +12,10 @@ class Book:
     published_year: int
     genre_name: str
     stock: int = 0
+    # Versión leída de la fila; el repositorio solo guarda si no ha cambiado
+    version: Optional[int] = None
+    # La lista se crea con el primer evento: la mayoría de entidades leídas no emiten ninguno
+    events: Optional[List[DomainEvent]] = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
         return f"{self.title} by {self.author_name}"
@@ -33,10 +39,22 @@ class Book:
         if not self.genre_name or len(self.genre_name.strip()) < 2:
             raise ValueError("Genre name too short")
 
-    def decrease_stock(self) -> None:
-        if not self.is_available():
-            raise ValueError(f"Book '{self.title}' not available")
-        self.stock -= 1
+    def stock_adjusted(self, stock: int, occurred_at: datetime) -> None:
+        self.stock = stock
+        self._record(BookStockChanged(book_id=self.id, stock=self.stock, occurred_at=occurred_at))
 
-    def increase_stock(self) -> None:
-        self.stock += 1
\ No newline at end of file
+    def update_stock(self, stock: int, occurred_at: datetime) -> None:
+        if stock < 0:
+            raise ValueError("Stock cannot be negative")
+        if stock != self.stock:
+            self.stock = stock
+            self._record(BookStockChanged(book_id=self.id, stock=self.stock, occurred_at=occurred_at))
+
+    def _record(self, event: DomainEvent) -> None:
+        if self.events is None:
+            self.events = []
+        self.events.append(event)
+
+    def pull_events(self) -> List[DomainEvent]:
+        events, self.events = self.events or [], None
+        return events
\ No newline at end of file
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class FacetValue:
+    value: Optional[object]
+    label: str
+    count: int = 0
+
+
+@dataclass
+class BookFacets:
+    """Conteos de libros por faceta para un conjunto de filtros"""
+    total: int = 0
+    genres: List[FacetValue] = field(default_factory=list)
+    authors: List[FacetValue] = field(default_factory=list)
+    decades: List[FacetValue] = field(default_factory=list)
+    availability: List[FacetValue] = field(default_factory=list)
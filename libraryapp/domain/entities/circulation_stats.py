@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class BookCirculation:
+    book_id: int
+    title: str
+    loans: int = 0
+    returns: int = 0
+
+
+@dataclass
+class GenreCirculation:
+    genre_name: str
+    loans: int = 0
+    returns: int = 0
+
+
+@dataclass
+class MonthlyCirculation:
+    month: str
+    loans: int = 0
+    returns: int = 0
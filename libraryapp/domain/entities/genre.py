@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Genre:
     """Entidad de dominio para Género"""
     id: Optional[int]
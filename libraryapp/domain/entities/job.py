@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: Optional[int]
+    job_type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: JobStatus = JobStatus.PENDING
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_by_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    def __str__(self) -> str:
+        return f"{self.job_type} #{self.id} ({self.status.value})"
+
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def validate(self) -> None:
+        if not self.job_type or not self.job_type.strip():
+            raise ValueError("Job type is required")
+
+        if not isinstance(self.params, dict):
+            raise ValueError("Job params must be an object")
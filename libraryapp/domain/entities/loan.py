@@ -1,17 +1,21 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 from datetime import datetime
 from .book import Book
 from .user import User
+from ..events.domain_events import DomainEvent, LoanReturned
 
 
-@dataclass
+@dataclass(slots=True)
 class Loan:
     id: Optional[int]
     student: User
     book: Book
     borrowed_at: datetime
     returned_at: Optional[datetime] = None
+    due_at: Optional[datetime] = None
+    # La lista se crea con el primer evento: la mayoría de entidades leídas no emiten ninguno
+    events: Optional[List[DomainEvent]] = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
         status = "Returned" if self.is_returned() else "Active"
@@ -20,6 +24,9 @@ class Loan:
     def is_returned(self) -> bool:
         return self.returned_at is not None
 
+    def is_overdue(self, now: datetime) -> bool:
+        return not self.is_returned() and self.due_at is not None and self.due_at < now
+
     def validate(self) -> None:
         if not self.student.is_student():
             raise ValueError("Only students can have loans")
@@ -30,6 +37,9 @@ class Loan:
         if self.returned_at and self.returned_at < self.borrowed_at:
             raise ValueError("Invalid return date")
         
+        if self.due_at and self.due_at < self.borrowed_at:
+            raise ValueError("Invalid due date")
+        
         self.student.validate()
         self.book.validate()
 
@@ -40,5 +50,17 @@ class Loan:
         if return_date < self.borrowed_at:
             raise ValueError("Invalid return date")
         
+        # El stock del libro lo repone el repositorio con un ajuste atómico
         self.returned_at = return_date
-        self.book.increase_stock()
\ No newline at end of file
+        self._record(LoanReturned(
+            loan_id=self.id, student_id=self.student.id, book_id=self.book.id, occurred_at=return_date
+        ))
+
+    def _record(self, event: DomainEvent) -> None:
+        if self.events is None:
+            self.events = []
+        self.events.append(event)
+
+    def pull_events(self) -> List[DomainEvent]:
+        events, self.events = self.events or [], None
+        return events
\ No newline at end of file
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    Una página de resultados de un repositorio.
+
+    has_next se sabe sin contar (se pide una fila de más). total es None si no
+    se pidió; con total_is_estimate viene de las estadísticas de la base de
+    datos en lugar de un COUNT(*).
+    """
+    items: List[T] = field(default_factory=list)
+    offset: int = 0
+    limit: int = 50
+    has_next: bool = False
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
@@ -8,7 +8,7 @@ class UserRole(Enum):
     LIBRARIAN = "librarian"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: Optional[int]
     username: str
@@ -16,6 +16,8 @@ class User:
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     role: UserRole = UserRole.STUDENT
+    # Versión leída; el repositorio solo guarda si no ha cambiado
+    version: Optional[int] = None
 
     def __str__(self) -> str:
         return f"{self.username} ({self.role.value})"
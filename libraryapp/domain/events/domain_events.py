@@ -0,0 +1,76 @@
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Type
+
+
+class DomainEvent:
+    """
+    Clase base para eventos de dominio.
+
+    occurred_at no tiene valor por defecto: lo fija el caso de uso con su Clock,
+    igual que el resto de fechas del préstamo.
+    """
+
+    @property
+    def event_type(self) -> str:
+        return type(self).__name__
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name != 'occurred_at'
+        }
+
+
+@dataclass(frozen=True)
+class LoanCreated(DomainEvent):
+    loan_id: int
+    student_id: int
+    book_id: int
+    occurred_at: datetime
+
+
+@dataclass(frozen=True)
+class LoanReturned(DomainEvent):
+    loan_id: int
+    student_id: int
+    book_id: int
+    occurred_at: datetime
+
+
+@dataclass(frozen=True)
+class LoanOverdue(DomainEvent):
+    loan_id: int
+    student_id: int
+    book_id: int
+    days_overdue: int
+    occurred_at: datetime
+
+
+@dataclass(frozen=True)
+class BookStockChanged(DomainEvent):
+    book_id: int
+    stock: int
+    occurred_at: datetime
+
+
+@dataclass(frozen=True)
+class BookDeleted(DomainEvent):
+    book_id: int
+    occurred_at: datetime
+
+
+EVENT_TYPES: Dict[str, Type[DomainEvent]] = {
+    event_class.__name__: event_class
+    for event_class in (LoanCreated, LoanReturned, LoanOverdue, BookStockChanged, BookDeleted)
+}
+
+
+def event_from_payload(event_type: str, payload: Dict[str, Any], occurred_at: datetime) -> DomainEvent:
+    """Reconstruir un evento a partir de su forma serializada"""
+    try:
+        event_class = EVENT_TYPES[event_type]
+    except KeyError:
+        raise ValueError(f"Unknown domain event type '{event_type}'")
+    return event_class(occurred_at=occurred_at, **payload)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..entities.author import Author
+from ..entities.page import Page
 
 
 class AuthorRepository(ABC):
@@ -29,4 +30,29 @@ class AuthorRepository(ABC):
     @abstractmethod
     def find_by_name(self, name: str) -> List[Author]:
         """Buscar autores por nombre (búsqueda parcial)"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_by_name(self, name: str) -> Optional[Author]:
+        """Obtener el autor con ese nombre exacto (sin distinguir mayúsculas)"""
+        pass
+
+    @abstractmethod
+    def suggest_names(self, prefix: str, limit: int) -> List[Author]:
+        """Autores cuyo nombre empieza por el prefijo, en orden alfabético"""
+        pass
+
+    @abstractmethod
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Author]:
+        """Página de autores en orden alfabético"""
+        pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Author]:
+        """Recorrer todos los autores por lotes, sin cargarlos a la vez en memoria"""
+        pass
+
+    @abstractmethod
+    def estimate_count(self) -> int:
+        """Número aproximado de autores (exacto en tablas pequeñas)"""
+        pass
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
 from ..entities.book import Book
+from ..entities.book_facets import BookFacets
+from ..entities.page import Page
 
 
 class BookRepository(ABC):
@@ -18,7 +20,25 @@ class BookRepository(ABC):
 
     @abstractmethod
     def save(self, book: Book) -> Book:
-        """Guardar libro (crear o actualizar)"""
+        """
+        Guardar libro (crear o actualizar).
+
+        Al actualizar solo escribe si la fila sigue en book.version; si otra
+        operación la cambió lanza ConcurrencyException. Deja en book.version
+        la nueva versión.
+        """
+        pass
+
+    @abstractmethod
+    def adjust_stock(self, book_id: int, delta: int) -> Optional[int]:
+        """
+        Sumar delta al stock en una sola escritura (stock = stock + delta).
+
+        No compara la versión leída, así que los préstamos y devoluciones
+        simultáneos del mismo libro no chocan entre sí; sí la avanza para que
+        una edición condicional posterior detecte el cambio. Devuelve el nuevo
+        stock, o None si el libro no existe o el stock quedaría negativo.
+        """
         pass
 
     @abstractmethod
@@ -27,8 +47,8 @@ class BookRepository(ABC):
         pass
 
     @abstractmethod
-    def find_with_filters(self, filters: Dict[str, Any]) -> List[Book]:
-        """Buscar libros con filtros dinámicos"""
+    def find_with_filters(self, filters: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> List[Book]:
+        """Buscar libros con filtros dinámicos; con fields solo se cargan esos campos"""
         pass
 
     @abstractmethod
@@ -49,4 +69,57 @@ class BookRepository(ABC):
     @abstractmethod
     def find_by_genre_name(self, genre_name: str) -> List[Book]:
         """Buscar libros por nombre de género"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def save_all(self, books: List[Book]) -> List[Book]:
+        """Crear varios libros nuevos en bloque"""
+        pass
+
+    @abstractmethod
+    def exists_by_title_author(self, title: str, author_name: str) -> bool:
+        """Indicar si ya existe un libro con ese título y autor (sin distinguir mayúsculas)"""
+        pass
+
+    @abstractmethod
+    def find_existing_title_authors(self, pairs: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Devolver los pares (título, autor) ya existentes, en minúsculas"""
+        pass
+
+    @abstractmethod
+    def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> BookFacets:
+        """Contar libros por género, autor, década y disponibilidad para los filtros dados"""
+        pass
+
+    @abstractmethod
+    def suggest_titles(self, prefix: str, limit: int) -> List[Book]:
+        """Libros cuyo título empieza por el prefijo, en orden alfabético"""
+        pass
+
+    @abstractmethod
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Book]:
+        """
+        Página de libros filtrados en el orden del listado.
+
+        with_total también cuenta; en resultados grandes el total es una estimación
+        (Page.total_is_estimate) salvo con exact_total.
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Book]:
+        """Recorrer todos los libros por lotes, sin cargarlos a la vez en memoria"""
+        pass
+
+    @abstractmethod
+    def estimate_count(self) -> int:
+        """Número aproximado de libros (exacto en tablas pequeñas)"""
+        pass
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List
+from ..entities.circulation_stats import BookCirculation, GenreCirculation, MonthlyCirculation
+
+
+class CirculationStatsRepository(ABC):
+    """Interface para las estadísticas de circulación pre-agregadas"""
+
+    @abstractmethod
+    def record(self, book_id: int, day: date, loans: int = 0, returns: int = 0) -> None:
+        """Sumar préstamos/devoluciones de un libro en los rollups del día"""
+        pass
+
+    @abstractmethod
+    def by_book(self, start: date, end: date, limit: int = 20) -> List[BookCirculation]:
+        """Libros más prestados en el rango de fechas"""
+        pass
+
+    @abstractmethod
+    def by_genre(self, start: date, end: date) -> List[GenreCirculation]:
+        """Préstamos y devoluciones por género en el rango de fechas"""
+        pass
+
+    @abstractmethod
+    def by_month(self, start: date, end: date) -> List[MonthlyCirculation]:
+        """Préstamos y devoluciones por mes en el rango de fechas"""
+        pass
+
+    @abstractmethod
+    def rebuild(self) -> int:
+        """Recalcular todos los rollups desde los préstamos; devuelve filas generadas"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..entities.genre import Genre
+from ..entities.page import Page
 
 
 class GenreRepository(ABC):
@@ -29,4 +30,24 @@ class GenreRepository(ABC):
     @abstractmethod
     def find_by_name(self, name: str) -> List[Genre]:
         """Buscar géneros por nombre (búsqueda parcial)"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_by_name(self, name: str) -> Optional[Genre]:
+        """Obtener el género con ese nombre exacto (sin distinguir mayúsculas)"""
+        pass
+
+    @abstractmethod
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Genre]:
+        """Página de géneros en orden alfabético"""
+        pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Genre]:
+        """Recorrer todos los géneros por lotes, sin cargarlos a la vez en memoria"""
+        pass
+
+    @abstractmethod
+    def estimate_count(self) -> int:
+        """Número aproximado de géneros (exacto en tablas pequeñas)"""
+        pass
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from ..entities.job import Job
+
+
+class JobRepository(ABC):
+    """Interface para el repositorio de trabajos en segundo plano"""
+
+    @abstractmethod
+    def get_by_id(self, job_id: int) -> Optional[Job]:
+        """Obtener trabajo por ID"""
+        pass
+
+    @abstractmethod
+    def save(self, job: Job) -> Job:
+        """Guardar trabajo (crear o actualizar)"""
+        pass
+
+    @abstractmethod
+    def find_recent(self, created_by_id: Optional[int] = None, limit: int = 50) -> List[Job]:
+        """Obtener los trabajos más recientes, opcionalmente de un usuario"""
+        pass
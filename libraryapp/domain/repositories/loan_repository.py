@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
 from ..entities.loan import Loan
+from ..entities.page import Page
 
 
 class LoanRepository(ABC):
@@ -12,13 +14,27 @@ class LoanRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Loan]:
-        """Obtener todos los préstamos"""
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Obtener todos los préstamos; con fields solo se cargan esos campos"""
         pass
 
     @abstractmethod
     def save(self, loan: Loan) -> Loan:
-        """Guardar préstamo (crear o actualizar)"""
+        """
+        Guardar préstamo (crear o actualizar).
+
+        Un segundo préstamo activo del mismo libro para el mismo estudiante
+        lanza BusinessRuleException (restricción única de la tabla).
+        """
+        pass
+
+    @abstractmethod
+    def mark_returned(self, loan: Loan) -> bool:
+        """
+        Registrar loan.returned_at solo si el préstamo sigue activo.
+
+        Devuelve False si otra devolución simultánea ya lo cerró.
+        """
         pass
 
     @abstractmethod
@@ -27,8 +43,8 @@ class LoanRepository(ABC):
         pass
 
     @abstractmethod
-    def find_by_student_id(self, student_id: int) -> List[Loan]:
-        """Buscar préstamos por ID de estudiante"""
+    def find_by_student_id(self, student_id: int, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Buscar préstamos por ID de estudiante; con fields solo se cargan esos campos"""
         pass
 
     @abstractmethod
@@ -43,5 +59,118 @@ class LoanRepository(ABC):
 
     @abstractmethod
     def find_returned_loans(self) -> List[Loan]:
-        """Obtener préstamos devueltos"""
-        pass
\ No newline at end of file
+        """Obtener préstamos devueltos aún no archivados"""
+        pass
+
+    @abstractmethod
+    def count_active_for_student(self, student_id: int) -> int:
+        """Contar préstamos activos de un estudiante"""
+        pass
+
+    @abstractmethod
+    def count_active_for_book(self, book_id: int) -> int:
+        """Contar préstamos activos de un libro"""
+        pass
+
+    @abstractmethod
+    def exists_active(self, student_id: int, book_id: int) -> bool:
+        """Indicar si el estudiante tiene el libro en préstamo"""
+        pass
+
+    @abstractmethod
+    def lock_student(self, student_id: int) -> None:
+        """
+        Serializar hasta el fin de la transacción los préstamos del estudiante.
+
+        Se llama dentro de UnitOfWork.atomic() antes de contar sus préstamos
+        activos, para que dos préstamos simultáneos no superen juntos el límite.
+        """
+        pass
+
+    def active_summary_for_student(self, student_id: int, book_id: int) -> Tuple[int, bool]:
+        """
+        Préstamos activos del estudiante y si uno de ellos es el libro indicado.
+
+        Las implementaciones pueden resolverlo en una sola consulta.
+        """
+        return self.count_active_for_student(student_id), self.exists_active(student_id, book_id)
+
+    @abstractmethod
+    def find_overdue(
+        self,
+        now: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """
+        Página de préstamos activos vencidos, ordenados por fecha límite.
+
+        after: (due_at, id) del último préstamo de la página anterior
+        """
+        pass
+
+    @abstractmethod
+    def count_overdue(self, now: datetime) -> int:
+        """Contar préstamos activos vencidos"""
+        pass
+
+    @abstractmethod
+    def find_overdue_unprocessed(self, now: datetime, limit: int) -> List[Loan]:
+        """Obtener un lote de préstamos vencidos aún no procesados"""
+        pass
+
+    @abstractmethod
+    def mark_overdue_processed(self, loan_ids: List[int], processed_at: datetime) -> int:
+        """Marcar préstamos vencidos como procesados"""
+        pass
+
+    @abstractmethod
+    def archive_returned_before(self, cutoff: datetime, limit: int) -> int:
+        """Mover al histórico un lote de préstamos devueltos antes de cutoff; devuelve cuántos"""
+        pass
+
+    @abstractmethod
+    def get_archived_by_id(self, loan_id: int) -> Optional[Loan]:
+        """Obtener un préstamo del histórico por ID"""
+        pass
+
+    @abstractmethod
+    def find_archived(
+        self,
+        student_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """
+        Página del histórico, del más reciente al más antiguo.
+
+        before: (borrowed_at, id) del último préstamo de la página anterior
+        """
+        pass
+
+    @abstractmethod
+    def find_page(
+        self,
+        student_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Loan]:
+        """
+        Página de préstamos (de un estudiante si se indica), del más reciente al más antiguo.
+
+        El total de resultados grandes es una estimación salvo con exact_total.
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Loan]:
+        """Recorrer todos los préstamos por lotes, sin cargarlos a la vez en memoria"""
+        pass
+
+    @abstractmethod
+    def estimate_count(self) -> int:
+        """Número aproximado de préstamos (exacto en tablas pequeñas)"""
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+from ..entities.page import Page
 from ..entities.user import User, UserRole
 
 
@@ -17,13 +18,18 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[User]:
-        """Obtener todos los usuarios"""
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Obtener todos los usuarios; con fields solo se cargan esos campos"""
         pass
 
     @abstractmethod
     def save(self, user: User, password: Optional[str] = None) -> User:
-        """Guardar usuario (crear o actualizar)"""
+        """
+        Guardar usuario (crear o actualizar).
+
+        Al actualizar solo escribe si el usuario sigue en user.version; si no,
+        lanza ConcurrencyException.
+        """
         pass
 
     @abstractmethod
@@ -32,6 +38,43 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    def find_by_role(self, role: UserRole) -> List[User]:
-        """Buscar usuarios por rol"""
-        pass
\ No newline at end of file
+    def find_by_role(self, role: UserRole, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Buscar usuarios por rol; con fields solo se cargan esos campos"""
+        pass
+
+    @abstractmethod
+    def exists_by_email(self, email: str) -> bool:
+        """Indicar si algún usuario usa ese email"""
+        pass
+
+    @abstractmethod
+    def count_by_role(self, role: UserRole) -> int:
+        """Contar usuarios de un rol"""
+        pass
+
+    @abstractmethod
+    def find_page(
+        self,
+        role: Optional[UserRole] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[User]:
+        """
+        Página de usuarios (de un rol si se indica), ordenados por ID.
+
+        El total de resultados grandes es una estimación salvo con exact_total.
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[User]:
+        """Recorrer todos los usuarios por lotes, sin cargarlos a la vez en memoria"""
+        pass
+
+    @abstractmethod
+    def estimate_count(self) -> int:
+        """Número aproximado de usuarios (exacto en tablas pequeñas)"""
+        pass
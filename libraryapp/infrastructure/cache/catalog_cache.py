@@ -0,0 +1,68 @@
+"""Caché de lecturas del catálogo invalidada por número de versión"""
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'catalog:version'
+# Versión aparte para el stock: un préstamo no debe invalidar lo que no depende de él
+STOCK_VERSION_KEY = 'catalog:stock-version'
+
+
+def _version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        # Inicializar con el reloj: si la clave se expulsa nunca se reutiliza una versión vieja
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def catalog_version() -> int:
+    """Versión actual del catálogo; cambia con cada escritura confirmada salvo las de solo stock"""
+    return _version(CATALOG_VERSION_KEY)
+
+
+def stock_version() -> int:
+    """Versión actual del stock; cambia con cualquier escritura confirmada"""
+    return _version(STOCK_VERSION_KEY)
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def bump_catalog_version(stock_only: bool = False) -> None:
+    """
+    Invalidar las entradas del catálogo al confirmar la transacción actual.
+
+    Con stock_only solo cambian las que dependen del stock (disponibilidad).
+    """
+    def bump():
+        _bump(STOCK_VERSION_KEY)
+        if not stock_only:
+            _bump(CATALOG_VERSION_KEY)
+
+    transaction.on_commit(bump)
+
+
+def catalog_cache_key(
+    namespace: str,
+    params: Optional[Dict[str, Any]] = None,
+    depends_on_stock: bool = False
+) -> str:
+    """Clave estable para un conjunto de parámetros (el orden no importa)"""
+    normalized = json.dumps(
+        sorted((key, str(value)) for key, value in (params or {}).items())
+    )
+    digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    version = catalog_version()
+    if depends_on_stock:
+        version = f'{version}.{stock_version()}'
+    return f'catalog:{namespace}:{version}:{digest}'
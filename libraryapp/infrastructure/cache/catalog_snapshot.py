@@ -0,0 +1,409 @@
+"""
+Copia en memoria del catálogo de libros, organizada por columnas.
+
+Cada proceso carga el catálogo una vez y lo mantiene al día con los mensajes
+del broker (BookChange). Los filtros se evalúan como operaciones sobre
+máscaras de bits (enteros de Python, una posición por libro): un AND/OR entre
+dos máscaras recorre el catálogo completo en C, sin bucles en Python.
+"""
+import bisect
+import heapq
+import logging
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from ...domain.entities.book import Book
+from ...domain.entities.book_facets import BookFacets, FacetValue
+from ..external.stock_broker import BookChange, StockChange, get_stock_broker
+from ..models.django_models import DjangoBook
+
+logger = logging.getLogger(__name__)
+
+# Posiciones de los bits encendidos de cada byte, para recorrer máscaras rápido
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def _is_true(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'si', 'sí')
+    return bool(value)
+
+
+def _mask(positions: List[int]) -> int:
+    """Máscara con las posiciones dadas (ascendentes), construida en un solo paso"""
+    if not positions:
+        return 0
+    data = bytearray((positions[-1] >> 3) + 1)
+    for pos in positions:
+        data[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(data, 'little')
+
+
+def _listing_key(title: str, book_id: int) -> Tuple[str, int]:
+    return title, book_id
+
+
+class _Columns:
+    """
+    Columnas del catálogo con una posición por libro.
+
+    Las posiciones [0, sorted_size) siguen el orden del listado de la base de
+    datos. Los cambios posteriores se aplican sin recargar: una baja apaga el
+    bit de su posición, una alta (o un cambio de título, que altera el orden)
+    ocupa una posición nueva al final y el listado la intercala al recorrer.
+    """
+
+    def __init__(self, rows: List[Tuple]):
+        # rows: (id, title, author_id, author_name, genre_id, genre_name, year, stock)
+        # ya ordenadas como el listado de la base de datos
+        self.size = len(rows)
+        self.sorted_size = self.size
+        self.ids = array('q', (row[0] for row in rows))
+        self.titles = [row[1] for row in rows]
+        self.lower_titles = [title.lower() for title in self.titles]
+        self.author_ids = array('q', (row[2] for row in rows))
+        self.genre_ids = array('q', (row[4] for row in rows))
+        self.years = array('l', (row[6] for row in rows))
+        self.stocks = array('l', (row[7] for row in rows))
+
+        # Nombres internados: cada autor/género se guarda una sola vez
+        self.author_names: Dict[int, str] = {}
+        self.genre_names: Dict[int, str] = {}
+        self.position: Dict[int, int] = {}
+        # Posiciones añadidas tras la carga, en orden de listado
+        self.appended: List[int] = []
+
+        # Posiciones por valor y una sola conversión a entero por máscara: OR-ear
+        # bit a bit sobre un entero creciente copiaría la máscara en cada fila
+        author_positions: Dict[int, List[int]] = defaultdict(list)
+        genre_positions: Dict[int, List[int]] = defaultdict(list)
+        year_positions: Dict[int, List[int]] = defaultdict(list)
+        available_positions: List[int] = []
+        for pos, row in enumerate(rows):
+            self.position[row[0]] = pos
+            self.author_names.setdefault(row[2], row[3])
+            self.genre_names.setdefault(row[4], row[5])
+            author_positions[row[2]].append(pos)
+            genre_positions[row[4]].append(pos)
+            year_positions[row[6]].append(pos)
+            if row[7] > 0:
+                available_positions.append(pos)
+
+        self.author_masks = {key: _mask(value) for key, value in author_positions.items()}
+        self.genre_masks = {key: _mask(value) for key, value in genre_positions.items()}
+        self.year_masks = {key: _mask(value) for key, value in year_positions.items()}
+        self.available_mask = _mask(available_positions)
+        self.all_mask = (1 << self.size) - 1
+
+    def positions(self, mask: int) -> Iterator[int]:
+        """Posiciones encendidas de la máscara, en orden de posición"""
+        data = mask.to_bytes((self.size + 7) // 8, 'little')
+        for index, byte in enumerate(data):
+            if byte:
+                base = index * 8
+                for bit in _BYTE_BITS[byte]:
+                    yield base + bit
+
+    def ordered(self, mask: int) -> Iterator[int]:
+        """Posiciones encendidas en el orden del listado"""
+        if not self.appended:
+            return self.positions(mask)
+        loaded = (pos for pos in self.positions(mask) if pos < self.sorted_size)
+        appended = [pos for pos in self.appended if mask >> pos & 1]
+        return heapq.merge(loaded, appended, key=self._listing_key)
+
+    def _listing_key(self, pos: int) -> Tuple[str, int]:
+        return _listing_key(self.titles[pos], self.ids[pos])
+
+    def book(self, pos: int) -> Book:
+        return Book(
+            id=self.ids[pos],
+            title=self.titles[pos],
+            author_name=self.author_names[self.author_ids[pos]],
+            published_year=self.years[pos],
+            genre_name=self.genre_names[self.genre_ids[pos]],
+            stock=self.stocks[pos]
+        )
+
+    def set_stock(self, pos: int, stock: int) -> None:
+        self.stocks[pos] = stock
+        if stock > 0:
+            self.available_mask |= 1 << pos
+        else:
+            self.available_mask &= ~(1 << pos)
+
+    def same_layout(self, pos: int, fields: Dict[str, Any]) -> bool:
+        """True si el cambio no altera orden ni índices (solo stock)"""
+        return (
+            self.titles[pos] == fields.get('title')
+            and self.author_ids[pos] == fields.get('author_id')
+            and self.genre_ids[pos] == fields.get('genre_id')
+            and self.years[pos] == fields.get('published_year')
+            and self.author_names[self.author_ids[pos]] == fields.get('author_name')
+            and self.genre_names[self.genre_ids[pos]] == fields.get('genre_name')
+        )
+
+    def update(self, pos: int, fields: Dict[str, Any]) -> None:
+        """Cambio sin efecto en el orden (mismo título): mover el bit entre máscaras"""
+        bit = 1 << pos
+        for masks, values, key in (
+            (self.author_masks, self.author_ids, 'author_id'),
+            (self.genre_masks, self.genre_ids, 'genre_id'),
+            (self.year_masks, self.years, 'published_year'),
+        ):
+            old, new = values[pos], int(fields[key])
+            if old != new:
+                masks[old] &= ~bit
+                masks[new] = masks.get(new, 0) | bit
+                values[pos] = new
+        self.author_names[self.author_ids[pos]] = fields['author_name']
+        self.genre_names[self.genre_ids[pos]] = fields['genre_name']
+        self.set_stock(pos, int(fields['stock']))
+
+    def remove(self, book_id: int) -> None:
+        """Baja: apagar la posición en todas sus máscaras (cada libro está en una de cada)"""
+        pos = self.position.pop(book_id, None)
+        if pos is None:
+            return
+        clear = ~(1 << pos)
+        self.author_masks[self.author_ids[pos]] &= clear
+        self.genre_masks[self.genre_ids[pos]] &= clear
+        self.year_masks[self.years[pos]] &= clear
+        self.available_mask &= clear
+        self.all_mask &= clear
+        if pos >= self.sorted_size:
+            self.appended.remove(pos)
+
+    def append(self, book_id: int, fields: Dict[str, Any]) -> None:
+        """Alta: nueva posición al final, intercalada en el listado por título"""
+        pos = self.size
+        self.ids.append(book_id)
+        self.titles.append(fields['title'])
+        self.lower_titles.append(fields['title'].lower())
+        self.author_ids.append(int(fields['author_id']))
+        self.genre_ids.append(int(fields['genre_id']))
+        self.years.append(int(fields['published_year']))
+        self.stocks.append(0)
+        self.author_names[self.author_ids[pos]] = fields['author_name']
+        self.genre_names[self.genre_ids[pos]] = fields['genre_name']
+        self.size += 1
+
+        bit = 1 << pos
+        self.author_masks[self.author_ids[pos]] = self.author_masks.get(self.author_ids[pos], 0) | bit
+        self.genre_masks[self.genre_ids[pos]] = self.genre_masks.get(self.genre_ids[pos], 0) | bit
+        self.year_masks[self.years[pos]] = self.year_masks.get(self.years[pos], 0) | bit
+        self.set_stock(pos, int(fields['stock']))
+        self.position[book_id] = pos
+        bisect.insort(self.appended, pos, key=self._listing_key)
+        # La última: las lecturas concurrentes no ven la posición hasta tenerla completa
+        self.all_mask |= bit
+
+
+class CatalogSnapshot:
+    """
+    Copia del catálogo para lecturas.
+
+    Los cambios se aplican en sitio sin releer la base de datos. Las altas y
+    los cambios de título se intercalan en el listado por comparación de
+    cadenas en Python; cuando se acumulan max_appended la copia se marca como
+    obsoleta y la siguiente lectura la recarga con una sola consulta, que
+    recupera el orden exacto (la intercalación de la base de datos).
+    """
+
+    def __init__(self, refresh_seconds: float = 300, max_appended: int = 1000):
+        self.refresh_seconds = refresh_seconds
+        self.max_appended = max_appended
+        self._lock = threading.Lock()
+        self._columns: Optional[_Columns] = None
+        self._loaded_at = 0.0
+        self._stale = True
+
+    # --- Mantenimiento ---------------------------------------------------
+
+    def apply(self, change) -> None:
+        """Observador del broker: aplicar un cambio recibido"""
+        with self._lock:
+            columns = self._columns
+            if columns is None:
+                return
+            if isinstance(change, StockChange):
+                pos = columns.position.get(change.book_id)
+                if pos is not None:
+                    columns.set_stock(pos, change.stock)
+                return
+            if not isinstance(change, BookChange):
+                return
+
+            pos = columns.position.get(change.book_id)
+            if change.action == 'delete':
+                columns.remove(change.book_id)
+            elif change.action != 'upsert':
+                self._stale = True
+            elif pos is not None and columns.same_layout(pos, change.fields):
+                columns.set_stock(pos, int(change.fields['stock']))
+            elif pos is not None and columns.titles[pos] == change.fields.get('title'):
+                columns.update(pos, change.fields)
+            else:
+                columns.remove(change.book_id)
+                columns.append(change.book_id, change.fields)
+                if len(columns.appended) >= self.max_appended:
+                    self._stale = True
+
+    def load(self) -> None:
+        rows = list(
+            DjangoBook.objects.order_by('title', 'id').values_list(
+                'id', 'title', 'author_id', 'author__name',
+                'genre_id', 'genre__name', 'published_year', 'stock'
+            )
+        )
+        self._columns = _Columns(rows)
+        self._loaded_at = time.monotonic()
+        self._stale = False
+        logger.info("Catálogo en memoria cargado: %s libros", len(rows))
+
+    def columns(self) -> _Columns:
+        columns = self._columns
+        expired = time.monotonic() - self._loaded_at > self.refresh_seconds
+        if columns is None or self._stale or expired:
+            with self._lock:
+                # Los cambios que lleguen durante la carga esperan al lock y se aplican después
+                if self._columns is None or self._stale or time.monotonic() - self._loaded_at > self.refresh_seconds:
+                    self.load()
+                columns = self._columns
+        return columns
+
+    # --- Consultas ------------------------------------------------------
+
+    def get(self, book_id: int) -> Optional[Book]:
+        columns = self.columns()
+        pos = columns.position.get(book_id)
+        return columns.book(pos) if pos is not None else None
+
+    def all(self) -> List[Book]:
+        columns = self.columns()
+        return [columns.book(pos) for pos in columns.ordered(columns.all_mask)]
+
+    def filter(self, filters: Dict[str, Any]) -> List[Book]:
+        columns = self.columns()
+        return [columns.book(pos) for pos in self._matching(columns, filters)]
+
+    def page(self, filters: Dict[str, Any], offset: int, limit: int) -> Tuple[List[Book], int]:
+        """Libros de la página y total que cumple los filtros; solo se construyen los de la página"""
+        columns = self.columns()
+        positions = list(self._matching(columns, filters))
+        return [columns.book(pos) for pos in positions[offset:offset + limit]], len(positions)
+
+    def iterate(self) -> Iterator[Book]:
+        columns = self.columns()
+        return (columns.book(pos) for pos in columns.ordered(columns.all_mask))
+
+    def size(self) -> int:
+        return len(self.columns().position)
+
+    def facets(self, filters: Dict[str, Any], max_values: int) -> BookFacets:
+        columns = self.columns()
+        genres, authors, decades, availability = Counter(), Counter(), Counter(), Counter()
+        total = 0
+        for pos in self._matching(columns, filters):
+            total += 1
+            genres[columns.genre_ids[pos]] += 1
+            authors[columns.author_ids[pos]] += 1
+            decades[columns.years[pos] // 10 * 10] += 1
+            availability[columns.stocks[pos] > 0] += 1
+
+        def top(counter, names):
+            ranked = sorted(counter.items(), key=lambda item: (-item[1], names[item[0]]))
+            return [FacetValue(value=key, label=names[key], count=count) for key, count in ranked[:max_values]]
+
+        return BookFacets(
+            total=total,
+            genres=top(genres, columns.genre_names),
+            authors=top(authors, columns.author_names),
+            decades=[
+                FacetValue(value=decade, label=f'{decade}s', count=decades[decade])
+                for decade in sorted(decades)
+            ],
+            availability=[
+                FacetValue(value=value, label='available' if value else 'unavailable', count=availability[value])
+                for value in (True, False) if availability[value]
+            ]
+        )
+
+    def _matching(self, columns: _Columns, filters: Dict[str, Any]) -> Iterator[int]:
+        """Mismos filtros que DjangoBookRepository.find_with_filters"""
+        mask = columns.all_mask
+
+        if 'author_name' in filters:
+            needle = str(filters['author_name']).lower()
+            mask &= self._union(columns.author_masks, (
+                author_id for author_id, name in columns.author_names.items() if needle in name.lower()
+            ))
+        if 'genre_name' in filters:
+            needle = str(filters['genre_name']).lower()
+            mask &= self._union(columns.genre_masks, (
+                genre_id for genre_id, name in columns.genre_names.items() if needle in name.lower()
+            ))
+        if 'author_id' in filters:
+            mask &= columns.author_masks.get(int(filters['author_id']), 0)
+        if 'genre_id' in filters:
+            mask &= columns.genre_masks.get(int(filters['genre_id']), 0)
+
+        if 'published_year_min' in filters or 'published_year_max' in filters:
+            low = int(filters.get('published_year_min', -10 ** 9))
+            high = int(filters.get('published_year_max', 10 ** 9))
+            mask &= self._union(columns.year_masks, (
+                year for year in columns.year_masks if low <= year <= high
+            ))
+        if 'published_year' in filters:
+            mask &= columns.year_masks.get(int(filters['published_year']), 0)
+
+        if 'available' in filters:
+            if _is_true(filters['available']):
+                mask &= columns.available_mask
+            else:
+                mask &= ~columns.available_mask & columns.all_mask
+
+        # Título y stock exacto no tienen máscara: se comprueban solo en los candidatos
+        title = str(filters['title']).lower() if 'title' in filters else None
+        stock = int(filters['stock']) if 'stock' in filters else None
+        for pos in columns.ordered(mask):
+            if title is not None and title not in columns.lower_titles[pos]:
+                continue
+            if stock is not None and columns.stocks[pos] != stock:
+                continue
+            yield pos
+
+    @staticmethod
+    def _union(masks: Dict[int, int], keys) -> int:
+        result = 0
+        for key in keys:
+            result |= masks.get(key, 0)
+        return result
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """Copia del catálogo del proceso, suscrita al broker antes de la primera carga"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                config = getattr(settings, 'CATALOG_SNAPSHOT', {})
+                snapshot = CatalogSnapshot(
+                    config.get('REFRESH_SECONDS', 300), config.get('MAX_APPENDED', 1000)
+                )
+                get_stock_broker().add_listener(snapshot.apply)
+                _snapshot = snapshot
+    return _snapshot
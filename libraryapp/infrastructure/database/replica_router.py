@@ -0,0 +1,116 @@
+"""
+Enrutado de lecturas a réplicas con intención explícita.
+
+Por defecto todo va a `default`. Solo las lecturas marcadas con
+`reads_from_replica` / `replica_reads()` (listados, búsquedas, detalle,
+exportaciones) van a una réplica de settings.DATABASE_REPLICAS, y aun así
+vuelven al primario cuando:
+- hay una transacción abierta en `default` (la lectura forma parte de una escritura)
+- la petición está fijada al primario porque el usuario escribió hace poco
+  (leer sus propias escrituras mientras la réplica se pone al día)
+"""
+import functools
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Solo los datos de la aplicación; la caché en base de datos, sesiones, etc. siempre en default
+REPLICATED_APP_LABELS = {'libraryapp', 'auth'}
+
+_read_intent: ContextVar[bool] = ContextVar('replica_read_intent', default=False)
+_pinned_to_primary: ContextVar[bool] = ContextVar('replica_pinned_to_primary', default=False)
+_wrote: ContextVar[bool] = ContextVar('replica_wrote', default=False)
+
+
+def replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', {}))
+
+
+@contextmanager
+def replica_reads():
+    """Las lecturas del bloque pueden ir a una réplica"""
+    token = _read_intent.set(True)
+    try:
+        yield
+    finally:
+        _read_intent.reset(token)
+
+
+def reads_from_replica(method):
+    """Decorador para métodos de repositorio que toleran datos con unos segundos de retraso"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _sticky_key(user_id) -> str:
+    return f'replica:sticky:user:{user_id}'
+
+
+def _sticky_seconds() -> int:
+    return getattr(settings, 'REPLICA_ROUTING', {}).get('STICKY_SECONDS', 10)
+
+
+def begin_request(user_id):
+    """
+    Inicio de una petición (cualquier vista): si el usuario escribió hace menos
+    de STICKY_SECONDS, ninguna de sus lecturas va a una réplica.
+    Devuelve el estado para end_request.
+    """
+    if not replica_aliases():
+        return None
+    pinned = user_id is not None and bool(cache.get(_sticky_key(user_id)))
+    return _pinned_to_primary.set(pinned), _wrote.set(False)
+
+
+def end_request(state, user_id) -> None:
+    """Fin de la petición: si escribió, sus lecturas siguientes van al primario"""
+    if state is None:
+        return
+    pinned_token, wrote_token = state
+    if _wrote.get() and user_id is not None:
+        cache.set(_sticky_key(user_id), True, _sticky_seconds())
+    _pinned_to_primary.reset(pinned_token)
+    _wrote.reset(wrote_token)
+
+
+def begin_replica_reads():
+    """Como replica_reads() pero sin bloque: devuelve el token para end_replica_reads"""
+    return _read_intent.set(True)
+
+
+def end_replica_reads(token) -> None:
+    _read_intent.reset(token)
+
+
+class ReplicaRouter:
+    """Router de Django: escrituras al primario, lecturas marcadas a una réplica"""
+
+    def db_for_read(self, model, **hints):
+        if not _read_intent.get() or _pinned_to_primary.get():
+            return None
+        if model._meta.app_label not in REPLICATED_APP_LABELS:
+            return None
+        replicas = replica_aliases()
+        if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in REPLICATED_APP_LABELS:
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primario y réplicas contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación, no por migrate
+        return db not in replica_aliases() or None
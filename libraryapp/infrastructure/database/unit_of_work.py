@@ -0,0 +1,13 @@
+"""Unidad de trabajo sobre las transacciones de Django"""
+from typing import ContextManager
+
+from django.db import transaction
+
+from ...application.interfaces.unit_of_work import UnitOfWork
+
+
+class DjangoUnitOfWork(UnitOfWork):
+    """transaction.atomic() sobre `default`; anidada, crea un savepoint"""
+
+    def atomic(self) -> ContextManager[None]:
+        return transaction.atomic()
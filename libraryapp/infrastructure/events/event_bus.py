@@ -0,0 +1,36 @@
+"""Bus de eventos en proceso usado por el procesador del outbox"""
+import logging
+from collections import defaultdict
+from typing import Callable, DefaultDict, List, Type
+
+from ...domain.events.domain_events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+EventHandler = Callable[[DomainEvent], None]
+
+
+class EventBus:
+    """Registro de manejadores por tipo de evento"""
+
+    def __init__(self):
+        self._handlers: DefaultDict[Type[DomainEvent], List[EventHandler]] = defaultdict(list)
+
+    def subscribe(self, event_class: Type[DomainEvent]):
+        """Decorador para registrar un manejador de un tipo de evento"""
+        def decorator(handler: EventHandler) -> EventHandler:
+            self._handlers[event_class].append(handler)
+            return handler
+        return decorator
+
+    def handlers_for(self, event: DomainEvent) -> List[EventHandler]:
+        return list(self._handlers.get(type(event), ()))
+
+    def dispatch(self, event: DomainEvent) -> None:
+        """Ejecutar los manejadores; cualquier excepción se propaga al procesador"""
+        for handler in self.handlers_for(event):
+            handler(event)
+
+
+# Bus compartido: los módulos de manejadores se registran sobre esta instancia
+event_bus = EventBus()
@@ -0,0 +1,22 @@
+"""Manejadores de eventos de dominio ejecutados por el procesador del outbox"""
+from django.utils import timezone
+
+from ...domain.events.domain_events import LoanCreated, LoanReturned
+from ..repositories.django_circulation_stats_repository import DjangoCirculationStatsRepository
+from .event_bus import event_bus
+
+stats_repository = DjangoCirculationStatsRepository()
+
+
+@event_bus.subscribe(LoanCreated)
+def count_loan(event: LoanCreated) -> None:
+    """Sumar el préstamo a los rollups diarios de circulación"""
+    day = timezone.localtime(event.occurred_at).date()
+    stats_repository.record(event.book_id, day, loans=1)
+
+
+@event_bus.subscribe(LoanReturned)
+def count_return(event: LoanReturned) -> None:
+    """Sumar la devolución a los rollups diarios de circulación"""
+    day = timezone.localtime(event.occurred_at).date()
+    stats_repository.record(event.book_id, day, returns=1)
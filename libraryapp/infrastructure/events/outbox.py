@@ -0,0 +1,105 @@
+"""Outbox transaccional: escritura de eventos y procesamiento por lotes"""
+import logging
+from datetime import timedelta
+from typing import List
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ...application.interfaces.event_publisher import EventPublisher
+from ...domain.events.domain_events import DomainEvent, event_from_payload
+from ..models.django_models import DjangoOutboxEvent
+from .event_bus import EventBus
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxEventPublisher(EventPublisher):
+    """Guarda los eventos en el outbox con un único INSERT en la transacción actual"""
+
+    def publish(self, events: List[DomainEvent]) -> None:
+        if not events:
+            return
+        DjangoOutboxEvent.objects.bulk_create([
+            DjangoOutboxEvent(
+                event_type=event.event_type,
+                payload=event.to_payload(),
+                occurred_at=event.occurred_at,
+            )
+            for event in events
+        ])
+
+
+class OutboxProcessor:
+    """
+    Procesa eventos pendientes del outbox en lotes.
+
+    Un evento que falla se reintenta con backoff exponencial (retry_base,
+    2 × retry_base, ... hasta retry_max); tras max_attempts fallos queda
+    como dead letter (attempts = max_attempts, sin processed_at) y ya no se
+    toma en ningún lote.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        batch_size: int = 100,
+        max_attempts: int = 5,
+        retry_base: timedelta = timedelta(seconds=5),
+        retry_max: timedelta = timedelta(hours=1)
+    ):
+        self.bus = bus
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+    def process_batch(self) -> int:
+        """Procesar un lote; devuelve el número de eventos tomados"""
+        now = timezone.now()
+        with transaction.atomic():
+            # skip_locked permite ejecutar varios workers en paralelo sin duplicar trabajo
+            rows = list(
+                DjangoOutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(processed_at__isnull=True, attempts__lt=self.max_attempts)
+                .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+                .order_by('id')[:self.batch_size]
+            )
+            for row in rows:
+                self._process_row(row, now)
+            DjangoOutboxEvent.objects.bulk_update(
+                rows, ['processed_at', 'attempts', 'last_error', 'next_attempt_at']
+            )
+        return len(rows)
+
+    def _process_row(self, row: DjangoOutboxEvent, now) -> None:
+        try:
+            event = event_from_payload(row.event_type, row.payload, row.occurred_at)
+            # Savepoint por evento: un manejador fallido no invalida el lote
+            with transaction.atomic():
+                self.bus.dispatch(event)
+            row.processed_at = now
+            row.last_error = ''
+        except Exception as e:
+            row.attempts += 1
+            row.last_error = str(e)
+            if row.attempts >= self.max_attempts:
+                row.next_attempt_at = None
+                logger.exception(
+                    "Evento %s #%s descartado tras %s intentos (dead letter)",
+                    row.event_type, row.id, row.attempts
+                )
+            else:
+                row.next_attempt_at = now + self._backoff(row.attempts)
+                logger.exception("Error procesando evento %s #%s", row.event_type, row.id)
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+
+    def purge_processed(self, older_than) -> int:
+        """Eliminar eventos procesados anteriores a la fecha indicada"""
+        deleted, _ = DjangoOutboxEvent.objects.filter(
+            processed_at__isnull=False, processed_at__lt=older_than
+        ).delete()
+        return deleted
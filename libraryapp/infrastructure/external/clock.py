@@ -0,0 +1,11 @@
+"""Reloj del sistema para los casos de uso"""
+from datetime import datetime, timezone
+
+from ...application.interfaces.clock import Clock
+
+
+class SystemClock(Clock):
+    """Hora actual en UTC (lo mismo que django.utils.timezone.now() con USE_TZ)"""
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
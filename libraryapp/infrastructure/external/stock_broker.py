@@ -0,0 +1,309 @@
+"""Broker de cambios del catálogo: difusión en proceso con backend entre procesos"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from ...application.interfaces.stock_change_publisher import StockChangePublisher
+from ...domain.entities.book import Book
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StockChange:
+    """Mensaje publicado cada vez que cambia el stock de un libro"""
+    book_id: int
+    stock: int
+
+    @property
+    def available(self) -> bool:
+        return self.stock > 0
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'book_id': self.book_id,
+            'stock': self.stock,
+            'available': self.available,
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'StockChange':
+        data = json.loads(payload)
+        return cls(book_id=int(data['book_id']), stock=int(data['stock']))
+
+
+@dataclass(frozen=True)
+class BookChange:
+    """
+    Mensaje con el estado de un libro tras escribirlo.
+
+    action: 'upsert' (fields trae la fila completa), 'delete' o 'reload'
+    (escritura masiva: los observadores deben recargar todo el catálogo).
+    """
+    action: str
+    book_id: Optional[int] = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'type': 'book',
+            'action': self.action,
+            'book_id': self.book_id,
+            'fields': self.fields,
+        })
+
+
+CatalogChange = Union[StockChange, BookChange]
+
+
+def decode_change(payload: str) -> CatalogChange:
+    """Reconstruir un mensaje recibido por el backend"""
+    data = json.loads(payload)
+    if data.get('type') == 'book':
+        return BookChange(
+            action=data['action'], book_id=data.get('book_id'), fields=data.get('fields') or {}
+        )
+    return StockChange(book_id=int(data['book_id']), stock=int(data['stock']))
+
+
+class LocalStockBackend:
+    """Backend en proceso: entrega los cambios solo a los suscriptores del mismo proceso"""
+
+    def __init__(self):
+        self._dispatch: Optional[Callable[[CatalogChange], None]] = None
+
+    def start(self, dispatch: Callable[[CatalogChange], None]) -> None:
+        self._dispatch = dispatch
+
+    def publish(self, change: CatalogChange) -> None:
+        if self._dispatch is not None:
+            self._dispatch(change)
+
+
+class PostgresNotifyStockBackend:
+    """
+    Backend entre procesos usando LISTEN/NOTIFY de PostgreSQL.
+
+    Cada proceso que tiene suscriptores mantiene una única conexión dedicada
+    escuchando el canal; los procesos que solo publican no abren conexiones extra.
+    """
+
+    def __init__(self, channel: str, alias: str = 'default', reconnect_delay: float = 2.0):
+        self.channel = channel
+        self.alias = alias
+        self.reconnect_delay = reconnect_delay
+
+    def start(self, dispatch: Callable[[CatalogChange], None]) -> None:
+        listener = threading.Thread(
+            target=self._listen, args=(dispatch,), name='stock-listener', daemon=True
+        )
+        listener.start()
+
+    def publish(self, change: CatalogChange) -> None:
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, change.to_json()])
+
+    def _listen(self, dispatch: Callable[[CatalogChange], None]) -> None:
+        while True:
+            wrapper = connections.create_connection(self.alias)
+            try:
+                wrapper.ensure_connection()
+                wrapper.set_autocommit(True)
+                raw_connection = wrapper.connection
+                with raw_connection.cursor() as cursor:
+                    cursor.execute('LISTEN "%s"' % self.channel.replace('"', ''))
+
+                while True:
+                    if select.select([raw_connection], [], [], 30) == ([], [], []):
+                        continue
+                    raw_connection.poll()
+                    while raw_connection.notifies:
+                        notify = raw_connection.notifies.pop(0)
+                        try:
+                            dispatch(decode_change(notify.payload))
+                        except (ValueError, KeyError):
+                            logger.warning("Notificación de stock inválida: %r", notify.payload)
+            except Exception:
+                logger.exception("Conexión LISTEN de stock perdida, reintentando")
+            finally:
+                wrapper.close()
+            time.sleep(self.reconnect_delay)
+
+
+class StockSubscription:
+    """
+    Suscripción de un observador asíncrono (p. ej. una conexión SSE).
+
+    Los cambios pendientes se agrupan por libro: un cliente lento solo recibe
+    el último stock de cada libro en lugar de acumular una cola ilimitada.
+    """
+
+    def __init__(self, broker: 'StockBroker', book_ids: Optional[Iterable[int]] = None):
+        self._broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.book_ids: Optional[Set[int]] = set(book_ids) if book_ids else None
+        self._pending: Dict[int, StockChange] = {}
+        self._ready = asyncio.Event()
+
+    def offer(self, change: StockChange) -> None:
+        """Registrar un cambio (se ejecuta en el event loop de la suscripción)"""
+        if self.book_ids is not None and change.book_id not in self.book_ids:
+            return
+        self._pending[change.book_id] = change
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> List[StockChange]:
+        """Esperar cambios; devuelve lista vacía si vence el timeout"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        changes = list(self._pending.values())
+        self._pending.clear()
+        return changes
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class StockBroker:
+    """
+    Difusión en proceso de cambios de stock y del catálogo.
+
+    Un único hilo de entrega por proceso reparte cada cambio con una sola
+    llamada por event loop, así miles de observadores no multiplican el coste.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._lock = threading.Lock()
+        self._started = False
+        self._listeners: Set[Callable[[CatalogChange], None]] = set()
+        self._subscriptions: Dict[asyncio.AbstractEventLoop, Set[StockSubscription]] = {}
+
+    def publish(self, change: CatalogChange) -> None:
+        self._backend.publish(change)
+
+    def add_listener(self, listener: Callable[[CatalogChange], None]) -> None:
+        """Registrar un observador síncrono"""
+        with self._lock:
+            self._listeners.add(listener)
+            self._ensure_started()
+
+    def remove_listener(self, listener: Callable[[CatalogChange], None]) -> None:
+        with self._lock:
+            self._listeners.discard(listener)
+
+    def subscribe(self, book_ids: Optional[Iterable[int]] = None) -> StockSubscription:
+        """Crear una suscripción asíncrona (debe llamarse dentro de un event loop)"""
+        subscription = StockSubscription(self, book_ids)
+        with self._lock:
+            self._subscriptions.setdefault(subscription.loop, set()).add(subscription)
+            self._ensure_started()
+        return subscription
+
+    def unsubscribe(self, subscription: StockSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.loop)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.loop]
+
+    def _ensure_started(self) -> None:
+        if not self._started:
+            self._backend.start(self._dispatch)
+            self._started = True
+
+    def _dispatch(self, change: CatalogChange) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+            loops = list(self._subscriptions)
+
+        for listener in listeners:
+            try:
+                listener(change)
+            except Exception:
+                logger.exception("Error en observador de stock")
+
+        # Las suscripciones SSE solo reciben cambios de stock
+        if not isinstance(change, StockChange):
+            return
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, loop, change)
+            except RuntimeError:
+                # El event loop ya se cerró: descartar sus suscripciones
+                with self._lock:
+                    self._subscriptions.pop(loop, None)
+
+    def _fan_out(self, loop: asyncio.AbstractEventLoop, change: StockChange) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(loop, ()))
+        for subscription in subscriptions:
+            subscription.offer(change)
+
+
+class BrokerStockChangePublisher(StockChangePublisher):
+    """Publica cambios de stock en el broker una vez confirmada la transacción"""
+
+    def __init__(self, broker: StockBroker):
+        self.broker = broker
+
+    def publish(self, book: Book) -> None:
+        change = StockChange(book_id=book.id, stock=book.stock)
+        transaction.on_commit(lambda: self._safe_publish(change))
+
+    def _safe_publish(self, change: StockChange) -> None:
+        # Un fallo de notificación nunca debe romper la operación de negocio
+        try:
+            self.broker.publish(change)
+        except Exception:
+            logger.exception("No se pudo publicar el cambio de stock del libro %s", change.book_id)
+
+
+def publish_book_change(change: BookChange) -> None:
+    """
+    Difundir un cambio del catálogo al confirmar la transacción.
+
+    Solo se publica si algún proceso mantiene la copia en memoria del catálogo
+    (settings.CATALOG_SNAPSHOT['ENABLED']); en otro caso no hay observadores.
+    """
+    if not getattr(settings, 'CATALOG_SNAPSHOT', {}).get('ENABLED', False):
+        return
+
+    def _publish():
+        try:
+            get_stock_broker().publish(change)
+        except Exception:
+            logger.exception("No se pudo publicar el cambio del libro %s", change.book_id)
+
+    transaction.on_commit(_publish)
+
+
+_broker: Optional[StockBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_stock_broker() -> StockBroker:
+    """Obtener el broker del proceso, creado según settings.STOCK_EVENTS"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, 'STOCK_EVENTS', {})
+                if config.get('BACKEND', 'local') == 'postgres':
+                    backend = PostgresNotifyStockBackend(config.get('CHANNEL', 'book_stock'))
+                else:
+                    backend = LocalStockBackend()
+                _broker = StockBroker(backend)
+    return _broker
@@ -0,0 +1,83 @@
+"""Archivos generados por los trabajos de exportación"""
+import csv
+import io
+import uuid
+from typing import Iterable, Sequence
+
+from django.conf import settings
+from django.db import transaction
+
+from ...shared.exceptions.business_exceptions import NotFoundException
+from ..models.django_models import DjangoExportChunk, DjangoExportFile
+
+
+def save_csv_export(prefix: str, header: Sequence[str], rows: Iterable[Sequence]) -> str:
+    """
+    Escribir el CSV fila a fila y guardarlo en la base de datos en bloques de
+    EXPORTS['CHUNK_BYTES']: en memoria solo hay un bloque a la vez, y la API
+    lo sirve aunque el worker corra en otro servicio sin disco compartido.
+
+    Devuelve la ruta guardada; el resultado del trabajo solo guarda esa
+    referencia, no el contenido.
+    """
+    chunk_bytes = getattr(settings, 'EXPORTS', {}).get('CHUNK_BYTES', 1024 * 1024)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Un archivo a medias nunca queda visible: todos los bloques o ninguno
+    with transaction.atomic():
+        export = DjangoExportFile.objects.create(path=f'exports/{prefix}-{uuid.uuid4().hex}.csv')
+        seq = size = 0
+
+        def flush():
+            nonlocal seq, size
+            data = buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            DjangoExportChunk.objects.create(export=export, seq=seq, data=data)
+            seq += 1
+            size += len(data)
+
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= chunk_bytes:
+                flush()
+        if buffer.tell():
+            flush()
+        DjangoExportFile.objects.filter(id=export.id).update(size=size)
+    return export.path
+
+
+class ExportReader:
+    """Archivo exportado como objeto de solo lectura: una consulta por bloque leído"""
+
+    def __init__(self, export_id: int):
+        self.export_id = export_id
+        self._seq = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Siguiente bloque guardado (FileResponse lee hasta recibir b''); con size < 0, el resto"""
+        if size is not None and size < 0:
+            return b''.join(iter(lambda: self.read(1), b''))
+        data = (
+            DjangoExportChunk.objects
+            .filter(export_id=self.export_id, seq=self._seq)
+            .values_list('data', flat=True)
+            .first()
+        )
+        if data is None:
+            return b''
+        self._seq += 1
+        return bytes(data)
+
+    def close(self) -> None:
+        pass
+
+
+def open_export(path: str) -> ExportReader:
+    """Abrir un archivo guardado por save_csv_export"""
+    export_id = DjangoExportFile.objects.filter(path=path).values_list('id', flat=True).first()
+    if export_id is None:
+        raise NotFoundException(f"El archivo exportado {path} ya no existe")
+    return ExportReader(export_id)
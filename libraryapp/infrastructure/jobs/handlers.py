@@ -0,0 +1,142 @@
+"""Trabajos pesados para bibliotecarios: importación, exportación y reportes"""
+import csv
+import heapq
+import io
+from collections import Counter
+from typing import Any, Dict
+
+from django.db.models import Count, Q, Sum
+
+from ...application.use_cases.book_use_cases import ImportBooksUseCase
+from ...application.use_cases.loan_use_cases import ProcessOverdueLoansUseCase
+from ..database.replica_router import reads_from_replica
+from ..database.unit_of_work import DjangoUnitOfWork
+from ..events.outbox import OutboxEventPublisher
+from ..external.clock import SystemClock
+from ..models.django_models import DjangoBook, DjangoLoan, DjangoLoanArchive
+from ..repositories.django_book_repository import DjangoBookRepository
+from ..repositories.django_loan_repository import DjangoLoanRepository
+from ..repositories.django_circulation_stats_repository import DjangoCirculationStatsRepository
+from .exports import save_csv_export
+from .registry import JOB_HANDLERS, job_handler
+
+# Importar este módulo registra los manejadores en JOB_HANDLERS
+__all__ = ['JOB_HANDLERS']
+
+
+@job_handler('import_books')
+def import_books(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Importar libros en bloque.
+
+    Acepta `books` (lista de objetos) o `csv` (texto con cabecera
+    title,author_name,genre_name,published_year,stock).
+    """
+    if 'csv' in params:
+        rows = list(csv.DictReader(io.StringIO(params['csv'])))
+    else:
+        rows = params.get('books', [])
+    return ImportBooksUseCase(DjangoBookRepository(), DjangoUnitOfWork()).execute(rows)
+
+
+@job_handler('export_loans')
+@reads_from_replica
+def export_loans(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Exportar préstamos a CSV (incluido el histórico archivado); `status` opcional: active | returned"""
+    columns = ('id', 'student__username', 'book__title', 'borrowed_at', 'returned_at')
+    queryset = DjangoLoan.objects.order_by('id')
+    if params.get('status') == 'active':
+        queryset = queryset.filter(returned_at__isnull=True)
+    elif params.get('status') == 'returned':
+        queryset = queryset.filter(returned_at__isnull=False)
+    sources = [queryset.values_list(*columns).iterator(chunk_size=2000)]
+    if params.get('status') != 'active':
+        # El histórico solo contiene préstamos devueltos
+        sources.append(
+            DjangoLoanArchive.objects.order_by('id').values_list(*columns).iterator(chunk_size=2000)
+        )
+
+    rows = 0
+
+    def csv_rows():
+        nonlocal rows
+        # values_list + iterator: sin instanciar modelos ni cargar todo en memoria;
+        # merge intercala ambas tablas manteniendo el orden por id
+        for loan_id, username, title, borrowed_at, returned_at in heapq.merge(*sources):
+            rows += 1
+            yield (
+                loan_id,
+                username,
+                title,
+                borrowed_at.isoformat(),
+                returned_at.isoformat() if returned_at else '',
+            )
+
+    path = save_csv_export('loans', ('id', 'student', 'book', 'borrowed_at', 'returned_at'), csv_rows())
+    return {
+        'filename': 'loans.csv',
+        'content_type': 'text/csv',
+        'rows': rows,
+        'path': path,
+    }
+
+
+@job_handler('circulation_report')
+@reads_from_replica
+def circulation_report(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Reporte de circulación calculado con consultas agregadas"""
+    limit = int(params.get('top', 10))
+    books = DjangoBook.objects.aggregate(total=Count('id'), stock=Sum('stock'))
+    loans = DjangoLoan.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(returned_at__isnull=True)),
+    )
+    loans['total'] += DjangoLoanArchive.objects.count()
+
+    # Conteos de la tabla activa y del histórico sumados en Python
+    book_loans, book_titles, genre_loans = Counter(), {}, Counter()
+    for model in (DjangoLoan, DjangoLoanArchive):
+        for row in model.objects.values('book_id', 'book__title').annotate(loans=Count('id')):
+            book_loans[row['book_id']] += row['loans']
+            book_titles[row['book_id']] = row['book__title']
+        for row in model.objects.values('book__genre__name').annotate(loans=Count('id')):
+            genre_loans[row['book__genre__name']] += row['loans']
+    top_books = [
+        {'book_id': book_id, 'book__title': book_titles[book_id], 'loans': count}
+        for book_id, count in sorted(book_loans.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    ]
+    by_genre = [
+        {'book__genre__name': genre_name, 'loans': count}
+        for genre_name, count in genre_loans.most_common()
+    ]
+
+    return {
+        'books': books['total'],
+        'total_stock': books['stock'] or 0,
+        'loans': loans['total'],
+        'active_loans': loans['active'],
+        'returned_loans': loans['total'] - loans['active'],
+        'top_books': [
+            {'book_id': row['book_id'], 'title': row['book__title'], 'loans': row['loans']}
+            for row in top_books
+        ],
+        'loans_by_genre': [
+            {'genre_name': row['book__genre__name'], 'loans': row['loans']}
+            for row in by_genre
+        ],
+    }
+
+
+@job_handler('process_overdue_loans')
+def process_overdue_loans(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Registrar eventos LoanOverdue para los préstamos vencidos pendientes"""
+    processed = ProcessOverdueLoansUseCase(
+        DjangoLoanRepository(), DjangoUnitOfWork(), SystemClock(), OutboxEventPublisher()
+    ).execute(chunk_size=int(params.get('chunk_size', 500)))
+    return {'processed': processed}
+
+
+@job_handler('rebuild_circulation_stats')
+def rebuild_circulation_stats(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Recalcular los rollups de circulación desde la tabla de préstamos"""
+    return {'rows': DjangoCirculationStatsRepository().rebuild()}
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""Registro de manejadores de trabajos en segundo plano"""
+from typing import Any, Callable, Dict
+
+JobHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str):
+    """Decorador para registrar la función que ejecuta un tipo de trabajo"""
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[job_type] = handler
+        return handler
+    return decorator
@@ -0,0 +1,41 @@
+"""
+Funciones ejecutadas en los procesos hijos del worker de trabajos.
+
+Los procesos se crean con 'spawn', así que este módulo no importa modelos a
+nivel de módulo: Django se inicializa en `setup_worker` antes de usarlos.
+"""
+
+
+def setup_worker() -> None:
+    """Inicializar Django en el proceso hijo"""
+    import django
+    django.setup()
+
+
+def execute_job(job_id: int) -> str:
+    """Ejecutar un trabajo ya reclamado y guardar su resultado"""
+    from django.db import close_old_connections
+    from django.utils import timezone
+
+    from ...domain.entities.job import JobStatus
+    from ..repositories.django_job_repository import DjangoJobRepository
+    from .handlers import JOB_HANDLERS
+
+    close_old_connections()
+    job_repository = DjangoJobRepository()
+    job = job_repository.get_by_id(job_id)
+    if job is None:
+        return 'missing'
+
+    try:
+        handler = JOB_HANDLERS[job.job_type]
+        job.result = handler(job.params)
+        job.status = JobStatus.SUCCEEDED
+        job.error = None
+    except Exception as e:
+        job.status = JobStatus.FAILED
+        job.error = f"{type(e).__name__}: {e}"
+
+    job.finished_at = timezone.now()
+    job_repository.save(job)
+    return job.status.value
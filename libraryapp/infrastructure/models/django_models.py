@@ -1,40 +1,339 @@
 """Modelos de Django - Capa de infraestructura"""
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
+
+
+class DjangoAuthor(models.Model):
+    """Modelo Django para Autor"""
+    name = models.CharField(max_length=200)
+    birth_year = models.PositiveIntegerField(null=True, blank=True)
+    nationality = models.CharField(max_length=100, null=True, blank=True)
+
+    class Meta:
+        db_table = 'libraryapp_author'
+        ordering = ['name']
+        constraints = [
+            # Índice único sobre lower(name): deduplica y resuelve nombres sin escanear
+            models.UniqueConstraint(Lower('name'), name='author_name_lower_unique'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class DjangoGenre(models.Model):
+    """Modelo Django para Género"""
+    name = models.CharField(max_length=100)
+    description = models.TextField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'libraryapp_genre'
+        ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='genre_name_lower_unique'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class DjangoBookManager(models.Manager):
+    """Siempre trae autor y género en la misma consulta (JOIN sobre FKs enteras)"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author', 'genre')
 
 
 class DjangoBook(models.Model):
     """Modelo Django para Libro"""
     title = models.CharField(max_length=255)
-    author_name = models.CharField(max_length=200)
+    author = models.ForeignKey(DjangoAuthor, on_delete=models.PROTECT, related_name='books')
     published_year = models.PositiveIntegerField()
-    genre_name = models.CharField(max_length=100)
+    genre = models.ForeignKey(DjangoGenre, on_delete=models.PROTECT, related_name='books')
     stock = models.PositiveIntegerField(default=0)
+    # Control de concurrencia optimista: cada actualización la incrementa
+    version = models.PositiveIntegerField(default=1)
+
+    objects = DjangoBookManager()
 
     class Meta:
         db_table = 'libraryapp_book'
         ordering = ['title']
 
+    @property
+    def author_name(self):
+        return self.author.name
+
+    @property
+    def genre_name(self):
+        return self.genre.name
+
     def __str__(self):
         return f"{self.title} by {self.author_name}"
 
 
+class DjangoUserVersion(models.Model):
+    """
+    Versión de cada usuario para el control de concurrencia optimista.
+
+    auth_user pertenece a django.contrib.auth, así que la columna vive en esta
+    tabla 1:1; sin fila, el usuario está en la versión 1.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='version_row'
+    )
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        db_table = 'libraryapp_user_version'
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
 class DjangoLoan(models.Model):
     """Modelo Django para Préstamo"""
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     book = models.ForeignKey(DjangoBook, on_delete=models.CASCADE)
     borrowed_at = models.DateTimeField(auto_now_add=True)
     returned_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField(null=True, blank=True)
+    overdue_notified_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'libraryapp_loan'
         ordering = ['-borrowed_at']
+        indexes = [
+            # Solo préstamos activos: el índice crece con los préstamos abiertos, no con el histórico
+            models.Index(
+                fields=['due_at', 'id'],
+                condition=models.Q(returned_at__isnull=True),
+                name='loan_active_due_idx',
+            ),
+            models.Index(
+                fields=['due_at', 'id'],
+                condition=models.Q(returned_at__isnull=True, overdue_notified_at__isnull=True),
+                name='loan_overdue_pending_idx',
+            ),
+            # Candidatos a archivar (y devoluciones recientes) sin recorrer los activos
+            models.Index(
+                fields=['returned_at', 'id'],
+                condition=models.Q(returned_at__isnull=False),
+                name='loan_returned_idx',
+            ),
+        ]
+        constraints = [
+            # Préstamos abiertos de un estudiante (límite por estudiante y libro repetido);
+            # única para que dos préstamos simultáneos del mismo libro no pasen ambos
+            models.UniqueConstraint(
+                fields=['student', 'book'],
+                condition=models.Q(returned_at__isnull=True),
+                name='loan_active_student_uniq',
+            ),
+        ]
 
     def __str__(self):
         status = "Returned" if self.returned_at else "Active"
         return f"{self.book.title} - {self.student.username} ({status})"
 
 
+class DjangoLoanArchive(models.Model):
+    """
+    Préstamos devueltos hace tiempo, movidos fuera de libraryapp_loan por
+    `manage.py archive_loans`. Conservan el ID original; la tabla activa solo
+    guarda préstamos abiertos y devoluciones recientes.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    # Sin índice propio: lo cubre loan_archive_student_idx
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
+    book = models.ForeignKey(DjangoBook, on_delete=models.CASCADE)
+    borrowed_at = models.DateTimeField()
+    returned_at = models.DateTimeField()
+    due_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'libraryapp_loan_archive'
+        ordering = ['-borrowed_at', '-id']
+        indexes = [
+            # Historial por estudiante y global paginados por (borrowed_at, id)
+            models.Index(fields=['student', '-borrowed_at', '-id'], name='loan_archive_student_idx'),
+            models.Index(fields=['-borrowed_at', '-id'], name='loan_archive_borrowed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.book.title} - {self.student.username} (Archived)"
+
+
+class DjangoDailyBookStat(models.Model):
+    """Rollup diario de préstamos y devoluciones por libro"""
+    day = models.DateField()
+    book = models.ForeignKey(DjangoBook, on_delete=models.CASCADE)
+    loans = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'libraryapp_daily_book_stat'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'book'], name='daily_book_stat_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} book #{self.book_id}: {self.loans}/{self.returns}"
+
+
+class DjangoDailyGenreStat(models.Model):
+    """Rollup diario de préstamos y devoluciones por género"""
+    day = models.DateField()
+    genre_name = models.CharField(max_length=100)
+    loans = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'libraryapp_daily_genre_stat'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'genre_name'], name='daily_genre_stat_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.genre_name}: {self.loans}/{self.returns}"
+
+
+class DjangoOutboxEvent(models.Model):
+    """Outbox transaccional de eventos de dominio pendientes de procesar"""
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    occurred_at = models.DateTimeField()
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    # Tras un fallo, el evento no se reintenta antes de esta fecha (backoff exponencial)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'libraryapp_outbox_event'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(processed_at__isnull=True),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        status = "Processed" if self.processed_at else "Pending"
+        return f"{self.event_type} #{self.id} ({status})"
+
+
+class DjangoJob(models.Model):
+    """Modelo Django para trabajos en segundo plano (cola respaldada por la BD)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    job_type = models.CharField(max_length=100)
+    params = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Concesión del worker que lo ejecuta: la renueva mientras el proceso vive;
+    # vencida, otro worker lo devuelve a 'pending' (o lo da por fallido)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'libraryapp_job'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['id'],
+                condition=models.Q(status='pending'),
+                name='job_pending_idx',
+            ),
+            models.Index(
+                fields=['locked_until'],
+                condition=models.Q(status='running'),
+                name='job_running_lease_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.job_type} #{self.id} ({self.status})"
+
+
+class DjangoExportFile(models.Model):
+    """
+    Archivo generado por un trabajo de exportación.
+
+    Se guarda en la base de datos (por bloques en DjangoExportChunk) porque el
+    worker de trabajos y la API son servicios distintos sin disco compartido.
+    """
+    path = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'libraryapp_export_file'
+
+    def __str__(self):
+        return f"{self.path} ({self.size} bytes)"
+
+
+class DjangoExportChunk(models.Model):
+    """Bloque de un archivo exportado; la descarga los lee en orden de seq"""
+    # Sin índice propio: el índice único (export, seq) ya empieza por export_id
+    export = models.ForeignKey(DjangoExportFile, on_delete=models.CASCADE, db_index=False)
+    seq = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        db_table = 'libraryapp_export_chunk'
+        constraints = [
+            models.UniqueConstraint(fields=['export', 'seq'], name='export_chunk_seq_unique'),
+        ]
+
+
+class DjangoIdempotencyKey(models.Model):
+    """Respuesta guardada de una petición enviada con la cabecera Idempotency-Key"""
+    # Sin índice propio: el índice único (user, key) ya empieza por user_id
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
+    key = models.CharField(max_length=255)
+    # sha256 del método, la ruta y el cuerpo: detecta claves reutilizadas con otra petición
+    fingerprint = models.CharField(max_length=64)
+    # Sin código de estado mientras la petición original sigue en curso
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Concesión de la reserva: si vence sin respuesta, el proceso que la tomó murió
+    # y un reintento con la misma petición puede volver a reservarla
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'libraryapp_idempotency_key'
+        constraints = [
+            # Los reintentos se resuelven con una sola búsqueda por este índice
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_user_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.status_code or 'in progress'})"
+
+
 # Alias para compatibilidad con el código existente
 Book = DjangoBook
-Loan = DjangoLoan
\ No newline at end of file
+Loan = DjangoLoan
+Author = DjangoAuthor
+Genre = DjangoGenre
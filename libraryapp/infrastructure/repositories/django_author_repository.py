@@ -1,10 +1,20 @@
 """Implementación concreta del repositorio de autores usando Django ORM"""
-from typing import List, Optional
+from typing import Iterator, List, Optional
+
+from django.db.models.functions import Lower
 
 from ...domain.entities.author import Author
+from ...domain.entities.page import Page
 from ...domain.repositories.author_repository import AuthorRepository
 from ..models.django_models import DjangoAuthor
 from .mappers import AuthorMapper
+from .pagination import estimated_count, iter_chunks, slice_page
+from .prefix_search import filter_prefix
+
+
+
+def _to_domain_list(django_authors) -> List[Author]:
+    return [AuthorMapper.to_domain(django_author) for django_author in django_authors]
 
 
 class DjangoAuthorRepository(AuthorRepository):
@@ -53,4 +63,32 @@ class DjangoAuthorRepository(AuthorRepository):
     def find_by_name(self, name: str) -> List[Author]:
         """Buscar autores por nombre (búsqueda parcial)"""
         django_authors = DjangoAuthor.objects.filter(name__icontains=name)
-        return [AuthorMapper.to_domain(django_author) for django_author in django_authors]
\ No newline at end of file
+        return [AuthorMapper.to_domain(django_author) for django_author in django_authors]
+
+    def get_by_name(self, name: str) -> Optional[Author]:
+        """Obtener el autor con ese nombre exacto (sin distinguir mayúsculas)"""
+        # lower(name) = lower(%s) usa el índice único sobre Lower('name')
+        django_author = DjangoAuthor.objects.annotate(lower_name=Lower('name')).filter(
+            lower_name=name.strip().lower()
+        ).first()
+        return AuthorMapper.to_domain(django_author) if django_author else None
+
+    def suggest_names(self, prefix: str, limit: int) -> List[Author]:
+        """Autores cuyo nombre empieza por el prefijo, en orden alfabético"""
+        django_authors = filter_prefix(DjangoAuthor.objects.all(), 'name', prefix)[:limit]
+        return [AuthorMapper.to_domain(django_author) for django_author in django_authors]
+
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Author]:
+        """Página de autores en orden alfabético"""
+        return slice_page(
+            DjangoAuthor.objects.order_by('name', 'id'), offset, limit, _to_domain_list,
+            with_total=with_total, filtered=False
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Author]:
+        """Recorrer todos los autores por lotes, sin cargarlos a la vez en memoria"""
+        return iter_chunks(DjangoAuthor.objects.order_by('id'), _to_domain_list, chunk_size)
+
+    def estimate_count(self) -> int:
+        """Número aproximado de autores (exacto en tablas pequeñas)"""
+        return estimated_count(DjangoAuthor)
@@ -1,11 +1,229 @@
 """Implementación concreta del repositorio de libros usando Django ORM"""
-from typing import List, Optional, Dict, Any
-from django.db.models import Q
+from dataclasses import replace
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Q
+from django.db.models.functions import Lower
 
 from ...domain.entities.book import Book
+from ...domain.entities.book_facets import BookFacets, FacetValue
+from ...domain.entities.page import Page
 from ...domain.repositories.book_repository import BookRepository
-from ..models.django_models import DjangoBook
+from ...shared.exceptions.business_exceptions import ConcurrencyException
+from ..cache.catalog_cache import bump_catalog_version, catalog_cache_key
+from ..database.replica_router import reads_from_replica
+from ..external.stock_broker import BookChange, publish_book_change
+from ..models.django_models import DjangoAuthor, DjangoBook, DjangoGenre
 from .mappers import BookMapper
+from .pagination import estimated_count, iter_chunks, slice_page
+from .prefix_search import filter_prefix, prefix_key
+
+
+def _resolve_names(model, names) -> Dict[str, Any]:
+    """
+    Resolver nombres de autor/género a sus filas, creando las que falten.
+
+    Devuelve un diccionario nombre-en-minúsculas -> instancia; la búsqueda usa
+    el índice único sobre lower(name), así que es una consulta por tipo.
+    """
+    wanted = {name.strip().lower(): name.strip() for name in names}
+    if not wanted:
+        return {}
+
+    def fetch():
+        return {
+            instance.lower_name: instance
+            for instance in model.objects.annotate(lower_name=Lower('name')).filter(
+                lower_name__in=list(wanted)
+            )
+        }
+
+    found = fetch()
+    missing = [model(name=wanted[key]) for key in wanted if key not in found]
+    if missing:
+        # ignore_conflicts: otra petición pudo crear el mismo nombre a la vez
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        found = fetch()
+    return found
+
+
+def _name_filter(model, value: str):
+    """Subconsulta de IDs cuyo nombre contiene el texto (tabla pequeña de catálogo)"""
+    return model.objects.filter(name__icontains=value).values('id')
+
+
+def _is_true(value) -> bool:
+    """Los filtros llegan como texto desde la query string ('true'/'false')"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'si', 'sí')
+    return bool(value)
+
+
+def _apply_filters(queryset, filters: Dict[str, Any]):
+    """Aplicar los filtros dinámicos del listado de libros"""
+    if 'title' in filters:
+        queryset = queryset.filter(title__icontains=filters['title'])
+    
+    # Los nombres se buscan en las tablas de catálogo y el libro se filtra por FK
+    if 'author_name' in filters:
+        queryset = queryset.filter(author_id__in=_name_filter(DjangoAuthor, filters['author_name']))
+    
+    if 'genre_name' in filters:
+        queryset = queryset.filter(genre_id__in=_name_filter(DjangoGenre, filters['genre_name']))
+    
+    if 'author_id' in filters:
+        queryset = queryset.filter(author_id=filters['author_id'])
+    
+    if 'genre_id' in filters:
+        queryset = queryset.filter(genre_id=filters['genre_id'])
+    
+    if 'published_year_min' in filters:
+        queryset = queryset.filter(published_year__gte=filters['published_year_min'])
+    
+    if 'published_year_max' in filters:
+        queryset = queryset.filter(published_year__lte=filters['published_year_max'])
+    
+    if 'available' in filters:
+        if _is_true(filters['available']):
+            queryset = queryset.filter(stock__gt=0)
+        else:
+            queryset = queryset.filter(stock=0)
+    
+    if 'published_year' in filters:
+        queryset = queryset.filter(published_year=filters['published_year'])
+    
+    if 'stock' in filters:
+        queryset = queryset.filter(stock=filters['stock'])
+    
+    return queryset
+
+
+def _upsert_change(django_book: DjangoBook) -> BookChange:
+    """Mensaje con la fila completa para las copias en memoria del catálogo"""
+    return BookChange(action='upsert', book_id=django_book.id, fields={
+        'title': django_book.title,
+        'author_id': django_book.author_id,
+        'author_name': django_book.author.name,
+        'genre_id': django_book.genre_id,
+        'genre_name': django_book.genre.name,
+        'published_year': django_book.published_year,
+        'stock': django_book.stock,
+    })
+
+
+def _save_if_unchanged(django_book: DjangoBook, expected_version: Optional[int]) -> None:
+    """
+    Escribir la fila solo si sigue en expected_version (la del libro leído por
+    el caso de uso; sin ella, la que se acaba de leer) y avanzar la versión.
+    """
+    if expected_version is None:
+        expected_version = django_book.version
+    updated = DjangoBook.objects.filter(id=django_book.id, version=expected_version).update(
+        title=django_book.title,
+        author=django_book.author,
+        genre=django_book.genre,
+        published_year=django_book.published_year,
+        stock=django_book.stock,
+        version=expected_version + 1
+    )
+    if not updated:
+        raise ConcurrencyException(
+            f"Book with ID {django_book.id} was modified by another request; reload it and retry"
+        )
+    django_book.version = expected_version + 1
+
+
+# Columnas necesarias para cada campo expuesto de Book
+BOOK_FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'author_name': ('author__name',),
+    'published_year': ('published_year',),
+    'genre_name': ('genre__name',),
+    'stock': ('stock',),
+    'is_available': ('stock',),
+}
+
+
+def _select_fields(queryset, fields: Optional[Iterable[str]]):
+    """Cargar solo las columnas (y JOINs) que necesitan los campos pedidos"""
+    if not fields:
+        return queryset
+    columns = {'id'} | {column for field in fields for column in BOOK_FIELD_COLUMNS.get(field, ())}
+    related = {column.split('__')[0] for column in columns if '__' in column}
+    # select_related(None) quita los JOIN del manager por defecto
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def _to_domain_list(django_books) -> List[Book]:
+    return [BookMapper.to_domain(django_book) for django_book in django_books]
+
+
+# Filtros cuyo resultado cambia con el stock: con ellos ninguna faceta sobrevive a un préstamo
+STOCK_FILTERS = ('available', 'stock')
+
+
+def _facet_values(rows, value_key: str, label_key: str) -> List[FacetValue]:
+    return [FacetValue(value=row[value_key], label=row[label_key], count=row['count']) for row in rows]
+
+
+def _compute_catalog_facets(filters: Dict[str, Any], max_values: int) -> BookFacets:
+    """
+    Facetas que no dependen del stock: total, género, autor y década.
+
+    Una consulta agregada pequeña por faceta (GROUP BY de una sola columna,
+    con el top-N resuelto en la base de datos) en lugar de un GROUP BY por
+    todas las columnas, que devuelve casi una fila por libro.
+    """
+    queryset = _apply_filters(DjangoBook.objects.all(), filters).order_by()
+    genres = (
+        queryset.values('genre_id', 'genre__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'genre__name')[:max_values]
+    )
+    authors = (
+        queryset.values('author_id', 'author__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'author__name')[:max_values]
+    )
+    decades = (
+        queryset.annotate(
+            decade=ExpressionWrapper(F('published_year') / 10 * 10, output_field=IntegerField())
+        )
+        .values('decade')
+        .annotate(count=Count('id'))
+        .order_by('decade')
+    )
+    return BookFacets(
+        total=queryset.count(),
+        genres=_facet_values(genres, 'genre_id', 'genre__name'),
+        authors=_facet_values(authors, 'author_id', 'author__name'),
+        decades=[
+            FacetValue(value=row['decade'], label=f"{row['decade']}s", count=row['count'])
+            for row in decades
+        ]
+    )
+
+
+def _compute_availability(filters: Dict[str, Any]) -> List[FacetValue]:
+    """Faceta de disponibilidad: un único aggregate con conteo condicional"""
+    counts = _apply_filters(DjangoBook.objects.all(), filters).aggregate(
+        available=Count('id', filter=Q(stock__gt=0)),
+        unavailable=Count('id', filter=Q(stock__lte=0)),
+    )
+    return [
+        FacetValue(value=value, label=label, count=counts[label])
+        for value, label in ((True, 'available'), (False, 'unavailable')) if counts[label]
+    ]
+
+
+def _catalog_fields(django_book) -> Tuple:
+    """Columnas del libro que afectan a las facetas y listados distintas del stock"""
+    return (django_book.title, django_book.author_id, django_book.genre_id, django_book.published_year)
 
 
 class DjangoBookRepository(BookRepository):
@@ -19,13 +237,20 @@ class DjangoBookRepository(BookRepository):
         except DjangoBook.DoesNotExist:
             return None
 
+    @reads_from_replica
     def get_all(self) -> List[Book]:
         """Obtener todos los libros"""
         django_books = DjangoBook.objects.all()
         return [BookMapper.to_domain(django_book) for django_book in django_books]
 
     def save(self, book: Book) -> Book:
-        """Guardar libro (crear o actualizar)"""
+        """
+        Guardar libro (crear o actualizar).
+
+        La actualización es condicional (UPDATE ... WHERE version = leída): si
+        otra escritura ganó entretanto no cambia ninguna fila y se lanza
+        ConcurrencyException en lugar de pisarla, sin bloquear la fila.
+        """
         # Obtener o crear modelo Django
         if book.id:
             try:
@@ -35,77 +260,215 @@ class DjangoBookRepository(BookRepository):
         else:
             django_book = DjangoBook()
 
+        before = _catalog_fields(django_book) if django_book.pk is not None else None
+
         # Mapear todos los datos usando el mapper
-        django_book = BookMapper.to_django(book, django_book)
+        authors = _resolve_names(DjangoAuthor, [book.author_name])
+        genres = _resolve_names(DjangoGenre, [book.genre_name])
+        django_book = BookMapper.to_django(
+            book, django_book,
+            author=authors[book.author_name.strip().lower()],
+            genre=genres[book.genre_name.strip().lower()]
+        )
         
         # Guardar
-        django_book.save()
+        if django_book.pk is None:
+            django_book.save()
+        else:
+            _save_if_unchanged(django_book, book.version)
+        bump_catalog_version(stock_only=before == _catalog_fields(django_book))
+        publish_book_change(_upsert_change(django_book))
         
         # Actualizar ID en la entidad de dominio si es nueva
         book.id = django_book.id
+        book.version = django_book.version
+        # Reflejar la grafía canónica del autor y el género ya existentes
+        book.author_name = django_book.author.name
+        book.genre_name = django_book.genre.name
         
         return book
 
+    def adjust_stock(self, book_id: int, delta: int) -> Optional[int]:
+        """
+        Sumar delta al stock con un UPDATE ... SET stock = stock + delta
+        (WHERE stock >= -delta al restar): la fila solo se bloquea durante la
+        escritura y no hay conflicto de versión entre préstamos simultáneos.
+        """
+        queryset = DjangoBook.objects.filter(id=book_id)
+        if delta < 0:
+            queryset = queryset.filter(stock__gte=-delta)
+        if not queryset.update(stock=F('stock') + delta, version=F('version') + 1):
+            return None
+        django_book = DjangoBook.objects.select_related('author', 'genre').get(id=book_id)
+        bump_catalog_version(stock_only=True)
+        publish_book_change(_upsert_change(django_book))
+        return django_book.stock
+
     def delete(self, book_id: int) -> bool:
         """Eliminar libro por ID"""
         try:
             django_book = DjangoBook.objects.get(id=book_id)
             django_book.delete()
+            bump_catalog_version()
+            publish_book_change(BookChange(action='delete', book_id=book_id))
             return True
         except DjangoBook.DoesNotExist:
             return False
 
-    def find_with_filters(self, filters: Dict[str, Any]) -> List[Book]:
-        """Buscar libros con filtros dinámicos"""
-        queryset = DjangoBook.objects.all()
-        
-        # Aplicar filtros
-        if 'title' in filters:
-            queryset = queryset.filter(title__icontains=filters['title'])
-        
-        if 'author_name' in filters:
-            queryset = queryset.filter(author_name__icontains=filters['author_name'])
-        
-        if 'genre_name' in filters:
-            queryset = queryset.filter(genre_name__icontains=filters['genre_name'])
-        
-        if 'published_year_min' in filters:
-            queryset = queryset.filter(published_year__gte=filters['published_year_min'])
-        
-        if 'published_year_max' in filters:
-            queryset = queryset.filter(published_year__lte=filters['published_year_max'])
-        
-        if 'available' in filters:
-            if filters['available']:
-                queryset = queryset.filter(stock__gt=0)
-            else:
-                queryset = queryset.filter(stock=0)
-        
-        if 'published_year' in filters:
-            queryset = queryset.filter(published_year=filters['published_year'])
-        
-        if 'stock' in filters:
-            queryset = queryset.filter(stock=filters['stock'])
-        
-        django_books = queryset.all()
+    @reads_from_replica
+    def find_with_filters(self, filters: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> List[Book]:
+        """Buscar libros con filtros dinámicos; con fields solo se cargan esos campos"""
+        django_books = _select_fields(_apply_filters(DjangoBook.objects.all(), filters), fields)
         return [BookMapper.to_domain(django_book) for django_book in django_books]
 
+    @reads_from_replica
+    def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> BookFacets:
+        """Contar libros por género, autor, década y disponibilidad para los filtros dados"""
+        config = getattr(settings, 'BOOK_FACETS', {})
+        timeout = config.get('CACHE_SECONDS', 300)
+        filters = filters or {}
+        stock_filtered = any(name in filters for name in STOCK_FILTERS)
+
+        # Género/autor/década solo caducan con cambios de catálogo; la
+        # disponibilidad se cachea aparte y un préstamo solo invalida esa entrada
+        key = catalog_cache_key('facets', filters, depends_on_stock=stock_filtered)
+        facets = cache.get(key)
+        if facets is None:
+            facets = _compute_catalog_facets(filters, config.get('MAX_VALUES', 50))
+            cache.set(key, facets, timeout)
+
+        availability_key = catalog_cache_key('facets:availability', filters, depends_on_stock=True)
+        availability = cache.get(availability_key)
+        if availability is None:
+            availability = _compute_availability(filters)
+            cache.set(availability_key, availability, timeout)
+        return replace(facets, availability=availability)
+
+    @reads_from_replica
     def find_available(self) -> List[Book]:
         """Obtener libros disponibles (con stock > 0)"""
         django_books = DjangoBook.objects.filter(stock__gt=0)
         return [BookMapper.to_domain(django_book) for django_book in django_books]
 
+    @reads_from_replica
     def find_by_title(self, title: str) -> List[Book]:
         """Buscar libros por título (búsqueda parcial)"""
         django_books = DjangoBook.objects.filter(title__icontains=title)
         return [BookMapper.to_domain(django_book) for django_book in django_books]
 
+    @reads_from_replica
+    def suggest_titles(self, prefix: str, limit: int) -> List[Book]:
+        """Libros cuyo título empieza por el prefijo, en orden alfabético"""
+        django_books = filter_prefix(DjangoBook.objects.all(), 'title', prefix)[:limit]
+        return [BookMapper.to_domain(django_book) for django_book in django_books]
+
+    @reads_from_replica
     def find_by_author_name(self, author_name: str) -> List[Book]:
         """Buscar libros por nombre de autor"""
-        django_books = DjangoBook.objects.filter(author_name__icontains=author_name)
+        django_books = DjangoBook.objects.filter(author_id__in=_name_filter(DjangoAuthor, author_name))
         return [BookMapper.to_domain(django_book) for django_book in django_books]
 
+    @reads_from_replica
     def find_by_genre_name(self, genre_name: str) -> List[Book]:
         """Buscar libros por nombre de género"""
-        django_books = DjangoBook.objects.filter(genre_name__icontains=genre_name)
-        return [BookMapper.to_domain(django_book) for django_book in django_books]
\ No newline at end of file
+        django_books = DjangoBook.objects.filter(genre_id__in=_name_filter(DjangoGenre, genre_name))
+        return [BookMapper.to_domain(django_book) for django_book in django_books]
+
+    def save_all(self, books: List[Book]) -> List[Book]:
+        """Crear varios libros nuevos en bloque"""
+        authors = _resolve_names(DjangoAuthor, {book.author_name for book in books})
+        genres = _resolve_names(DjangoGenre, {book.genre_name for book in books})
+        django_books = DjangoBook.objects.bulk_create(
+            [
+                BookMapper.to_django(
+                    book,
+                    author=authors[book.author_name.strip().lower()],
+                    genre=genres[book.genre_name.strip().lower()]
+                )
+                for book in books
+            ],
+            batch_size=500
+        )
+        bump_catalog_version()
+        publish_book_change(BookChange(action='reload'))
+        for book, django_book in zip(books, django_books):
+            book.id = django_book.id
+            book.version = django_book.version
+            book.author_name = django_book.author.name
+            book.genre_name = django_book.genre.name
+        return books
+
+    def exists_by_title_author(self, title: str, author_name: str) -> bool:
+        """
+        Indicar si ya existe un libro con ese título y autor (sin distinguir mayúsculas).
+
+        iexact compila a UPPER() y no usa ningún índice: el autor se resuelve por
+        el índice único de lower(name) y el título por el de lower(title).
+        """
+        authors = DjangoAuthor.objects.annotate(lower_name=Lower('name')).filter(
+            lower_name=author_name.strip().lower()
+        ).values('id')
+        return DjangoBook.objects.annotate(title_key=prefix_key('title')).filter(
+            title_key=title.lower(), author_id__in=authors
+        ).exists()
+
+    def find_existing_title_authors(
+        self, pairs: List[Tuple[str, str]], batch_size: int = 500
+    ) -> Set[Tuple[str, str]]:
+        """
+        Devolver los pares (título, autor) ya existentes, en minúsculas.
+
+        Por lotes de claves en minúsculas: los autores se buscan por el índice
+        único de lower(name) y los libros por el de lower(title) restringido a
+        esos autores; el par exacto se comprueba en Python.
+        """
+        wanted = sorted({(title.lower(), author_name.lower()) for title, author_name in pairs})
+        found = set()
+        for start in range(0, len(wanted), batch_size):
+            batch = wanted[start:start + batch_size]
+            authors = dict(
+                DjangoAuthor.objects.annotate(lower_name=Lower('name'))
+                .filter(lower_name__in={author_name for _, author_name in batch})
+                .values_list('id', 'lower_name')
+            )
+            if not authors:
+                continue
+            rows = (
+                DjangoBook.objects.annotate(title_key=prefix_key('title'))
+                .filter(title_key__in={title for title, _ in batch}, author_id__in=list(authors))
+                .values_list('title_key', 'author_id')
+            )
+            batch_pairs = set(batch)
+            for title, author_id in rows:
+                pair = (title, authors[author_id])
+                if pair in batch_pairs:
+                    found.add(pair)
+        return found
+
+    @reads_from_replica
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Book]:
+        """Página de libros filtrados en el orden del listado; total estimado si es grande salvo con exact_total"""
+        django_books = _select_fields(
+            _apply_filters(DjangoBook.objects.all(), filters or {}), fields
+        ).order_by('title', 'id')
+        return slice_page(
+            django_books, offset, limit, _to_domain_list,
+            with_total=with_total, filtered=bool(filters), exact_total=exact_total
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Book]:
+        """Recorrer todos los libros por lotes, sin cargarlos a la vez en memoria"""
+        return iter_chunks(DjangoBook.objects.order_by('id'), _to_domain_list, chunk_size)
+
+    @reads_from_replica
+    def estimate_count(self) -> int:
+        """Número aproximado de libros (exacto en tablas pequeñas)"""
+        return estimated_count(DjangoBook)
@@ -0,0 +1,139 @@
+"""Implementación de las estadísticas de circulación sobre tablas de rollup"""
+from datetime import date
+from itertools import product
+from typing import List
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+
+from ...domain.entities.circulation_stats import BookCirculation, GenreCirculation, MonthlyCirculation
+from ...domain.repositories.circulation_stats_repository import CirculationStatsRepository
+from ..models.django_models import (
+    DjangoBook, DjangoDailyBookStat, DjangoDailyGenreStat, DjangoLoan, DjangoLoanArchive
+)
+
+
+def _increment(model, lookup, loans: int, returns: int) -> None:
+    """UPDATE atómico del contador; si la fila no existe se crea (con reintento ante carreras)"""
+    updated = model.objects.filter(**lookup).update(
+        loans=F('loans') + loans, returns=F('returns') + returns
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(loans=loans, returns=returns, **lookup)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT
+        model.objects.filter(**lookup).update(
+            loans=F('loans') + loans, returns=F('returns') + returns
+        )
+
+
+class DjangoCirculationStatsRepository(CirculationStatsRepository):
+    """Las consultas leen solo los rollups diarios, nunca la tabla de préstamos"""
+
+    def record(self, book_id: int, day: date, loans: int = 0, returns: int = 0) -> None:
+        """Sumar préstamos/devoluciones de un libro en los rollups del día"""
+        genre_name = DjangoBook.objects.filter(id=book_id).values_list('genre__name', flat=True).first()
+        if genre_name is None:
+            # El libro ya fue eliminado: sus estadísticas desaparecen con él
+            return
+        _increment(DjangoDailyBookStat, {'day': day, 'book_id': book_id}, loans, returns)
+        _increment(DjangoDailyGenreStat, {'day': day, 'genre_name': genre_name}, loans, returns)
+
+    def by_book(self, start: date, end: date, limit: int = 20) -> List[BookCirculation]:
+        """Libros más prestados en el rango de fechas"""
+        rows = (
+            DjangoDailyBookStat.objects.filter(day__gte=start, day__lte=end)
+            .values('book_id', 'book__title')
+            .annotate(total_loans=Sum('loans'), total_returns=Sum('returns'))
+            .order_by('-total_loans', 'book_id')[:limit]
+        )
+        return [
+            BookCirculation(
+                book_id=row['book_id'],
+                title=row['book__title'],
+                loans=row['total_loans'],
+                returns=row['total_returns']
+            )
+            for row in rows
+        ]
+
+    def by_genre(self, start: date, end: date) -> List[GenreCirculation]:
+        """Préstamos y devoluciones por género en el rango de fechas"""
+        rows = (
+            DjangoDailyGenreStat.objects.filter(day__gte=start, day__lte=end)
+            .values('genre_name')
+            .annotate(total_loans=Sum('loans'), total_returns=Sum('returns'))
+            .order_by('-total_loans', 'genre_name')
+        )
+        return [
+            GenreCirculation(
+                genre_name=row['genre_name'],
+                loans=row['total_loans'],
+                returns=row['total_returns']
+            )
+            for row in rows
+        ]
+
+    def by_month(self, start: date, end: date) -> List[MonthlyCirculation]:
+        """Préstamos y devoluciones por mes en el rango de fechas"""
+        # El rollup por género tiene muchas menos filas que el de libros
+        rows = (
+            DjangoDailyGenreStat.objects.filter(day__gte=start, day__lte=end)
+            .annotate(month=TruncMonth('day'))
+            .values('month')
+            .annotate(total_loans=Sum('loans'), total_returns=Sum('returns'))
+            .order_by('month')
+        )
+        return [
+            MonthlyCirculation(
+                month=row['month'].strftime('%Y-%m'),
+                loans=row['total_loans'],
+                returns=row['total_returns']
+            )
+            for row in rows
+        ]
+
+    def rebuild(self) -> int:
+        """
+        Recalcular todos los rollups desde los préstamos; devuelve filas generadas.
+
+        Debe ejecutarse con el outbox drenado: los eventos pendientes de préstamos
+        ya incluidos en el recálculo se contarían dos veces.
+        """
+        book_stats = {}
+        genre_stats = {}
+
+        # Dos agregaciones en la base de datos (préstamos y devoluciones por día y libro)
+        # sobre la tabla activa y el histórico archivado
+        for model, (date_field, counter) in product(
+            (DjangoLoan, DjangoLoanArchive), (('borrowed_at', 'loans'), ('returned_at', 'returns'))
+        ):
+            rows = (
+                model.objects.filter(**{f'{date_field}__isnull': False})
+                .annotate(day=TruncDate(date_field))
+                .values('day', 'book_id', 'book__genre__name')
+                .annotate(total=Count('id'))
+            )
+            for row in rows:
+                book_key = (row['day'], row['book_id'])
+                genre_key = (row['day'], row['book__genre__name'])
+                book_stats.setdefault(book_key, {'loans': 0, 'returns': 0})[counter] += row['total']
+                genre_stats.setdefault(genre_key, {'loans': 0, 'returns': 0})[counter] += row['total']
+
+        with transaction.atomic():
+            DjangoDailyBookStat.objects.all().delete()
+            DjangoDailyGenreStat.objects.all().delete()
+            DjangoDailyBookStat.objects.bulk_create([
+                DjangoDailyBookStat(day=day, book_id=book_id, **counts)
+                for (day, book_id), counts in book_stats.items()
+            ], batch_size=1000)
+            DjangoDailyGenreStat.objects.bulk_create([
+                DjangoDailyGenreStat(day=day, genre_name=genre_name, **counts)
+                for (day, genre_name), counts in genre_stats.items()
+            ], batch_size=1000)
+
+        return len(book_stats) + len(genre_stats)
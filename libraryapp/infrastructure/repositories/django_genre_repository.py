@@ -1,10 +1,19 @@
 """Implementación concreta del repositorio de géneros usando Django ORM"""
-from typing import List, Optional
+from typing import Iterator, List, Optional
+
+from django.db.models.functions import Lower
 
 from ...domain.entities.genre import Genre
+from ...domain.entities.page import Page
 from ...domain.repositories.genre_repository import GenreRepository
 from ..models.django_models import DjangoGenre
 from .mappers import GenreMapper
+from .pagination import estimated_count, iter_chunks, slice_page
+
+
+
+def _to_domain_list(django_genres) -> List[Genre]:
+    return [GenreMapper.to_domain(django_genre) for django_genre in django_genres]
 
 
 class DjangoGenreRepository(GenreRepository):
@@ -53,4 +62,27 @@ class DjangoGenreRepository(GenreRepository):
     def find_by_name(self, name: str) -> List[Genre]:
         """Buscar géneros por nombre (búsqueda parcial)"""
         django_genres = DjangoGenre.objects.filter(name__icontains=name)
-        return [GenreMapper.to_domain(django_genre) for django_genre in django_genres]
\ No newline at end of file
+        return [GenreMapper.to_domain(django_genre) for django_genre in django_genres]
+
+    def get_by_name(self, name: str) -> Optional[Genre]:
+        """Obtener el género con ese nombre exacto (sin distinguir mayúsculas)"""
+        # lower(name) = lower(%s) usa el índice único sobre Lower('name')
+        django_genre = DjangoGenre.objects.annotate(lower_name=Lower('name')).filter(
+            lower_name=name.strip().lower()
+        ).first()
+        return GenreMapper.to_domain(django_genre) if django_genre else None
+
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Genre]:
+        """Página de géneros en orden alfabético"""
+        return slice_page(
+            DjangoGenre.objects.order_by('name', 'id'), offset, limit, _to_domain_list,
+            with_total=with_total, filtered=False
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Genre]:
+        """Recorrer todos los géneros por lotes, sin cargarlos a la vez en memoria"""
+        return iter_chunks(DjangoGenre.objects.order_by('id'), _to_domain_list, chunk_size)
+
+    def estimate_count(self) -> int:
+        """Número aproximado de géneros (exacto en tablas pequeñas)"""
+        return estimated_count(DjangoGenre)
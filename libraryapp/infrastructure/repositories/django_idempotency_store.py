@@ -0,0 +1,85 @@
+"""Claves de idempotencia guardadas en PostgreSQL"""
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ...application.interfaces.idempotency_store import IdempotencyRecord, IdempotencyStore
+from ..models.django_models import DjangoIdempotencyKey
+
+
+class DjangoIdempotencyStore(IdempotencyStore):
+    """
+    Cada clave es una fila por (usuario, clave). La fila se inserta antes de
+    ejecutar la petición (reserva) y se completa con la respuesta; el índice
+    único garantiza que dos reintentos simultáneos no ejecuten ambos.
+
+    La reserva dura `lease`; vencida sin respuesta, la petición original murió
+    a medias (su transacción se deshizo) y la clave se puede volver a reservar.
+    Las filas caducadas se reutilizan al reservar, pero no se borran aquí: las
+    elimina purge_expired desde una tarea periódica.
+    """
+
+    def __init__(self, ttl: Optional[timedelta] = None, lease: Optional[timedelta] = None):
+        config = getattr(settings, 'IDEMPOTENCY', {})
+        if ttl is None:
+            ttl = timedelta(hours=config.get('TTL_HOURS', 24))
+        if lease is None:
+            lease = timedelta(seconds=config.get('LEASE_SECONDS', 60))
+        self.ttl = ttl
+        self.lease = lease
+
+    def get(self, user_id: int, key: str) -> Optional[IdempotencyRecord]:
+        row = (
+            DjangoIdempotencyKey.objects
+            .filter(user_id=user_id, key=key, created_at__gte=timezone.now() - self.ttl)
+            .values_list('fingerprint', 'status_code', 'response_body')
+            .first()
+        )
+        if row is None:
+            return None
+        return IdempotencyRecord(fingerprint=row[0], status_code=row[1], body=row[2])
+
+    def claim(self, user_id: int, key: str, fingerprint: str) -> bool:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                DjangoIdempotencyKey.objects.create(
+                    user_id=user_id, key=key, fingerprint=fingerprint, locked_until=now + self.lease
+                )
+            return True
+        except IntegrityError:
+            pass
+
+        # La fila existe: se puede tomar si caducó (aún sin purgar) o si es una
+        # reserva de la misma petición cuya concesión venció sin respuesta
+        abandoned = Q(status_code__isnull=True, fingerprint=fingerprint) & (
+            Q(locked_until__lt=now) | Q(locked_until__isnull=True)
+        )
+        reclaimed = DjangoIdempotencyKey.objects.filter(user_id=user_id, key=key).filter(
+            Q(created_at__lt=now - self.ttl) | abandoned
+        ).update(
+            fingerprint=fingerprint,
+            status_code=None,
+            response_body=None,
+            created_at=now,
+            locked_until=now + self.lease,
+        )
+        return reclaimed > 0
+
+    def complete(self, user_id: int, key: str, status_code: int, body: Any) -> None:
+        DjangoIdempotencyKey.objects.filter(user_id=user_id, key=key).update(
+            status_code=status_code, response_body=body, locked_until=None
+        )
+
+    def release(self, user_id: int, key: str) -> None:
+        DjangoIdempotencyKey.objects.filter(
+            user_id=user_id, key=key, status_code__isnull=True
+        ).delete()
+
+    def purge_expired(self, older_than: datetime) -> int:
+        deleted, _ = DjangoIdempotencyKey.objects.filter(created_at__lt=older_than).delete()
+        return deleted
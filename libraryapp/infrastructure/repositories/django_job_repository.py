@@ -0,0 +1,47 @@
+"""Implementación concreta del repositorio de trabajos usando Django ORM"""
+from typing import List, Optional
+
+from ...domain.entities.job import Job
+from ...domain.repositories.job_repository import JobRepository
+from ..models.django_models import DjangoJob
+from .mappers import JobMapper
+
+
+class DjangoJobRepository(JobRepository):
+    """Implementación del repositorio de trabajos usando Django ORM"""
+
+    def get_by_id(self, job_id: int) -> Optional[Job]:
+        """Obtener trabajo por ID"""
+        try:
+            django_job = DjangoJob.objects.get(id=job_id)
+            return JobMapper.to_domain(django_job)
+        except DjangoJob.DoesNotExist:
+            return None
+
+    def save(self, job: Job) -> Job:
+        """Guardar trabajo (crear o actualizar)"""
+        if job.id:
+            try:
+                django_job = DjangoJob.objects.get(id=job.id)
+            except DjangoJob.DoesNotExist:
+                django_job = DjangoJob()
+        else:
+            django_job = DjangoJob()
+
+        django_job = JobMapper.to_django(job, django_job)
+        django_job.save()
+
+        # Actualizar ID y fecha de creación en la entidad de dominio
+        job.id = django_job.id
+        job.created_at = django_job.created_at
+
+        return job
+
+    def find_recent(self, created_by_id: Optional[int] = None, limit: int = 50) -> List[Job]:
+        """Obtener los trabajos más recientes, opcionalmente de un usuario"""
+        # Los resultados pueden ser grandes (exportaciones): no se cargan en listados
+        queryset = DjangoJob.objects.defer('result')
+        if created_by_id is not None:
+            queryset = queryset.filter(created_by_id=created_by_id)
+        django_jobs = queryset.order_by('-id')[:limit]
+        return [JobMapper.to_domain(django_job) for django_job in django_jobs]
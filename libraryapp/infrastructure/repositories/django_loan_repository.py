@@ -1,11 +1,53 @@
 """Implementación concreta del repositorio de préstamos usando Django ORM"""
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
 from django.contrib.auth.models import User as DjangoUser
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 
 from ...domain.entities.loan import Loan
+from ...domain.entities.page import Page
 from ...domain.repositories.loan_repository import LoanRepository
-from ..models.django_models import DjangoLoan, DjangoBook
+from ...shared.exceptions.business_exceptions import BusinessRuleException
+from ..database.replica_router import reads_from_replica
+from ..models.django_models import DjangoLoan, DjangoBook, DjangoLoanArchive
 from .mappers import LoanMapper
+from .pagination import estimated_count, iter_chunks, slice_page
+
+
+# Columnas (o relaciones) necesarias para cada campo expuesto de Loan
+LOAN_FIELD_COLUMNS = {
+    'id': ('id',),
+    'student': ('student',),
+    'book': ('book',),
+    'borrowed_at': ('borrowed_at',),
+    'returned_at': ('returned_at',),
+    'due_at': ('due_at',),
+    'is_returned': ('returned_at',),
+    'is_overdue': ('returned_at', 'due_at'),
+}
+
+
+def _loan_queryset(fields: Optional[Iterable[str]] = None):
+    """Préstamos con sus relaciones; con fields solo las columnas y JOINs necesarios"""
+    if not fields:
+        return DjangoLoan.objects.select_related(
+            'student', 'book__author', 'book__genre'
+        ).prefetch_related('student__groups')
+
+    columns = {'id'} | {column for field in fields for column in LOAN_FIELD_COLUMNS.get(field, ())}
+    queryset = DjangoLoan.objects.only(*columns)
+    if 'student' in columns:
+        queryset = queryset.select_related('student').prefetch_related('student__groups')
+    if 'book' in columns:
+        queryset = queryset.select_related('book__author', 'book__genre')
+    return queryset
+
+
+def _archive_queryset():
+    return DjangoLoanArchive.objects.select_related(
+        'student', 'book__author', 'book__genre'
+    ).prefetch_related('student__groups')
 
 
 class DjangoLoanRepository(LoanRepository):
@@ -14,19 +56,16 @@ class DjangoLoanRepository(LoanRepository):
     def get_by_id(self, loan_id: int) -> Optional[Loan]:
         """Obtener préstamo por ID"""
         try:
-            django_loan = DjangoLoan.objects.select_related(
-                'student', 'book'
-            ).get(id=loan_id)
+            django_loan = _loan_queryset().get(id=loan_id)
             return LoanMapper.to_domain(django_loan)
         except DjangoLoan.DoesNotExist:
             return None
 
-    def get_all(self) -> List[Loan]:
-        """Obtener todos los préstamos"""
-        django_loans = DjangoLoan.objects.select_related(
-            'student', 'book'
-        ).all()
-        return [LoanMapper.to_domain(django_loan) for django_loan in django_loans]
+    @reads_from_replica
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Obtener todos los préstamos; con fields solo se cargan esos campos"""
+        django_loans = _loan_queryset(fields)
+        return LoanMapper.to_domain_list(django_loans)
 
     def save(self, loan: Loan) -> Loan:
         """Guardar préstamo (crear o actualizar)"""
@@ -52,14 +91,29 @@ class DjangoLoanRepository(LoanRepository):
         django_loan.student = django_student
         django_loan.book = django_book
         
-        # Guardar
-        django_loan.save()
+        # Guardar; loan_active_student_uniq impide dos préstamos activos del
+        # mismo libro aunque dos peticiones pasen a la vez la validación
+        try:
+            with transaction.atomic():
+                django_loan.save()
+        except IntegrityError:
+            if django_loan.returned_at is not None:
+                raise
+            raise BusinessRuleException(
+                f"El estudiante '{loan.student.username}' ya tiene el libro '{loan.book.title}' en préstamo"
+            )
         
         # Actualizar ID en la entidad de dominio si es nueva
         loan.id = django_loan.id
         
         return loan
 
+    def mark_returned(self, loan: Loan) -> bool:
+        """Cerrar el préstamo con un UPDATE ... WHERE returned_at IS NULL"""
+        return DjangoLoan.objects.filter(id=loan.id, returned_at__isnull=True).update(
+            returned_at=loan.returned_at
+        ) > 0
+
     def delete(self, loan_id: int) -> bool:
         """Eliminar préstamo por ID"""
         try:
@@ -69,30 +123,164 @@ class DjangoLoanRepository(LoanRepository):
         except DjangoLoan.DoesNotExist:
             return False
 
-    def find_by_student_id(self, student_id: int) -> List[Loan]:
-        """Buscar préstamos por ID de estudiante"""
-        django_loans = DjangoLoan.objects.select_related(
-            'student', 'book'
-        ).filter(student_id=student_id)
-        return [LoanMapper.to_domain(django_loan) for django_loan in django_loans]
+    @reads_from_replica
+    def find_by_student_id(self, student_id: int, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Buscar préstamos por ID de estudiante; con fields solo se cargan esos campos"""
+        django_loans = _loan_queryset(fields).filter(student_id=student_id)
+        return LoanMapper.to_domain_list(django_loans)
 
+    @reads_from_replica
     def find_by_book_id(self, book_id: int) -> List[Loan]:
         """Buscar préstamos por ID de libro"""
-        django_loans = DjangoLoan.objects.select_related(
-            'student', 'book'
-        ).filter(book_id=book_id)
-        return [LoanMapper.to_domain(django_loan) for django_loan in django_loans]
+        django_loans = _loan_queryset().filter(book_id=book_id)
+        return LoanMapper.to_domain_list(django_loans)
 
+    @reads_from_replica
     def find_active_loans(self) -> List[Loan]:
         """Obtener préstamos activos (no devueltos)"""
-        django_loans = DjangoLoan.objects.select_related(
-            'student', 'book'
-        ).filter(returned_at__isnull=True)
-        return [LoanMapper.to_domain(django_loan) for django_loan in django_loans]
+        django_loans = _loan_queryset().filter(returned_at__isnull=True)
+        return LoanMapper.to_domain_list(django_loans)
 
+    @reads_from_replica
     def find_returned_loans(self) -> List[Loan]:
-        """Obtener préstamos devueltos"""
-        django_loans = DjangoLoan.objects.select_related(
-            'student', 'book'
-        ).filter(returned_at__isnull=False)
-        return [LoanMapper.to_domain(django_loan) for django_loan in django_loans]
\ No newline at end of file
+        """Obtener préstamos devueltos aún no archivados"""
+        django_loans = _loan_queryset().filter(returned_at__isnull=False)
+        return LoanMapper.to_domain_list(django_loans)
+
+    # Las comprobaciones previas a prestar o borrar leen del primario (no de la
+    # réplica) y se resuelven con el índice parcial loan_active_student_idx o
+    # con el índice de la clave foránea del libro
+
+    def count_active_for_student(self, student_id: int) -> int:
+        """Contar préstamos activos de un estudiante"""
+        return DjangoLoan.objects.filter(student_id=student_id, returned_at__isnull=True).count()
+
+    def count_active_for_book(self, book_id: int) -> int:
+        """Contar préstamos activos de un libro"""
+        return DjangoLoan.objects.filter(book_id=book_id, returned_at__isnull=True).count()
+
+    def exists_active(self, student_id: int, book_id: int) -> bool:
+        """Indicar si el estudiante tiene el libro en préstamo"""
+        return DjangoLoan.objects.filter(
+            student_id=student_id, book_id=book_id, returned_at__isnull=True
+        ).exists()
+
+    def lock_student(self, student_id: int) -> None:
+        """SELECT ... FOR UPDATE sobre la fila del estudiante; se libera al confirmar la transacción"""
+        list(DjangoUser.objects.select_for_update().filter(id=student_id).values_list('id', flat=True))
+
+    def active_summary_for_student(self, student_id: int, book_id: int) -> Tuple[int, bool]:
+        """Préstamos activos del estudiante y si uno es el libro, en una sola consulta"""
+        summary = DjangoLoan.objects.filter(
+            student_id=student_id, returned_at__isnull=True
+        ).aggregate(
+            active=Count('id'),
+            same_book=Count('id', filter=Q(book_id=book_id)),
+        )
+        return summary['active'], summary['same_book'] > 0
+
+    @reads_from_replica
+    def find_overdue(
+        self,
+        now: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """Página de préstamos activos vencidos, ordenados por fecha límite"""
+        # Filtro y orden coinciden con el índice parcial loan_active_due_idx;
+        # el cursor (due_at, id) evita recorrer las páginas anteriores
+        queryset = _loan_queryset().filter(returned_at__isnull=True, due_at__lt=now)
+        if after is not None:
+            due_at, loan_id = after
+            queryset = queryset.filter(Q(due_at__gt=due_at) | Q(due_at=due_at, id__gt=loan_id))
+        return LoanMapper.to_domain_list(queryset.order_by('due_at', 'id')[:limit])
+
+    @reads_from_replica
+    def count_overdue(self, now: datetime) -> int:
+        """Contar préstamos activos vencidos"""
+        return DjangoLoan.objects.filter(returned_at__isnull=True, due_at__lt=now).count()
+
+    def find_overdue_unprocessed(self, now: datetime, limit: int) -> List[Loan]:
+        """Obtener un lote de préstamos vencidos aún no procesados"""
+        # Los préstamos procesados salen del índice loan_overdue_pending_idx,
+        # así cada lote cuesta lo mismo sin importar cuántos se procesaron antes
+        django_loans = _loan_queryset().filter(
+            returned_at__isnull=True, overdue_notified_at__isnull=True, due_at__lt=now
+        ).order_by('due_at', 'id')[:limit]
+        return LoanMapper.to_domain_list(django_loans)
+
+    def mark_overdue_processed(self, loan_ids: List[int], processed_at: datetime) -> int:
+        """Marcar préstamos vencidos como procesados"""
+        return DjangoLoan.objects.filter(id__in=loan_ids).update(overdue_notified_at=processed_at)
+
+    def archive_returned_before(self, cutoff: datetime, limit: int) -> int:
+        """Mover al histórico un lote de préstamos devueltos antes de cutoff; devuelve cuántos"""
+        with transaction.atomic():
+            # skip_locked: varios procesos de archivado no toman las mismas filas
+            rows = list(
+                DjangoLoan.objects.select_for_update(skip_locked=True)
+                .filter(returned_at__isnull=False, returned_at__lt=cutoff)
+                .order_by('returned_at', 'id')
+                .values('id', 'student_id', 'book_id', 'borrowed_at', 'returned_at', 'due_at')[:limit]
+            )
+            if not rows:
+                return 0
+            DjangoLoanArchive.objects.bulk_create([DjangoLoanArchive(**row) for row in rows])
+            DjangoLoan.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        return len(rows)
+
+    def get_archived_by_id(self, loan_id: int) -> Optional[Loan]:
+        """Obtener un préstamo del histórico por ID"""
+        try:
+            django_loan = _archive_queryset().get(id=loan_id)
+            return LoanMapper.to_domain(django_loan)
+        except DjangoLoanArchive.DoesNotExist:
+            return None
+
+    @reads_from_replica
+    def find_archived(
+        self,
+        student_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """Página del histórico, del más reciente al más antiguo (paginación por clave)"""
+        queryset = _archive_queryset()
+        if student_id is not None:
+            queryset = queryset.filter(student_id=student_id)
+        if before is not None:
+            borrowed_at, loan_id = before
+            # Continúa en el índice justo después de la última fila devuelta, sin OFFSET
+            queryset = queryset.filter(
+                Q(borrowed_at__lt=borrowed_at) | Q(borrowed_at=borrowed_at, id__lt=loan_id)
+            )
+        return LoanMapper.to_domain_list(queryset.order_by('-borrowed_at', '-id')[:limit])
+
+    @reads_from_replica
+    def find_page(
+        self,
+        student_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Loan]:
+        """Página de préstamos (de un estudiante si se indica); total estimado si es grande salvo con exact_total"""
+        django_loans = _loan_queryset(fields)
+        if student_id is not None:
+            django_loans = django_loans.filter(student_id=student_id)
+        return slice_page(
+            django_loans.order_by('-borrowed_at', '-id'), offset, limit, LoanMapper.to_domain_list,
+            with_total=with_total, filtered=student_id is not None, exact_total=exact_total
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Loan]:
+        """Recorrer todos los préstamos por lotes, sin cargarlos a la vez en memoria"""
+        # to_domain_list reutiliza estudiantes y libros dentro de cada lote
+        return iter_chunks(_loan_queryset().order_by('id'), LoanMapper.to_domain_list, chunk_size)
+
+    @reads_from_replica
+    def estimate_count(self) -> int:
+        """Número aproximado de préstamos (exacto en tablas pequeñas)"""
+        return estimated_count(DjangoLoan)
@@ -1,10 +1,64 @@
 """Implementación concreta del repositorio de usuarios usando Django ORM"""
-from typing import List, Optional
+from functools import partial
+from typing import Iterable, Iterator, List, Optional
 from django.contrib.auth.models import User as DjangoUser, Group
+from django.db import transaction
 
+from ...domain.entities.page import Page
 from ...domain.entities.user import User, UserRole
 from ...domain.repositories.user_repository import UserRepository
+from ...shared.exceptions.business_exceptions import ConcurrencyException
+from ..database.replica_router import reads_from_replica
+from ..models.django_models import DjangoUserVersion
 from .mappers import UserMapper
+from .pagination import estimated_count, iter_chunks, slice_page
+
+
+# Columnas expuestas de User; el rol sale de los grupos (prefetch)
+USER_FIELD_COLUMNS = ('id', 'username', 'email', 'first_name', 'last_name')
+
+
+def _with_role(fields: Optional[Iterable[str]]) -> bool:
+    return not fields or 'role' in fields
+
+
+def _user_queryset(fields: Optional[Iterable[str]] = None):
+    """Usuarios con sus grupos; con fields solo las columnas necesarias"""
+    queryset = DjangoUser.objects.all()
+    if fields:
+        queryset = queryset.only('id', *(field for field in fields if field in USER_FIELD_COLUMNS))
+    if _with_role(fields):
+        queryset = queryset.prefetch_related('groups')
+    return queryset
+
+
+
+def _role_group(role: UserRole) -> str:
+    return 'Librarians' if role == UserRole.LIBRARIAN else 'Students'
+
+
+def _advance_version(user: User) -> None:
+    """
+    Pasar el usuario a la versión siguiente solo si sigue en user.version
+    (UPDATE ... WHERE version = leída); si no, ConcurrencyException.
+
+    El UPDATE retiene la fila de versión hasta el final de la transacción, así
+    que otra escritura concurrente espera y después no encuentra su versión.
+    """
+    row, _ = DjangoUserVersion.objects.get_or_create(user_id=user.id)
+    expected = row.version if user.version is None else user.version
+    updated = DjangoUserVersion.objects.filter(user_id=user.id, version=expected).update(
+        version=expected + 1
+    )
+    if not updated:
+        raise ConcurrencyException(
+            f"El usuario con ID {user.id} fue modificado por otra petición; vuelve a leerlo y reintenta"
+        )
+    user.version = expected + 1
+
+
+def _to_domain_list(django_users, with_role: bool = True) -> List[User]:
+    return [UserMapper.to_domain(django_user, with_role) for django_user in django_users]
 
 
 class DjangoUserRepository(UserRepository):
@@ -13,26 +67,33 @@ class DjangoUserRepository(UserRepository):
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Obtener usuario por ID"""
         try:
-            django_user = DjangoUser.objects.prefetch_related('groups').get(id=user_id)
-            return UserMapper.to_domain(django_user)
+            django_user = DjangoUser.objects.select_related('version_row').prefetch_related(
+                'groups'
+            ).get(id=user_id)
+            return UserMapper.to_domain(django_user, with_version=True)
         except DjangoUser.DoesNotExist:
             return None
 
     def get_by_username(self, username: str) -> Optional[User]:
         """Obtener usuario por nombre de usuario"""
         try:
-            django_user = DjangoUser.objects.prefetch_related('groups').get(username=username)
-            return UserMapper.to_domain(django_user)
+            django_user = DjangoUser.objects.select_related('version_row').prefetch_related(
+                'groups'
+            ).get(username=username)
+            return UserMapper.to_domain(django_user, with_version=True)
         except DjangoUser.DoesNotExist:
             return None
 
-    def get_all(self) -> List[User]:
-        """Obtener todos los usuarios"""
-        django_users = DjangoUser.objects.prefetch_related('groups').all()
-        return [UserMapper.to_domain(django_user) for django_user in django_users]
+    @reads_from_replica
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Obtener todos los usuarios; con fields solo se cargan esos campos"""
+        django_users = _user_queryset(fields)
+        with_role = _with_role(fields)
+        return [UserMapper.to_domain(django_user, with_role) for django_user in django_users]
 
+    @transaction.atomic
     def save(self, user: User, password: Optional[str] = None) -> User:
-        """Guardar usuario (crear o actualizar)"""
+        """Guardar usuario (crear o actualizar); la actualización exige que no cambiara su versión"""
         is_new_user = user.id is None
         
         if user.id:
@@ -44,6 +105,9 @@ class DjangoUserRepository(UserRepository):
         else:
             django_user = DjangoUser()
 
+        if not is_new_user:
+            _advance_version(user)
+
         # Mapear campos básicos
         django_user.username = user.username
         django_user.email = user.email
@@ -71,6 +135,8 @@ class DjangoUserRepository(UserRepository):
         
         # Actualizar ID en la entidad de dominio si es nueva
         user.id = django_user.id
+        if is_new_user:
+            user.version = 1
         
         return user
 
@@ -83,15 +149,56 @@ class DjangoUserRepository(UserRepository):
         except DjangoUser.DoesNotExist:
             return False
 
-    def find_by_role(self, role: UserRole) -> List[User]:
-        """Buscar usuarios por rol"""
+    @reads_from_replica
+    def find_by_role(self, role: UserRole, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Buscar usuarios por rol; con fields solo se cargan esos campos"""
         if role == UserRole.LIBRARIAN:
-            django_users = DjangoUser.objects.prefetch_related('groups').filter(
+            django_users = _user_queryset(fields).filter(
                 groups__name='Librarians'
             )
         else:  # UserRole.STUDENT
-            django_users = DjangoUser.objects.prefetch_related('groups').filter(
+            django_users = _user_queryset(fields).filter(
                 groups__name='Students'
             )
         
-        return [UserMapper.to_domain(django_user) for django_user in django_users]
\ No newline at end of file
+        with_role = _with_role(fields)
+        return [UserMapper.to_domain(django_user, with_role) for django_user in django_users]
+
+    def exists_by_email(self, email: str) -> bool:
+        """Indicar si algún usuario usa ese email (índice auth_user_email_idx, migración 0015)"""
+        return DjangoUser.objects.filter(email=email).exists()
+
+    def count_by_role(self, role: UserRole) -> int:
+        """Contar usuarios de un rol"""
+        return DjangoUser.objects.filter(groups__name=_role_group(role)).count()
+
+    @reads_from_replica
+    def find_page(
+        self,
+        role: Optional[UserRole] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[User]:
+        """Página de usuarios (de un rol si se indica); total estimado si es grande salvo con exact_total"""
+        django_users = _user_queryset(fields)
+        if role is not None:
+            django_users = django_users.filter(
+                groups__name=_role_group(role)
+            )
+        return slice_page(
+            django_users.order_by('id'), offset, limit,
+            partial(_to_domain_list, with_role=_with_role(fields)),
+            with_total=with_total, filtered=role is not None, exact_total=exact_total
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[User]:
+        """Recorrer todos los usuarios por lotes, sin cargarlos a la vez en memoria"""
+        return iter_chunks(_user_queryset().order_by('id'), _to_domain_list, chunk_size)
+
+    @reads_from_replica
+    def estimate_count(self) -> int:
+        """Número aproximado de usuarios (exacto en tablas pequeñas)"""
+        return estimated_count(DjangoUser)
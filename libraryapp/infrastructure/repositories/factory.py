@@ -0,0 +1,84 @@
+"""Selección de implementaciones de repositorio según la configuración"""
+from django.conf import settings
+
+from ...application.interfaces.clock import Clock
+from ...application.interfaces.unit_of_work import UnitOfWork
+from ...domain.repositories.author_repository import AuthorRepository
+from ...domain.repositories.book_repository import BookRepository
+from ...domain.repositories.genre_repository import GenreRepository
+from ...domain.repositories.loan_repository import LoanRepository
+from ...domain.repositories.user_repository import UserRepository
+
+
+def _in_memory() -> bool:
+    """REPOSITORIES['BACKEND'] = 'memory': repositorios de dominio en el MemoryStore del proceso"""
+    return getattr(settings, 'REPOSITORIES', {}).get('BACKEND', 'django') == 'memory'
+
+
+def get_book_repository() -> BookRepository:
+    if _in_memory():
+        from .memory_book_repository import MemoryBookRepository
+        return MemoryBookRepository()
+    from .django_book_repository import DjangoBookRepository
+    return DjangoBookRepository()
+
+
+def get_book_read_repository() -> BookRepository:
+    """
+    Repositorio para los endpoints de solo lectura del catálogo.
+
+    Con CATALOG_SNAPSHOT['ENABLED'] sirve las lecturas desde la copia en memoria
+    del proceso; en otro caso consulta la base de datos (o el MemoryStore).
+    """
+    if _in_memory():
+        return get_book_repository()
+    if getattr(settings, 'CATALOG_SNAPSHOT', {}).get('ENABLED', False):
+        from .snapshot_book_repository import SnapshotBookRepository
+        return SnapshotBookRepository()
+    return get_book_repository()
+
+
+def get_loan_repository() -> LoanRepository:
+    if _in_memory():
+        from .memory_loan_repository import MemoryLoanRepository
+        return MemoryLoanRepository()
+    from .django_loan_repository import DjangoLoanRepository
+    return DjangoLoanRepository()
+
+
+def get_user_repository() -> UserRepository:
+    if _in_memory():
+        from .memory_user_repository import MemoryUserRepository
+        return MemoryUserRepository()
+    from .django_user_repository import DjangoUserRepository
+    return DjangoUserRepository()
+
+
+def get_author_repository() -> AuthorRepository:
+    if _in_memory():
+        from .memory_author_repository import MemoryAuthorRepository
+        return MemoryAuthorRepository()
+    from .django_author_repository import DjangoAuthorRepository
+    return DjangoAuthorRepository()
+
+
+def get_genre_repository() -> GenreRepository:
+    if _in_memory():
+        from .memory_genre_repository import MemoryGenreRepository
+        return MemoryGenreRepository()
+    from .django_genre_repository import DjangoGenreRepository
+    return DjangoGenreRepository()
+
+
+def get_unit_of_work() -> UnitOfWork:
+    """Transacciones de la base de datos, o el lock del MemoryStore en el perfil en memoria"""
+    if _in_memory():
+        from .memory_unit_of_work import MemoryUnitOfWork
+        return MemoryUnitOfWork()
+    from ..database.unit_of_work import DjangoUnitOfWork
+    return DjangoUnitOfWork()
+
+
+def get_clock() -> Clock:
+    from ..external.clock import SystemClock
+    return SystemClock()
@@ -1,13 +1,17 @@
 """Mappers para convertir entre entidades de dominio y modelos de Django"""
-from typing import Optional
+import sys
+from typing import Dict, Iterable, List, Optional
 from django.contrib.auth.models import User as DjangoUser
 
+from ...domain.entities.author import Author
 from ...domain.entities.book import Book
+from ...domain.entities.genre import Genre
 from ...domain.entities.user import User, UserRole
 from ...domain.entities.loan import Loan
+from ...domain.entities.job import Job, JobStatus
 
 from ..models.django_models import (
-    DjangoBook, DjangoLoan
+    DjangoAuthor, DjangoBook, DjangoGenre, DjangoLoan, DjangoJob, DjangoUserVersion
 )
 
 
@@ -15,20 +19,37 @@ class UserMapper:
     """Mapper para User"""
     
     @staticmethod
-    def to_domain(django_user: DjangoUser) -> User:
-        """Convertir modelo Django a entidad de dominio"""
-        # Determinar rol basado en grupos
-        role = UserRole.STUDENT
-        if django_user.groups.filter(name='Librarians').exists():
-            role = UserRole.LIBRARIAN
+    def to_domain(django_user: DjangoUser, with_role: bool = True, with_version: bool = False) -> User:
+        """
+        Convertir modelo Django a entidad de dominio.
+
+        with_version lee la versión de select_related('version_row'); solo lo
+        piden las lecturas que preceden a una actualización.
+        """
+        # Determinar rol basado en grupos; .all() reutiliza prefetch_related('groups')
+        role = None
+        if with_role:
+            role = UserRole.STUDENT
+            if any(group.name == 'Librarians' for group in django_user.groups.all()):
+                role = UserRole.LIBRARIAN
+        
+        version = None
+        if with_version:
+            try:
+                version = django_user.version_row.version
+            except DjangoUserVersion.DoesNotExist:
+                version = 1
         
+        # Las columnas pueden diferirse con only() cuando se piden campos concretos
+        deferred = django_user.get_deferred_fields()
         return User(
             id=django_user.id,
-            username=django_user.username,
-            email=django_user.email,
-            first_name=django_user.first_name or None,
-            last_name=django_user.last_name or None,
-            role=role
+            username=None if 'username' in deferred else django_user.username,
+            email=None if 'email' in deferred else django_user.email,
+            first_name=None if 'first_name' in deferred else django_user.first_name or None,
+            last_name=None if 'last_name' in deferred else django_user.last_name or None,
+            role=role,
+            version=version
         )
 
 
@@ -38,30 +59,93 @@ class BookMapper:
     @staticmethod
     def to_domain(django_book: DjangoBook) -> Book:
         """Convertir modelo Django a entidad de dominio"""
+        # Las columnas pueden diferirse con only() cuando se piden campos concretos
+        deferred = django_book.get_deferred_fields()
         return Book(
             id=django_book.id,
-            title=django_book.title,
-            author_name=django_book.author_name,
-            published_year=django_book.published_year,
-            genre_name=django_book.genre_name,
-            stock=django_book.stock
+            title=None if 'title' in deferred else django_book.title,
+            # Los nombres se repiten entre filas: internarlos comparte una sola cadena
+            author_name=None if 'author_id' in deferred else sys.intern(django_book.author_name),
+            published_year=None if 'published_year' in deferred else django_book.published_year,
+            genre_name=None if 'genre_id' in deferred else sys.intern(django_book.genre_name),
+            stock=None if 'stock' in deferred else django_book.stock,
+            version=None if 'version' in deferred else django_book.version
         )
     
     @staticmethod
-    def to_django(book: Book, django_book: Optional[DjangoBook] = None) -> DjangoBook:
+    def to_django(
+        book: Book,
+        django_book: Optional[DjangoBook] = None,
+        author: Optional[DjangoAuthor] = None,
+        genre: Optional[DjangoGenre] = None
+    ) -> DjangoBook:
         """Convertir entidad de dominio a modelo Django"""
         if django_book is None:
             django_book = DjangoBook()
         
         django_book.title = book.title
-        django_book.author_name = book.author_name
         django_book.published_year = book.published_year
-        django_book.genre_name = book.genre_name
         django_book.stock = book.stock
         
+        # Autor y género se resuelven a filas (FK) en el repositorio
+        if author is not None:
+            django_book.author = author
+        if genre is not None:
+            django_book.genre = genre
+        
         return django_book
 
 
+class AuthorMapper:
+    """Mapper para Author"""
+    
+    @staticmethod
+    def to_domain(django_author: DjangoAuthor) -> Author:
+        """Convertir modelo Django a entidad de dominio"""
+        return Author(
+            id=django_author.id,
+            name=django_author.name,
+            birth_year=django_author.birth_year,
+            nationality=django_author.nationality
+        )
+    
+    @staticmethod
+    def to_django(author: Author, django_author: Optional[DjangoAuthor] = None) -> DjangoAuthor:
+        """Convertir entidad de dominio a modelo Django"""
+        if django_author is None:
+            django_author = DjangoAuthor()
+        
+        django_author.name = author.name.strip()
+        django_author.birth_year = author.birth_year
+        django_author.nationality = author.nationality
+        
+        return django_author
+
+
+class GenreMapper:
+    """Mapper para Genre"""
+    
+    @staticmethod
+    def to_domain(django_genre: DjangoGenre) -> Genre:
+        """Convertir modelo Django a entidad de dominio"""
+        return Genre(
+            id=django_genre.id,
+            name=django_genre.name,
+            description=django_genre.description
+        )
+    
+    @staticmethod
+    def to_django(genre: Genre, django_genre: Optional[DjangoGenre] = None) -> DjangoGenre:
+        """Convertir entidad de dominio a modelo Django"""
+        if django_genre is None:
+            django_genre = DjangoGenre()
+        
+        django_genre.name = genre.name.strip()
+        django_genre.description = genre.description
+        
+        return django_genre
+
+
 class LoanMapper:
     """Mapper para Loan"""
     
@@ -73,9 +157,45 @@ class LoanMapper:
             student=UserMapper.to_domain(django_loan.student),
             book=BookMapper.to_domain(django_loan.book),
             borrowed_at=django_loan.borrowed_at,
-            returned_at=django_loan.returned_at
+            returned_at=django_loan.returned_at,
+            due_at=django_loan.due_at
         )
     
+    @staticmethod
+    def to_domain_list(django_loans: Iterable[DjangoLoan]) -> List[Loan]:
+        """
+        Convertir un listado reutilizando una sola entidad User/Book por ID.
+
+        Solo para resultados de lectura: los préstamos del mismo libro comparten
+        la instancia, así que no deben modificarse.
+        """
+        users: Dict[int, User] = {}
+        books: Dict[int, Book] = {}
+        loans = []
+        deferred = None
+        for django_loan in django_loans:
+            if deferred is None:
+                # Todas las filas de un queryset difieren las mismas columnas
+                deferred = django_loan.get_deferred_fields()
+            student = book = None
+            if 'student_id' not in deferred:
+                student = users.get(django_loan.student_id)
+                if student is None:
+                    student = users[django_loan.student_id] = UserMapper.to_domain(django_loan.student)
+            if 'book_id' not in deferred:
+                book = books.get(django_loan.book_id)
+                if book is None:
+                    book = books[django_loan.book_id] = BookMapper.to_domain(django_loan.book)
+            loans.append(Loan(
+                id=django_loan.id,
+                student=student,
+                book=book,
+                borrowed_at=None if 'borrowed_at' in deferred else django_loan.borrowed_at,
+                returned_at=None if 'returned_at' in deferred else django_loan.returned_at,
+                due_at=None if 'due_at' in deferred else django_loan.due_at
+            ))
+        return loans
+    
     @staticmethod
     def to_django(loan: Loan, django_loan: Optional[DjangoLoan] = None) -> DjangoLoan:
         """Convertir entidad de dominio a modelo Django"""
@@ -84,6 +204,45 @@ class LoanMapper:
         
         django_loan.borrowed_at = loan.borrowed_at
         django_loan.returned_at = loan.returned_at
+        django_loan.due_at = loan.due_at
         
         # Las relaciones se manejan por separado
-        return django_loan
\ No newline at end of file
+        return django_loan
+
+
+class JobMapper:
+    """Mapper para Job"""
+    
+    @staticmethod
+    def to_domain(django_job: DjangoJob) -> Job:
+        """Convertir modelo Django a entidad de dominio"""
+        return Job(
+            id=django_job.id,
+            job_type=django_job.job_type,
+            params=django_job.params,
+            status=JobStatus(django_job.status),
+            # El resultado puede diferirse en listados para no cargar exportaciones
+            result=None if 'result' in django_job.get_deferred_fields() else django_job.result,
+            error=django_job.error or None,
+            created_by_id=django_job.created_by_id,
+            created_at=django_job.created_at,
+            started_at=django_job.started_at,
+            finished_at=django_job.finished_at
+        )
+    
+    @staticmethod
+    def to_django(job: Job, django_job: Optional[DjangoJob] = None) -> DjangoJob:
+        """Convertir entidad de dominio a modelo Django"""
+        if django_job is None:
+            django_job = DjangoJob()
+        
+        django_job.job_type = job.job_type
+        django_job.params = job.params
+        django_job.status = job.status.value
+        django_job.result = job.result
+        django_job.error = job.error or ''
+        django_job.created_by_id = job.created_by_id
+        django_job.started_at = job.started_at
+        django_job.finished_at = job.finished_at
+        
+        return django_job
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Implementación en memoria del repositorio de autores"""
+from dataclasses import replace
+from typing import Iterator, List, Optional
+
+from ...domain.entities.author import Author
+from ...domain.entities.page import Page
+from ...domain.repositories.author_repository import AuthorRepository
+from .memory_store import MemoryStore, get_memory_store, slice_list
+
+
+def _by_name(author: Author):
+    return author.name, author.id
+
+
+class MemoryAuthorRepository(AuthorRepository):
+    """Autores del MemoryStore; el nombre en minúsculas es único, como en la base de datos"""
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def get_by_id(self, author_id: int) -> Optional[Author]:
+        """Obtener autor por ID"""
+        with self.store.lock:
+            author = self.store.authors.get(author_id)
+            return replace(author) if author else None
+
+    def get_all(self) -> List[Author]:
+        """Obtener todos los autores, en orden alfabético"""
+        return self._sorted(lambda author: True)
+
+    def save(self, author: Author) -> Author:
+        """Guardar autor (crear o actualizar)"""
+        store = self.store
+        with store.lock:
+            if author.id not in store.authors:
+                author.id = store.next_id('author')
+            store.put_author(author)
+        return author
+
+    def delete(self, author_id: int) -> bool:
+        """Eliminar autor por ID (falla si tiene libros)"""
+        with self.store.lock:
+            return self.store.remove_author(author_id)
+
+    def find_by_name(self, name: str) -> List[Author]:
+        """Buscar autores por nombre (búsqueda parcial)"""
+        needle = name.lower()
+        return self._sorted(lambda author: needle in author.name.lower())
+
+    def get_by_name(self, name: str) -> Optional[Author]:
+        """Obtener el autor con ese nombre exacto (sin distinguir mayúsculas)"""
+        with self.store.lock:
+            author_id = self.store.author_by_name.get(name.strip().lower())
+            return replace(self.store.authors[author_id]) if author_id is not None else None
+
+    def suggest_names(self, prefix: str, limit: int) -> List[Author]:
+        """Autores cuyo nombre empieza por el prefijo, en orden alfabético"""
+        prefix = prefix.strip().lower()
+        with self.store.lock:
+            # Las claves del índice único ya están en minúsculas
+            matches = sorted(key for key in self.store.author_by_name if key.startswith(prefix))[:limit]
+            return [replace(self.store.authors[self.store.author_by_name[key]]) for key in matches]
+
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Author]:
+        """Página de autores en orden alfabético"""
+        return slice_list(self.get_all(), offset, limit, lambda author: author, with_total)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Author]:
+        """Recorrer todos los autores por ID"""
+        with self.store.lock:
+            authors = [replace(self.store.authors[author_id]) for author_id in sorted(self.store.authors)]
+        return iter(authors)
+
+    def estimate_count(self) -> int:
+        """Número de autores (exacto)"""
+        return len(self.store.authors)
+
+    def _sorted(self, predicate) -> List[Author]:
+        with self.store.lock:
+            return [
+                replace(author)
+                for author in sorted(self.store.authors.values(), key=_by_name)
+                if predicate(author)
+            ]
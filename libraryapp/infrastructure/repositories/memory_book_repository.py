@@ -0,0 +1,266 @@
+"""Implementación en memoria del repositorio de libros"""
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from ...domain.entities.book import Book
+from ...domain.entities.book_facets import BookFacets, FacetValue
+from ...domain.entities.page import Page
+from ...domain.repositories.book_repository import BookRepository
+from ...shared.exceptions.business_exceptions import ConcurrencyException
+from .memory_store import BookRow, MemoryStore, get_memory_store, slice_list
+
+
+def _is_true(value) -> bool:
+    """Los filtros llegan como texto desde la query string ('true'/'false')"""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'si', 'sí')
+    return bool(value)
+
+
+def _top_values(counter: Counter, labels: Dict[Any, str], limit: int) -> List[FacetValue]:
+    ranked = sorted(counter.items(), key=lambda item: (-item[1], labels[item[0]]))
+    return [FacetValue(value=value, label=labels[value], count=count) for value, count in ranked[:limit]]
+
+
+class MemoryBookRepository(BookRepository):
+    """Libros del MemoryStore, con los mismos filtros y orden que DjangoBookRepository"""
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """Obtener libro por ID"""
+        with self.store.lock:
+            row = self.store.books.get(book_id)
+            return self.store.book_entity(row) if row else None
+
+    def get_all(self) -> List[Book]:
+        """Obtener todos los libros"""
+        return self._books(self._ordered(None))
+
+    def save(self, book: Book) -> Book:
+        """Guardar libro (crear o actualizar); la actualización exige que no cambiara su versión"""
+        store = self.store
+        with store.lock:
+            previous = store.books.get(book.id) if book.id else None
+            if previous is None:
+                book_id, version = store.next_id('book'), 1
+            else:
+                if book.version is not None and book.version != previous.version:
+                    raise ConcurrencyException(
+                        f"Book with ID {book.id} was modified by another request; reload it and retry"
+                    )
+                book_id, version = book.id, previous.version + 1
+            author = store.resolve_author(book.author_name)
+            genre = store.resolve_genre(book.genre_name)
+            store.put_book(BookRow(
+                id=book_id,
+                title=book.title,
+                author_id=author.id,
+                genre_id=genre.id,
+                published_year=book.published_year,
+                stock=book.stock,
+                version=version
+            ))
+        book.id = book_id
+        book.version = version
+        # Reflejar la grafía canónica del autor y el género ya existentes
+        book.author_name = author.name
+        book.genre_name = genre.name
+        return book
+
+    def adjust_stock(self, book_id: int, delta: int) -> Optional[int]:
+        """Sumar delta al stock bajo el lock del almacén, sin comparar la versión"""
+        with self.store.lock:
+            row = self.store.books.get(book_id)
+            if row is None or row.stock + delta < 0:
+                return None
+            row.stock += delta
+            row.version += 1
+            return row.stock
+
+    def delete(self, book_id: int) -> bool:
+        """Eliminar libro por ID"""
+        with self.store.lock:
+            return self.store.remove_book(book_id)
+
+    def find_with_filters(self, filters: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> List[Book]:
+        """Buscar libros con filtros dinámicos (en memoria siempre se devuelven todos los campos)"""
+        return self._books(self._ordered(filters))
+
+    def find_available(self) -> List[Book]:
+        """Obtener libros disponibles (con stock > 0)"""
+        return self._books(self._ordered({'available': True}))
+
+    def find_by_title(self, title: str) -> List[Book]:
+        """Buscar libros por título (búsqueda parcial)"""
+        return self._books(self._ordered({'title': title}))
+
+    def find_by_author_name(self, author_name: str) -> List[Book]:
+        """Buscar libros por nombre de autor"""
+        return self._books(self._ordered({'author_name': author_name}))
+
+    def find_by_genre_name(self, genre_name: str) -> List[Book]:
+        """Buscar libros por nombre de género"""
+        return self._books(self._ordered({'genre_name': genre_name}))
+
+    def save_all(self, books: List[Book]) -> List[Book]:
+        """Crear varios libros nuevos en bloque"""
+        with self.store.lock:
+            for book in books:
+                self.save(book)
+        return books
+
+    def exists_by_title_author(self, title: str, author_name: str) -> bool:
+        """Indicar si ya existe un libro con ese título y autor (sin distinguir mayúsculas)"""
+        store = self.store
+        with store.lock:
+            author_id = store.author_by_name.get(author_name.strip().lower())
+            return author_id is not None and (title.lower(), author_id) in store.books_by_title_author
+
+    def find_existing_title_authors(self, pairs: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Devolver los pares (título, autor) ya existentes, en minúsculas"""
+        return {
+            (title.lower(), author_name.lower())
+            for title, author_name in pairs
+            if self.exists_by_title_author(title, author_name)
+        }
+
+    def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> BookFacets:
+        """Contar libros por género, autor, década y disponibilidad para los filtros dados"""
+        max_values = getattr(settings, 'BOOK_FACETS', {}).get('MAX_VALUES', 50)
+        store = self.store
+        genres, authors, decades, availability = Counter(), Counter(), Counter(), Counter()
+        with store.lock:
+            rows = [store.books[book_id] for book_id in self._matching(filters or {})]
+            genre_labels = {row.genre_id: store.genres[row.genre_id].name for row in rows}
+            author_labels = {row.author_id: store.authors[row.author_id].name for row in rows}
+        for row in rows:
+            genres[row.genre_id] += 1
+            authors[row.author_id] += 1
+            decades[row.published_year // 10 * 10] += 1
+            availability[row.stock > 0] += 1
+        return BookFacets(
+            total=len(rows),
+            genres=_top_values(genres, genre_labels, max_values),
+            authors=_top_values(authors, author_labels, max_values),
+            decades=[
+                FacetValue(value=decade, label=f'{decade}s', count=decades[decade])
+                for decade in sorted(decades)
+            ],
+            availability=[
+                FacetValue(value=value, label='available' if value else 'unavailable', count=availability[value])
+                for value in (True, False) if availability[value]
+            ]
+        )
+
+    def suggest_titles(self, prefix: str, limit: int) -> List[Book]:
+        """Libros cuyo título empieza por el prefijo, en orden alfabético"""
+        prefix = prefix.strip().lower()
+        store = self.store
+        with store.lock:
+            # Recorre el índice ordenado por lower(título) desde el prefijo, como el rango en SQL
+            index = store.title_prefix
+            position = bisect_left(index, (prefix,))
+            books = []
+            while position < len(index) and len(books) < limit and index[position][0].startswith(prefix):
+                books.append(store.book_entity(store.books[index[position][1]]))
+                position += 1
+        return books
+
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Book]:
+        """Página de libros filtrados en el orden del listado (el total en memoria es exacto)"""
+        store = self.store
+        with store.lock:
+            return slice_list(
+                self._ordered(filters), offset, limit,
+                lambda book_id: store.book_entity(store.books[book_id]), with_total
+            )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Book]:
+        """Recorrer todos los libros por ID, copiando cada lote bajo el lock"""
+        store = self.store
+        with store.lock:
+            book_ids = sorted(store.books)
+        for start in range(0, len(book_ids), chunk_size):
+            with store.lock:
+                chunk = [store.books.get(book_id) for book_id in book_ids[start:start + chunk_size]]
+                books = [store.book_entity(row) for row in chunk if row is not None]
+            yield from books
+
+    def estimate_count(self) -> int:
+        """Número de libros (exacto)"""
+        return len(self.store.books)
+
+    # --- Consultas internas ----------------------------------------------
+
+    def _books(self, book_ids: List[int]) -> List[Book]:
+        store = self.store
+        with store.lock:
+            return [store.book_entity(store.books[book_id]) for book_id in book_ids]
+
+    def _ordered(self, filters: Optional[Dict[str, Any]]) -> List[int]:
+        """IDs que cumplen los filtros en el orden del listado (título, id)"""
+        with self.store.lock:
+            if not filters:
+                return [book_id for _, book_id in self.store.title_order]
+            matching = self._matching(filters)
+            return [book_id for _, book_id in self.store.title_order if book_id in matching]
+
+    def _matching(self, filters: Dict[str, Any]) -> Set[int]:
+        """Mismos filtros que DjangoBookRepository.find_with_filters"""
+        store = self.store
+        candidates: Optional[Set[int]] = None
+
+        def restrict(book_ids: Iterable[int]) -> None:
+            nonlocal candidates
+            book_ids = set(book_ids)
+            candidates = book_ids if candidates is None else candidates & book_ids
+
+        # Nombres y claves foráneas: se resuelven en los índices de autor y género
+        if 'author_name' in filters:
+            needle = str(filters['author_name']).lower()
+            restrict(
+                book_id
+                for author_id, author in store.authors.items() if needle in author.name.lower()
+                for book_id in store.books_by_author.get(author_id, ())
+            )
+        if 'genre_name' in filters:
+            needle = str(filters['genre_name']).lower()
+            restrict(
+                book_id
+                for genre_id, genre in store.genres.items() if needle in genre.name.lower()
+                for book_id in store.books_by_genre.get(genre_id, ())
+            )
+        if 'author_id' in filters:
+            restrict(store.books_by_author.get(int(filters['author_id']), ()))
+        if 'genre_id' in filters:
+            restrict(store.books_by_genre.get(int(filters['genre_id']), ()))
+
+        rows = (store.books[book_id] for book_id in (store.books if candidates is None else candidates))
+        title = str(filters['title']).lower() if 'title' in filters else None
+        low = int(filters['published_year_min']) if 'published_year_min' in filters else None
+        high = int(filters['published_year_max']) if 'published_year_max' in filters else None
+        year = int(filters['published_year']) if 'published_year' in filters else None
+        available = _is_true(filters['available']) if 'available' in filters else None
+        stock = int(filters['stock']) if 'stock' in filters else None
+        return {
+            row.id for row in rows
+            if (title is None or title in row.title.lower())
+            and (low is None or row.published_year >= low)
+            and (high is None or row.published_year <= high)
+            and (year is None or row.published_year == year)
+            and (available is None or (row.stock > 0) == available)
+            and (stock is None or row.stock == stock)
+        }
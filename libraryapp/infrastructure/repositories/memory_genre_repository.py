@@ -0,0 +1,76 @@
+"""Implementación en memoria del repositorio de géneros"""
+from dataclasses import replace
+from typing import Iterator, List, Optional
+
+from ...domain.entities.genre import Genre
+from ...domain.entities.page import Page
+from ...domain.repositories.genre_repository import GenreRepository
+from .memory_store import MemoryStore, get_memory_store, slice_list
+
+
+def _by_name(genre: Genre):
+    return genre.name, genre.id
+
+
+class MemoryGenreRepository(GenreRepository):
+    """Géneros del MemoryStore; el nombre en minúsculas es único, como en la base de datos"""
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def get_by_id(self, genre_id: int) -> Optional[Genre]:
+        """Obtener género por ID"""
+        with self.store.lock:
+            genre = self.store.genres.get(genre_id)
+            return replace(genre) if genre else None
+
+    def get_all(self) -> List[Genre]:
+        """Obtener todos los géneros, en orden alfabético"""
+        return self._sorted(lambda genre: True)
+
+    def save(self, genre: Genre) -> Genre:
+        """Guardar género (crear o actualizar)"""
+        store = self.store
+        with store.lock:
+            if genre.id not in store.genres:
+                genre.id = store.next_id('genre')
+            store.put_genre(genre)
+        return genre
+
+    def delete(self, genre_id: int) -> bool:
+        """Eliminar género por ID (falla si tiene libros)"""
+        with self.store.lock:
+            return self.store.remove_genre(genre_id)
+
+    def find_by_name(self, name: str) -> List[Genre]:
+        """Buscar géneros por nombre (búsqueda parcial)"""
+        needle = name.lower()
+        return self._sorted(lambda genre: needle in genre.name.lower())
+
+    def get_by_name(self, name: str) -> Optional[Genre]:
+        """Obtener el género con ese nombre exacto (sin distinguir mayúsculas)"""
+        with self.store.lock:
+            genre_id = self.store.genre_by_name.get(name.strip().lower())
+            return replace(self.store.genres[genre_id]) if genre_id is not None else None
+
+    def find_page(self, offset: int = 0, limit: int = 50, with_total: bool = True) -> Page[Genre]:
+        """Página de géneros en orden alfabético"""
+        return slice_list(self.get_all(), offset, limit, lambda genre: genre, with_total)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Genre]:
+        """Recorrer todos los géneros por ID"""
+        with self.store.lock:
+            genres = [replace(self.store.genres[genre_id]) for genre_id in sorted(self.store.genres)]
+        return iter(genres)
+
+    def estimate_count(self) -> int:
+        """Número de géneros (exacto)"""
+        return len(self.store.genres)
+
+    def _sorted(self, predicate) -> List[Genre]:
+        with self.store.lock:
+            return [
+                replace(genre)
+                for genre in sorted(self.store.genres.values(), key=_by_name)
+                if predicate(genre)
+            ]
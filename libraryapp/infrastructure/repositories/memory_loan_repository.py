@@ -0,0 +1,223 @@
+"""Implementación en memoria del repositorio de préstamos"""
+from bisect import bisect_left, bisect_right
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ...domain.entities.loan import Loan
+from ...domain.entities.page import Page
+from ...domain.repositories.loan_repository import LoanRepository
+from ...shared.exceptions.business_exceptions import BusinessRuleException
+from .memory_store import LoanRow, MemoryStore, get_memory_store, slice_list
+
+
+def _newest_first(row: LoanRow):
+    return row.borrowed_at, row.id
+
+
+class MemoryLoanRepository(LoanRepository):
+    """Préstamos del MemoryStore; los índices de activos y devueltos evitan recorrer el histórico"""
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def get_by_id(self, loan_id: int) -> Optional[Loan]:
+        """Obtener préstamo por ID"""
+        with self.store.lock:
+            row = self.store.loans.get(loan_id)
+            return self.store.loan_entity(row) if row else None
+
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Obtener todos los préstamos, del más reciente al más antiguo"""
+        return self._loans(self.store.loans)
+
+    def save(self, loan: Loan) -> Loan:
+        """Guardar préstamo (crear o actualizar)"""
+        store = self.store
+        with store.lock:
+            previous = store.loans.get(loan.id) if loan.id else None
+            if previous is None and loan.returned_at is None and self.exists_active(loan.student.id, loan.book.id):
+                raise BusinessRuleException(
+                    f"El estudiante '{loan.student.username}' ya tiene el libro '{loan.book.title}' en préstamo"
+                )
+            row = LoanRow(
+                id=previous.id if previous else store.next_id('loan'),
+                student_id=loan.student.id,
+                book_id=loan.book.id,
+                borrowed_at=loan.borrowed_at,
+                returned_at=loan.returned_at,
+                due_at=loan.due_at,
+                overdue_notified_at=previous.overdue_notified_at if previous else None
+            )
+            store.put_loan(row)
+        loan.id = row.id
+        return loan
+
+    def mark_returned(self, loan: Loan) -> bool:
+        """Cerrar el préstamo solo si sigue activo"""
+        store = self.store
+        with store.lock:
+            row = store.loans.get(loan.id)
+            if row is None or row.returned_at is not None:
+                return False
+            store.put_loan(replace(row, returned_at=loan.returned_at))
+        return True
+
+    def delete(self, loan_id: int) -> bool:
+        """Eliminar préstamo por ID"""
+        with self.store.lock:
+            return self.store.remove_loan(loan_id)
+
+    def find_by_student_id(self, student_id: int, fields: Optional[Iterable[str]] = None) -> List[Loan]:
+        """Buscar préstamos por ID de estudiante"""
+        return self._loans(self.store.loans_by_student.get(student_id, ()))
+
+    def find_by_book_id(self, book_id: int) -> List[Loan]:
+        """Buscar préstamos por ID de libro"""
+        return self._loans(self.store.loans_by_book.get(book_id, ()))
+
+    def find_active_loans(self) -> List[Loan]:
+        """Obtener préstamos activos (no devueltos)"""
+        return self._loans(self.store.active_loans)
+
+    def find_returned_loans(self) -> List[Loan]:
+        """Obtener préstamos devueltos aún no archivados"""
+        return self._loans(self.store.returned_loans)
+
+    def count_active_for_student(self, student_id: int) -> int:
+        """Contar préstamos activos de un estudiante"""
+        return len(self.store.active_by_student.get(student_id, ()))
+
+    def count_active_for_book(self, book_id: int) -> int:
+        """Contar préstamos activos de un libro"""
+        return len(self.store.active_by_book.get(book_id, ()))
+
+    def lock_student(self, student_id: int) -> None:
+        """Nada que hacer: MemoryUnitOfWork.atomic() ya retiene el lock del almacén"""
+
+    def exists_active(self, student_id: int, book_id: int) -> bool:
+        """Indicar si el estudiante tiene el libro en préstamo"""
+        store = self.store
+        with store.lock:
+            return any(
+                store.loans[loan_id].book_id == book_id
+                for loan_id in store.active_by_student.get(student_id, ())
+            )
+
+    def find_overdue(
+        self,
+        now: datetime,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """Página de préstamos activos vencidos, ordenados por fecha límite"""
+        with self.store.lock:
+            rows = self._overdue(now, after)
+            return [self.store.loan_entity(row) for row in islice(rows, limit)]
+
+    def count_overdue(self, now: datetime) -> int:
+        """Contar préstamos activos vencidos"""
+        with self.store.lock:
+            return bisect_left(self.store.active_by_due, (now,))
+
+    def find_overdue_unprocessed(self, now: datetime, limit: int) -> List[Loan]:
+        """Obtener un lote de préstamos vencidos aún no procesados"""
+        with self.store.lock:
+            rows = (row for row in self._overdue(now) if row.overdue_notified_at is None)
+            return [self.store.loan_entity(row) for row in islice(rows, limit)]
+
+    def mark_overdue_processed(self, loan_ids: List[int], processed_at: datetime) -> int:
+        """Marcar préstamos vencidos como procesados"""
+        store = self.store
+        with store.lock:
+            rows = [store.loans[loan_id] for loan_id in loan_ids if loan_id in store.loans]
+            for row in rows:
+                row.overdue_notified_at = processed_at
+        return len(rows)
+
+    def archive_returned_before(self, cutoff: datetime, limit: int) -> int:
+        """Mover al histórico un lote de préstamos devueltos antes de cutoff; devuelve cuántos"""
+        store = self.store
+        with store.lock:
+            rows = sorted(
+                (store.loans[loan_id] for loan_id in store.returned_loans
+                 if store.loans[loan_id].returned_at < cutoff),
+                key=lambda row: (row.returned_at, row.id)
+            )[:limit]
+            for row in rows:
+                store.archive_loan(row.id)
+        return len(rows)
+
+    def get_archived_by_id(self, loan_id: int) -> Optional[Loan]:
+        """Obtener un préstamo del histórico por ID"""
+        with self.store.lock:
+            row = self.store.archive.get(loan_id)
+            return self.store.loan_entity(row) if row else None
+
+    def find_archived(
+        self,
+        student_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 50
+    ) -> List[Loan]:
+        """Página del histórico, del más reciente al más antiguo (paginación por clave)"""
+        store = self.store
+        with store.lock:
+            loan_ids = store.archive if student_id is None else store.archive_by_student.get(student_id, ())
+            rows = (store.archive[loan_id] for loan_id in loan_ids)
+            if before is not None:
+                rows = (row for row in rows if _newest_first(row) < before)
+            rows = sorted(rows, key=_newest_first, reverse=True)[:limit]
+            return [store.loan_entity(row) for row in rows]
+
+    def find_page(
+        self,
+        student_id: Optional[int] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Loan]:
+        """Página de préstamos (de un estudiante si se indica); el total en memoria es exacto"""
+        store = self.store
+        with store.lock:
+            loan_ids = store.loans if student_id is None else store.loans_by_student.get(student_id, ())
+            rows = sorted((store.loans[loan_id] for loan_id in loan_ids), key=_newest_first, reverse=True)
+            return slice_list(rows, offset, limit, store.loan_entity, with_total)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Loan]:
+        """Recorrer todos los préstamos por ID, copiando cada lote bajo el lock"""
+        store = self.store
+        with store.lock:
+            loan_ids = sorted(store.loans)
+        for start in range(0, len(loan_ids), chunk_size):
+            with store.lock:
+                rows = [store.loans.get(loan_id) for loan_id in loan_ids[start:start + chunk_size]]
+                loans = [store.loan_entity(row) for row in rows if row is not None]
+            yield from loans
+
+    def estimate_count(self) -> int:
+        """Número de préstamos (exacto)"""
+        return len(self.store.loans)
+
+    # --- Consultas internas ----------------------------------------------
+
+    def _loans(self, loan_ids: Iterable[int]) -> List[Loan]:
+        """Préstamos por IDs, en el orden por defecto del modelo (más recientes primero)"""
+        store = self.store
+        with store.lock:
+            rows = sorted((store.loans[loan_id] for loan_id in loan_ids), key=_newest_first, reverse=True)
+            return [store.loan_entity(row) for row in rows]
+
+    def _overdue(self, now: datetime, after: Optional[Tuple[datetime, int]] = None) -> Iterator[LoanRow]:
+        """
+        Activos vencidos en orden (fecha límite, id), como loan_active_due_idx:
+        se recorre el tramo de active_by_due anterior a now sin reordenar.
+        """
+        store = self.store
+        due = store.active_by_due
+        start = bisect_right(due, after) if after is not None else 0
+        end = bisect_left(due, (now,))
+        return (store.loans[due[position][1]] for position in range(start, end))
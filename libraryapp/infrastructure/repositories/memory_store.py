@@ -0,0 +1,393 @@
+"""
+Almacén en memoria compartido por los repositorios Memory* (perfil
+config.settings_inmemory, pruebas de casos de uso y benchmarks).
+
+Guarda las filas en diccionarios por ID y mantiene índices secundarios que
+reflejan los de la base de datos:
+- nombre único en minúsculas de autores y géneros (author_name_lower_unique)
+- claves foráneas de libros (autor, género) y préstamos (estudiante, libro)
+- título ordenado para el listado y lower(título) para la búsqueda por prefijo
+- préstamos activos por estudiante (loan_active_student_uniq), activos
+  ordenados por (fecha límite, id) (loan_active_due_idx) y devueltos
+  (loan_returned_idx)
+- histórico por estudiante (loan_archive_student_idx)
+
+Las entidades se copian al entrar y al salir, como al leer de la base de
+datos: modificar una entidad no cambia el almacén hasta llamar a save().
+"""
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from django.conf import settings
+
+from ...domain.entities.author import Author
+from ...domain.entities.book import Book
+from ...domain.entities.genre import Genre
+from ...domain.entities.loan import Loan
+from ...domain.entities.page import Page
+from ...domain.entities.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclass(slots=True)
+class BookRow:
+    id: int
+    title: str
+    author_id: int
+    genre_id: int
+    published_year: int
+    stock: int = 0
+    version: int = 1
+
+
+@dataclass(slots=True)
+class LoanRow:
+    id: int
+    student_id: int
+    book_id: int
+    borrowed_at: datetime
+    returned_at: Optional[datetime] = None
+    due_at: Optional[datetime] = None
+    overdue_notified_at: Optional[datetime] = None
+
+
+def _discard(index: Dict, key, value) -> None:
+    """Quitar value del conjunto index[key], sin dejar conjuntos vacíos"""
+    values = index.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del index[key]
+
+
+def _remove_sorted(entries: List, entry) -> None:
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
+
+
+def slice_list(items: List, offset: int, limit: int, to_entity: Callable, with_total: bool = True) -> Page:
+    """Página de una lista ya ordenada; en memoria el total es exacto y gratis"""
+    return Page(
+        items=[to_entity(item) for item in items[offset:offset + limit]],
+        offset=offset,
+        limit=limit,
+        has_next=offset + limit < len(items),
+        total=len(items) if with_total else None
+    )
+
+
+class MemoryStore:
+    """Tablas e índices en memoria; todas las operaciones toman el mismo lock"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._last_ids: Dict[str, int] = defaultdict(int)
+
+        self.authors: Dict[int, Author] = {}
+        self.author_by_name: Dict[str, int] = {}
+        self.genres: Dict[int, Genre] = {}
+        self.genre_by_name: Dict[str, int] = {}
+
+        self.books: Dict[int, BookRow] = {}
+        self.books_by_author: Dict[int, Set[int]] = {}
+        self.books_by_genre: Dict[int, Set[int]] = {}
+        self.books_by_title_author: Dict[Tuple[str, int], Set[int]] = {}
+        self.title_order: List[Tuple[str, int]] = []
+        self.title_prefix: List[Tuple[str, int]] = []
+
+        self.users: Dict[int, User] = {}
+        self.user_by_username: Dict[str, int] = {}
+        self.users_by_email: Dict[str, Set[int]] = {}
+        self.users_by_role: Dict[UserRole, Set[int]] = {}
+
+        self.loans: Dict[int, LoanRow] = {}
+        self.loans_by_student: Dict[int, Set[int]] = {}
+        self.loans_by_book: Dict[int, Set[int]] = {}
+        self.active_loans: Set[int] = set()
+        self.active_by_student: Dict[int, Set[int]] = {}
+        self.active_by_book: Dict[int, Set[int]] = {}
+        self.active_by_due: List[Tuple[datetime, int]] = []
+        self.returned_loans: Set[int] = set()
+        self.archive: Dict[int, LoanRow] = {}
+        self.archive_by_student: Dict[int, Set[int]] = {}
+
+    def next_id(self, table: str, wanted: Optional[int] = None) -> int:
+        """Siguiente ID de la tabla (o el indicado, al cargar filas existentes)"""
+        if wanted is None:
+            wanted = self._last_ids[table] + 1
+        self._last_ids[table] = max(self._last_ids[table], wanted)
+        return wanted
+
+    # --- Autores y géneros ---------------------------------------------
+
+    def put_author(self, author: Author) -> Author:
+        key = author.name.strip().lower()
+        owner = self.author_by_name.get(key)
+        if owner is not None and owner != author.id:
+            raise ValueError(f"Ya existe un autor llamado '{author.name}'")
+        previous = self.authors.get(author.id)
+        if previous is not None:
+            self.author_by_name.pop(previous.name.strip().lower(), None)
+        self.authors[author.id] = replace(author)
+        self.author_by_name[key] = author.id
+        return author
+
+    def remove_author(self, author_id: int) -> bool:
+        author = self.authors.get(author_id)
+        if author is None:
+            return False
+        if author_id in self.books_by_author:
+            raise ValueError(f"El autor '{author.name}' tiene libros")
+        del self.authors[author_id]
+        del self.author_by_name[author.name.strip().lower()]
+        return True
+
+    def put_genre(self, genre: Genre) -> Genre:
+        key = genre.name.strip().lower()
+        owner = self.genre_by_name.get(key)
+        if owner is not None and owner != genre.id:
+            raise ValueError(f"Ya existe un género llamado '{genre.name}'")
+        previous = self.genres.get(genre.id)
+        if previous is not None:
+            self.genre_by_name.pop(previous.name.strip().lower(), None)
+        self.genres[genre.id] = replace(genre)
+        self.genre_by_name[key] = genre.id
+        return genre
+
+    def remove_genre(self, genre_id: int) -> bool:
+        genre = self.genres.get(genre_id)
+        if genre is None:
+            return False
+        if genre_id in self.books_by_genre:
+            raise ValueError(f"El género '{genre.name}' tiene libros")
+        del self.genres[genre_id]
+        del self.genre_by_name[genre.name.strip().lower()]
+        return True
+
+    def resolve_author(self, name: str) -> Author:
+        """Autor con ese nombre (sin distinguir mayúsculas), creándolo si falta"""
+        author_id = self.author_by_name.get(name.strip().lower())
+        if author_id is None:
+            return self.put_author(Author(id=self.next_id('author'), name=name.strip()))
+        return self.authors[author_id]
+
+    def resolve_genre(self, name: str) -> Genre:
+        """Género con ese nombre (sin distinguir mayúsculas), creándolo si falta"""
+        genre_id = self.genre_by_name.get(name.strip().lower())
+        if genre_id is None:
+            return self.put_genre(Genre(id=self.next_id('genre'), name=name.strip()))
+        return self.genres[genre_id]
+
+    # --- Libros ----------------------------------------------------------
+
+    def put_book(self, row: BookRow) -> None:
+        self._unindex_book(row.id)
+        self.books[row.id] = row
+        self.books_by_author.setdefault(row.author_id, set()).add(row.id)
+        self.books_by_genre.setdefault(row.genre_id, set()).add(row.id)
+        self.books_by_title_author.setdefault((row.title.lower(), row.author_id), set()).add(row.id)
+        insort(self.title_order, (row.title, row.id))
+        insort(self.title_prefix, (row.title.lower(), row.id))
+
+    def remove_book(self, book_id: int) -> bool:
+        if book_id not in self.books:
+            return False
+        # on_delete=CASCADE: los préstamos del libro se borran con él
+        for loan_id in list(self.loans_by_book.get(book_id, ())):
+            self.remove_loan(loan_id)
+        for loan_id in [row.id for row in self.archive.values() if row.book_id == book_id]:
+            self._remove_archived(loan_id)
+        self._unindex_book(book_id)
+        del self.books[book_id]
+        return True
+
+    def _unindex_book(self, book_id: int) -> None:
+        row = self.books.get(book_id)
+        if row is None:
+            return
+        _discard(self.books_by_author, row.author_id, book_id)
+        _discard(self.books_by_genre, row.genre_id, book_id)
+        _discard(self.books_by_title_author, (row.title.lower(), row.author_id), book_id)
+        _remove_sorted(self.title_order, (row.title, book_id))
+        _remove_sorted(self.title_prefix, (row.title.lower(), book_id))
+
+    def book_entity(self, row: BookRow) -> Book:
+        return Book(
+            id=row.id,
+            title=row.title,
+            author_name=self.authors[row.author_id].name,
+            published_year=row.published_year,
+            genre_name=self.genres[row.genre_id].name,
+            stock=row.stock,
+            version=row.version
+        )
+
+    # --- Usuarios --------------------------------------------------------
+
+    def put_user(self, user: User) -> None:
+        owner = self.user_by_username.get(user.username)
+        if owner is not None and owner != user.id:
+            raise ValueError(f"Username '{user.username}' already exists")
+        self._unindex_user(user.id)
+        self.users[user.id] = replace(user)
+        self.user_by_username[user.username] = user.id
+        self.users_by_email.setdefault(user.email, set()).add(user.id)
+        self.users_by_role.setdefault(user.role, set()).add(user.id)
+
+    def remove_user(self, user_id: int) -> bool:
+        if user_id not in self.users:
+            return False
+        # on_delete=CASCADE: los préstamos del usuario se borran con él
+        for loan_id in list(self.loans_by_student.get(user_id, ())):
+            self.remove_loan(loan_id)
+        for loan_id in list(self.archive_by_student.get(user_id, ())):
+            self._remove_archived(loan_id)
+        self._unindex_user(user_id)
+        del self.users[user_id]
+        return True
+
+    def _unindex_user(self, user_id: int) -> None:
+        user = self.users.get(user_id)
+        if user is None:
+            return
+        self.user_by_username.pop(user.username, None)
+        _discard(self.users_by_email, user.email, user_id)
+        _discard(self.users_by_role, user.role, user_id)
+
+    def user_entity(self, user_id: int) -> User:
+        return replace(self.users[user_id])
+
+    # --- Préstamos -------------------------------------------------------
+
+    def put_loan(self, row: LoanRow) -> None:
+        if row.student_id not in self.users or row.book_id not in self.books:
+            raise ValueError(
+                f"Estudiante o libro no encontrado: estudiante {row.student_id}, libro {row.book_id}"
+            )
+        self._unindex_loan(row.id)
+        self.loans[row.id] = row
+        self.loans_by_student.setdefault(row.student_id, set()).add(row.id)
+        self.loans_by_book.setdefault(row.book_id, set()).add(row.id)
+        if row.returned_at is None:
+            self.active_loans.add(row.id)
+            self.active_by_student.setdefault(row.student_id, set()).add(row.id)
+            self.active_by_book.setdefault(row.book_id, set()).add(row.id)
+            if row.due_at is not None:
+                insort(self.active_by_due, (row.due_at, row.id))
+        else:
+            self.returned_loans.add(row.id)
+
+    def remove_loan(self, loan_id: int) -> bool:
+        if loan_id not in self.loans:
+            return False
+        self._unindex_loan(loan_id)
+        del self.loans[loan_id]
+        return True
+
+    def _unindex_loan(self, loan_id: int) -> None:
+        row = self.loans.get(loan_id)
+        if row is None:
+            return
+        _discard(self.loans_by_student, row.student_id, loan_id)
+        _discard(self.loans_by_book, row.book_id, loan_id)
+        self.active_loans.discard(loan_id)
+        _discard(self.active_by_student, row.student_id, loan_id)
+        _discard(self.active_by_book, row.book_id, loan_id)
+        if row.returned_at is None and row.due_at is not None:
+            _remove_sorted(self.active_by_due, (row.due_at, loan_id))
+        self.returned_loans.discard(loan_id)
+
+    def put_archived(self, row: LoanRow) -> None:
+        self.archive[row.id] = row
+        self.archive_by_student.setdefault(row.student_id, set()).add(row.id)
+
+    def archive_loan(self, loan_id: int) -> None:
+        """Mover un préstamo devuelto al histórico conservando su ID"""
+        row = self.loans[loan_id]
+        self.remove_loan(loan_id)
+        self.put_archived(replace(row, overdue_notified_at=None))
+
+    def _remove_archived(self, loan_id: int) -> None:
+        row = self.archive.pop(loan_id)
+        _discard(self.archive_by_student, row.student_id, loan_id)
+
+    def loan_entity(self, row: LoanRow) -> Loan:
+        return Loan(
+            id=row.id,
+            student=self.user_entity(row.student_id),
+            book=self.book_entity(self.books[row.book_id]),
+            borrowed_at=row.borrowed_at,
+            returned_at=row.returned_at,
+            due_at=row.due_at
+        )
+
+    def loan_entities(self, loan_ids: Iterable[int], table: Optional[Dict[int, LoanRow]] = None) -> List[Loan]:
+        table = self.loans if table is None else table
+        return [self.loan_entity(table[loan_id]) for loan_id in loan_ids]
+
+    # --- Carga -----------------------------------------------------------
+
+    def load_from_database(self) -> None:
+        """Copiar al almacén el contenido actual de la base de datos, conservando los IDs"""
+        from django.contrib.auth.models import User as DjangoUser
+        from ..models.django_models import (
+            DjangoAuthor, DjangoBook, DjangoGenre, DjangoLoan, DjangoLoanArchive
+        )
+        from .mappers import AuthorMapper, GenreMapper, UserMapper
+
+        with self.lock:
+            for django_author in DjangoAuthor.objects.order_by('id'):
+                self.put_author(AuthorMapper.to_domain(django_author))
+                self.next_id('author', django_author.id)
+            for django_genre in DjangoGenre.objects.order_by('id'):
+                self.put_genre(GenreMapper.to_domain(django_genre))
+                self.next_id('genre', django_genre.id)
+            for values in DjangoBook.objects.order_by('id').values(
+                'id', 'title', 'author_id', 'genre_id', 'published_year', 'stock', 'version'
+            ):
+                self.put_book(BookRow(**values))
+                self.next_id('book', values['id'])
+            django_users = DjangoUser.objects.select_related('version_row').prefetch_related('groups')
+            for django_user in django_users.order_by('id'):
+                self.put_user(UserMapper.to_domain(django_user, with_version=True))
+                self.next_id('user', django_user.id)
+            loan_columns = ('id', 'student_id', 'book_id', 'borrowed_at', 'returned_at', 'due_at')
+            for values in DjangoLoan.objects.order_by('id').values(*loan_columns, 'overdue_notified_at'):
+                self.put_loan(LoanRow(**values))
+                self.next_id('loan', values['id'])
+            for values in DjangoLoanArchive.objects.order_by('id').values(*loan_columns):
+                self.put_archived(LoanRow(**values))
+                self.next_id('loan', values['id'])
+        logger.info(
+            "Almacén en memoria cargado: %s libros, %s usuarios, %s préstamos",
+            len(self.books), len(self.users), len(self.loans)
+        )
+
+
+_store: Optional[MemoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_memory_store() -> MemoryStore:
+    """
+    Almacén del proceso. Con REPOSITORIES['SEED_FROM_DATABASE'] se llena una
+    vez con los datos de la base de datos (usuarios de demostración incluidos).
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = MemoryStore()
+                if getattr(settings, 'REPOSITORIES', {}).get('SEED_FROM_DATABASE', False):
+                    store.load_from_database()
+                _store = store
+    return _store
@@ -0,0 +1,19 @@
+"""Unidad de trabajo del MemoryStore"""
+from typing import ContextManager, Optional
+
+from ...application.interfaces.unit_of_work import UnitOfWork
+from .memory_store import MemoryStore, get_memory_store
+
+
+class MemoryUnitOfWork(UnitOfWork):
+    """
+    Retiene el lock del almacén durante toda la operación: las escrituras de
+    varios repositorios no se intercalan con las de otros hilos. No hay
+    rollback; los casos de uso validan antes de escribir.
+    """
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def atomic(self) -> ContextManager[None]:
+        return self.store.lock
@@ -0,0 +1,102 @@
+"""Implementación en memoria del repositorio de usuarios"""
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Optional
+
+from ...domain.entities.page import Page
+from ...domain.entities.user import User, UserRole
+from ...domain.repositories.user_repository import UserRepository
+from ...shared.exceptions.business_exceptions import ConcurrencyException
+from .memory_store import MemoryStore, get_memory_store, slice_list
+
+
+class MemoryUserRepository(UserRepository):
+    """
+    Usuarios del MemoryStore.
+
+    Las contraseñas no se guardan: la autenticación (JWT) sigue usando la
+    tabla de usuarios de Django, así que solo pueden iniciar sesión los
+    usuarios cargados desde la base de datos.
+    """
+
+    def __init__(self, store: Optional[MemoryStore] = None):
+        self.store = store or get_memory_store()
+
+    def get_by_id(self, user_id: int) -> Optional[User]:
+        """Obtener usuario por ID"""
+        with self.store.lock:
+            return self.store.user_entity(user_id) if user_id in self.store.users else None
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        """Obtener usuario por nombre de usuario"""
+        with self.store.lock:
+            user_id = self.store.user_by_username.get(username)
+            return self.store.user_entity(user_id) if user_id is not None else None
+
+    def get_all(self, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Obtener todos los usuarios, ordenados por ID"""
+        return self._users(self.store.users)
+
+    def save(self, user: User, password: Optional[str] = None) -> User:
+        """Guardar usuario (crear o actualizar); la actualización exige que no cambiara su versión"""
+        store = self.store
+        with store.lock:
+            previous = store.users.get(user.id) if user.id else None
+            if previous is None:
+                user.id = store.next_id('user')
+                user.version = 1
+                store.put_user(user)
+            else:
+                current = previous.version or 1
+                if user.version is not None and user.version != current:
+                    raise ConcurrencyException(
+                        f"El usuario con ID {user.id} fue modificado por otra petición; vuelve a leerlo y reintenta"
+                    )
+                user.version = current + 1
+                # Como en la base de datos, el rol (grupo) solo se asigna al crear
+                store.put_user(replace(user, role=previous.role))
+        return user
+
+    def delete(self, user_id: int) -> bool:
+        """Eliminar usuario por ID"""
+        with self.store.lock:
+            return self.store.remove_user(user_id)
+
+    def find_by_role(self, role: UserRole, fields: Optional[Iterable[str]] = None) -> List[User]:
+        """Buscar usuarios por rol"""
+        return self._users(self.store.users_by_role.get(role, ()))
+
+    def exists_by_email(self, email: str) -> bool:
+        """Indicar si algún usuario usa ese email"""
+        return email in self.store.users_by_email
+
+    def count_by_role(self, role: UserRole) -> int:
+        """Contar usuarios de un rol"""
+        return len(self.store.users_by_role.get(role, ()))
+
+    def find_page(
+        self,
+        role: Optional[UserRole] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[User]:
+        """Página de usuarios (de un rol si se indica), ordenados por ID; el total es exacto"""
+        store = self.store
+        with store.lock:
+            user_ids = sorted(store.users if role is None else store.users_by_role.get(role, ()))
+            return slice_list(user_ids, offset, limit, store.user_entity, with_total)
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[User]:
+        """Recorrer todos los usuarios por ID"""
+        return iter(self.get_all())
+
+    def estimate_count(self) -> int:
+        """Número de usuarios (exacto)"""
+        return len(self.store.users)
+
+    def _users(self, user_ids: Iterable[int]) -> List[User]:
+        store = self.store
+        with store.lock:
+            return [store.user_entity(user_id) for user_id in sorted(user_ids)]
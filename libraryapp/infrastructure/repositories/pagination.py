@@ -0,0 +1,116 @@
+"""Páginas, recorridos por lotes y conteos estimados sobre querysets"""
+import json
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from django.conf import settings
+from django.db import connections, router
+
+from ...domain.entities.page import Page
+
+T = TypeVar('T')
+
+
+def _estimate_min_rows() -> int:
+    return getattr(settings, 'PAGINATION', {}).get('ESTIMATE_MIN_ROWS', 100_000)
+
+
+def table_estimate(model) -> Optional[int]:
+    """
+    Filas de la tabla del modelo según las estadísticas de PostgreSQL
+    (pg_class.reltuples, actualizado por VACUUM/ANALYZE), sin recorrerla.
+
+    None por debajo de PAGINATION['ESTIMATE_MIN_ROWS'], en tablas sin analizar
+    (reltuples = -1) y en otros motores: ahí el COUNT(*) exacto es barato y la
+    estimación de una tabla pequeña puede ir muy desfasada.
+    """
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < _estimate_min_rows():
+        return None
+    return row[0]
+
+
+def planner_estimate(queryset) -> Optional[int]:
+    """
+    Filas que el planificador de PostgreSQL espera para el queryset filtrado
+    (EXPLAIN, sin ejecutarlo). Es una estimación a partir de las estadísticas
+    de cada columna: sirve para mostrar "unos 120 000 resultados", no como
+    total exacto. None en las mismas condiciones que table_estimate.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    rows = int(plan[0]['Plan']['Plan Rows'])
+    return rows if rows >= _estimate_min_rows() else None
+
+
+def count_total(queryset, filtered: bool = True, exact: bool = False) -> Tuple[int, bool]:
+    """
+    Total del queryset y si es una estimación.
+
+    Salvo con exact, los resultados grandes se estiman (reltuples sin filtros,
+    EXPLAIN con filtros) y solo los pequeños se cuentan con COUNT(*).
+    """
+    if not exact:
+        estimate = planner_estimate(queryset) if filtered else table_estimate(queryset.model)
+        if estimate is not None:
+            return estimate, True
+    return queryset.count(), False
+
+
+def estimated_count(model) -> int:
+    """Filas de la tabla: estimadas en tablas grandes, COUNT(*) en el resto"""
+    estimate = table_estimate(model)
+    return estimate if estimate is not None else model.objects.count()
+
+
+def slice_page(
+    queryset,
+    offset: int,
+    limit: int,
+    to_domain: Callable[[Iterable], List[T]],
+    with_total: bool = True,
+    filtered: bool = True,
+    exact_total: bool = False
+) -> Page[T]:
+    """
+    Página de un queryset ya ordenado.
+
+    Se lee una fila de más para saber si hay página siguiente sin contar.
+    El total se estima en resultados grandes salvo con exact_total (ver count_total).
+    """
+    rows = list(queryset[offset:offset + limit + 1])
+    page = Page(
+        items=to_domain(rows[:limit]),
+        offset=offset,
+        limit=limit,
+        has_next=len(rows) > limit,
+    )
+    if with_total:
+        page.total, page.total_is_estimate = count_total(queryset, filtered, exact_total)
+    return page
+
+
+def iter_chunks(
+    queryset,
+    to_domain: Callable[[Iterable], List[T]],
+    chunk_size: int = 1000
+) -> Iterator[T]:
+    """
+    Recorrer un queryset con un cursor de servidor (iterator) convirtiendo
+    cada lote a entidades; la memoria queda acotada por chunk_size.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from to_domain(chunk)
@@ -0,0 +1,34 @@
+"""Búsqueda por prefijo apoyada en índices de expresión sobre lower(columna)"""
+from django.db import connections
+from django.db.models.functions import Collate, Lower
+
+
+def _next_prefix(prefix: str) -> str:
+    """Menor cadena mayor que todas las que empiezan por prefix (límite superior del rango)"""
+    code = ord(prefix[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        # Los sustitutos no son codificables en UTF-8
+        code = 0xE000
+    return prefix[:-1] + chr(min(code, 0x10FFFF))
+
+
+def prefix_key(field: str, alias: str = 'default'):
+    """
+    Expresión ordenable byte a byte: lower(field), con COLLATE "C" en PostgreSQL.
+
+    Coincide con los índices creados en la migración 0007, así que el filtro por
+    rango, el ORDER BY y el LIMIT se resuelven recorriendo el índice.
+    """
+    expression = Lower(field)
+    if connections[alias].vendor == 'postgresql':
+        expression = Collate(expression, 'C')
+    return expression
+
+
+def filter_prefix(queryset, field: str, prefix: str):
+    """Filas cuyo lower(field) empieza por el prefijo, ordenadas por esa clave"""
+    prefix = prefix.strip().lower()
+    return queryset.annotate(prefix_key=prefix_key(field, queryset.db)).filter(
+        prefix_key__gte=prefix,
+        prefix_key__lt=_next_prefix(prefix)
+    ).order_by('prefix_key')
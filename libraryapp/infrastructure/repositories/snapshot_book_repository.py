@@ -0,0 +1,116 @@
+"""Repositorio de libros de solo lectura servido desde la copia en memoria del catálogo"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from ...domain.entities.book import Book
+from ...domain.entities.book_facets import BookFacets
+from ...domain.entities.page import Page
+from ...domain.repositories.book_repository import BookRepository
+from ..cache.catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+from .django_book_repository import DjangoBookRepository
+
+
+class SnapshotBookRepository(BookRepository):
+    """
+    Lecturas desde CatalogSnapshot; las escrituras se delegan en la base de datos.
+
+    Pensado para endpoints de lectura: los casos de uso que leen para luego
+    escribir (préstamos, actualizaciones) deben usar DjangoBookRepository.
+    """
+
+    def __init__(
+        self,
+        snapshot: Optional[CatalogSnapshot] = None,
+        database_repository: Optional[BookRepository] = None
+    ):
+        self.snapshot = snapshot or get_catalog_snapshot()
+        self.database_repository = database_repository or DjangoBookRepository()
+
+    def get_by_id(self, book_id: int) -> Optional[Book]:
+        """Obtener libro por ID"""
+        return self.snapshot.get(book_id)
+
+    def get_all(self) -> List[Book]:
+        """Obtener todos los libros"""
+        return self.snapshot.all()
+
+    def save(self, book: Book) -> Book:
+        """Guardar libro (crear o actualizar)"""
+        return self.database_repository.save(book)
+
+    def adjust_stock(self, book_id: int, delta: int) -> Optional[int]:
+        """Sumar delta al stock en la base de datos"""
+        return self.database_repository.adjust_stock(book_id, delta)
+
+    def delete(self, book_id: int) -> bool:
+        """Eliminar libro por ID"""
+        return self.database_repository.delete(book_id)
+
+    def find_with_filters(self, filters: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> List[Book]:
+        """Buscar libros con filtros dinámicos (la copia en memoria ya tiene todos los campos)"""
+        return self.snapshot.filter(filters)
+
+    def find_available(self) -> List[Book]:
+        """Obtener libros disponibles (con stock > 0)"""
+        return self.snapshot.filter({'available': True})
+
+    def find_by_title(self, title: str) -> List[Book]:
+        """Buscar libros por título (búsqueda parcial)"""
+        return self.snapshot.filter({'title': title})
+
+    def find_by_author_name(self, author_name: str) -> List[Book]:
+        """Buscar libros por nombre de autor"""
+        return self.snapshot.filter({'author_name': author_name})
+
+    def find_by_genre_name(self, genre_name: str) -> List[Book]:
+        """Buscar libros por nombre de género"""
+        return self.snapshot.filter({'genre_name': genre_name})
+
+    def save_all(self, books: List[Book]) -> List[Book]:
+        """Crear varios libros nuevos en bloque"""
+        return self.database_repository.save_all(books)
+
+    def exists_by_title_author(self, title: str, author_name: str) -> bool:
+        """Indicar si ya existe un libro con ese título y autor (sin distinguir mayúsculas)"""
+        return self.database_repository.exists_by_title_author(title, author_name)
+
+    def find_existing_title_authors(self, pairs: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Devolver los pares (título, autor) ya existentes, en minúsculas"""
+        return self.database_repository.find_existing_title_authors(pairs)
+
+    def facet_counts(self, filters: Optional[Dict[str, Any]] = None) -> BookFacets:
+        """Contar libros por género, autor, década y disponibilidad para los filtros dados"""
+        max_values = getattr(settings, 'BOOK_FACETS', {}).get('MAX_VALUES', 50)
+        return self.snapshot.facets(filters or {}, max_values)
+
+    def suggest_titles(self, prefix: str, limit: int) -> List[Book]:
+        """Libros cuyo título empieza por el prefijo, en orden alfabético"""
+        return self.database_repository.suggest_titles(prefix, limit)
+
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 50,
+        fields: Optional[Iterable[str]] = None,
+        with_total: bool = True,
+        exact_total: bool = False
+    ) -> Page[Book]:
+        """Página de libros filtrados en el orden del listado (el total en memoria es exacto y gratis)"""
+        books, total = self.snapshot.page(filters or {}, offset, limit)
+        return Page(
+            items=books,
+            offset=offset,
+            limit=limit,
+            has_next=offset + limit < total,
+            total=total if with_total else None
+        )
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[Book]:
+        """Recorrer todos los libros de la copia en memoria"""
+        return self.snapshot.iterate()
+
+    def estimate_count(self) -> int:
+        """Número de libros de la copia en memoria"""
+        return self.snapshot.size()
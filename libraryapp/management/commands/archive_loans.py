@@ -0,0 +1,33 @@
+"""Archivado periódico de préstamos devueltos"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...application.use_cases.loan_use_cases import ArchiveLoansUseCase
+from ...infrastructure.external.clock import SystemClock
+from ...infrastructure.repositories.django_loan_repository import DjangoLoanRepository
+
+
+class Command(BaseCommand):
+    help = "Mueve a libraryapp_loan_archive los préstamos devueltos hace más de N días"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            default=getattr(settings, 'LOAN_ARCHIVE', {}).get('AFTER_DAYS', 180),
+            help="Antigüedad mínima de la devolución (por defecto, LOAN_ARCHIVE['AFTER_DAYS'])"
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--max-chunks', type=int, default=None,
+            help="Límite de lotes por ejecución (por defecto, hasta agotar los candidatos)"
+        )
+
+    def handle(self, *args, **options):
+        archived = ArchiveLoansUseCase(DjangoLoanRepository(), SystemClock()).execute(
+            older_than=timedelta(days=options['older_than_days']),
+            chunk_size=options['chunk_size'],
+            max_chunks=options['max_chunks'],
+        )
+        self.stdout.write(f"Archivados {archived} préstamos")
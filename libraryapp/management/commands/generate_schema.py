@@ -0,0 +1,23 @@
+"""Generación del esquema OpenAPI durante el build"""
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from ...presentation.views.schema import generate_schema, schema_file
+
+
+class Command(BaseCommand):
+    help = "Escribe el esquema OpenAPI en OPENAPI_SCHEMA['FILE'] para servirlo como archivo estático"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None,
+            help="Ruta del archivo (por defecto, OPENAPI_SCHEMA['FILE'])"
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['output']) if options['output'] else schema_file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        schema = generate_schema()
+        path.write_bytes(schema)
+        self.stdout.write(f"Esquema OpenAPI escrito en {path} ({len(schema)} bytes)")
@@ -0,0 +1,54 @@
+"""Worker que drena el outbox de eventos de dominio"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...infrastructure.events.event_bus import event_bus
+from ...infrastructure.events.outbox import OutboxProcessor
+
+
+class Command(BaseCommand):
+    help = "Procesa en lotes los eventos pendientes del outbox transaccional"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument(
+            '--interval', type=float, default=2.0,
+            help="Segundos de espera cuando no hay eventos pendientes"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Drenar los eventos pendientes y terminar"
+        )
+        parser.add_argument(
+            '--purge-after-days', type=int, default=7,
+            help="Eliminar eventos procesados con más de N días (0 desactiva)"
+        )
+
+    def handle(self, *args, **options):
+        processor = OutboxProcessor(
+            event_bus,
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts'],
+        )
+
+        while True:
+            processed = processor.process_batch()
+            if processed:
+                self.stdout.write(f"Procesados {processed} eventos")
+                # Lote completo: probablemente hay más pendientes
+                if processed == options['batch_size']:
+                    continue
+
+            if options['purge_after_days']:
+                older_than = timezone.now() - timedelta(days=options['purge_after_days'])
+                purged = processor.purge_processed(older_than)
+                if purged:
+                    self.stdout.write(f"Eliminados {purged} eventos procesados")
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
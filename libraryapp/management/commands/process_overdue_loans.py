@@ -0,0 +1,25 @@
+"""Procesamiento periódico de préstamos vencidos"""
+from django.core.management.base import BaseCommand
+
+from ...application.use_cases.loan_use_cases import ProcessOverdueLoansUseCase
+from ...infrastructure.database.unit_of_work import DjangoUnitOfWork
+from ...infrastructure.events.outbox import OutboxEventPublisher
+from ...infrastructure.external.clock import SystemClock
+from ...infrastructure.repositories.django_loan_repository import DjangoLoanRepository
+
+
+class Command(BaseCommand):
+    help = "Registra un evento LoanOverdue por cada préstamo vencido aún no procesado"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument(
+            '--max-chunks', type=int, default=None,
+            help="Límite de lotes por ejecución (por defecto, hasta agotar los pendientes)"
+        )
+
+    def handle(self, *args, **options):
+        processed = ProcessOverdueLoansUseCase(
+            DjangoLoanRepository(), DjangoUnitOfWork(), SystemClock(), OutboxEventPublisher()
+        ).execute(chunk_size=options['chunk_size'], max_chunks=options['max_chunks'])
+        self.stdout.write(f"Procesados {processed} préstamos vencidos")
@@ -0,0 +1,70 @@
+"""Perfil de importación del arranque de un worker (python -X importtime)"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Lo que hace un worker antes de atender la primera petición
+STARTUP_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+def parse_importtime(stderr: str):
+    """Filas (módulo, propio_us, acumulado_us) del informe de -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabecera
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa la aplicación como un worker nuevo (django.setup() y URLconf) con "
+        "-X importtime y muestra los módulos y paquetes que más tardan"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help="Filas de cada tabla")
+        parser.add_argument(
+            '--settings-module', default=None,
+            help="DJANGO_SETTINGS_MODULE del proceso perfilado (por defecto, el actual)"
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ)
+        if options['settings_module']:
+            env['DJANGO_SETTINGS_MODULE'] = options['settings_module']
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+            env=env, capture_output=True, text=True
+        )
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            raise CommandError(f"No se pudo perfilar el arranque:\n{result.stderr[-2000:]}")
+
+        top = options['top']
+        total_us = sum(own for _, own, _ in rows)
+        self.stdout.write(f"{len(rows)} módulos importados en {total_us / 1000:.1f} ms\n")
+
+        self.stdout.write("Módulos por tiempo acumulado (ms):")
+        for module, _, cumulative in sorted(rows, key=lambda row: -row[2])[:top]:
+            self.stdout.write(f"{cumulative / 1000:10.1f}  {module}")
+
+        # Tiempo propio sumado por paquete de primer nivel: qué dependencias pesan
+        packages = defaultdict(lambda: [0, 0])
+        for module, own, _ in rows:
+            package = packages[module.split('.')[0]]
+            package[0] += own
+            package[1] += 1
+        self.stdout.write("\nPaquetes por tiempo propio (ms, módulos):")
+        for name, (own, count) in sorted(packages.items(), key=lambda item: -item[1][0])[:top]:
+            self.stdout.write(f"{own / 1000:10.1f}  {name} ({count})")
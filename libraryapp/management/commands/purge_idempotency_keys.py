@@ -0,0 +1,24 @@
+"""Limpieza periódica de claves de idempotencia caducadas"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...infrastructure.repositories.django_idempotency_store import DjangoIdempotencyStore
+
+
+class Command(BaseCommand):
+    help = "Elimina las claves de idempotencia más antiguas que su TTL"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours', type=int,
+            default=getattr(settings, 'IDEMPOTENCY', {}).get('TTL_HOURS', 24),
+            help="Antigüedad mínima de las claves a eliminar (por defecto, IDEMPOTENCY['TTL_HOURS'])"
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(hours=options['older_than_hours'])
+        purged = DjangoIdempotencyStore().purge_expired(older_than)
+        self.stdout.write(f"Eliminadas {purged} claves de idempotencia")
@@ -0,0 +1,12 @@
+"""Recalcular los rollups de estadísticas de circulación"""
+from django.core.management.base import BaseCommand
+
+from ...infrastructure.repositories.django_circulation_stats_repository import DjangoCirculationStatsRepository
+
+
+class Command(BaseCommand):
+    help = "Recalcula los rollups diarios de circulación desde los préstamos (ejecutar con el outbox drenado)"
+
+    def handle(self, *args, **options):
+        rows = DjangoCirculationStatsRepository().rebuild()
+        self.stdout.write(f"Rollups recalculados: {rows} filas")
@@ -0,0 +1,135 @@
+"""Worker de trabajos en segundo plano con pool de procesos"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ...infrastructure.jobs.worker import execute_job, setup_worker
+from ...infrastructure.models.django_models import DjangoJob
+
+
+class Command(BaseCommand):
+    help = "Ejecuta los trabajos encolados (importaciones, exportaciones, reportes) en un pool de procesos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 2,
+            help="Número de procesos del pool"
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2.0,
+            help="Segundos de espera cuando no hay trabajos pendientes"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Ejecutar los trabajos pendientes y terminar"
+        )
+        parser.add_argument(
+            '--lease-seconds', type=int, default=60,
+            help="Duración de la concesión de un trabajo; se renueva mientras el worker vive"
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=3,
+            help="Ejecuciones de un trabajo abandonado (worker caído) antes de darlo por fallido"
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        self.lease = timedelta(seconds=options['lease_seconds'])
+        running = {}
+
+        # 'spawn' evita heredar conexiones abiertas a la base de datos
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker,
+        ) as pool:
+            while True:
+                self._renew_leases(running.values())
+                self._requeue_abandoned(options['max_attempts'])
+                free_slots = processes - len(running)
+                claimed = self._claim_jobs(free_slots) if free_slots else []
+                for job_id in claimed:
+                    running[pool.submit(execute_job, job_id)] = job_id
+                    self.stdout.write(f"Trabajo #{job_id} iniciado")
+
+                if not running:
+                    if options['once']:
+                        break
+                    connections.close_all()
+                    time.sleep(options['interval'])
+                    continue
+
+                if claimed and len(running) < processes:
+                    continue
+
+                done, _ = wait(running, timeout=options['interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as e:
+                        # El proceso hijo murió antes de guardar el resultado
+                        status = 'failed'
+                        DjangoJob.objects.filter(id=job_id).update(
+                            status='failed',
+                            error=f"{type(e).__name__}: {e}",
+                            finished_at=timezone.now(),
+                            locked_until=None,
+                        )
+                    self.stdout.write(f"Trabajo #{job_id} terminado: {status}")
+
+    def _claim_jobs(self, limit):
+        """Marcar como 'running' hasta `limit` trabajos pendientes"""
+        with transaction.atomic():
+            job_ids = list(
+                DjangoJob.objects.select_for_update(skip_locked=True)
+                .filter(status='pending')
+                .order_by('id')
+                .values_list('id', flat=True)[:limit]
+            )
+            if job_ids:
+                now = timezone.now()
+                DjangoJob.objects.filter(id__in=job_ids).update(
+                    status='running',
+                    started_at=now,
+                    locked_until=now + self.lease,
+                    attempts=F('attempts') + 1,
+                )
+        return job_ids
+
+    def _renew_leases(self, job_ids):
+        """Extender la concesión de los trabajos que este worker sigue ejecutando"""
+        job_ids = list(job_ids)
+        if job_ids:
+            DjangoJob.objects.filter(id__in=job_ids, status='running').update(
+                locked_until=timezone.now() + self.lease
+            )
+
+    def _requeue_abandoned(self, max_attempts):
+        """
+        Trabajos 'running' con la concesión vencida: su worker murió sin
+        terminarlos. Vuelven a 'pending' o, agotados los intentos, fallan.
+        """
+        now = timezone.now()
+        abandoned = DjangoJob.objects.filter(status='running').filter(
+            # Sin concesión: reclamados por un worker anterior a las concesiones
+            Q(locked_until__lt=now) | Q(locked_until__isnull=True)
+        )
+        failed = abandoned.filter(attempts__gte=max_attempts).update(
+            status='failed',
+            error=f"Abandonado: el worker dejó de responder en {max_attempts} intentos",
+            finished_at=now,
+            locked_until=None,
+        )
+        requeued = abandoned.filter(attempts__lt=max_attempts).update(
+            status='pending', started_at=None, locked_until=None
+        )
+        if failed or requeued:
+            self.stdout.write(f"Trabajos abandonados: {requeued} reencolados, {failed} fallidos")
@@ -0,0 +1,103 @@
+"""Datos para las pruebas de carga (benchmarks/checkout_storm.py)"""
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User as DjangoUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from ...application.use_cases.book_use_cases import ImportBooksUseCase
+from ...infrastructure.cache.catalog_cache import bump_catalog_version
+from ...infrastructure.database.unit_of_work import DjangoUnitOfWork
+from ...infrastructure.external.stock_broker import BookChange, publish_book_change
+from ...infrastructure.models.django_models import DjangoBook, DjangoLoan
+from ...infrastructure.repositories.django_book_repository import DjangoBookRepository
+
+STUDENT_PREFIX = 'loadstudent'
+LIBRARIAN_PREFIX = 'loadlibrarian'
+BOOK_AUTHOR = 'Autor de Carga'
+BOOK_GENRES = ['Carga Ciencia', 'Carga Historia', 'Carga Novela', 'Carga Poesía']
+
+
+def _username(prefix: str, number: int) -> str:
+    return f'{prefix}{number:05d}'
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea estudiantes, bibliotecarios y libros de prueba de carga "
+        "(loadstudent00001..., loadlibrarian00001..., libros de 'Autor de Carga')"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=500)
+        parser.add_argument('--librarians', type=int, default=2)
+        parser.add_argument('--books', type=int, default=100)
+        parser.add_argument('--stock', type=int, default=3, help="Ejemplares de cada libro de carga")
+        parser.add_argument('--password', default='LoadTest!2024')
+        parser.add_argument(
+            '--reset', action='store_true',
+            help="Borrar los préstamos de los estudiantes de carga y restaurar el stock de sus libros"
+        )
+
+    def handle(self, *args, **options):
+        # Un solo hash para todos: PBKDF2 por usuario tardaría minutos con miles de estudiantes
+        password = make_password(options['password'])
+        students = self._create_users(STUDENT_PREFIX, options['students'], 'Students', password)
+        librarians = self._create_users(LIBRARIAN_PREFIX, options['librarians'], 'Librarians', password)
+
+        result = ImportBooksUseCase(DjangoBookRepository(), DjangoUnitOfWork()).execute([
+            {
+                'title': f'Libro de carga {number:04d}',
+                'author_name': BOOK_AUTHOR,
+                'genre_name': BOOK_GENRES[number % len(BOOK_GENRES)],
+                'published_year': 1950 + number % 70,
+                'stock': options['stock'],
+            }
+            for number in range(1, options['books'] + 1)
+        ])
+        self.stdout.write(
+            f"Usuarios nuevos: {students} estudiantes, {librarians} bibliotecarios; "
+            f"libros nuevos: {result['created']}"
+        )
+
+        if options['reset']:
+            with transaction.atomic():
+                deleted, _ = DjangoLoan.objects.filter(student__username__startswith=STUDENT_PREFIX).delete()
+                books = DjangoBook.objects.filter(author__name=BOOK_AUTHOR).update(
+                    stock=options['stock'], version=F('version') + 1
+                )
+            # update() no pasa por el repositorio: invalidar la caché del catálogo y
+            # avisar a los snapshots de cada worker de que recarguen
+            bump_catalog_version(stock_only=True)
+            publish_book_change(BookChange(action='reload'))
+            self.stdout.write(f"Borrados {deleted} préstamos; stock restaurado en {books} libros")
+
+    def _create_users(self, prefix: str, count: int, group_name: str, password: str) -> int:
+        usernames = [_username(prefix, number) for number in range(1, count + 1)]
+        existing = set(DjangoUser.objects.filter(username__in=usernames).values_list('username', flat=True))
+        new_users = [
+            DjangoUser(
+                username=username,
+                email=f'{username}@load.test',
+                first_name='Carga',
+                last_name=username,
+                password=password,
+            )
+            for username in usernames if username not in existing
+        ]
+        if not new_users:
+            return 0
+        with transaction.atomic():
+            DjangoUser.objects.bulk_create(new_users, batch_size=1000)
+            group, _ = Group.objects.get_or_create(name=group_name)
+            memberships = DjangoUser.groups.through
+            memberships.objects.bulk_create(
+                [
+                    memberships(user_id=user_id, group_id=group.id)
+                    for user_id in DjangoUser.objects.filter(
+                        username__in=[user.username for user in new_users]
+                    ).values_list('id', flat=True)
+                ],
+                batch_size=1000
+            )
+        return len(new_users)
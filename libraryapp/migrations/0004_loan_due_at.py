@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:42
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_due_at(apps, schema_editor):
+    """Calcular la fecha límite de los préstamos existentes con el periodo configurado"""
+    DjangoLoan = apps.get_model('libraryapp', 'DjangoLoan')
+    loan_period = timedelta(days=getattr(settings, 'LOAN_PERIOD_DAYS', 14))
+    DjangoLoan.objects.filter(due_at__isnull=True).update(
+        due_at=models.F('borrowed_at') + loan_period
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0003_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='djangoloan',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='djangoloan',
+            name='overdue_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_due_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='djangoloan',
+            index=models.Index(condition=models.Q(('returned_at__isnull', True)), fields=['due_at', 'id'], name='loan_active_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='djangoloan',
+            index=models.Index(condition=models.Q(('overdue_notified_at__isnull', True), ('returned_at__isnull', True)), fields=['due_at', 'id'], name='loan_overdue_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0004_loan_due_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DjangoDailyBookStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('returns', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'libraryapp_daily_book_stat',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoDailyGenreStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('genre_name', models.CharField(max_length=100)),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('returns', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'libraryapp_daily_genre_stat',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='djangodailygenrestat',
+            constraint=models.UniqueConstraint(fields=('day', 'genre_name'), name='daily_genre_stat_unique'),
+        ),
+        migrations.AddField(
+            model_name='djangodailybookstat',
+            name='book',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='libraryapp.djangobook'),
+        ),
+        migrations.AddConstraint(
+            model_name='djangodailybookstat',
+            constraint=models.UniqueConstraint(fields=('day', 'book'), name='daily_book_stat_unique'),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:05
+
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+def _canonical_names(values):
+    """Agrupar nombres sin distinguir mayúsculas/espacios; el canónico es la grafía más usada"""
+    groups = defaultdict(Counter)
+    for value in values:
+        cleaned = (value or '').strip()
+        groups[cleaned.lower()][cleaned] += 1
+    return {
+        key: spellings.most_common(1)[0][0]
+        for key, spellings in groups.items()
+    }
+
+
+def _normalize(apps, text_field, fk_field, model_name):
+    DjangoBook = apps.get_model('libraryapp', 'DjangoBook')
+    Target = apps.get_model('libraryapp', model_name)
+
+    rows = list(DjangoBook.objects.values_list('pk', text_field))
+    canonical = _canonical_names(value for _, value in rows)
+
+    book_ids = defaultdict(list)
+    for pk, value in rows:
+        book_ids[(value or '').strip().lower()].append(pk)
+
+    for key, name in canonical.items():
+        target = Target.objects.create(name=name)
+        DjangoBook.objects.filter(pk__in=book_ids[key]).update(**{fk_field: target.pk})
+
+
+def forwards(apps, schema_editor):
+    _normalize(apps, 'author_name', 'author_id', 'DjangoAuthor')
+    _normalize(apps, 'genre_name', 'genre_id', 'DjangoGenre')
+
+
+def backwards(apps, schema_editor):
+    DjangoBook = apps.get_model('libraryapp', 'DjangoBook')
+    for book in DjangoBook.objects.select_related('author', 'genre').iterator():
+        DjangoBook.objects.filter(pk=book.pk).update(
+            author_name=book.author.name, genre_name=book.genre.name
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0005_circulation_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DjangoAuthor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('birth_year', models.PositiveIntegerField(blank=True, null=True)),
+                ('nationality', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'db_table': 'libraryapp_author',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'libraryapp_genre',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='djangoauthor',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='author_name_lower_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='djangogenre',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='genre_name_lower_unique'),
+        ),
+        migrations.AddField(
+            model_name='djangobook',
+            name='author',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='books', to='libraryapp.djangoauthor'),
+        ),
+        migrations.AddField(
+            model_name='djangobook',
+            name='genre',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='books', to='libraryapp.djangogenre'),
+        ),
+        # Las columnas de texto admiten vacío para que la migración sea reversible
+        migrations.AlterField(
+            model_name='djangobook',
+            name='author_name',
+            field=models.CharField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='djangobook',
+            name='genre_name',
+            field=models.CharField(default='', max_length=100),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='djangobook',
+            name='author_name',
+        ),
+        migrations.RemoveField(
+            model_name='djangobook',
+            name='genre_name',
+        ),
+        migrations.AlterField(
+            model_name='djangobook',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='books', to='libraryapp.djangoauthor'),
+        ),
+        migrations.AlterField(
+            model_name='djangobook',
+            name='genre',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='books', to='libraryapp.djangogenre'),
+        ),
+    ]
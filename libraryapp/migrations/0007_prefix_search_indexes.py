@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:40
+
+from django.db import migrations
+
+# Índices de expresión en orden de bytes (COLLATE "C"): sirven para el rango de
+# prefijo y también para ORDER BY ... LIMIT, a diferencia de un índice con la
+# colación por defecto. En SQLite la colación BINARY ya ordena así.
+PREFIX_INDEXES = [
+    ('book_title_prefix_idx', 'libraryapp_book', 'title'),
+    ('author_name_prefix_idx', 'libraryapp_author', 'name'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    collate = ' COLLATE "C"' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, table, column in PREFIX_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} ((lower({column}){collate}))'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for name, _, _ in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0006_normalize_authors_genres'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
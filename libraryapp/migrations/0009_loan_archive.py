@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('libraryapp', '0008_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DjangoLoanArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('borrowed_at', models.DateTimeField()),
+                ('returned_at', models.DateTimeField()),
+                ('due_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'libraryapp_loan_archive',
+                'ordering': ['-borrowed_at', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='djangoloan',
+            index=models.Index(condition=models.Q(('returned_at__isnull', False)), fields=['returned_at', 'id'], name='loan_returned_idx'),
+        ),
+        migrations.AddField(
+            model_name='djangoloanarchive',
+            name='book',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='libraryapp.djangobook'),
+        ),
+        migrations.AddField(
+            model_name='djangoloanarchive',
+            name='student',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='djangoloanarchive',
+            index=models.Index(fields=['student', '-borrowed_at', '-id'], name='loan_archive_student_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='djangoloanarchive',
+            index=models.Index(fields=['-borrowed_at', '-id'], name='loan_archive_borrowed_idx'),
+        ),
+    ]
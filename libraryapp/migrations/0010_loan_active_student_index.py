@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0009_loan_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='djangoloan',
+            index=models.Index(condition=models.Q(('returned_at__isnull', True)), fields=['student', 'book'], name='loan_active_student_idx'),
+        ),
+    ]
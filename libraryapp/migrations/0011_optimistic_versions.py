@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('libraryapp', '0010_loan_active_student_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DjangoUserVersion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='version_row', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'db_table': 'libraryapp_user_version',
+            },
+        ),
+        migrations.AddField(
+            model_name='djangobook',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0011_optimistic_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='djangooutboxevent',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0012_outbox_next_attempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='djangojob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='djangojob',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='djangojob',
+            index=models.Index(condition=models.Q(('status', 'running')), fields=['locked_until'], name='job_running_lease_idx'),
+        ),
+    ]
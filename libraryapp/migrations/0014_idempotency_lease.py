@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0013_job_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='djangoidempotencykey',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
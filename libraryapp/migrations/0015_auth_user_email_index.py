@@ -0,0 +1,20 @@
+from django.db import migrations
+
+# auth_user.email no tiene índice en django.contrib.auth: sin él, la comprobación
+# de email duplicado al crear o editar usuarios recorre la tabla entera.
+# RunSQL porque el modelo User no pertenece a esta aplicación.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('libraryapp', '0014_idempotency_lease'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_email_idx ON auth_user (email)',
+            'DROP INDEX IF EXISTS auth_user_email_idx',
+        ),
+    ]
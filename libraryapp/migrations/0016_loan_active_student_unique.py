@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0015_auth_user_email_index'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='djangoloan',
+            constraint=models.UniqueConstraint(condition=models.Q(('returned_at__isnull', True)), fields=('student', 'book'), name='loan_active_student_uniq'),
+        ),
+        migrations.RemoveIndex(
+            model_name='djangoloan',
+            name='loan_active_student_idx',
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('libraryapp', '0016_loan_active_student_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DjangoExportFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'libraryapp_export_file',
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoExportChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('export', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='libraryapp.djangoexportfile')),
+            ],
+            options={
+                'db_table': 'libraryapp_export_chunk',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='djangoexportchunk',
+            constraint=models.UniqueConstraint(fields=('export', 'seq'), name='export_chunk_seq_unique'),
+        ),
+    ]
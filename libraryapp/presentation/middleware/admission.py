@@ -0,0 +1,123 @@
+"""
+Control de admisión: rechazar peticiones en lugar de encolarlas hasta el timeout.
+
+Dos comprobaciones, ambas antes de tocar la base de datos:
+- Tiempo en cola: si el proxy envía X-Request-Start y la petición ya esperó más
+  de MAX_QUEUE_MS (backlog de gunicorn lleno), responder 503 de inmediato; el
+  cliente habría agotado su timeout igualmente.
+- Concurrencia global: como mucho MAX_CONCURRENT peticiones de la API en curso
+  entre todos los workers, contadas con incr/decr sobre la caché CACHE (que debe
+  ser un backend sin base de datos y sin purgas, como la de THROTTLING). El
+  contador va por periodos de LEASE_SECONDS: una petición suma en el periodo en
+  que entra y resta en ese mismo contador al salir, y las que están en curso se
+  cuentan sumando el periodo actual y el anterior. Si un worker muere sin
+  restar, su plaza desaparece sola cuando caduca el contador de su periodo.
+"""
+import logging
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'CACHE': 'ratelimit',
+    'MAX_CONCURRENT': 0,
+    'MAX_QUEUE_MS': 0,
+    'LEASE_SECONDS': 30,
+    'RETRY_AFTER': 2,
+    'PATH_PREFIXES': ['/api/'],
+    # El stream SSE mantiene la conexión abierta minutos: no ocupa plaza
+    'EXEMPT_PATHS': ['/api/books/stream/'],
+}
+
+
+def queue_time_ms(header: str) -> Optional[float]:
+    """
+    Milisegundos desde X-Request-Start ('t=<epoch>' en s, ms o µs según
+    el proxy, como lo envían nginx y Heroku/Render).
+    """
+    value = header.strip()
+    if value.startswith('t='):
+        value = value[2:]
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    # Normalizar a segundos según la magnitud
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return (time.time() - started) * 1000
+
+
+class AdmissionControlMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.config = {**DEFAULT_CONFIG, **getattr(settings, 'ADMISSION_CONTROL', {})}
+        self.cache = caches[self.config['CACHE']]
+        self.slots = self.config['MAX_CONCURRENT']
+
+    def process_request(self, request):
+        if not self._applies(request.path):
+            return None
+
+        max_queue_ms = self.config['MAX_QUEUE_MS']
+        if max_queue_ms:
+            waited = queue_time_ms(request.META.get('HTTP_X_REQUEST_START', ''))
+            if waited is not None and waited > max_queue_ms:
+                logger.warning("Petición descartada tras %.0f ms en cola: %s", waited, request.path)
+                return self._reject('Servidor saturado, reintente más tarde')
+
+        if self.slots:
+            counter = self._acquire()
+            if counter is None:
+                return self._reject('Demasiadas peticiones en curso, reintente más tarde')
+            request._admission_counter = counter
+        return None
+
+    def process_response(self, request, response):
+        # Las excepciones de la vista ya llegan aquí convertidas en respuesta
+        counter = getattr(request, '_admission_counter', None)
+        if counter is not None:
+            self._release(counter)
+        return response
+
+    def _applies(self, path: str) -> bool:
+        if path in self.config['EXEMPT_PATHS']:
+            return False
+        return any(path.startswith(prefix) for prefix in self.config['PATH_PREFIXES'])
+
+    def _acquire(self) -> Optional[str]:
+        """Sumar una petición en curso; None (sin plaza) si se supera MAX_CONCURRENT"""
+        lease = self.config['LEASE_SECONDS']
+        period = int(time.time() // lease)
+        key = f'admission:inflight:{period}'
+        # El contador cuenta durante su periodo y el siguiente
+        self.cache.add(key, 0, 2 * lease + 1)
+        try:
+            current = self.cache.incr(key)
+        except ValueError:
+            return None
+        in_flight = current + self.cache.get(f'admission:inflight:{period - 1}', 0)
+        if in_flight > self.slots:
+            self._release(key)
+            return None
+        return key
+
+    def _release(self, key: str) -> None:
+        try:
+            self.cache.decr(key)
+        except ValueError:
+            # El contador ya caducó: la petición duró más que dos periodos
+            pass
+
+    def _reject(self, message: str) -> JsonResponse:
+        response = JsonResponse({'error': message}, status=503)
+        response['Retry-After'] = str(self.config['RETRY_AFTER'])
+        return response
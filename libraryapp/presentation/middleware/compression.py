@@ -0,0 +1,210 @@
+"""
+Compresión de respuestas de la API según Accept-Encoding.
+
+gzip está siempre disponible; brotli (`br`) y zstd se ofrecen solo si están
+instalados los paquetes `brotli` y `zstandard`. Las respuestas en streaming se
+comprimen por bloques y se vacía el compresor tras cada bloque, de modo que el
+cliente recibe los datos a medida que se generan. Los ficheros (FileResponse,
+como la descarga de exportaciones) ya están completos: se comprimen sin vaciar
+entre bloques, que con bloques pequeños empeoraría mucho la compresión.
+"""
+import re
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+_ENCODING_RE = re.compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+DEFAULT_CONFIG = {
+    'MIN_SIZE': 1024,
+    # Orden de preferencia del servidor cuando el cliente acepta varias
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+    'ZSTD_LEVEL': 3,
+    # Sin text/html: las páginas HTML (admin, Swagger) llevan el token CSRF junto a
+    # datos que controla el usuario, y comprimirlas las expone a BREACH
+    'CONTENT_TYPES': [
+        'application/json',
+        'application/msgpack',
+        'application/xml',
+        'application/javascript',
+        'text/csv',
+        'text/plain',
+    ],
+}
+
+
+class _GzipCompressor:
+    def __init__(self, config):
+        # wbits=31: formato gzip (cabecera y CRC), no deflate crudo
+        self._compressor = zlib.compressobj(config['GZIP_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, config):
+        self._compressor = brotli.Compressor(quality=config['BROTLI_QUALITY'])
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, config):
+        self._compressor = zstandard.ZstdCompressor(level=config['ZSTD_LEVEL']).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_compressors() -> Dict[str, Callable]:
+    """Codificaciones soportadas por este proceso"""
+    compressors = {'gzip': _GzipCompressor}
+    if brotli is not None:
+        compressors['br'] = _BrotliCompressor
+    if zstandard is not None:
+        compressors['zstd'] = _ZstdCompressor
+    return compressors
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Codificaciones aceptadas por el cliente con su peso q"""
+    accepted = {}
+    for item in header.split(','):
+        match = _ENCODING_RE.match(item)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) is not None else 1.0
+        except ValueError:
+            continue
+        accepted[match.group(1).lower()] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str, preference: List[str]) -> Optional[str]:
+    """
+    Elegir la codificación de mayor q aceptada por el cliente; en empate gana
+    el orden de preferencia del servidor. Devuelve None si no hay ninguna.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in preference:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compress_stream(iterator, compressor, flush=True):
+    for chunk in iterator:
+        data = compressor.compress(chunk)
+        if flush:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_async_stream(iterator, compressor, flush=True):
+    async for chunk in iterator:
+        data = compressor.compress(chunk)
+        if flush:
+            data += compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime las respuestas que superan settings.RESPONSE_COMPRESSION['MIN_SIZE'].
+
+    No toca respuestas ya codificadas, tipos de contenido no comprimibles ni
+    streams SSE (text/event-stream), que deben llegar sin buffers intermedios.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.config = {**DEFAULT_CONFIG, **getattr(settings, 'RESPONSE_COMPRESSION', {})}
+        self.compressors = available_compressors()
+        self.preference = [
+            encoding for encoding in self.config['ENCODINGS'] if encoding in self.compressors
+        ]
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not self._compressible_type(response):
+            return response
+        if not response.streaming and len(response.content) < self.config['MIN_SIZE']:
+            return response
+
+        # La respuesta depende de Accept-Encoding aunque finalmente no se comprima
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.preference)
+        if encoding is None:
+            return response
+        compressor = self.compressors[encoding](self.config)
+
+        if response.streaming:
+            flush = not isinstance(response, FileResponse)
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(
+                    response.streaming_content, compressor, flush
+                )
+            else:
+                response.streaming_content = _compress_stream(response.streaming_content, compressor, flush)
+            del response['Content-Length']
+        else:
+            compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # El ETag fuerte identifica los bytes sin comprimir
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressible_type(self, response) -> bool:
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in self.config['CONTENT_TYPES']
@@ -0,0 +1,57 @@
+"""
+Lectura de las propias escrituras con réplicas, para todas las vistas.
+
+Si el usuario escribió hace menos de REPLICA_ROUTING['STICKY_SECONDS'], todas
+las lecturas de su petición van al primario, sea cual sea la vista (ViewSets
+con o sin ReplicaRoutingMixin, trabajos, estadísticas, admin). Al terminar,
+si la petición escribió, se marca al usuario.
+
+El usuario se identifica antes de que DRF autentique: con un JWT se toma del
+token validado (sin consultar la base de datos); sin él, de la sesión.
+"""
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from ...infrastructure.database.replica_router import begin_request, end_request, replica_aliases
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.jwt = JWTAuthentication()
+
+    def process_request(self, request):
+        if not replica_aliases():
+            return None
+        user_id = self._user_id(request)
+        request._replica_state = (begin_request(user_id), user_id)
+        return None
+
+    def process_response(self, request, response):
+        state = getattr(request, '_replica_state', None)
+        if state is not None:
+            routing_state, user_id = state
+            # La vista pudo autenticar al usuario (p. ej. al obtener el token)
+            end_request(routing_state, user_id if user_id is not None else self._authenticated_id(request))
+            request._replica_state = None
+        return response
+
+    def _user_id(self, request):
+        header = self.jwt.get_header(request)
+        if header is None:
+            return self._authenticated_id(request)
+        raw_token = self.jwt.get_raw_token(header)
+        if raw_token is None:
+            return None
+        try:
+            token = self.jwt.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        return token.get(api_settings.USER_ID_CLAIM)
+
+    @staticmethod
+    def _authenticated_id(request):
+        user = getattr(request, 'user', None)
+        return user.pk if user is not None and user.is_authenticated else None
@@ -0,0 +1,41 @@
+"""
+Renderer MessagePack para clientes que piden `Accept: application/msgpack`.
+
+Requiere el paquete opcional `msgpack`; la configuración solo lo registra en
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] cuando está instalado.
+"""
+import datetime
+import decimal
+import uuid
+
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+
+def _default(value):
+    """Tipos sin equivalente en MessagePack: mismo texto que el JSON de la API"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f'Tipo no serializable en MessagePack: {type(value).__name__}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if msgpack is None:
+            raise RuntimeError('El paquete msgpack no está instalado')
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
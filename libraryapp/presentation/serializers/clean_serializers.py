@@ -1,13 +1,37 @@
 
+from django.utils import timezone
 from rest_framework import serializers
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from ...domain.entities.book import Book
-from ...domain.entities.user import User
+from ...domain.entities.book_facets import BookFacets
 from ...domain.entities.loan import Loan
+from ...domain.entities.job import Job
 
 
-class UserSerializer(serializers.Serializer):
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets: con fields=[...] la representación solo incluye esos campos.
+
+    Cada serializer declara en FIELD_GETTERS cómo obtener cada campo; los campos
+    no pedidos ni se calculan (pueden venir sin cargar desde el repositorio).
+    """
+    FIELD_GETTERS: Dict[str, Callable[[Any], Any]] = {}
+
+    def __init__(self, *args, fields: Optional[Iterable[str]] = None, **kwargs):
+        if fields:
+            wanted = set(fields)
+            self.sparse_fields = [name for name in self.FIELD_GETTERS if name in wanted]
+        else:
+            self.sparse_fields = list(self.FIELD_GETTERS)
+        super().__init__(*args, **kwargs)
+
+    def to_representation(self, instance) -> Dict[str, Any]:
+        getters = self.FIELD_GETTERS
+        return {name: getters[name](instance) for name in self.sparse_fields}
+
+
+class UserSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     username = serializers.CharField(max_length=150)
     email = serializers.EmailField()
@@ -16,18 +40,17 @@ class UserSerializer(serializers.Serializer):
     last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
     role = serializers.CharField(read_only=True)
 
-    def to_representation(self, instance: User) -> Dict[str, Any]:
-        return {
-            'id': instance.id,
-            'username': instance.username,
-            'email': instance.email,
-            'first_name': instance.first_name,
-            'last_name': instance.last_name,
-            'role': instance.role.value if instance.role else None
-        }
+    FIELD_GETTERS = {
+        'id': lambda user: user.id,
+        'username': lambda user: user.username,
+        'email': lambda user: user.email,
+        'first_name': lambda user: user.first_name,
+        'last_name': lambda user: user.last_name,
+        'role': lambda user: user.role.value if user.role else None,
+    }
 
 
-class BookSerializer(serializers.Serializer):
+class BookSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     title = serializers.CharField(max_length=255)
     author_name = serializers.CharField(max_length=200)
@@ -39,36 +62,113 @@ class BookSerializer(serializers.Serializer):
     def get_is_available(self, instance: Book) -> bool:
         return instance.is_available()
 
-    def to_representation(self, instance: Book) -> Dict[str, Any]:
+    FIELD_GETTERS = {
+        'id': lambda book: book.id,
+        'title': lambda book: book.title,
+        'author_name': lambda book: book.author_name,
+        'published_year': lambda book: book.published_year,
+        'genre_name': lambda book: book.genre_name,
+        'stock': lambda book: book.stock,
+        'is_available': lambda book: book.is_available(),
+    }
+
+
+class BookFacetsSerializer(serializers.Serializer):
+    def to_representation(self, instance: BookFacets) -> Dict[str, Any]:
         return {
-            'id': instance.id,
-            'title': instance.title,
-            'author_name': instance.author_name,
-            'published_year': instance.published_year,
-            'genre_name': instance.genre_name,
-            'stock': instance.stock,
-            'is_available': instance.is_available()
+            'total': instance.total,
+            'genres': [vars(value) for value in instance.genres],
+            'authors': [vars(value) for value in instance.authors],
+            'decades': [vars(value) for value in instance.decades],
+            'availability': [vars(value) for value in instance.availability],
         }
 
 
-class LoanSerializer(serializers.Serializer):
+class LoanSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     student = UserSerializer(read_only=True)
     book = BookSerializer(read_only=True)
     book_id = serializers.IntegerField(write_only=True, required=False)
     borrowed_at = serializers.DateTimeField(read_only=True)
     returned_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    due_at = serializers.DateTimeField(read_only=True, allow_null=True)
     is_returned = serializers.SerializerMethodField()
 
     def get_is_returned(self, instance: Loan) -> bool:
         return instance.is_returned()
 
-    def to_representation(self, instance: Loan) -> Dict[str, Any]:
+    FIELD_GETTERS = {
+        'id': lambda loan: loan.id,
+        'student': lambda loan: UserSerializer().to_representation(loan.student),
+        'book': lambda loan: BookSerializer().to_representation(loan.book),
+        'borrowed_at': lambda loan: loan.borrowed_at.isoformat() if loan.borrowed_at else None,
+        'returned_at': lambda loan: loan.returned_at.isoformat() if loan.returned_at else None,
+        'due_at': lambda loan: loan.due_at.isoformat() if loan.due_at else None,
+        'is_returned': lambda loan: loan.is_returned(),
+        'is_overdue': lambda loan: loan.is_overdue(timezone.now()),
+    }
+
+
+class CompactLoanListSerializer(serializers.Serializer):
+    """
+    Listado de préstamos con referencias por ID y objetos relacionados aparte.
+
+    Cada estudiante y libro se serializa una sola vez en 'students'/'books',
+    indexados por ID, en lugar de repetirse dentro de cada préstamo.
+    """
+
+    def to_representation(self, instance: List[Loan]) -> Dict[str, Any]:
+        now = timezone.now()
+        user_serializer, book_serializer = UserSerializer(), BookSerializer()
+        students: Dict[str, Any] = {}
+        books: Dict[str, Any] = {}
+        loans = []
+        for loan in instance:
+            student_key, book_key = str(loan.student.id), str(loan.book.id)
+            if student_key not in students:
+                students[student_key] = user_serializer.to_representation(loan.student)
+            if book_key not in books:
+                books[book_key] = book_serializer.to_representation(loan.book)
+            loans.append({
+                'id': loan.id,
+                'student_id': loan.student.id,
+                'book_id': loan.book.id,
+                'borrowed_at': loan.borrowed_at.isoformat() if loan.borrowed_at else None,
+                'returned_at': loan.returned_at.isoformat() if loan.returned_at else None,
+                'due_at': loan.due_at.isoformat() if loan.due_at else None,
+                'is_returned': loan.is_returned(),
+                'is_overdue': loan.is_overdue(now)
+            })
+        return {
+            'results': loans,
+            'included': {
+                'students': students,
+                'books': books
+            }
+        }
+
+
+class JobSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    job_type = serializers.CharField(max_length=100)
+    params = serializers.JSONField(required=False)
+    status = serializers.CharField(read_only=True)
+    result = serializers.JSONField(read_only=True)
+    error = serializers.CharField(read_only=True, allow_null=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    started_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    finished_at = serializers.DateTimeField(read_only=True, allow_null=True)
+
+    def to_representation(self, instance: Job) -> Dict[str, Any]:
         return {
             'id': instance.id,
-            'student': UserSerializer().to_representation(instance.student),
-            'book': BookSerializer().to_representation(instance.book),
-            'borrowed_at': instance.borrowed_at.isoformat() if instance.borrowed_at else None,
-            'returned_at': instance.returned_at.isoformat() if instance.returned_at else None,
-            'is_returned': instance.is_returned()
+            'job_type': instance.job_type,
+            'params': instance.params,
+            'status': instance.status.value,
+            'result': instance.result,
+            'error': instance.error,
+            'created_by_id': instance.created_by_id,
+            'created_at': instance.created_at.isoformat() if instance.created_at else None,
+            'started_at': instance.started_at.isoformat() if instance.started_at else None,
+            'finished_at': instance.finished_at.isoformat() if instance.finished_at else None,
         }
\ No newline at end of file
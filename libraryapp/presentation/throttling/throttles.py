@@ -0,0 +1,152 @@
+"""
+Límites de peticiones compartidos entre workers.
+
+Cada límite tiene capacidad BURST y se recupera a RATE peticiones por periodo.
+Se implementa como ventana deslizante sobre contadores de la caché
+settings.THROTTLING['CACHE']: la ventana dura lo que se tarda en recuperar
+BURST peticiones, y el uso estimado es el contador de la ventana actual más
+la parte aún solapada de la anterior. Solo se usan add/incr/decr, atómicos
+en los backends sin base de datos (Redis, memcached, memoria local): dos
+peticiones simultáneas nunca consumen la misma plaza, sin leer y reescribir
+estado. DatabaseCache no sirve aquí: su incr no es atómico y cada escritura
+cuenta las filas de la tabla para purgarla.
+"""
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Parámetros de texto de /api/books/ que disparan búsquedas con ILIKE
+SEARCH_PARAMS = ('title', 'author_name', 'genre_name')
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """'10/min' -> (10, 60)"""
+    count, period = rate.split('/')
+    return int(count), DURATIONS[period.strip()[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle base de ventana deslizante: la configuración del límite sale de
+    settings.THROTTLING['BUCKETS'][scope] ({'RATE': 'N/periodo', 'BURST': M}).
+
+    per_user=True cuenta por usuario (o IP si es anónimo); per_user=False,
+    un solo contador para el endpoint entre todos los usuarios.
+    """
+    scope: str = None
+    per_user = True
+
+    def __init__(self):
+        config = getattr(settings, 'THROTTLING', {})
+        bucket = config.get('BUCKETS', {}).get(self.scope)
+        self.enabled = bucket is not None
+        if self.enabled:
+            count, seconds = parse_rate(bucket['RATE'])
+            self.capacity = bucket.get('BURST', count)
+            # Tiempo en recuperar la capacidad completa al ritmo RATE
+            self.window = self.capacity * seconds / count
+        self.cache = caches[config.get('CACHE', 'default')]
+        self._wait: Optional[float] = None
+
+    def applies(self, request, view) -> bool:
+        """Las subclases restringen aquí a qué peticiones se aplica el límite"""
+        return True
+
+    def get_cache_key(self, request, view) -> str:
+        if not self.per_user:
+            return f'throttle:{self.scope}'
+        if request.user and request.user.is_authenticated:
+            return f'throttle:{self.scope}:user:{request.user.pk}'
+        return f'throttle:{self.scope}:ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view) -> bool:
+        if not self.enabled or not self.applies(request, view):
+            return True
+
+        key = self.get_cache_key(request, view)
+        now = time.time()
+        slot, elapsed = divmod(now, self.window)
+        current_key = f'{key}:{int(slot)}'
+        count = self._incr(current_key)
+        previous = self.cache.get(f'{key}:{int(slot) - 1}', 0)
+        # Parte de la ventana anterior que aún cae dentro de la ventana deslizante
+        overlap = 1 - elapsed / self.window
+        if previous * overlap + count <= self.capacity:
+            return True
+
+        # Las peticiones rechazadas no cuentan: no retrasan a los demás usuarios del endpoint
+        self.cache.decr(current_key)
+        if count > self.capacity or not previous:
+            self._wait = self.window - elapsed
+        else:
+            self._wait = max(0.0, (1 - (self.capacity - count) / previous) * self.window - elapsed)
+        return False
+
+    def _incr(self, key: str) -> int:
+        # La clave vive dos ventanas: la actual y la siguiente, donde cuenta como anterior
+        while True:
+            self.cache.add(key, 0, int(2 * self.window) + 1)
+            try:
+                return self.cache.incr(key)
+            except ValueError:
+                # Caducó entre add e incr: volver a crearla y contar sobre el valor real
+                continue
+
+    def wait(self) -> Optional[float]:
+        return self._wait
+
+
+class UserRateThrottle(SlidingWindowThrottle):
+    """Límite general por usuario autenticado"""
+    scope = 'user'
+
+    def applies(self, request, view) -> bool:
+        return bool(request.user and request.user.is_authenticated)
+
+
+class AnonRateThrottle(SlidingWindowThrottle):
+    """Límite general por IP para peticiones anónimas (login, refresh)"""
+    scope = 'anon'
+
+    def applies(self, request, view) -> bool:
+        return not (request.user and request.user.is_authenticated)
+
+
+class LoanCreateThrottle(SlidingWindowThrottle):
+    """Creación de préstamos por estudiante"""
+    scope = 'loan_create'
+
+
+class LoanCreateEndpointThrottle(SlidingWindowThrottle):
+    """Creación de préstamos entre todos los estudiantes"""
+    scope = 'loan_create_endpoint'
+    per_user = False
+
+
+def is_search(request, view) -> bool:
+    """Autocompletado o listado de libros con filtros de texto"""
+    if getattr(view, 'action', None) == 'suggest':
+        return True
+    return any(request.query_params.get(param) for param in SEARCH_PARAMS)
+
+
+class SearchThrottle(SlidingWindowThrottle):
+    """Búsquedas de texto por usuario"""
+    scope = 'search'
+
+    def applies(self, request, view) -> bool:
+        return is_search(request, view)
+
+
+class SearchEndpointThrottle(SlidingWindowThrottle):
+    """Búsquedas de texto entre todos los usuarios"""
+    scope = 'search_endpoint'
+    per_user = False
+
+    def applies(self, request, view) -> bool:
+        return is_search(request, view)
@@ -4,48 +4,180 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.http import FileResponse
+import base64
+from datetime import date, datetime, timedelta
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from ...infrastructure.models.django_models import DjangoBook
-from ..serializers.clean_serializers import BookSerializer, LoanSerializer, UserSerializer
+from ..serializers.clean_serializers import (
+    BookSerializer, BookFacetsSerializer, LoanSerializer, CompactLoanListSerializer,
+    UserSerializer, JobSerializer
+)
 from ..permissions.permissions import IsStudent, IsLibrarian
+from .idempotency import IDEMPOTENCY_KEY_HEADER, idempotent
+from .replica_routing import ReplicaRoutingMixin
+from ..throttling.throttles import (
+    LoanCreateThrottle, LoanCreateEndpointThrottle, SearchThrottle, SearchEndpointThrottle
+)
 from ...shared.exceptions.business_exceptions import (
-    NotFoundException, ValidationException, BusinessRuleException
+    NotFoundException, ValidationException, BusinessRuleException, ConcurrencyException
 )
 
 # Dependency Injection - En una aplicación real usarías un container
-from ...infrastructure.repositories.django_book_repository import DjangoBookRepository
-from ...infrastructure.repositories.django_loan_repository import DjangoLoanRepository
-from ...infrastructure.repositories.django_user_repository import DjangoUserRepository
+# (REPOSITORIES['BACKEND'] elige entre Django ORM y el almacén en memoria)
+from ...infrastructure.repositories.factory import (
+    get_author_repository, get_book_read_repository, get_book_repository, get_clock,
+    get_loan_repository, get_unit_of_work, get_user_repository
+)
+from ...infrastructure.external.stock_broker import BrokerStockChangePublisher, get_stock_broker
+from ...infrastructure.events.outbox import OutboxEventPublisher
+from ...infrastructure.repositories.django_job_repository import DjangoJobRepository
+from ...infrastructure.repositories.django_circulation_stats_repository import DjangoCirculationStatsRepository
+from ...infrastructure.repositories.django_idempotency_store import DjangoIdempotencyStore
+from ...infrastructure.jobs.exports import open_export
+from ...infrastructure.jobs.handlers import JOB_HANDLERS
 
 from ...application.use_cases.book_use_cases import (
-    GetBookUseCase, ListBooksUseCase, CreateBookUseCase, 
-    UpdateBookUseCase, DeleteBookUseCase
+    GetBookUseCase, ListBooksUseCase, ListBooksPageUseCase, CreateBookUseCase, 
+    UpdateBookUseCase, DeleteBookUseCase, GetBookFacetsUseCase, SuggestBooksUseCase
 )
 from ...application.use_cases.loan_use_cases import (
-    GetLoanUseCase, ListLoansUseCase, CreateLoanUseCase, 
-    ReturnLoanUseCase, DeleteLoanUseCase
+    GetLoanUseCase, ListLoansUseCase, ListLoansPageUseCase, CreateLoanUseCase, 
+    ReturnLoanUseCase, DeleteLoanUseCase, ListOverdueLoansUseCase, ListLoanHistoryUseCase
 )
 from ...application.use_cases.user_use_cases import (
-    GetUserUseCase, ListUsersUseCase, CreateUserUseCase,
+    GetUserUseCase, ListUsersUseCase, ListUsersPageUseCase, CreateUserUseCase,
     UpdateUserUseCase, DeleteUserUseCase, GetUserByUsernameUseCase
 )
+from ...application.use_cases.job_use_cases import (
+    SubmitJobUseCase, GetJobUseCase, ListJobsUseCase
+)
+from ...application.use_cases.stats_use_cases import (
+    GetBookCirculationUseCase, GetGenreCirculationUseCase, GetMonthlyCirculationUseCase
+)
+
+
+FIELDS_PARAMETER = openapi.Parameter(
+    'fields', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+    description='Campos a devolver separados por comas (p. ej. id,title,is_available)'
+)
+
+PAGE_PARAMETERS = [
+    openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Página (desde 1); devuelve {count, has_next, results}. Sin page, el listado completo'),
+    openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Tamaño de página (máx. 500, 50 por defecto)'),
+    openapi.Parameter('exact', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description='Con page: count exacto (COUNT(*)) aunque el resultado sea grande'),
+]
+
+
+IF_MATCH_HEADER = openapi.Parameter(
+    'If-Match', openapi.IN_HEADER, type=openapi.TYPE_STRING,
+    description='ETag ("<versión>") leído antes de editar; 409 si otra petición modificó el recurso'
+)
+
+
+def _if_match_version(request):
+    """Versión de la cabecera If-Match ("3" o W/"3"); None sin cabecera o con *"""
+    raw = request.headers.get('If-Match', '').strip()
+    if not raw or raw == '*':
+        return None
+    tag = raw[2:] if raw.startswith('W/') else raw
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise ValidationException('If-Match debe ser el ETag del recurso, p. ej. "3"')
+
+
+def _is_librarian(request) -> bool:
+    """Pertenencia al grupo Librarians, consultada una vez por petición"""
+    if not hasattr(request, '_is_librarian'):
+        request._is_librarian = request.user.groups.filter(name='Librarians').exists()
+    return request._is_librarian
+
+
+def _with_etag(response, entity):
+    """ETag con la versión de la entidad (las copias en memoria del catálogo no la tienen)"""
+    if entity.version is not None:
+        response['ETag'] = f'"{entity.version}"'
+    return response
+
+
+def _requested_page(request):
+    """
+    (page, page_size, exact) si se pidió ?page=; None para el listado completo.
+    Sin exact=true el total de resultados grandes es una estimación.
+    """
+    if 'page' not in request.GET:
+        return None
+    try:
+        page, page_size = int(request.GET['page']), int(request.GET.get('page_size', 50))
+    except ValueError:
+        raise ValidationException("page y page_size deben ser números enteros")
+    return page, page_size, request.GET.get('exact', '').lower() == 'true'
+
+
+def _page_data(page, page_number: int, data) -> dict:
+    """Cuerpo de un listado paginado; count_is_estimate si el total no es exacto"""
+    body = {
+        'count': page.total,
+        'count_is_estimate': page.total_is_estimate,
+        'page': page_number,
+        'page_size': page.limit,
+        'has_next': page.has_next,
+    }
+    if isinstance(data, dict):
+        body.update(data)
+    else:
+        body['results'] = data
+    return body
+
+
+def _requested_fields(request, serializer_class):
+    """Leer ?fields=a,b (sparse fieldsets) validando contra los campos del serializer"""
+    raw = request.GET.get('fields', '')
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in serializer_class.FIELD_GETTERS]
+    if unknown:
+        raise ValidationException(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(serializer_class.FIELD_GETTERS)}"
+        )
+    return fields or None
+
+
+def _encode_loan_cursor(moment, loan_id) -> str:
+    """Cursor opaco con la clave (fecha, id) del último préstamo de la página"""
+    raw = f'{moment.isoformat()}|{loan_id}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_loan_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        moment, loan_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(moment), int(loan_id)
+    except (ValueError, UnicodeError):
+        raise ValidationException("cursor inválido")
 
 
 class BookFilter(django_filters.FilterSet):
     title = django_filters.CharFilter(lookup_expr='icontains')
-    author_name = django_filters.CharFilter(lookup_expr='icontains')
-    genre_name = django_filters.CharFilter(lookup_expr='icontains')
+    author_name = django_filters.CharFilter(field_name='author__name', lookup_expr='icontains')
+    genre_name = django_filters.CharFilter(field_name='genre__name', lookup_expr='icontains')
+    author_id = django_filters.NumberFilter(field_name='author_id')
+    genre_id = django_filters.NumberFilter(field_name='genre_id')
     published_year_min = django_filters.NumberFilter(field_name='published_year', lookup_expr='gte')
     published_year_max = django_filters.NumberFilter(field_name='published_year', lookup_expr='lte')
     available = django_filters.BooleanFilter(method='filter_available')
 
     class Meta:
         model = DjangoBook
-        fields = ['author_name', 'genre_name', 'published_year', 'stock']
+        fields = ['author_name', 'genre_name', 'author_id', 'genre_id', 'published_year', 'stock']
 
     def filter_available(self, queryset, name, value):
         if value:
@@ -53,7 +185,7 @@ class BookFilter(django_filters.FilterSet):
         return queryset.filter(stock=0)
 
 
-class BookViewSet(viewsets.ViewSet):
+class BookViewSet(ReplicaRoutingMixin, viewsets.ViewSet):
     """
     ViewSet para gestión de libros usando Clean Architecture.
     
@@ -68,24 +200,61 @@ class BookViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = BookFilter
+    # Solo para que drf_yasg documente los parámetros de BookFilter (no se consulta)
+    queryset = DjangoBook.objects.none()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Dependency Injection
-        self.book_repository = DjangoBookRepository()
+        self.book_repository = get_book_repository()
+        # Las lecturas pueden servirse desde la copia en memoria (CATALOG_SNAPSHOT)
+        self.book_read_repository = get_book_read_repository()
+        self.stock_publisher = BrokerStockChangePublisher(get_stock_broker())
+        self.event_publisher = OutboxEventPublisher()
         
         # Use Cases
-        self.get_book_use_case = GetBookUseCase(self.book_repository)
-        self.list_books_use_case = ListBooksUseCase(self.book_repository)
+        self.get_book_use_case = GetBookUseCase(self.book_read_repository)
+        # Detalle para bibliotecarios: su ETag acaba en un If-Match, se lee del primario
+        self.get_current_book_use_case = GetBookUseCase(self.book_repository)
+        self.list_books_use_case = ListBooksUseCase(self.book_read_repository)
+        self.list_books_page_use_case = ListBooksPageUseCase(self.book_read_repository)
+        self.get_book_facets_use_case = GetBookFacetsUseCase(self.book_read_repository)
+        self.suggest_books_use_case = SuggestBooksUseCase(
+            self.book_repository, get_author_repository()
+        )
         self.create_book_use_case = CreateBookUseCase(self.book_repository)
-        self.update_book_use_case = UpdateBookUseCase(self.book_repository)
-        self.delete_book_use_case = DeleteBookUseCase(self.book_repository)
+        self.update_book_use_case = UpdateBookUseCase(
+            self.book_repository, get_unit_of_work(), get_clock(), self.stock_publisher, self.event_publisher
+        )
+        self.delete_book_use_case = DeleteBookUseCase(
+            self.book_repository, get_loan_repository(), get_unit_of_work(), get_clock(), self.event_publisher
+        )
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAuthenticated(), IsLibrarian()]
         return [IsAuthenticated()]
 
+    def uses_replica(self, request) -> bool:
+        if self.action == 'retrieve' and _is_librarian(request):
+            return False
+        return super().uses_replica(request)
+
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action in ['list', 'suggest']:
+            # Solo cuentan las peticiones con búsqueda de texto
+            throttles += [SearchThrottle(), SearchEndpointThrottle()]
+        return throttles
+
+    @swagger_auto_schema(
+        operation_description="Listar libros con filtros; con facets=true incluye conteos por faceta",
+        manual_parameters=[
+            openapi.Parameter('facets', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description='Devolver {results, facets} con conteos por género, autor, década y disponibilidad'),
+            FIELDS_PARAMETER,
+            *PAGE_PARAMETERS,
+        ],
+    )
     def list(self, request):
         """Listar libros con filtros"""
         try:
@@ -94,10 +263,42 @@ class BookViewSet(viewsets.ViewSet):
             for key, value in request.GET.items():
                 if value:
                     filters[key] = value
+            with_facets = filters.pop('facets', '').lower() == 'true'
+            for param in ('fields', 'page', 'page_size', 'exact'):
+                filters.pop(param, None)
+            fields = _requested_fields(request, BookSerializer)
+            requested_page = _requested_page(request)
             
-            books = self.list_books_use_case.execute(filters if filters else None)
-            serializer = BookSerializer(books, many=True)
-            return Response(serializer.data)
+            if requested_page:
+                page_number, page_size, exact = requested_page
+                page = self.list_books_page_use_case.execute(
+                    page_number, page_size, filters if filters else None, fields, exact_total=exact
+                )
+                books = page.items
+            else:
+                books = self.list_books_use_case.execute(filters if filters else None, fields)
+            serializer = BookSerializer(books, many=True, fields=fields)
+            if not with_facets:
+                data = serializer.data
+            else:
+                # La clave de caché de las facetas solo incluye parámetros de BookFilter
+                facet_filters = {
+                    key: value for key, value in filters.items()
+                    if key in BookFilter.base_filters
+                }
+                facets = self.get_book_facets_use_case.execute(facet_filters)
+                data = {
+                    'results': serializer.data,
+                    'facets': BookFacetsSerializer(facets).data
+                }
+            if requested_page:
+                return Response(_page_data(page, page_number, data))
+            return Response(data)
+        except ValidationException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -107,9 +308,10 @@ class BookViewSet(viewsets.ViewSet):
     def retrieve(self, request, pk=None):
         """Obtener libro específico"""
         try:
-            book = self.get_book_use_case.execute(int(pk))
+            use_case = self.get_current_book_use_case if _is_librarian(request) else self.get_book_use_case
+            book = use_case.execute(int(pk))
             serializer = BookSerializer(book)
-            return Response(serializer.data)
+            return _with_etag(Response(serializer.data), book)
         except NotFoundException as e:
             return Response(
                 {'error': str(e)}, 
@@ -177,7 +379,13 @@ class BookViewSet(viewsets.ViewSet):
                 'stock': openapi.Schema(type=openapi.TYPE_INTEGER, description='Stock del libro'),
             },
         ),
-        responses={200: BookSerializer, 400: 'Error de validación', 404: 'Libro no encontrado'}
+        manual_parameters=[IF_MATCH_HEADER],
+        responses={
+            200: BookSerializer,
+            400: 'Error de validación',
+            404: 'Libro no encontrado',
+            409: 'El libro cambió desde que se leyó (If-Match o escritura concurrente)',
+        }
     )
     def update(self, request, pk=None):
         """Actualizar libro completo"""
@@ -189,10 +397,11 @@ class BookViewSet(viewsets.ViewSet):
                 author_name=data.get('author_name'),
                 genre_name=data.get('genre_name'),
                 published_year=data.get('published_year'),
-                stock=data.get('stock')
+                stock=data.get('stock'),
+                expected_version=_if_match_version(request)
             )
             serializer = BookSerializer(book)
-            return Response(serializer.data)
+            return _with_etag(Response(serializer.data), book)
         except NotFoundException as e:
             return Response(
                 {'error': str(e)}, 
@@ -203,12 +412,18 @@ class BookViewSet(viewsets.ViewSet):
                 {'error': str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except ConcurrencyException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_409_CONFLICT
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(manual_parameters=[IF_MATCH_HEADER])
     def partial_update(self, request, pk=None):
         """Actualizar libro parcialmente"""
         return self.update(request, pk)
@@ -235,8 +450,44 @@ class BookViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(
+        operation_description="Sugerencias de títulos y autores que empiezan por el prefijo",
+        manual_parameters=[
+            openapi.Parameter('prefix', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True, description='Texto escrito por el usuario'),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Máximo de sugerencias por tipo (1-25, por defecto 10)'),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='suggest')
+    def suggest(self, request):
+        """Autocompletado por prefijo de títulos y autores"""
+        try:
+            limit = int(request.GET.get('limit', 10))
+            books, authors = self.suggest_books_use_case.execute(
+                request.GET.get('prefix', ''), limit
+            )
+            return Response({
+                'titles': [
+                    {'id': book.id, 'title': book.title, 'author_name': book.author_name}
+                    for book in books
+                ],
+                'authors': [
+                    {'id': author.id, 'name': author.name}
+                    for author in authors
+                ]
+            })
+        except (ValidationException, ValueError) as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-class LoanViewSet(viewsets.ViewSet):
+
+class LoanViewSet(ReplicaRoutingMixin, viewsets.ViewSet):
     """
     ViewSet para gestión de préstamos usando Clean Architecture.
     
@@ -251,28 +502,52 @@ class LoanViewSet(viewsets.ViewSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Dependency Injection
-        self.loan_repository = DjangoLoanRepository()
-        self.book_repository = DjangoBookRepository()
-        self.user_repository = DjangoUserRepository()
+        self.loan_repository = get_loan_repository()
+        self.book_repository = get_book_repository()
+        self.user_repository = get_user_repository()
+        self.stock_publisher = BrokerStockChangePublisher(get_stock_broker())
+        self.event_publisher = OutboxEventPublisher()
+        self.idempotency_store = DjangoIdempotencyStore()
         
         # Use Cases
         self.get_loan_use_case = GetLoanUseCase(self.loan_repository)
         self.list_loans_use_case = ListLoansUseCase(self.loan_repository)
+        self.list_loans_page_use_case = ListLoansPageUseCase(self.loan_repository)
+        unit_of_work, clock = get_unit_of_work(), get_clock()
         self.create_loan_use_case = CreateLoanUseCase(
-            self.loan_repository, self.book_repository, self.user_repository
+            self.loan_repository, self.book_repository, self.user_repository,
+            unit_of_work, clock, self.stock_publisher, self.event_publisher,
+            loan_period=timedelta(days=settings.LOAN_PERIOD_DAYS)
         )
         self.return_loan_use_case = ReturnLoanUseCase(
-            self.loan_repository, self.book_repository
+            self.loan_repository, self.book_repository, unit_of_work, clock,
+            self.stock_publisher, self.event_publisher
         )
         self.delete_loan_use_case = DeleteLoanUseCase(self.loan_repository)
+        self.list_overdue_loans_use_case = ListOverdueLoansUseCase(self.loan_repository, clock)
+        self.list_loan_history_use_case = ListLoanHistoryUseCase(self.loan_repository)
 
     def get_permissions(self):
         if self.action == 'create':
             return [IsAuthenticated(), IsStudent()]
-        if self.action == 'return_loan':
+        if self.action in ['return_loan', 'overdue']:
             return [IsAuthenticated(), IsLibrarian()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == 'create':
+            throttles += [LoanCreateThrottle(), LoanCreateEndpointThrottle()]
+        return throttles
+
+    @swagger_auto_schema(
+        operation_description="Listar préstamos; con compact=true los estudiantes y libros van aparte en 'included'",
+        manual_parameters=[
+            openapi.Parameter('compact', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN, description='Devolver {results, included: {students, books}} con student_id/book_id en cada préstamo (no combinable con fields)'),
+            FIELDS_PARAMETER,
+            *PAGE_PARAMETERS,
+        ],
+    )
     def list(self, request):
         """Listar préstamos"""
         try:
@@ -284,12 +559,42 @@ class LoanViewSet(viewsets.ViewSet):
             is_librarian = request.user.groups.filter(name='Librarians').exists()
             user_id = request.user.id if not is_librarian else None
             
-            loans = self.list_loans_use_case.execute(
-                user_id=user_id, 
-                is_librarian=is_librarian
+            compact = request.GET.get('compact', '').lower() == 'true'
+            fields = _requested_fields(request, LoanSerializer)
+            if compact and fields:
+                # La forma compacta es fija (student_id/book_id + included)
+                raise ValidationException("compact=true no admite fields")
+            requested_page = _requested_page(request)
+            
+            if requested_page:
+                page_number, page_size, exact = requested_page
+                page = self.list_loans_page_use_case.execute(
+                    user_id=request.user.id,
+                    is_librarian=is_librarian,
+                    page=page_number,
+                    page_size=page_size,
+                    fields=fields,
+                    exact_total=exact
+                )
+                loans = page.items
+            else:
+                loans = self.list_loans_use_case.execute(
+                    user_id=user_id, 
+                    is_librarian=is_librarian,
+                    fields=fields
+                )
+            if compact:
+                data = CompactLoanListSerializer(loans).data
+            else:
+                data = LoanSerializer(loans, many=True, fields=fields).data
+            if requested_page:
+                return Response(_page_data(page, page_number, data))
+            return Response(data)
+        except ValidationException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
             )
-            serializer = LoanSerializer(loans, many=True)
-            return Response(serializer.data)
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -322,6 +627,8 @@ class LoanViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(manual_parameters=[IDEMPOTENCY_KEY_HEADER])
+    @idempotent
     def create(self, request):
         """Crear nuevo préstamo"""
         try:
@@ -379,6 +686,82 @@ class LoanViewSet(viewsets.ViewSet):
             )
 
 
+    @swagger_auto_schema(
+        operation_description="Listar préstamos activos vencidos, ordenados por fecha límite",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Préstamos por página (1-500)'),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='next_cursor de la página anterior'),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='overdue')
+    def overdue(self, request):
+        """Listar préstamos vencidos (solo bibliotecarios)"""
+        try:
+            limit = int(request.GET.get('limit', 50))
+            loans, total = self.list_overdue_loans_use_case.execute(
+                after=_decode_loan_cursor(request.GET.get('cursor')),
+                limit=limit
+            )
+            serializer = LoanSerializer(loans, many=True)
+            next_cursor = None
+            if len(loans) == limit:
+                next_cursor = _encode_loan_cursor(loans[-1].due_at, loans[-1].id)
+            return Response({
+                'count': total,
+                'results': serializer.data,
+                'next_cursor': next_cursor
+            })
+        except (ValidationException, ValueError) as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+    @swagger_auto_schema(
+        operation_description="Histórico de préstamos archivados, del más reciente al más antiguo",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Préstamos por página (1-100)'),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='next_cursor de la página anterior'),
+            openapi.Parameter('student_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Filtrar por estudiante (solo bibliotecarios)'),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='history')
+    def history(self, request):
+        """Listar préstamos archivados (estudiantes: solo los suyos)"""
+        try:
+            is_librarian = request.user.groups.filter(name='Librarians').exists()
+            student_id = request.GET.get('student_id')
+            limit = int(request.GET.get('limit', 50))
+            loans = self.list_loan_history_use_case.execute(
+                user_id=request.user.id,
+                is_librarian=is_librarian,
+                student_id=int(student_id) if student_id else None,
+                before=_decode_loan_cursor(request.GET.get('cursor')),
+                limit=limit
+            )
+            serializer = LoanSerializer(loans, many=True)
+            next_cursor = None
+            if len(loans) == limit:
+                next_cursor = _encode_loan_cursor(loans[-1].borrowed_at, loans[-1].id)
+            return Response({'results': serializer.data, 'next_cursor': next_cursor})
+        except (ValidationException, ValueError) as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class UserViewSet(viewsets.ViewSet):
     """
     ViewSet para gestión de usuarios usando Clean Architecture.
@@ -397,14 +780,15 @@ class UserViewSet(viewsets.ViewSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Dependency Injection
-        self.user_repository = DjangoUserRepository()
+        self.user_repository = get_user_repository()
         
         # Use Cases
         self.get_user_use_case = GetUserUseCase(self.user_repository)
         self.list_users_use_case = ListUsersUseCase(self.user_repository)
+        self.list_users_page_use_case = ListUsersPageUseCase(self.user_repository)
         self.create_user_use_case = CreateUserUseCase(self.user_repository)
         self.update_user_use_case = UpdateUserUseCase(self.user_repository)
-        self.delete_user_use_case = DeleteUserUseCase(self.user_repository)
+        self.delete_user_use_case = DeleteUserUseCase(self.user_repository, get_loan_repository())
         self.get_user_by_username_use_case = GetUserByUsernameUseCase(self.user_repository)
 
     def get_permissions(self):
@@ -413,6 +797,7 @@ class UserViewSet(viewsets.ViewSet):
         # Solo bibliotecarios pueden hacer operaciones CRUD sobre usuarios
         return [IsAuthenticated(), IsLibrarian()]
 
+    @swagger_auto_schema(manual_parameters=[FIELDS_PARAMETER, *PAGE_PARAMETERS])
     def list(self, request):
         """Listar usuarios (solo bibliotecarios)"""
         try:
@@ -426,9 +811,23 @@ class UserViewSet(viewsets.ViewSet):
                 elif role_filter == 'librarian':
                     role = UserRole.LIBRARIAN
             
-            users = self.list_users_use_case.execute(role=role)
-            serializer = UserSerializer(users, many=True)
+            fields = _requested_fields(request, UserSerializer)
+            requested_page = _requested_page(request)
+            if requested_page:
+                page_number, page_size, exact = requested_page
+                page = self.list_users_page_use_case.execute(
+                    page_number, page_size, role=role, fields=fields, exact_total=exact
+                )
+                serializer = UserSerializer(page.items, many=True, fields=fields)
+                return Response(_page_data(page, page_number, serializer.data))
+            users = self.list_users_use_case.execute(role=role, fields=fields)
+            serializer = UserSerializer(users, many=True, fields=fields)
             return Response(serializer.data)
+        except ValidationException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
@@ -440,7 +839,7 @@ class UserViewSet(viewsets.ViewSet):
         try:
             user = self.get_user_use_case.execute(int(pk))
             serializer = UserSerializer(user)
-            return Response(serializer.data)
+            return _with_etag(Response(serializer.data), user)
         except NotFoundException as e:
             return Response(
                 {'error': str(e)}, 
@@ -486,6 +885,10 @@ class UserViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(
+        manual_parameters=[IF_MATCH_HEADER],
+        responses={409: 'El usuario cambió desde que se leyó (If-Match o escritura concurrente)'}
+    )
     def update(self, request, pk=None):
         """Actualizar usuario completo (solo bibliotecarios)"""
         try:
@@ -506,10 +909,11 @@ class UserViewSet(viewsets.ViewSet):
                 email=data.get('email'),
                 first_name=data.get('first_name'),
                 last_name=data.get('last_name'),
-                role=role
+                role=role,
+                expected_version=_if_match_version(request)
             )
             serializer = UserSerializer(user)
-            return Response(serializer.data)
+            return _with_etag(Response(serializer.data), user)
         except NotFoundException as e:
             return Response(
                 {'error': str(e)}, 
@@ -520,12 +924,18 @@ class UserViewSet(viewsets.ViewSet):
                 {'error': str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except ConcurrencyException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_409_CONFLICT
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(manual_parameters=[IF_MATCH_HEADER])
     def partial_update(self, request, pk=None):
         """Actualizar usuario parcialmente (solo bibliotecarios)"""
         return self.update(request, pk)
@@ -576,4 +986,191 @@ class UserViewSet(viewsets.ViewSet):
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class JobViewSet(viewsets.ViewSet):
+    """
+    ViewSet para trabajos en segundo plano (solo bibliotecarios).
+    
+    Los trabajos se encolan en la base de datos y los ejecuta `manage.py run_worker`:
+    - list: Listar trabajos recientes
+    - create: Encolar un trabajo (import_books, export_loans, circulation_report)
+    - retrieve: Consultar estado y resultado de un trabajo
+    - download: Descargar el archivo generado por una exportación
+    """
+    permission_classes = [IsAuthenticated, IsLibrarian]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Dependency Injection
+        self.job_repository = DjangoJobRepository()
+        self.idempotency_store = DjangoIdempotencyStore()
+        
+        # Use Cases
+        self.submit_job_use_case = SubmitJobUseCase(self.job_repository, JOB_HANDLERS.keys())
+        self.get_job_use_case = GetJobUseCase(self.job_repository)
+        self.list_jobs_use_case = ListJobsUseCase(self.job_repository)
+
+    def list(self, request):
+        """Listar trabajos recientes"""
+        try:
+            jobs = self.list_jobs_use_case.execute()
+            serializer = JobSerializer(jobs, many=True)
+            return Response(serializer.data)
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @swagger_auto_schema(
+        operation_description="Encolar un trabajo pesado para ejecutarse fuera de los workers web",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=['job_type'],
+            properties={
+                'job_type': openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description='import_books | export_loans | circulation_report'
+                ),
+                'params': openapi.Schema(type=openapi.TYPE_OBJECT, description='Parámetros del trabajo'),
+            },
+        ),
+        manual_parameters=[IDEMPOTENCY_KEY_HEADER],
+        responses={202: JobSerializer, 400: 'Error de validación'}
+    )
+    @idempotent
+    def create(self, request):
+        """Encolar trabajo"""
+        try:
+            data = request.data
+            job = self.submit_job_use_case.execute(
+                job_type=data['job_type'],
+                params=data.get('params'),
+                created_by_id=request.user.id
+            )
+            serializer = JobSerializer(job)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        except (ValidationException, KeyError) as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def retrieve(self, request, pk=None):
+        """Obtener estado de un trabajo"""
+        try:
+            job = self.get_job_use_case.execute(int(pk))
+            serializer = JobSerializer(job)
+            return Response(serializer.data)
+        except NotFoundException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=['get'], url_path='download')
+    def download(self, request, pk=None):
+        """Descargar el archivo generado por un trabajo de exportación"""
+        try:
+            job = self.get_job_use_case.execute(int(pk))
+            if not job.result or 'path' not in job.result:
+                return Response(
+                    {'error': 'El trabajo no tiene un archivo disponible'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            # FileResponse envía el archivo por bloques, sin leerlo entero en memoria
+            return FileResponse(
+                open_export(job.result['path']),
+                as_attachment=True,
+                filename=job.result.get('filename', 'export'),
+                content_type=job.result.get('content_type', 'application/octet-stream')
+            )
+        except NotFoundException as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class StatsViewSet(viewsets.ViewSet):
+    """
+    Estadísticas de circulación (solo bibliotecarios).
+    
+    Se responden desde rollups diarios mantenidos por el procesador del outbox,
+    sin agregar la tabla de préstamos. Rango opcional con ?from=YYYY-MM-DD&to=YYYY-MM-DD
+    (por defecto, el último año):
+    - books: libros más prestados (?limit=)
+    - genres: préstamos y devoluciones por género
+    - monthly: préstamos y devoluciones por mes
+    """
+    permission_classes = [IsAuthenticated, IsLibrarian]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Dependency Injection
+        self.stats_repository = DjangoCirculationStatsRepository()
+        
+        # Use Cases
+        self.get_book_circulation_use_case = GetBookCirculationUseCase(self.stats_repository)
+        self.get_genre_circulation_use_case = GetGenreCirculationUseCase(self.stats_repository)
+        self.get_monthly_circulation_use_case = GetMonthlyCirculationUseCase(self.stats_repository)
+
+    def _date_range(self, request):
+        start = request.GET.get('from')
+        end = request.GET.get('to')
+        return (
+            date.fromisoformat(start) if start else None,
+            date.fromisoformat(end) if end else None,
+        )
+
+    def _stats_response(self, compute):
+        try:
+            return Response([vars(row) for row in compute()])
+        except (ValidationException, ValueError) as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'], url_path='books')
+    def books(self, request):
+        """Libros más prestados"""
+        return self._stats_response(lambda: self.get_book_circulation_use_case.execute(
+            *self._date_range(request), limit=int(request.GET.get('limit', 20))
+        ))
+
+    @action(detail=False, methods=['get'], url_path='genres')
+    def genres(self, request):
+        """Circulación por género"""
+        return self._stats_response(lambda: self.get_genre_circulation_use_case.execute(
+            *self._date_range(request)
+        ))
+
+    @action(detail=False, methods=['get'], url_path='monthly')
+    def monthly(self, request):
+        """Circulación mensual"""
+        return self._stats_response(lambda: self.get_monthly_circulation_use_case.execute(
+            *self._date_range(request)
+        ))
\ No newline at end of file
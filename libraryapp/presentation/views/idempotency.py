@@ -0,0 +1,91 @@
+"""Soporte de la cabecera Idempotency-Key para endpoints POST"""
+import functools
+import hashlib
+import json
+
+from django.db import transaction
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_KEY_HEADER = openapi.Parameter(
+    'Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING,
+    description='Clave única por operación: los reintentos con la misma clave devuelven la respuesta original'
+)
+
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request) -> str:
+    """sha256 del método, la ruta y el cuerpo normalizado de la petición"""
+    body = json.dumps(request.data, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256()
+    for part in (request.method, request.path, body):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def idempotent(view_method):
+    """
+    Decorador para acciones de un ViewSet con `self.idempotency_store`.
+
+    Sin cabecera Idempotency-Key la acción se ejecuta normalmente. Con ella:
+    - primera petición: se reserva la clave, se ejecuta y se guarda la respuesta
+      en la misma transacción que la operación, así que no puede quedar hecha
+      sin respuesta guardada (las respuestas 5xx y los conflictos de versión
+      409 no se guardan: el reintento vuelve a ejecutarse)
+    - reintento con la misma petición: se devuelve la respuesta guardada sin ejecutar
+    - reintento mientras la original sigue en curso: 409 con Retry-After; si la
+      original murió, su reserva caduca y el reintento la vuelve a tomar
+    - misma clave con otra petición: 422
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'Idempotency-Key no puede superar {MAX_KEY_LENGTH} caracteres'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        store = self.idempotency_store
+        user_id = request.user.id
+        fingerprint = request_fingerprint(request)
+
+        record = store.get(user_id, key)
+        if (record is None or not record.completed) and store.claim(user_id, key, fingerprint):
+            try:
+                with transaction.atomic():
+                    response = view_method(self, request, *args, **kwargs)
+                    stored = not (
+                        response.status_code >= 500 or response.status_code == status.HTTP_409_CONFLICT
+                    )
+                    if stored:
+                        store.complete(user_id, key, response.status_code, response.data)
+            except Exception:
+                store.release(user_id, key)
+                raise
+            if not stored:
+                store.release(user_id, key)
+            return response
+
+        # Otra petición reservó la clave entre la búsqueda y la reserva
+        if record is None:
+            record = store.get(user_id, key)
+        if record is not None and record.fingerprint != fingerprint:
+            return Response(
+                {'error': 'La Idempotency-Key ya se usó con otra petición'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        if record is None or not record.completed:
+            return Response(
+                {'error': 'Hay una petición en curso con esta Idempotency-Key'},
+                status=status.HTTP_409_CONFLICT,
+                headers={'Retry-After': '1'}
+            )
+        return Response(record.body, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+
+    return wrapper
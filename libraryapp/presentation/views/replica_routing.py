@@ -0,0 +1,28 @@
+"""Lecturas en réplicas para acciones completas de un ViewSet"""
+from ...infrastructure.database.replica_router import begin_replica_reads, end_replica_reads
+
+
+class ReplicaRoutingMixin:
+    """
+    Las acciones de `replica_actions` leen de una réplica también en los métodos
+    de repositorio compartidos con escrituras (p. ej. get_by_id en retrieve).
+
+    La lectura de las propias escrituras no depende de este mixin: la aplica
+    ReplicaRoutingMiddleware a todas las vistas.
+    """
+    replica_actions = ('retrieve',)
+
+    def uses_replica(self, request) -> bool:
+        return self.action in self.replica_actions
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = begin_replica_reads() if self.uses_replica(request) else None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # initial() puede no haber terminado (autenticación o permisos denegados)
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            end_replica_reads(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
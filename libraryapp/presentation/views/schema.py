@@ -0,0 +1,99 @@
+"""
+Esquema OpenAPI generado una sola vez por proceso.
+
+drf_yasg recorre todos los ViewSets y decoradores swagger_auto_schema para
+construir el esquema: cuesta segundos de CPU. En producción `manage.py
+generate_schema` lo escribe durante el build como archivo estático (servido
+también por WhiteNoise); si no existe, se genera en la primera petición y se
+guarda en memoria. Swagger UI y ReDoc cargan el esquema de SPEC_URL, así que
+sus páginas no recorren las vistas.
+
+drf_yasg.views, drf_yasg.codecs y drf_yasg.generators (con jsonschema y los
+validadores de Swagger) se importan en la primera petición de documentación,
+no al arrancar cada worker.
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponse
+from drf_yasg import openapi
+from rest_framework import permissions
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="Library Management API",
+    default_version='v2.0',
+    description="Library Management API",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@library.local"),
+    license=openapi.License(name="BSD License"),
+)
+
+
+def _ui_view(renderer: str):
+    """Página de Swagger UI o ReDoc; la vista de drf_yasg se construye en la primera petición"""
+    view = None
+
+    def ui(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            from drf_yasg.views import get_schema_view
+            # El generador de las UI no recorre endpoints: el esquema llega de SPEC_URL
+            view = get_schema_view(
+                API_INFO,
+                public=True,
+                permission_classes=[permissions.AllowAny],
+            ).with_ui(renderer, cache_timeout=0)
+        return view(request, *args, **kwargs)
+
+    return ui
+
+
+swagger_ui = _ui_view('swagger')
+redoc_ui = _ui_view('redoc')
+
+_lock = threading.Lock()
+_schema: Optional[bytes] = None
+
+
+def _config():
+    return getattr(settings, 'OPENAPI_SCHEMA', {})
+
+
+def schema_file() -> Path:
+    return Path(_config().get('FILE', settings.BASE_DIR / 'libraryapp' / 'static' / 'openapi' / 'swagger.json'))
+
+
+def generate_schema() -> bytes:
+    """Generar el esquema completo recorriendo todas las vistas"""
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    schema = OpenAPISchemaGenerator(API_INFO).get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def get_schema() -> bytes:
+    """Esquema del archivo generado en el build (con PREBUILT) o generado una vez en memoria"""
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                path = schema_file()
+                if _config().get('PREBUILT') and path.exists():
+                    _schema = path.read_bytes()
+                else:
+                    logger.info("Generando el esquema OpenAPI en memoria")
+                    _schema = generate_schema()
+    return _schema
+
+
+def openapi_schema(request):
+    """GET /swagger.json"""
+    response = HttpResponse(get_schema(), content_type='application/json')
+    response['Cache-Control'] = f"public, max-age={_config().get('MAX_AGE', 3600)}"
+    return response
@@ -0,0 +1,82 @@
+"""Vistas de streaming (Server-Sent Events) servidas vía ASGI"""
+import asyncio
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ...infrastructure.external.stock_broker import get_stock_broker
+
+
+def _extract_token(request):
+    """El token puede venir en el header o en ?token= (EventSource no envía headers)"""
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Bearer '):
+        return header[len('Bearer '):].strip()
+    return request.GET.get('token')
+
+
+def _parse_book_ids(raw):
+    if not raw:
+        return None
+    return {int(value) for value in raw.split(',') if value.strip()}
+
+
+async def _stock_event_stream(book_ids):
+    config = getattr(settings, 'STOCK_EVENTS', {})
+    heartbeat = config.get('HEARTBEAT_SECONDS', 15)
+    max_seconds = config.get('MAX_STREAM_SECONDS', 300)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    subscription = get_stock_broker().subscribe(book_ids)
+    try:
+        # El cliente reconecta solo al cerrar el stream por tiempo máximo
+        yield 'retry: 3000\n\n'
+        while loop.time() < deadline:
+            changes = await subscription.wait(heartbeat)
+            if not changes:
+                yield ': keep-alive\n\n'
+                continue
+            for change in changes:
+                yield f'event: stock\ndata: {change.to_json()}\n\n'
+    finally:
+        subscription.close()
+
+
+async def book_stock_stream(request):
+    """
+    Stream SSE con los cambios de stock de los libros.
+
+    Parámetros opcionales:
+    - book_ids: lista separada por comas para limitar los libros observados
+    - token: JWT de acceso cuando el cliente no puede enviar el header Authorization
+
+    Bajo WSGI responde 501: cada conexión retendría un worker síncrono de gunicorn
+    hasta MAX_STREAM_SECONDS. Los clientes se conectan al servicio ASGI (library-stream).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'El stream de stock solo se sirve desde el servicio ASGI (library-stream)'}, status=501
+        )
+    token = _extract_token(request)
+    if not token:
+        return JsonResponse({'error': 'Token de autenticación requerido'}, status=401)
+    try:
+        AccessToken(token)
+    except TokenError as e:
+        return JsonResponse({'error': str(e)}, status=401)
+
+    try:
+        book_ids = _parse_book_ids(request.GET.get('book_ids'))
+    except ValueError:
+        return JsonResponse({'error': 'book_ids debe ser una lista de enteros'}, status=400)
+
+    response = StreamingHttpResponse(
+        _stock_event_stream(book_ids), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
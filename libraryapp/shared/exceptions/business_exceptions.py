@@ -16,6 +16,11 @@ class BusinessRuleException(BusinessException):
     pass
 
 
+class ConcurrencyException(BusinessException):
+    """Excepción cuando otra operación modificó la entidad después de leerla (versión distinta)"""
+    pass
+
+
 class NotFoundException(BusinessException):
     """Excepción base para entidades no encontradas"""
     pass
@@ -43,4 +48,9 @@ class AuthorNotFoundException(NotFoundException):
 
 class GenreNotFoundException(NotFoundException):
     """Excepción cuando no se encuentra un género"""
+    pass
+
+
+class JobNotFoundException(NotFoundException):
+    """Excepción cuando no se encuentra un trabajo en segundo plano"""
     pass
\ No newline at end of file
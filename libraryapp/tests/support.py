@@ -0,0 +1,79 @@
+"""
+Utilidades compartidas por las pruebas.
+
+Las pruebas de casos de uso usan su propio MemoryStore, un reloj fijo y un
+publicador de eventos que solo los acumula; las de presentación e
+infraestructura usan la base de datos de pruebas y la caché 'ratelimit'.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from ..application.interfaces.clock import Clock
+from ..application.interfaces.event_publisher import EventPublisher
+from ..application.use_cases.loan_use_cases import CreateLoanUseCase, ReturnLoanUseCase
+from ..domain.entities.book import Book
+from ..domain.entities.user import User, UserRole
+from ..domain.events.domain_events import DomainEvent
+from ..infrastructure.repositories.memory_book_repository import MemoryBookRepository
+from ..infrastructure.repositories.memory_loan_repository import MemoryLoanRepository
+from ..infrastructure.repositories.memory_store import MemoryStore
+from ..infrastructure.repositories.memory_unit_of_work import MemoryUnitOfWork
+from ..infrastructure.repositories.memory_user_repository import MemoryUserRepository
+
+
+class FixedClock(Clock):
+    """Reloj que solo avanza cuando la prueba lo pide"""
+
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def now(self) -> datetime:
+        return self.current
+
+    def advance(self, delta: timedelta) -> None:
+        self.current += delta
+
+
+class RecordingEventPublisher(EventPublisher):
+    """Acumula los eventos publicados"""
+
+    def __init__(self):
+        self.events: List[DomainEvent] = []
+
+    def publish(self, events: List[DomainEvent]) -> None:
+        self.events.extend(events)
+
+
+class LibraryFixture:
+    """Almacén en memoria con repositorios y casos de uso de préstamos"""
+
+    def setUp(self):
+        super().setUp()
+        self.store = MemoryStore()
+        self.books = MemoryBookRepository(self.store)
+        self.loans = MemoryLoanRepository(self.store)
+        self.users = MemoryUserRepository(self.store)
+        self.unit_of_work = MemoryUnitOfWork(self.store)
+        self.clock = FixedClock(datetime(2024, 9, 2, 9, 0, tzinfo=timezone.utc))
+        self.events = RecordingEventPublisher()
+        self.create_loan = CreateLoanUseCase(
+            self.loans, self.books, self.users, self.unit_of_work, self.clock,
+            event_publisher=self.events
+        )
+        self.return_loan = ReturnLoanUseCase(
+            self.loans, self.books, self.unit_of_work, self.clock, event_publisher=self.events
+        )
+
+    def add_student(self, username: str) -> User:
+        return self.users.save(User(id=None, username=username, email=f'{username}@university.com'))
+
+    def add_librarian(self, username: str) -> User:
+        return self.users.save(User(
+            id=None, username=username, email=f'{username}@library.com', role=UserRole.LIBRARIAN
+        ))
+
+    def add_book(self, title: str, stock: int = 1) -> Book:
+        return self.books.save(Book(
+            id=None, title=title, author_name='Gabriel García Márquez',
+            published_year=1967, genre_name='Realismo mágico', stock=stock
+        ))
@@ -0,0 +1,94 @@
+"""Libros: eventos de la entidad, concurrencia optimista (If-Match) y listados compactos"""
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from ..application.use_cases.book_use_cases import UpdateBookUseCase
+from ..domain.entities.book import Book
+from ..shared.exceptions.business_exceptions import ConcurrencyException
+from .support import LibraryFixture
+
+
+class EntityEventsTests(SimpleTestCase):
+
+    def test_events_list_created_on_first_event(self):
+        book = Book(id=1, title='Rayuela', author_name='Julio Cortázar', published_year=1963,
+                    genre_name='Novela', stock=1)
+        self.assertIsNone(book.events)
+        self.assertEqual(book.pull_events(), [])
+
+        book.update_stock(3, datetime(2024, 9, 2, 9, 0, tzinfo=timezone.utc))
+        events = book.pull_events()
+        self.assertEqual([event.stock for event in events], [3])
+        self.assertIsNone(book.events)
+
+
+class BookVersionTests(LibraryFixture, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.update_book = UpdateBookUseCase(self.books, self.unit_of_work, self.clock)
+        self.book = self.add_book('Cien años de soledad', stock=2)
+
+    def test_if_match_current_version(self):
+        book = self.update_book.execute(self.book.id, stock=5, expected_version=self.book.version)
+        self.assertEqual(book.stock, 5)
+        self.assertEqual(book.version, self.book.version + 1)
+
+    def test_if_match_stale_version(self):
+        self.update_book.execute(self.book.id, title='Cien años de soledad (ed. 2)')
+
+        with self.assertRaises(ConcurrencyException):
+            self.update_book.execute(self.book.id, stock=5, expected_version=self.book.version)
+        self.assertEqual(self.books.get_by_id(self.book.id).stock, 2)
+
+    def test_edit_after_checkout_conflicts(self):
+        # Un préstamo avanza la versión: la edición leída antes no pisa su stock
+        stale = self.books.get_by_id(self.book.id)
+        self.create_loan.execute(self.add_student('estudiante1').id, self.book.id)
+
+        stale.update_stock(10, self.clock.now())
+        with self.assertRaises(ConcurrencyException):
+            self.books.save(stale)
+        self.assertEqual(self.books.get_by_id(self.book.id).stock, 1)
+
+
+class BookListingApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='estudiante1'))
+
+    def test_sparse_fields(self):
+        data = self.client.get('/api/books/', {'fields': 'id,title', 'author_name': 'orwell'}).data
+        self.assertEqual(len(data), 1)
+        self.assertEqual(set(data[0]), {'id', 'title'})
+        self.assertEqual(data[0]['title'], '1984')
+
+        response = self.client.get('/api/books/', {'fields': 'title,isbn'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('isbn', response.data['error'])
+
+    def test_page_in_title_order(self):
+        data = self.client.get('/api/books/', {'page': 2, 'page_size': 3, 'fields': 'title'}).data
+        self.assertEqual(
+            [book['title'] for book in data['results']],
+            ['El principito', 'Fundación', 'La sombra del viento']
+        )
+        self.assertEqual(
+            (data['count'], data['count_is_estimate'], data['page'], data['page_size'], data['has_next']),
+            (8, False, 2, 3, True)
+        )
+
+        data = self.client.get('/api/books/', {'page': 3, 'page_size': 3, 'available': 'true'}).data
+        self.assertEqual((len(data['results']), data['has_next']), (2, False))
+
+    def test_invalid_page(self):
+        for params in ({'page': 0}, {'page': 1, 'page_size': 501}, {'page': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/books/', params).status_code, 400)
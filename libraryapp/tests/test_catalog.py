@@ -0,0 +1,185 @@
+"""Catálogo: facetas, sugerencias por prefijo y copia en memoria con máscaras de bits"""
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from ..infrastructure.cache.catalog_snapshot import CatalogSnapshot
+from ..infrastructure.external.stock_broker import BookChange, StockChange
+from ..infrastructure.models.django_models import DjangoAuthor, DjangoBook, DjangoGenre
+from ..infrastructure.repositories.django_book_repository import DjangoBookRepository
+from ..infrastructure.repositories.prefix_search import _next_prefix
+
+
+def add_book(title: str, author_name: str, genre_name: str, published_year: int, stock: int) -> DjangoBook:
+    author, _ = DjangoAuthor.objects.get_or_create(name=author_name)
+    genre, _ = DjangoGenre.objects.get_or_create(name=genre_name)
+    return DjangoBook.objects.create(
+        title=title, author=author, genre=genre, published_year=published_year, stock=stock
+    )
+
+
+class CatalogApiTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='estudiante1'))
+
+
+class BookFacetsApiTests(CatalogApiTestCase):
+
+    def test_facets_count_the_filtered_catalog(self):
+        add_book('Historias de cronopios', 'Julio Cortázar', 'Cuento', 1962, 0)
+
+        data = self.client.get('/api/books/', {'facets': 'true'}).data
+        facets = data['facets']
+        self.assertEqual(len(data['results']), 9)
+        self.assertEqual(facets['total'], 9)
+        self.assertEqual(facets['authors'][0], {
+            'value': DjangoAuthor.objects.get(name='Julio Cortázar').id, 'label': 'Julio Cortázar', 'count': 2
+        })
+        self.assertIn({'value': 1960, 'label': '1960s', 'count': 3}, facets['decades'])
+        self.assertEqual(facets['availability'], [
+            {'value': True, 'label': 'available', 'count': 8},
+            {'value': False, 'label': 'unavailable', 'count': 1},
+        ])
+
+        facets = self.client.get('/api/books/', {'facets': 'true', 'author_name': 'cortázar'}).data['facets']
+        self.assertEqual(facets['total'], 2)
+        self.assertEqual([value['label'] for value in facets['genres']], ['Cuento', 'Literatura experimental'])
+
+    def test_plain_listing_without_facets(self):
+        data = self.client.get('/api/books/').data
+        self.assertIsInstance(data, list)
+
+
+class SuggestApiTests(CatalogApiTestCase):
+
+    def test_prefix_is_case_insensitive(self):
+        add_book('Ciencia ficción reunida', 'Isaac Asimov', 'Ciencia ficción', 1990, 1)
+
+        data = self.client.get('/api/books/suggest/', {'prefix': 'CIEN'}).data
+        self.assertEqual(
+            [book['title'] for book in data['titles']], ['Cien años de soledad', 'Ciencia ficción reunida']
+        )
+        data = self.client.get('/api/books/suggest/', {'prefix': 'julio', 'limit': 1}).data
+        self.assertEqual(data['authors'], [
+            {'id': DjangoAuthor.objects.get(name='Julio Cortázar').id, 'name': 'Julio Cortázar'}
+        ])
+
+    def test_invalid_requests(self):
+        for params in ({}, {'prefix': '  '}, {'prefix': 'cien', 'limit': 26}, {'prefix': 'cien', 'limit': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/books/suggest/', params).status_code, 400)
+
+
+class NextPrefixTests(SimpleTestCase):
+
+    def test_upper_bound(self):
+        self.assertEqual(_next_prefix('cien'), 'cieo')
+        # Los sustitutos (U+D800-U+DFFF) se saltan
+        self.assertEqual(_next_prefix('a\ud7ff'), 'a\ue000')
+        self.assertEqual(_next_prefix('a\U0010ffff'), 'a\U0010ffff')
+
+
+class CatalogSnapshotTests(TestCase):
+
+    FILTERS = [
+        {},
+        {'author_name': 'garcía'},
+        {'genre_name': 'clásic'},
+        {'title': 'de'},
+        {'available': 'true'},
+        {'available': 'false'},
+        {'published_year_min': 1900, 'published_year_max': 1965},
+        {'published_year': 1949},
+        {'stock': 4},
+        {'genre_name': 'novela', 'published_year_min': 1700},
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.empty = add_book('Antología vacía', 'Autor Anónimo', 'Poesía', 1999, 0)
+        self.snapshot = CatalogSnapshot()
+        self.snapshot.load()
+
+    def titles(self, filters=None):
+        return [book.title for book in self.snapshot.filter(filters or {})]
+
+    def upsert(self, book: DjangoBook, **changes) -> BookChange:
+        fields = {
+            'title': book.title, 'author_id': book.author_id, 'author_name': book.author.name,
+            'genre_id': book.genre_id, 'genre_name': book.genre.name,
+            'published_year': book.published_year, 'stock': book.stock,
+        }
+        fields.update(changes)
+        return BookChange(action='upsert', book_id=book.id, fields=fields)
+
+    def test_filters_match_database(self):
+        repository = DjangoBookRepository()
+        for filters in self.FILTERS:
+            with self.subTest(filters=filters):
+                self.assertEqual(
+                    [(book.id, book.title, book.author_name, book.stock) for book in self.snapshot.filter(filters)],
+                    [(book.id, book.title, book.author_name, book.stock) for book in repository.find_with_filters(filters)]
+                )
+
+    def test_facets_match_database(self):
+        repository = DjangoBookRepository()
+        for filters in ({}, {'available': 'true'}, {'author_name': 'o'}):
+            with self.subTest(filters=filters):
+                self.assertEqual(self.snapshot.facets(filters, 50), repository.facet_counts(filters))
+
+    def test_stock_change_toggles_availability(self):
+        self.snapshot.apply(StockChange(book_id=self.empty.id, stock=2))
+        self.assertIn('Antología vacía', self.titles({'available': 'true'}))
+
+        rayuela = DjangoBook.objects.get(title='Rayuela')
+        self.snapshot.apply(StockChange(book_id=rayuela.id, stock=0))
+        self.assertEqual(self.titles({'available': 'false'}), ['Rayuela'])
+        self.assertEqual(self.snapshot.get(rayuela.id).stock, 0)
+
+    def test_upserts_keep_listing_order(self):
+        rayuela = DjangoBook.objects.get(title='Rayuela')
+        # Cambio de título: la posición nueva se intercala por orden alfabético
+        self.snapshot.apply(self.upsert(rayuela, title='Bestiario'))
+        self.assertEqual(self.titles()[:4], ['1984', 'Antología vacía', 'Bestiario', 'Cien años de soledad'])
+        self.assertEqual(self.titles({'author_name': 'cortázar'}), ['Bestiario'])
+
+        # Alta con autor y género nuevos
+        self.snapshot.apply(BookChange(action='upsert', book_id=999, fields={
+            'title': 'Ficciones', 'author_id': 900, 'author_name': 'Jorge Luis Borges',
+            'genre_id': 901, 'genre_name': 'Cuento', 'published_year': 1944, 'stock': 1,
+        }))
+        titles = self.titles()
+        self.assertEqual(titles[titles.index('El principito') + 1], 'Ficciones')
+        self.assertEqual(self.titles({'genre_name': 'cuento', 'available': 'true'}), ['Ficciones'])
+        self.assertEqual(self.titles({'published_year': 1944}), ['Ficciones'])
+        self.assertEqual(self.snapshot.size(), 10)
+
+        # Mismo título, otro autor: solo se mueve el bit entre máscaras
+        fundacion = DjangoBook.objects.get(title='Fundación')
+        self.snapshot.apply(self.upsert(fundacion, author_id=900, author_name='Jorge Luis Borges'))
+        self.assertEqual(self.titles({'author_name': 'borges'}), ['Ficciones', 'Fundación'])
+        self.assertEqual(self.titles({'author_name': 'asimov'}), [])
+
+    def test_delete_and_reload(self):
+        rayuela = DjangoBook.objects.get(title='Rayuela')
+        self.snapshot.apply(BookChange(action='delete', book_id=rayuela.id))
+        self.assertNotIn('Rayuela', self.titles())
+        self.assertIsNone(self.snapshot.get(rayuela.id))
+
+        DjangoBook.objects.filter(id=self.empty.id).update(title='Zoología fantástica')
+        self.assertNotIn('Zoología fantástica', self.titles())
+        self.snapshot.apply(BookChange(action='reload'))
+        self.assertEqual(self.titles()[-2:], ['Rayuela', 'Zoología fantástica'])
+
+    def test_too_many_appended_positions_force_reload(self):
+        snapshot = CatalogSnapshot(max_appended=1)
+        snapshot.load()
+        columns = snapshot.columns()
+        snapshot.apply(self.upsert(self.empty, title='Zoología fantástica'))
+        self.assertIsNot(snapshot.columns(), columns)
+        self.assertEqual(snapshot.columns().appended, [])
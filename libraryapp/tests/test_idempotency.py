@@ -0,0 +1,76 @@
+"""Claves de idempotencia de la capa de presentación"""
+from django.contrib.auth.models import User as DjangoUser
+from django.test import TestCase
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..infrastructure.repositories.django_idempotency_store import DjangoIdempotencyStore
+from ..presentation.views.idempotency import idempotent
+from ..shared.exceptions.business_exceptions import BusinessRuleException
+from .support import LibraryFixture
+
+
+class IdempotentLoanViewSet(viewsets.ViewSet):
+    """ViewSet mínimo con @idempotent sobre el CreateLoanUseCase en memoria de la prueba"""
+    fixture = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.idempotency_store = DjangoIdempotencyStore()
+
+    @idempotent
+    def create(self, request):
+        try:
+            loan = self.fixture.create_loan.execute(self.fixture.student.id, int(request.data['book_id']))
+            return Response({'id': loan.id, 'stock': loan.book.stock}, status=status.HTTP_201_CREATED)
+        except BusinessRuleException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class IdempotencyTests(LibraryFixture, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.student = self.add_student('estudiante1')
+        self.book = self.add_book('Cien años de soledad', stock=3)
+        self.user = DjangoUser.objects.create_user('idempotencia', 'idempotencia@university.com', 'x')
+        self.view = IdempotentLoanViewSet.as_view({'post': 'create'}, fixture=self)
+        self.factory = APIRequestFactory()
+
+    def post(self, body, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        request = self.factory.post('/api/loans/', body, format='json', **headers)
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    def test_replay_returns_stored_response(self):
+        first = self.post({'book_id': self.book.id}, key='prestamo-1')
+        retry = self.post({'book_id': self.book.id}, key='prestamo-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(len(self.loans.find_active_loans()), 1)
+        self.assertEqual(self.books.get_by_id(self.book.id).stock, 2)
+
+    def test_same_key_other_request(self):
+        self.post({'book_id': self.book.id}, key='prestamo-1')
+        other = self.add_book('El amor en los tiempos del cólera')
+
+        response = self.post({'book_id': other.id}, key='prestamo-1')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.books.get_by_id(other.id).stock, 1)
+
+    def test_business_errors_are_replayed(self):
+        self.post({'book_id': self.book.id})
+        first = self.post({'book_id': self.book.id}, key='prestamo-2')
+        retry = self.post({'book_id': self.book.id}, key='prestamo-2')
+
+        self.assertEqual(first.status_code, 400)
+        self.assertEqual((retry.status_code, retry.data), (400, first.data))
+
+    def test_without_key(self):
+        self.assertEqual(self.post({'book_id': self.book.id}).status_code, 201)
+        self.assertEqual(self.post({'book_id': self.book.id}).status_code, 400)
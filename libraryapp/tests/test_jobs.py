@@ -0,0 +1,126 @@
+"""Cola de trabajos en segundo plano y exportaciones"""
+import csv
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils.timezone import now as django_now
+from rest_framework.test import APIClient
+
+from ..application.use_cases.job_use_cases import SubmitJobUseCase
+from ..infrastructure.jobs.exports import open_export, save_csv_export
+from ..infrastructure.jobs.handlers import JOB_HANDLERS
+from ..infrastructure.jobs.worker import execute_job
+from ..infrastructure.models.django_models import (
+    DjangoBook,
+    DjangoExportChunk,
+    DjangoExportFile,
+    DjangoJob,
+    DjangoLoan,
+)
+from ..infrastructure.repositories.django_job_repository import DjangoJobRepository
+from ..management.commands.run_worker import Command as RunWorkerCommand
+from ..shared.exceptions.business_exceptions import ValidationException
+
+
+class JobQueueTests(TestCase):
+    """Cola de trabajos en la base de datos: reserva, concesiones y reencolado"""
+
+    def setUp(self):
+        self.worker = RunWorkerCommand(stdout=io.StringIO())
+        self.worker.lease = timedelta(seconds=60)
+
+    def job(self, **fields) -> DjangoJob:
+        fields.setdefault('job_type', 'circulation_report')
+        return DjangoJob.objects.create(**fields)
+
+    def test_submit_rejects_unknown_type(self):
+        with self.assertRaises(ValidationException):
+            SubmitJobUseCase(DjangoJobRepository(), JOB_HANDLERS.keys()).execute('borrar_todo')
+
+    def test_claim_oldest_pending(self):
+        first, second, third = self.job(), self.job(), self.job()
+        self.job(status='running')
+
+        self.assertEqual(self.worker._claim_jobs(2), [first.id, second.id])
+        claimed = DjangoJob.objects.get(id=first.id)
+        self.assertEqual((claimed.status, claimed.attempts), ('running', 1))
+        self.assertGreater(claimed.locked_until, django_now())
+        self.assertEqual(DjangoJob.objects.get(id=third.id).status, 'pending')
+
+    def test_renew_lease(self):
+        job = self.job(status='running', locked_until=django_now() + timedelta(seconds=5))
+
+        self.worker._renew_leases([job.id])
+        self.assertGreater(DjangoJob.objects.get(id=job.id).locked_until, django_now() + timedelta(seconds=30))
+
+    def test_requeue_abandoned(self):
+        expired = django_now() - timedelta(seconds=1)
+        retry = self.job(status='running', locked_until=expired, attempts=1)
+        exhausted = self.job(status='running', locked_until=expired, attempts=3)
+        alive = self.job(status='running', locked_until=django_now() + timedelta(seconds=60), attempts=1)
+
+        self.worker._requeue_abandoned(max_attempts=3)
+        self.assertEqual(DjangoJob.objects.get(id=retry.id).status, 'pending')
+        self.assertEqual(DjangoJob.objects.get(id=exhausted.id).status, 'failed')
+        self.assertEqual(DjangoJob.objects.get(id=alive.id).status, 'running')
+
+    @patch('django.db.close_old_connections')
+    def test_failed_handler(self, _):
+        def broken(params):
+            raise RuntimeError('sin conexión')
+
+        job = self.job(status='running')
+        with patch.dict(JOB_HANDLERS, {'circulation_report': broken}):
+            self.assertEqual(execute_job(job.id), 'failed')
+        self.assertIn('sin conexión', DjangoJob.objects.get(id=job.id).error)
+
+
+@override_settings(EXPORTS={'CHUNK_BYTES': 64})
+class ExportTests(TestCase):
+    """Exportaciones guardadas por bloques en la base de datos y descargadas desde la API"""
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='admin'))
+        student = DjangoUser.objects.get(username='estudiante1')
+        for book in DjangoBook.objects.order_by('id')[:3]:
+            DjangoLoan.objects.create(student=student, book=book, due_at=django_now() + timedelta(days=14))
+
+    def test_save_and_read_in_chunks(self):
+        rows = [(number, f'fila {number}') for number in range(20)]
+        path = save_csv_export('prueba', ('id', 'texto'), rows)
+
+        export = DjangoExportFile.objects.get(path=path)
+        self.assertGreater(DjangoExportChunk.objects.filter(export=export).count(), 1)
+        content = open_export(path).read()
+        self.assertEqual(len(content), export.size)
+        self.assertEqual(list(csv.reader(io.StringIO(content.decode('utf-8'))))[1:], [
+            [str(number), text] for number, text in rows
+        ])
+
+    @patch('django.db.close_old_connections')
+    def test_export_job_download(self, _):
+        response = self.client.post('/api/jobs/', {'job_type': 'export_loans'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['id']
+
+        self.assertEqual(execute_job(job_id), 'succeeded')
+        status_response = self.client.get(f'/api/jobs/{job_id}/')
+        self.assertEqual(status_response.data['result']['rows'], 3)
+
+        download = self.client.get(f'/api/jobs/{job_id}/download/')
+        self.assertEqual(download.status_code, 200)
+        lines = b''.join(download.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0], 'id,student,book,borrowed_at,returned_at')
+        self.assertEqual(len(lines), 4)
+
+    def test_missing_export(self):
+        job = DjangoJob.objects.create(
+            job_type='export_loans', status='succeeded', result={'path': 'exports/borrado.csv'}
+        )
+        self.assertEqual(self.client.get(f'/api/jobs/{job.id}/download/').status_code, 404)
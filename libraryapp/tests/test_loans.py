@@ -0,0 +1,240 @@
+"""Préstamos: stock, límite por estudiante, vencidos, archivo y listados de la API"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase
+from django.utils.timezone import now as django_now
+from rest_framework.test import APIClient
+
+from ..application.use_cases.loan_use_cases import (
+    ArchiveLoansUseCase,
+    GetLoanUseCase,
+    ListLoanHistoryUseCase,
+    ListOverdueLoansUseCase,
+    ProcessOverdueLoansUseCase,
+)
+from ..domain.entities.user import User
+from ..domain.events.domain_events import BookStockChanged, LoanCreated, LoanOverdue
+from ..infrastructure.models.django_models import DjangoBook, DjangoLoan
+from ..shared.exceptions.business_exceptions import (
+    BusinessRuleException,
+    LoanNotFoundException,
+    ValidationException,
+)
+from .support import LibraryFixture
+
+
+class LoanStockTests(LibraryFixture, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.student = self.add_student('estudiante1')
+
+    def test_checkout_and_return_adjust_stock(self):
+        book = self.add_book('Cien años de soledad', stock=2)
+
+        loan = self.create_loan.execute(self.student.id, book.id)
+        self.assertEqual(loan.book.stock, 1)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 1)
+
+        returned = self.return_loan.execute(loan.id)
+        self.assertIsNotNone(returned.returned_at)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 2)
+        self.assertEqual(
+            [event.stock for event in self.events.events if isinstance(event, BookStockChanged)], [1, 2]
+        )
+
+    def test_checkout_with_stale_book_does_not_conflict(self):
+        # Otro estudiante se llevó un ejemplar después de leer el libro: con stock
+        # restante el préstamo sale, sin error de versión
+        book = self.add_book('Cien años de soledad', stock=2)
+        stale = self.books.get_by_id(book.id)
+        self.create_loan.execute(self.add_student('estudiante2').id, book.id)
+
+        self.books.get_by_id = lambda book_id: stale
+        loan = self.create_loan.execute(self.student.id, book.id)
+        self.assertEqual(loan.book.stock, 0)
+
+    def test_checkout_without_stock(self):
+        book = self.add_book('Cien años de soledad', stock=1)
+        self.create_loan.execute(self.add_student('estudiante2').id, book.id)
+
+        with self.assertRaises(BusinessRuleException):
+            self.create_loan.execute(self.student.id, book.id)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 0)
+
+    def test_adjust_stock_never_goes_negative(self):
+        book = self.add_book('Cien años de soledad', stock=0)
+        self.assertIsNone(self.books.adjust_stock(book.id, -1))
+        self.assertEqual(self.books.adjust_stock(book.id, 1), 1)
+
+    def test_same_book_twice(self):
+        book = self.add_book('Cien años de soledad', stock=3)
+        self.create_loan.execute(self.student.id, book.id)
+
+        with self.assertRaises(BusinessRuleException):
+            self.create_loan.execute(self.student.id, book.id)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 2)
+
+    def test_limit_of_three_active_loans(self):
+        for number in range(3):
+            self.create_loan.execute(self.student.id, self.add_book(f'Libro {number}').id)
+
+        with self.assertRaises(BusinessRuleException):
+            self.create_loan.execute(self.student.id, self.add_book('Libro 3').id)
+
+    def test_student_locked_before_counting(self):
+        # El recuento de préstamos activos solo es fiable con el estudiante bloqueado
+        calls = []
+        lock_student, summary = self.loans.lock_student, self.loans.active_summary_for_student
+        self.loans.lock_student = lambda student_id: calls.append(('lock', student_id)) or lock_student(student_id)
+        self.loans.active_summary_for_student = (
+            lambda student_id, book_id: calls.append(('count', student_id)) or summary(student_id, book_id)
+        )
+
+        self.create_loan.execute(self.student.id, self.add_book('Cien años de soledad').id)
+        self.assertEqual(calls, [('lock', self.student.id), ('count', self.student.id)])
+
+    def test_librarians_cannot_borrow(self):
+        book = self.add_book('Cien años de soledad')
+        with self.assertRaises(ValidationException):
+            self.create_loan.execute(self.add_librarian('bibliotecario').id, book.id)
+
+    def test_return_twice(self):
+        book = self.add_book('Cien años de soledad')
+        loan = self.create_loan.execute(self.student.id, book.id)
+        self.return_loan.execute(loan.id)
+
+        with self.assertRaises(BusinessRuleException):
+            self.return_loan.execute(loan.id)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 1)
+
+    def test_concurrent_return_of_same_loan(self):
+        # Dos devoluciones leyeron el préstamo activo: solo la primera repone stock
+        book = self.add_book('Cien años de soledad')
+        loan = self.create_loan.execute(self.student.id, book.id)
+        stale = self.loans.get_by_id(loan.id)
+        self.return_loan.execute(loan.id)
+
+        self.loans.get_by_id = lambda loan_id: stale
+        with self.assertRaises(BusinessRuleException):
+            self.return_loan.execute(loan.id)
+        self.assertEqual(self.books.get_by_id(book.id).stock, 1)
+
+    def test_events(self):
+        book = self.add_book('Cien años de soledad')
+        loan = self.create_loan.execute(self.student.id, book.id)
+
+        stock_changed, created = self.events.events
+        self.assertEqual((stock_changed.book_id, stock_changed.stock), (book.id, 0))
+        self.assertIsInstance(created, LoanCreated)
+        self.assertEqual(created.loan_id, loan.id)
+        # La fecha de los eventos sale del reloj del caso de uso, no de la hora del sistema
+        self.assertEqual({stock_changed.occurred_at, created.occurred_at}, {self.clock.now()})
+
+
+class OverdueAndArchiveTests(LibraryFixture, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.student = self.add_student('estudiante1')
+        self.other = self.add_student('estudiante2')
+
+    def borrow(self, student: User, title: str, days_later: int = 0):
+        self.clock.advance(timedelta(days=days_later))
+        return self.create_loan.execute(student.id, self.add_book(title).id)
+
+    def test_overdue_pages_in_due_order(self):
+        first = self.borrow(self.student, 'Libro A')
+        second = self.borrow(self.other, 'Libro B', days_later=1)
+        third = self.borrow(self.student, 'Libro C', days_later=1)
+        self.return_loan.execute(second.id)
+        self.clock.advance(timedelta(days=30))
+
+        overdue = ListOverdueLoansUseCase(self.loans, self.clock)
+        page, count = overdue.execute(limit=1)
+        self.assertEqual(count, 2)
+        self.assertEqual([loan.id for loan in page], [first.id])
+
+        page, _ = overdue.execute(after=(page[-1].due_at, page[-1].id), limit=1)
+        self.assertEqual([loan.id for loan in page], [third.id])
+
+        with self.assertRaises(ValidationException):
+            overdue.execute(limit=0)
+
+    def test_process_overdue_once(self):
+        self.borrow(self.student, 'Libro A')
+        self.borrow(self.other, 'Libro B')
+        self.clock.advance(timedelta(days=15))
+
+        process = ProcessOverdueLoansUseCase(self.loans, self.unit_of_work, self.clock, self.events)
+        self.assertEqual(process.execute(chunk_size=1), 2)
+        self.assertEqual(process.execute(), 0)
+        self.assertEqual(len([event for event in self.events.events if isinstance(event, LoanOverdue)]), 2)
+
+    def test_archive_and_history(self):
+        old = self.borrow(self.student, 'Libro A')
+        self.return_loan.execute(old.id)
+        other = self.borrow(self.other, 'Libro B')
+        self.return_loan.execute(other.id)
+        recent = self.borrow(self.student, 'Libro C', days_later=100)
+        self.return_loan.execute(recent.id)
+
+        archived = ArchiveLoansUseCase(self.loans, self.clock).execute(timedelta(days=30), chunk_size=1)
+        self.assertEqual(archived, 2)
+        self.assertEqual([loan.id for loan in self.loans.find_returned_loans()], [recent.id])
+
+        # Los archivados siguen consultables por ID
+        self.assertEqual(GetLoanUseCase(self.loans).execute(old.id).id, old.id)
+        with self.assertRaises(LoanNotFoundException):
+            GetLoanUseCase(self.loans).execute(9999)
+
+        history = ListLoanHistoryUseCase(self.loans)
+        # Un estudiante solo ve lo suyo aunque pida otro student_id
+        own = history.execute(self.student.id, student_id=self.other.id)
+        self.assertEqual([loan.id for loan in own], [old.id])
+        everything = history.execute(self.student.id, is_librarian=True, limit=1)
+        self.assertEqual([loan.id for loan in everything], [other.id])
+        rest = history.execute(
+            self.student.id, is_librarian=True,
+            before=(everything[-1].borrowed_at, everything[-1].id)
+        )
+        self.assertEqual([loan.id for loan in rest], [old.id])
+
+
+class LoanListingApiTests(TestCase):
+    """Listado de préstamos: compact=true y sparse fieldsets (fields=)"""
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='admin'))
+        student = DjangoUser.objects.get(username='estudiante1')
+        for book in DjangoBook.objects.order_by('id')[:2]:
+            DjangoLoan.objects.create(student=student, book=book, due_at=django_now() + timedelta(days=14))
+
+    def test_compact_includes_each_student_once(self):
+        response = self.client.get('/api/loans/', {'compact': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(list(response.data['included']['students']), [
+            str(DjangoUser.objects.get(username='estudiante1').id)
+        ])
+        self.assertEqual(len(response.data['included']['books']), 2)
+        self.assertNotIn('student', response.data['results'][0])
+
+    def test_fields(self):
+        response = self.client.get('/api/loans/', {'fields': 'id,due_at'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({tuple(loan) for loan in response.data}, {('id', 'due_at')})
+
+    def test_compact_rejects_fields(self):
+        response = self.client.get('/api/loans/', {'compact': 'true', 'fields': 'id'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/loans/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,114 @@
+"""Middleware de la API: compresión de respuestas y control de admisión"""
+import gzip
+import time
+import zlib
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..presentation.middleware.admission import AdmissionControlMiddleware, queue_time_ms
+from ..presentation.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+PAYLOAD = {'results': [{'id': index, 'title': 'Cien años de soledad'} for index in range(200)]}
+
+
+class NegotiateEncodingTests(SimpleTestCase):
+
+    def test_quality_and_server_preference(self):
+        preference = ['zstd', 'br', 'gzip']
+        self.assertEqual(negotiate_encoding('gzip, deflate', preference), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip;q=1.0, br;q=0.5', preference), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip, br', preference), 'br')
+        self.assertEqual(negotiate_encoding('*;q=0.3, zstd;q=0', preference), 'br')
+        self.assertIsNone(negotiate_encoding('identity', preference))
+        self.assertIsNone(negotiate_encoding('gzip;q=0, br;q=bad', preference))
+
+
+@override_settings(RESPONSE_COMPRESSION={'MIN_SIZE': 200, 'ENCODINGS': ['gzip']})
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, accept='gzip'):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(self.factory.get('/api/books/', HTTP_ACCEPT_ENCODING=accept))
+
+    def test_gzip_round_trip(self):
+        original = JsonResponse(PAYLOAD)
+        body = original.content
+        original['ETag'] = '"7"'
+
+        response = self.process(original)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"7"')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), body)
+
+    def test_not_compressed(self):
+        cases = {
+            'below MIN_SIZE': (JsonResponse({'id': 1}), 'gzip'),
+            'not accepted': (JsonResponse(PAYLOAD), 'identity'),
+            'html': (HttpResponse('<p>' * 500, content_type='text/html'), 'gzip'),
+            'event stream': (
+                StreamingHttpResponse(iter([b'data: 1\n\n']), content_type='text/event-stream'), 'gzip'
+            ),
+        }
+        for name, (original, accept) in cases.items():
+            with self.subTest(name):
+                self.assertFalse(self.process(original, accept).has_header('Content-Encoding'))
+
+    def test_streaming_flushes_each_chunk(self):
+        original = StreamingHttpResponse(
+            iter([b'id,title\n', b'1,Rayuela\n']), content_type='text/csv'
+        )
+        original['Content-Length'] = '19'
+
+        response = self.process(original)
+        chunks = list(response.streaming_content)
+        self.assertFalse(response.has_header('Content-Length'))
+        # Cada bloque llega completo: descomprimible sin esperar al final
+        self.assertEqual(zlib.decompressobj(31).decompress(chunks[0]), b'id,title\n')
+        self.assertEqual(gzip.decompress(b''.join(chunks)), b'id,title\n1,Rayuela\n')
+
+
+@override_settings(ADMISSION_CONTROL={'MAX_CONCURRENT': 1, 'MAX_QUEUE_MS': 500, 'RETRY_AFTER': 3})
+class AdmissionControlTests(SimpleTestCase):
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.factory = RequestFactory()
+        self.middleware = AdmissionControlMiddleware(lambda request: HttpResponse())
+
+    def test_rejects_beyond_max_concurrent(self):
+        first = self.factory.get('/api/books/')
+        self.assertIsNone(self.middleware.process_request(first))
+
+        response = self.middleware.process_request(self.factory.get('/api/loans/'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+
+        # Otras rutas y rutas exentas no ocupan plaza
+        self.assertIsNone(self.middleware.process_request(self.factory.get('/admin/')))
+        self.assertIsNone(self.middleware.process_request(self.factory.get('/api/books/stream/')))
+
+        self.middleware.process_response(first, HttpResponse())
+        self.assertIsNone(self.middleware.process_request(self.factory.get('/api/loans/')))
+
+    def test_rejects_requests_that_waited_in_queue(self):
+        waited = self.factory.get('/api/books/', HTTP_X_REQUEST_START=f't={time.time() - 2:.3f}')
+        with self.assertLogs('libraryapp.presentation.middleware.admission', 'WARNING'):
+            self.assertEqual(self.middleware.process_request(waited).status_code, 503)
+
+        fresh = self.factory.get('/api/books/', HTTP_X_REQUEST_START=f't={time.time():.3f}')
+        self.assertIsNone(self.middleware.process_request(fresh))
+
+    def test_queue_time_units(self):
+        with patch('libraryapp.presentation.middleware.admission.time.time', return_value=1_700_000_001.0):
+            for header in ('t=1700000000.5', '1700000000500', 't=1700000000500000'):
+                with self.subTest(header=header):
+                    self.assertAlmostEqual(queue_time_ms(header), 500, places=3)
+            self.assertIsNone(queue_time_ms('t=never'))
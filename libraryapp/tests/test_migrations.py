@@ -0,0 +1,64 @@
+"""Migración de datos 0006: normalización de autores y géneros"""
+from importlib import import_module
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TransactionTestCase
+
+normalize_migration = import_module('libraryapp.migrations.0006_normalize_authors_genres')
+
+BEFORE = [('libraryapp', '0005_circulation_stats')]
+AFTER = [('libraryapp', '0006_normalize_authors_genres')]
+
+
+class CanonicalNamesTests(SimpleTestCase):
+
+    def test_groups_case_and_spacing_variants(self):
+        canonical = normalize_migration._canonical_names([
+            'Gabriel García Márquez', ' gabriel garcía márquez', 'Gabriel García Márquez', 'Rayuela', None,
+        ])
+        self.assertEqual(canonical, {
+            'gabriel garcía márquez': 'Gabriel García Márquez',
+            'rayuela': 'Rayuela',
+            '': '',
+        })
+
+
+class NormalizeAuthorsGenresMigrationTests(TransactionTestCase):
+    # Conserva los datos de la migración 0001 para los tests posteriores
+    serialized_rollback = True
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def test_variants_share_one_author_and_round_trip(self):
+        apps = self.migrate(BEFORE)
+        Book = apps.get_model('libraryapp', 'DjangoBook')
+        Book.objects.all().delete()
+        for author_name in ('Julio Cortázar', 'julio cortázar ', 'Julio Cortázar'):
+            Book.objects.create(
+                title='Rayuela', author_name=author_name, genre_name='Novela',
+                published_year=1963, stock=1
+            )
+
+        apps = self.migrate(AFTER)
+        Author = apps.get_model('libraryapp', 'DjangoAuthor')
+        Book = apps.get_model('libraryapp', 'DjangoBook')
+        self.assertEqual(list(Author.objects.values_list('name', flat=True)), ['Julio Cortázar'])
+        self.assertEqual(
+            set(Book.objects.values_list('author__name', 'genre__name')), {('Julio Cortázar', 'Novela')}
+        )
+
+        apps = self.migrate(BEFORE)
+        Book = apps.get_model('libraryapp', 'DjangoBook')
+        self.assertEqual(
+            set(Book.objects.values_list('author_name', 'genre_name')), {('Julio Cortázar', 'Novela')}
+        )
@@ -0,0 +1,82 @@
+"""Outbox transaccional: reintentos, backoff y dead letter"""
+from datetime import datetime, timedelta, timezone
+from typing import List
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from ..domain.events.domain_events import DomainEvent, LoanCreated
+from ..infrastructure.events.event_bus import EventBus
+from ..infrastructure.events.outbox import OutboxEventPublisher, OutboxProcessor
+from ..infrastructure.models.django_models import DjangoOutboxEvent
+
+
+class OutboxProcessorTests(TestCase):
+    """Reintentos con backoff y dead letter del procesador del outbox"""
+
+    NOW = datetime(2024, 9, 2, 9, 0, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.failures = 0
+        self.dispatched: List[DomainEvent] = []
+
+        @self.bus.subscribe(LoanCreated)
+        def handler(event):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError('manejador caído')
+            self.dispatched.append(event)
+
+        self.processor = OutboxProcessor(self.bus, max_attempts=3, retry_base=timedelta(seconds=5))
+        OutboxEventPublisher().publish([
+            LoanCreated(loan_id=1, student_id=2, book_id=3, occurred_at=self.NOW - timedelta(days=1))
+        ])
+        self.row = DjangoOutboxEvent.objects.get()
+
+    def process_at(self, now: datetime) -> int:
+        with patch('libraryapp.infrastructure.events.outbox.timezone.now', return_value=now):
+            return self.processor.process_batch()
+
+    def test_dispatch_keeps_occurred_at(self):
+        self.assertEqual(self.process_at(self.NOW), 1)
+        self.assertEqual(self.dispatched[0].occurred_at, self.NOW - timedelta(days=1))
+        self.assertEqual(DjangoOutboxEvent.objects.get().processed_at, self.NOW)
+
+    def test_retry_with_exponential_backoff(self):
+        self.failures = 2
+        with self.assertLogs('libraryapp.infrastructure.events.outbox', 'ERROR'):
+            self.process_at(self.NOW)
+        row = DjangoOutboxEvent.objects.get()
+        self.assertEqual((row.attempts, row.last_error), (1, 'manejador caído'))
+        self.assertEqual(row.next_attempt_at, self.NOW + timedelta(seconds=5))
+
+        # Antes del backoff no se toma
+        self.assertEqual(self.process_at(self.NOW + timedelta(seconds=4)), 0)
+
+        with self.assertLogs('libraryapp.infrastructure.events.outbox', 'ERROR'):
+            self.process_at(self.NOW + timedelta(seconds=5))
+        self.assertEqual(
+            DjangoOutboxEvent.objects.get().next_attempt_at, self.NOW + timedelta(seconds=15)
+        )
+
+        self.process_at(self.NOW + timedelta(seconds=15))
+        row = DjangoOutboxEvent.objects.get()
+        self.assertEqual((row.attempts, row.last_error), (2, ''))
+        self.assertIsNotNone(row.processed_at)
+        self.assertEqual(len(self.dispatched), 1)
+
+    def test_dead_letter_after_max_attempts(self):
+        self.failures = 10
+        later = self.NOW
+        with self.assertLogs('libraryapp.infrastructure.events.outbox', 'ERROR') as logs:
+            for _ in range(3):
+                self.process_at(later)
+                later += timedelta(hours=1)
+        self.assertIn('dead letter', logs.output[-1])
+
+        row = DjangoOutboxEvent.objects.get()
+        self.assertEqual(row.attempts, 3)
+        self.assertIsNone(row.processed_at)
+        self.assertIsNone(row.next_attempt_at)
+        self.assertEqual(self.process_at(later + timedelta(days=1)), 0)
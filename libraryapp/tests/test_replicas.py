@@ -0,0 +1,82 @@
+"""Enrutado de lecturas a réplicas y lectura de las propias escrituras"""
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..infrastructure.database.replica_router import (
+    ReplicaRouter, begin_request, end_request, replica_reads
+)
+from ..infrastructure.models.django_models import DjangoBook
+from ..presentation.middleware.replica_routing import ReplicaRoutingMiddleware
+
+REPLICAS = {'replica_1': {}}
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+
+    def test_only_marked_reads_go_to_replica(self):
+        self.assertIsNone(self.router.db_for_read(DjangoBook))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(DjangoBook), 'replica_1')
+            # Tablas fuera de la aplicación (caché, sesiones, contenttypes) siempre en el primario
+            self.assertIsNone(self.router.db_for_read(ContentType))
+
+    def test_recent_writer_pinned_to_primary(self):
+        state = begin_request(7)
+        self.assertEqual(self.router.db_for_write(DjangoBook), 'default')
+        end_request(state, 7)
+
+        state = begin_request(7)
+        with replica_reads():
+            self.assertIsNone(self.router.db_for_read(DjangoBook))
+        end_request(state, 7)
+
+        state = begin_request(8)
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(DjangoBook), 'replica_1')
+        end_request(state, 8)
+
+    def test_migrations_skip_replicas(self):
+        self.assertTrue(self.router.allow_migrate('default', 'libraryapp'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'libraryapp'))
+
+    @override_settings(DATABASE_REPLICAS={})
+    def test_without_replicas(self):
+        self.assertIsNone(begin_request(7))
+        with replica_reads():
+            self.assertIsNone(self.router.db_for_read(DjangoBook))
+
+    def test_middleware_identifies_user_from_jwt(self):
+        token = AccessToken()
+        token['user_id'] = 42
+        factory = RequestFactory()
+
+        def writes(request):
+            ReplicaRouter().db_for_write(DjangoBook)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(writes)(factory.post('/api/loans/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        self.assertTrue(cache.get('replica:sticky:user:42'))
+
+        def reads(request):
+            with replica_reads():
+                self.assertIsNone(self.router.db_for_read(DjangoBook))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(reads)(factory.get('/api/books/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTransactionTests(TestCase):
+
+    def test_reads_inside_transaction_stay_on_primary(self):
+        # TestCase abre una transacción en default
+        with replica_reads():
+            self.assertIsNone(ReplicaRouter().db_for_read(DjangoBook))
@@ -0,0 +1,102 @@
+"""Recorridos por lotes y conteos estimados de los repositorios"""
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User as DjangoUser
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils.timezone import now as django_now
+
+from ..domain.entities.book import Book
+from ..infrastructure.models.django_models import DjangoBook, DjangoLoan
+from ..infrastructure.repositories.django_book_repository import DjangoBookRepository
+from ..infrastructure.repositories.django_loan_repository import DjangoLoanRepository
+from ..infrastructure.repositories.memory_book_repository import MemoryBookRepository
+from ..infrastructure.repositories.memory_store import MemoryStore
+
+
+class RepositoryScanTests(TestCase):
+    """Recorridos por lotes (iter_all) y conteos estimados (estimate_count)"""
+
+    def setUp(self):
+        student = DjangoUser.objects.get(username='estudiante1')
+        for book in DjangoBook.objects.order_by('id')[:3]:
+            DjangoLoan.objects.create(student=student, book=book, due_at=django_now() + timedelta(days=14))
+
+    def test_iter_all_in_chunks(self):
+        books = list(DjangoBookRepository().iter_all(chunk_size=2))
+        self.assertEqual(
+            [book.id for book in books], list(DjangoBook.objects.order_by('id').values_list('id', flat=True))
+        )
+
+        loans = list(DjangoLoanRepository().iter_all(chunk_size=2))
+        self.assertEqual(len(loans), 3)
+        self.assertEqual({loan.student.username for loan in loans}, {'estudiante1'})
+
+    def test_memory_iter_all(self):
+        store = MemoryStore()
+        books = MemoryBookRepository(store)
+        for title in ('Rayuela', 'Ficciones', 'Pedro Páramo'):
+            books.save(Book(id=None, title=title, author_name='Autor', published_year=1960, genre_name='Novela'))
+
+        self.assertEqual(
+            [book.title for book in books.iter_all(chunk_size=2)], ['Rayuela', 'Ficciones', 'Pedro Páramo']
+        )
+        self.assertEqual(books.estimate_count(), 3)
+
+    def test_estimate_count_exact_outside_postgresql(self):
+        self.assertEqual(DjangoBookRepository().estimate_count(), DjangoBook.objects.count())
+
+    def test_estimate_count_from_reltuples(self):
+        with patch('libraryapp.infrastructure.repositories.pagination.connections') as connections:
+            connection = connections.__getitem__.return_value
+            connection.vendor = 'postgresql'
+            cursor = connection.cursor.return_value.__enter__.return_value
+
+            cursor.fetchone.return_value = (250_000,)
+            self.assertEqual(DjangoLoanRepository().estimate_count(), 250_000)
+            self.assertIn('reltuples', cursor.execute.call_args[0][0])
+
+            # Tabla pequeña o sin analizar: COUNT(*) exacto
+            cursor.fetchone.return_value = (-1,)
+            self.assertEqual(DjangoLoanRepository().estimate_count(), 3)
+
+
+class PageTotalTests(TestCase):
+    """Totales de página: EXPLAIN con filtros, reltuples sin ellos, COUNT(*) si se pide exacto"""
+
+    def setUp(self):
+        patcher = patch('libraryapp.infrastructure.repositories.pagination.connections')
+        connections = patcher.start()
+        self.addCleanup(patcher.stop)
+        connection = connections.__getitem__.return_value
+        connection.vendor = 'postgresql'
+        self.cursor = connection.cursor.return_value.__enter__.return_value
+
+    def explain(self, rows: int):
+        plan = json.dumps([{'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': rows}}])
+        return patch.object(QuerySet, 'explain', return_value=plan)
+
+    def test_filtered_total_from_planner(self):
+        repository = DjangoBookRepository()
+        with self.explain(180_000) as explain:
+            page = repository.find_page({'available': 'true'}, offset=0, limit=2)
+            self.assertEqual((page.total, page.total_is_estimate), (180_000, True))
+            self.assertEqual(explain.call_args.kwargs, {'format': 'json'})
+            self.assertEqual(len(page.items), 2)
+
+            page = repository.find_page({'available': 'true'}, offset=0, limit=2, exact_total=True)
+            self.assertEqual((page.total, page.total_is_estimate), (8, False))
+
+        # Pocas filas estimadas: COUNT(*) exacto
+        with self.explain(12):
+            page = repository.find_page({'available': 'true'}, offset=0, limit=2)
+            self.assertEqual((page.total, page.total_is_estimate), (8, False))
+
+    def test_unfiltered_total_from_reltuples(self):
+        self.cursor.fetchone.return_value = (400_000,)
+        with self.explain(0) as explain:
+            page = DjangoBookRepository().find_page(offset=0, limit=2)
+        self.assertEqual((page.total, page.total_is_estimate), (400_000, True))
+        explain.assert_not_called()
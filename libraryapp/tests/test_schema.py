@@ -0,0 +1,59 @@
+"""Esquema OpenAPI generado una vez por proceso o en el build"""
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..presentation.views import schema
+
+
+class OpenApiSchemaTests(SimpleTestCase):
+
+    def setUp(self):
+        schema._schema = None
+        self.addCleanup(setattr, schema, '_schema', None)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name) / 'swagger.json'
+        self.factory = RequestFactory()
+
+    def get(self):
+        return schema.openapi_schema(self.factory.get('/swagger.json'))
+
+    def test_generated_once_per_process(self):
+        with patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+            first = self.get()
+            second = self.get()
+
+        generate.assert_called_once()
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['Cache-Control'], 'public, max-age=3600')
+        paths = json.loads(first.content)['paths']
+        self.assertIn('/books/suggest/', paths)
+        self.assertIn('/loans/', paths)
+
+    def test_prebuilt_file(self):
+        self.path.write_bytes(b'{"swagger": "2.0", "paths": {}}')
+        with override_settings(OPENAPI_SCHEMA={'FILE': self.path, 'PREBUILT': True, 'MAX_AGE': 60}), \
+                patch.object(schema, 'generate_schema') as generate:
+            response = self.get()
+
+        generate.assert_not_called()
+        self.assertEqual(response.content, b'{"swagger": "2.0", "paths": {}}')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_prebuilt_file_missing(self):
+        with override_settings(OPENAPI_SCHEMA={'FILE': self.path, 'PREBUILT': True}), \
+                patch.object(schema, 'generate_schema', return_value=b'{}') as generate:
+            self.assertEqual(self.get().content, b'{}')
+        generate.assert_called_once()
+
+    def test_generate_schema_command(self):
+        output = Path(self.directory.name) / 'build' / 'openapi.json'
+        call_command('generate_schema', output=str(output), stdout=StringIO())
+
+        self.assertEqual(json.loads(output.read_bytes())['info']['title'], 'Library Management API')
@@ -0,0 +1,90 @@
+"""Estadísticas de circulación: rollups diarios mantenidos por el outbox y su recálculo"""
+from datetime import date, datetime, timezone
+
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from ..domain.events.domain_events import LoanCreated, LoanReturned
+from ..infrastructure.events.event_bus import event_bus
+from ..infrastructure.events.outbox import OutboxEventPublisher, OutboxProcessor
+from ..infrastructure.models.django_models import (
+    DjangoBook, DjangoDailyBookStat, DjangoDailyGenreStat, DjangoLoan
+)
+from ..infrastructure.repositories.django_circulation_stats_repository import DjangoCirculationStatsRepository
+
+
+def at(day: int, month: int = 9) -> datetime:
+    """Mediodía UTC: el día del rollup no depende de la zona horaria"""
+    return datetime(2024, month, day, 12, 0, tzinfo=timezone.utc)
+
+
+class CirculationStatsTests(TestCase):
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='admin'))
+        self.student = DjangoUser.objects.get(username='estudiante1')
+        self.first, self.second = DjangoBook.objects.order_by('id')[:2]
+
+    def publish(self, *events) -> None:
+        OutboxEventPublisher().publish(list(events))
+        OutboxProcessor(event_bus).process_batch()
+
+    def loan_events(self, book, borrowed_at, returned_at=None):
+        events = [LoanCreated(loan_id=1, student_id=self.student.id, book_id=book.id, occurred_at=borrowed_at)]
+        if returned_at:
+            events.append(
+                LoanReturned(loan_id=1, student_id=self.student.id, book_id=book.id, occurred_at=returned_at)
+            )
+        return events
+
+    def test_rollups_follow_event_dates(self):
+        self.publish(
+            *self.loan_events(self.first, at(2), at(20)),
+            *self.loan_events(self.first, at(3)),
+            *self.loan_events(self.second, at(30), at(1, month=10)),
+        )
+
+        stat = DjangoDailyBookStat.objects.get(book=self.first, day=date(2024, 9, 2))
+        self.assertEqual((stat.loans, stat.returns), (1, 0))
+        self.assertEqual(DjangoDailyGenreStat.objects.get(
+            genre_name=self.first.genre.name, day=date(2024, 9, 20)
+        ).returns, 1)
+
+        books = self.client.get('/api/stats/books/', {'from': '2024-09-01', 'to': '2024-09-30'}).data
+        self.assertEqual(
+            [(row['book_id'], row['loans'], row['returns']) for row in books],
+            [(self.first.id, 2, 1), (self.second.id, 1, 0)]
+        )
+        monthly = self.client.get('/api/stats/monthly/', {'from': '2024-09-01', 'to': '2024-10-31'}).data
+        self.assertEqual(
+            [(row['month'], row['loans'], row['returns']) for row in monthly],
+            [('2024-09', 3, 1), ('2024-10', 0, 1)]
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        for book, borrowed_at, returned_at in (
+            (self.first, at(2), at(20)), (self.first, at(3), None), (self.second, at(30), at(1, month=10))
+        ):
+            DjangoLoan.objects.create(
+                student=self.student, book=book, borrowed_at=borrowed_at, returned_at=returned_at
+            )
+            self.publish(*self.loan_events(book, borrowed_at, returned_at))
+
+        repository = DjangoCirculationStatsRepository()
+        start, end = date(2024, 9, 1), date(2024, 10, 31)
+        incremental = (repository.by_book(start, end), repository.by_genre(start, end))
+        # DjangoLoan.borrowed_at es auto_now_add: las fechas de prueba se fijan después
+        for loan, borrowed_at in zip(DjangoLoan.objects.order_by('id'), (at(2), at(3), at(30))):
+            DjangoLoan.objects.filter(id=loan.id).update(borrowed_at=borrowed_at)
+
+        # Cinco días distintos con actividad, por libro y por género
+        self.assertEqual(repository.rebuild(), 10)
+        self.assertEqual((repository.by_book(start, end), repository.by_genre(start, end)), incremental)
+
+    def test_invalid_range(self):
+        response = self.client.get('/api/stats/genres/', {'from': '2024-13-01'})
+        self.assertEqual(response.status_code, 400)
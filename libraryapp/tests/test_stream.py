@@ -0,0 +1,93 @@
+"""Broker de cambios de stock y stream SSE"""
+import asyncio
+import queue
+import time
+import uuid
+from typing import List
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TransactionTestCase
+
+from ..infrastructure.external.stock_broker import (
+    BookChange,
+    LocalStockBackend,
+    PostgresNotifyStockBackend,
+    StockBroker,
+    StockChange,
+    decode_change,
+)
+from ..presentation.views.stream_views import book_stock_stream
+
+
+class StockStreamTests(SimpleTestCase):
+    """Difusión del broker de stock y vista SSE"""
+
+    def test_stream_not_served_under_wsgi(self):
+        request = RequestFactory().get('/api/books/stream/')
+        response = asyncio.run(book_stock_stream(request))
+        self.assertEqual(response.status_code, 501)
+
+    def test_stream_under_asgi_requires_token(self):
+        request = AsyncRequestFactory().get('/api/books/stream/')
+        response = asyncio.run(book_stock_stream(request))
+        self.assertEqual(response.status_code, 401)
+
+    def test_fan_out_coalesces_and_filters(self):
+        broker = StockBroker(LocalStockBackend())
+        heard: List = []
+        broker.add_listener(heard.append)
+
+        async def scenario():
+            everything, only_first = broker.subscribe(), broker.subscribe([1])
+            broker.publish(StockChange(book_id=1, stock=3))
+            broker.publish(StockChange(book_id=2, stock=0))
+            broker.publish(StockChange(book_id=1, stock=2))
+            broker.publish(BookChange(action='reload'))
+            # Un cliente lento solo recibe el último stock de cada libro
+            received = (await everything.wait(1), await only_first.wait(1), await only_first.wait(0.01))
+            everything.close()
+            only_first.close()
+            return received
+
+        everything, only_first, nothing = asyncio.run(scenario())
+        self.assertEqual(
+            sorted(everything, key=lambda change: change.book_id),
+            [StockChange(book_id=1, stock=2), StockChange(book_id=2, stock=0)]
+        )
+        self.assertEqual((only_first, nothing), ([StockChange(book_id=1, stock=2)], []))
+        # Los observadores síncronos reciben todo, también los cambios del catálogo
+        self.assertEqual(len(heard), 4)
+        self.assertEqual(broker._subscriptions, {})
+
+    def test_notify_payload_round_trip(self):
+        change = BookChange(action='upsert', book_id=7, fields={'title': 'Rayuela'})
+        with patch('libraryapp.infrastructure.external.stock_broker.connections') as connections:
+            PostgresNotifyStockBackend('book_stock').publish(change)
+        cursor = connections.__getitem__.return_value.cursor.return_value.__enter__.return_value
+        sql, (channel, payload) = cursor.execute.call_args[0]
+        self.assertIn('pg_notify', sql)
+        self.assertEqual(channel, 'book_stock')
+        self.assertEqual(decode_change(payload), change)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'LISTEN/NOTIFY requiere PostgreSQL')
+class PostgresNotifyStockBackendTests(TransactionTestCase):
+    """Entrega entre conexiones con LISTEN/NOTIFY"""
+
+    def test_notification_reaches_listener(self):
+        backend = PostgresNotifyStockBackend(f'stock_test_{uuid.uuid4().hex[:8]}')
+        received = queue.Queue()
+        backend.start(received.put)
+
+        # El hilo tarda un momento en ejecutar LISTEN: publicar hasta que llegue
+        change, deadline = StockChange(book_id=5, stock=1), time.monotonic() + 10
+        while time.monotonic() < deadline:
+            backend.publish(change)
+            try:
+                self.assertEqual(received.get(timeout=0.2), change)
+                return
+            except queue.Empty:
+                continue
+        self.fail('La notificación no llegó al hilo LISTEN')
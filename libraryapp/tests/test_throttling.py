@@ -0,0 +1,85 @@
+"""Límites de peticiones con ventana deslizante sobre la caché 'ratelimit'"""
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from ..presentation.throttling.throttles import SlidingWindowThrottle
+
+
+class SampleThrottle(SlidingWindowThrottle):
+    scope = 'sample'
+
+
+@override_settings(THROTTLING={'CACHE': 'ratelimit', 'BUCKETS': {'sample': {'RATE': '3/min', 'BURST': 3}}})
+class ThrottlingTests(SimpleTestCase):
+
+    # A mitad de una ventana de 60 s (BURST 3 a 3/min)
+    NOW = 1_700_000_010.0
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.factory = APIRequestFactory()
+        clock = patch('libraryapp.presentation.throttling.throttles.time.time', return_value=self.NOW)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def request(self, ip: str):
+        request = self.factory.get('/api/books/', REMOTE_ADDR=ip)
+        request.user = None
+        return request
+
+    def test_burst_then_reject(self):
+        throttle = SampleThrottle()
+        allowed = [throttle.allow_request(self.request('10.0.0.1'), None) for _ in range(4)]
+
+        self.assertEqual(allowed, [True, True, True, False])
+        self.assertEqual(throttle.wait(), 60 - self.NOW % 60)
+
+    def test_rejected_requests_do_not_count(self):
+        throttle = SampleThrottle()
+        for _ in range(10):
+            throttle.allow_request(self.request('10.0.0.1'), None)
+
+        slot = int(self.NOW // throttle.window)
+        self.assertEqual(caches['ratelimit'].get(f'throttle:sample:ip:10.0.0.1:{slot}'), 3)
+
+    def test_buckets_per_client(self):
+        throttle = SampleThrottle()
+        for _ in range(3):
+            throttle.allow_request(self.request('10.0.0.1'), None)
+
+        self.assertFalse(throttle.allow_request(self.request('10.0.0.1'), None))
+        self.assertTrue(throttle.allow_request(self.request('10.0.0.2'), None))
+
+    def test_previous_window_still_counts(self):
+        throttle = SampleThrottle()
+        for _ in range(3):
+            throttle.allow_request(self.request('10.0.0.1'), None)
+
+        # 45 s dentro de la ventana siguiente la anterior aún pesa un 25 %: caben dos, no tres
+        with patch('libraryapp.presentation.throttling.throttles.time.time', return_value=self.NOW + 75):
+            allowed = [throttle.allow_request(self.request('10.0.0.1'), None) for _ in range(3)]
+        self.assertEqual(allowed, [True, True, False])
+
+    def test_counter_expired_between_add_and_incr(self):
+        # La clave caduca tras el add y otra petición la recrea y cuenta antes que esta
+        throttle = SampleThrottle()
+        cache, incr = caches['ratelimit'], caches['ratelimit'].incr
+
+        def expired_once(key, delta=1):
+            if not expired_once.done:
+                expired_once.done = True
+                cache.set(key, 1)
+                raise ValueError(key)
+            return incr(key, delta)
+
+        expired_once.done = False
+        with patch.object(cache, 'incr', expired_once):
+            self.assertEqual(throttle._incr('throttle:sample:carrera'), 2)
+
+    @override_settings(THROTTLING={'CACHE': 'ratelimit', 'BUCKETS': {}})
+    def test_unconfigured_scope_is_unlimited(self):
+        throttle = SampleThrottle()
+        self.assertTrue(all(throttle.allow_request(self.request('10.0.0.1'), None) for _ in range(10)))
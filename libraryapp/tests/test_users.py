@@ -0,0 +1,46 @@
+"""Usuarios: concurrencia optimista con ETag / If-Match"""
+from django.contrib.auth.models import User as DjangoUser
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+
+class UserVersionApiTests(TestCase):
+
+    def setUp(self):
+        caches['ratelimit'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(DjangoUser.objects.get(username='admin'))
+        self.user = DjangoUser.objects.create_user('lector', email='lector@library.local', password='secreto123')
+        self.url = f'/api/users/{self.user.id}/'
+
+    def test_etag_advances_on_update(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.patch(self.url, {'first_name': 'Ana'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['first_name'], 'Ana')
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+
+        # Sin If-Match la escritura no se condiciona
+        response = self.client.patch(self.url, {'last_name': 'Pérez'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_stale_if_match_conflicts(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {'first_name': 'Ana'}, format='json', HTTP_IF_MATCH=etag)
+
+        response = self.client.patch(self.url, {'first_name': 'Eva'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(DjangoUser.objects.get(id=self.user.id).first_name, 'Ana')
+
+        # Etiqueta débil tras compresión: misma versión
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'first_name': 'Eva'}, format='json', HTTP_IF_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_malformed_if_match(self):
+        response = self.client.patch(self.url, {'first_name': 'Eva'}, format='json', HTTP_IF_MATCH='"v3"')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('If-Match', response.data['error'])
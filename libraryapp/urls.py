@@ -1,12 +1,16 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path, include
-from .presentation.views.api_views import BookViewSet, LoanViewSet, UserViewSet
+from .presentation.views.api_views import BookViewSet, LoanViewSet, UserViewSet, JobViewSet, StatsViewSet
+from .presentation.views.stream_views import book_stock_stream
 
 router = DefaultRouter()
 router.register(r'books', BookViewSet, basename='book')
 router.register(r'loans', LoanViewSet, basename='loan')
 router.register(r'users', UserViewSet, basename='user')
+router.register(r'jobs', JobViewSet, basename='job')
+router.register(r'stats', StatsViewSet, basename='stats')
 
 urlpatterns = [
+    path('api/books/stream/', book_stock_stream, name='book-stock-stream'),
     path('api/', include(router.urls)),
 ]
\ No newline at end of file